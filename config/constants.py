@@ -54,14 +54,22 @@ COLORS = {
     'purple': (128, 0, 128)
 }
 
-# Ses komutları
+# Ses komutları (sıra önceliktir; LLM'e gitmeden yanıtlanır)
 AUDIO_COMMANDS = {
-    'greeting': ['merhaba', 'selam', 'günaydın', 'hello', 'hi'],
-    'goodbye': ['hoşçakal', 'güle güle', 'bye', 'goodbye'],
+    'greeting': ['merhaba', 'selam', 'günaydın', 'hello', 'hi', 'hey'],
+    'goodbye': ['hoşçakal', 'güle güle', 'bye', 'goodbye', 'see you'],
     'question': ['nasılsın', 'ne yapıyorsun', 'how are you'],
     'thanks': ['teşekkür', 'sağol', 'thank you', 'thanks']
 }
 
+# Ses komutuna eşlik eden animasyon
+INTENT_ANIMATIONS = {
+    'greeting': 'greeting',
+    'goodbye': 'goodbye',
+    'question': 'nod',
+    'thanks': 'nod'
+}
+
 # Animasyon türleri
 ANIMATION_TYPES = {
     'greeting': 'Selamlama',
@@ -6,7 +6,7 @@ import json
 import os
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 @dataclass
 class CameraSettings:
@@ -36,6 +36,35 @@ class ServoSettings:
     movement_speed: int = 5
     enable_pid: bool = True
     
+    # Kafa PID döngüsü (enable_pid=True ise tespitten bağımsız çalışır)
+    pid_rate_hz: float = 100.0
+    pid_kp: float = 8.0  # 1/s - hata başına hız komutu
+    pid_ki: float = 0.5
+    pid_kd: float = 0.05
+    pid_feed_forward: float = 1.0  # setpoint hızı kazancı
+    
+    limit_log_interval: float = 10.0  # limit ihlali özet log aralığı (saniye)
+    
+    # Seri komut/yanıt günlüğü (replay_journal.py ile tekrar oynatılır); boş ise kapalı
+    journal_dir: str = ""
+    
+    # Son komut edilen poz (yeniden başlatmada kalibrasyon yerine bu pozdan devam)
+    warm_restart: bool = True
+    state_file: str = "data/servo_state.bin"
+    state_save_interval: float = 0.5  # saniye
+    
+    # Piksel -> kafa açısı tablosu ve kol IK ızgarası önbelleği
+    gaze_lut_cache_dir: str = "data/calibration"  # boş ise diske kaydedilmez
+    camera_head_offset: tuple = (0.0, 0.0, 0.0)  # kameradan kafa dönme merkezine (x, y, z) metre
+    
+    # Animasyon dosyalarını çalışırken yeniden yükle
+    animation_hot_reload: bool = True
+    animation_reload_interval: float = 1.0  # saniye (polling modu)
+    
+    # Çoklu kart: [{"name": "head", "port": "/dev/ttyUSB0", "servos": [12, 13]}, ...]
+    # None ise tüm servolar tek port (port/baudrate) üzerinden sürülür
+    servo_buses: List[Dict[str, Any]] = None
+    
     # Servo açı limitleri
     arm_limits: Dict[str, tuple] = None
     head_limits: Dict[str, tuple] = None
@@ -64,17 +93,86 @@ class AISettings:
     language: str = "tr"
     max_tokens: int = 150
     temperature: float = 0.7
+    api_base: str = ""  # boş ise OpenAI varsayılanı (test için yerel sunucu verilebilir)
+    request_timeout: float = 10.0  # saniye (kuyruk beklemesi dahil toplam süre sınırı)
+    verify_connection: bool = True  # başlangıçta API anahtarını arka planda doğrula (token harcamaz)
+    
+    # asyncio istemcisi (tek HTTP bağlantı havuzu, öncelik kuyruğu, yeniden deneme)
+    async_client: bool = True
+    chat_concurrency: int = 2  # aynı anda açık istek sayısı
+    chat_queue_size: int = 16
+    max_retries: int = 2
+    retry_backoff: float = 0.25  # saniye, her denemede 2 katı (+-%50 jitter)
+    
+    # Komut (selamlama, teşekkür...) cümlenin en az bu oranıysa hazır yanıt verilir;
+    # daha uzun cümlede animasyon oynar ama soru yine GPT'ye gider
+    intent_min_coverage: float = 0.5
+    
+    # Tekrarlanan sorular için yanıt önbelleği (0 ise kapalı)
+    response_cache_size: int = 256
+    response_cache_ttl: float = 2 * 86400.0  # saniye
+    response_cache_file: str = "data/cache/chat_responses.json"  # boş ise sadece bellekte
+    
+    # Yerel SSS indeksi: yüksek benzerlikte GPT'ye gitmeden yanıtlar (boş ise kapalı)
+    faq_file: str = "data/configs/faq.json"
+    faq_threshold: float = 0.6  # kosinüs benzerliği
+    faq_word_coverage: float = 1.0  # sorgu kelimelerinin eşleşen soruda geçme oranı (fazladan kelime -> GPT)
+    
+    # Konuşma kaydı (SQLite, WAL; boş ise kapalı). Kayıtlardaki soru sıklığı
+    # başlangıçta önbelleği ısıtır ve sık sorulanlar SSS'ye eklenir
+    conversation_db: str = "data/conversations/conversations.db"
+    conversation_flush_interval: float = 2.0  # saniye, toplu yazma aralığı
+    frequent_question_count: int = 3  # önbelleğe alınacak en az soruluş sayısı
+    faq_promote_count: int = 5  # bu kadar sorulan GPT yanıtı SSS'ye eklenir (0 ise kapalı)
+    
+    # Konuşma geçmişi token bütçesi (aşılınca eski turlar özetlenip çıkarılır)
+    history_token_budget: int = 1000
+    history_summary_tokens: int = 150  # özet mesajının üst sınırı
+    
+    # Ziyaretçi (takip ID'si) başına sohbet oturumları
+    max_chat_sessions: int = 32
+    session_idle_timeout: float = 300.0  # saniye, takip olayı kaçırılırsa
+    session_memory_tokens: int = 16000  # tüm oturumların toplam geçmiş sınırı
+    
+    # Yeni birincil hedef için selamlamayı ziyaretçi konuşmadan hazırla
+    greeting_prefetch: bool = True
+    greeting_distance: float = 2.0  # metre, etkileşim mesafesi
+    greeting_cancel_window: float = 3.0  # saniye; hedef bu sürede değişirse istek iptal edilir
+    
+    # Son isteklerin gecikme/token kayıtları (halka tampon; p50/p95/p99 için)
+    telemetry_size: int = 1000
     enable_tts: bool = True
     enable_stt: bool = True
+    
+    # Konuşma arka ucu: "stub" (donanımsız), "wav" (çıktıyı dosyaya yaz), "sounddevice"
+    speech_backend: str = "stub"
+    speech_sample_rate: int = 16000
+    speech_output_file: str = "logs/speech_output.wav"
+    tts_model: str = "tts-1"  # sounddevice arka ucu (OpenAI audio/speech)
+    tts_voice: str = "alloy"
+    vad_threshold: float = 0.02  # RMS, tam ölçeğe göre
+    vad_silence_ms: int = 400  # bu kadar sessizlik sözü bitirir
+    max_utterance_seconds: float = 10.0
 
 @dataclass
 class TrackingSettings:
     """Takip ayarları"""
     min_distance: float = 0.5  # metre
     max_distance: float = 5.0  # metre
-    tracking_smoothing: float = 0.3
+    tracking_smoothing: float = 0.3  # 0 ise bakış yumuşatma filtresi kapalı
     face_priority: bool = True
     auto_switch_target: bool = False
+    
+    # Gecikme telafisi (hedefi ölçülen uçtan uca gecikme kadar ileri tahmin et)
+    enable_prediction: bool = True
+    max_prediction_time: float = 0.4  # saniye
+    
+    # Bakış yumuşatma (One-Euro filtresi, eksen bazlı; piksel biriminde)
+    smoothing_min_cutoff_x: float = 1.0  # Hz - durağan hedefte titreşim bastırma
+    smoothing_beta_x: float = 0.05  # hız arttıkça kesim frekansı artışı
+    smoothing_min_cutoff_y: float = 0.7  # Hz - bbox merkezi dikeyde daha gürültülü
+    smoothing_beta_y: float = 0.05
+    smoothing_d_cutoff: float = 1.0  # Hz - hız tahmini filtresi
 
 @dataclass
 class SystemSettings:
@@ -84,6 +182,15 @@ class SystemSettings:
     auto_save_config: bool = True
     gui_theme: str = "dark"
     fullscreen: bool = False
+    
+    # Çok süreçli mod: kamera ve YOLO ayrı süreçlerde, kareler paylaşılan bellekte
+    multiprocess: bool = False
+    frame_ring_slots: int = 4  # en az; tespit gecikmesini karşılayacak kadar artırılır
+    frame_ring_latency: float = 0.5  # saniye; tespit bu kadar gecikse de karesi halkada kalmalı
+    process_max_restarts: int = 5  # process_restart_window içinde; aşılırsa süreç kapalı kalır
+    process_restart_window: float = 60.0  # saniye
+    process_hang_timeout: float = 5.0  # saniye; kalp atışı gelmezse süreç yeniden başlatılır
+    process_startup_timeout: float = 60.0  # saniye; model yükleme dahil ilk kalp atışına kadar
 
 
 class Settings:
@@ -4,9 +4,22 @@
 
 from .yolo_detector import YOLODetector
 from .openai_chat import OpenAIChat
+from .async_chat import AsyncOpenAIChat, BoundedPriorityQueue
+from .response_cache import ResponseCache
+from .faq_index import FAQIndex
+from .intent_router import IntentRouter
+from .conversation_history import ConversationHistory
+from .conversation_store import ConversationStore
+from .chat_sessions import ChatSession, SessionManager
+from .chat_telemetry import ChatTelemetry, RequestSample
+from .speech import SpeechPipeline, VoiceActivityDetector, create_speech_pipeline
+from .speech_backends import TTSBackend, STTBackend, AudioSink
 from .ai_interface import AIInterface, DetectionInterface, ChatInterface
 
 __all__ = [
-    'YOLODetector', 'OpenAIChat', 
+    'YOLODetector', 'OpenAIChat', 'AsyncOpenAIChat', 'BoundedPriorityQueue',
+    'ResponseCache', 'FAQIndex', 'IntentRouter', 'ConversationHistory', 'ChatSession', 'SessionManager',
+    'ChatTelemetry', 'RequestSample', 'ConversationStore',
+    'SpeechPipeline', 'VoiceActivityDetector', 'create_speech_pipeline', 'TTSBackend', 'STTBackend', 'AudioSink',
     'AIInterface', 'DetectionInterface', 'ChatInterface'
 ]
\ No newline at end of file
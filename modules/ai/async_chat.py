@@ -0,0 +1,481 @@
+# =======================
+# modules/ai/async_chat.py - asyncio Tabanlı GPT İstemcisi
+# =======================
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+import aiohttp
+import numpy as np
+import openai
+
+from config.settings import AISettings
+from modules.ai.ai_interface import ChatInterface
+from modules.ai.chat_telemetry import (
+    REQUEST_ASYNC, REQUEST_GREETING, RequestSample, create_trace_config, current_sample
+)
+from modules.ai.conversation_history import ConversationHistory
+from modules.ai.conversation_store import SOURCE_LLM
+from modules.ai.openai_chat import OpenAIChat
+from modules.system.logger import SystemLogger
+
+
+# İstek öncelikleri (küçük değer önce işlenir)
+PRIORITY_PRIMARY_TARGET = 0  # birincil hedefin selamlaması / sorusu
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2  # spekülatif işler (sonucu kullanılmayabilir)
+
+# Tekrar denenebilir hatalar (bağlantı, zaman aşımı, 429/503)
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Geçici hata mı (diğer 5xx yanıtlar dahil)"""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, openai.error.APIError) and (error.http_status or 0) >= 500
+
+
+@dataclass(order=True)
+class ChatRequest:
+    """Kuyruktaki tek sohbet isteği"""
+    priority: int
+    sequence: int
+    message: str = field(compare=False)
+    deadline: float = field(compare=False)  # time.monotonic() cinsinden
+    future: asyncio.Future = field(compare=False)
+    history: ConversationHistory = field(compare=False)  # isteği yapan ziyaretçinin geçmişi
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    record: bool = field(compare=False, default=True)  # False: geçmişe/önbelleğe yazılmaz (ön yükleme)
+    sample: Optional[RequestSample] = field(compare=False, default=None)  # telemetri ölçümü
+    started: bool = field(compare=False, default=False)  # işçi kuyruktan aldı
+
+
+class BoundedPriorityQueue:
+    """Sınırlı kapasiteli öncelik kuyruğu
+
+    Kuyruk doluyken gelen istek, kuyruktaki en düşük öncelikli istekten
+    daha önemliyse onu dışarı atar; değilse reddedilir.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.heap: List[ChatRequest] = []
+        self.not_empty = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    async def put(self, request: ChatRequest) -> Optional[ChatRequest]:
+        """İsteği ekle; dışarı atılan (veya reddedilen) isteği döndür"""
+        async with self.not_empty:
+            evicted = None
+            if len(self.heap) >= self.maxsize:
+                worst = max(self.heap)
+                if request >= worst:
+                    return request
+                self.heap.remove(worst)
+                heapq.heapify(self.heap)
+                evicted = worst
+
+            heapq.heappush(self.heap, request)
+            self.not_empty.notify()
+            return evicted
+
+    async def get(self) -> ChatRequest:
+        async with self.not_empty:
+            while not self.heap:
+                await self.not_empty.wait()
+            return heapq.heappop(self.heap)
+
+
+@dataclass
+class GreetingPrefetch:
+    """Yeni birincil hedef için arka planda hazırlanan selamlama"""
+    track_id: Hashable
+    future: Future
+    started: float = field(default_factory=time.monotonic)
+
+
+class AsyncOpenAIChat(OpenAIChat, ChatInterface):
+    """GPT istemcisi: paylaşılan HTTP havuzu, öncelik kuyruğu, süre sınırı ve yeniden deneme
+
+    İstekler kendi event loop thread'inde çalışır. Asenkron çağıranlar
+    ask() ile, senkron çağıranlar get_response() ile kullanır. Prompt,
+    geçmiş ve özel yanıtlar OpenAIChat ile aynıdır.
+    """
+
+    def __init__(self, settings: AISettings, logger: SystemLogger):
+        super().__init__(settings, logger)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[Thread] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.queue: Optional[BoundedPriorityQueue] = None
+        self.workers: List[asyncio.Task] = []
+        self.sequence = itertools.count()
+
+        # Kuyruk metrikleri
+        self.queue_waits: Deque[float] = deque(maxlen=500)
+        self.max_queue_depth = 0
+        self.completed_requests = 0
+        self.failed_requests = 0
+        self.deadline_exceeded = 0
+        self.retry_count = 0
+        self.rejected_requests = 0
+        self.cancelled_requests = 0
+
+        # Ziyaretçi konuşmadan hazırlanan selamlamalar (takip ID'si -> ön yükleme)
+        self.greetings: Dict[Hashable, GreetingPrefetch] = {}
+        self.greetings_lock = Lock()
+        self.prefetch_started = 0
+        self.prefetch_used = 0
+        self.prefetch_cancelled = 0
+        self.prefetch_wasted = 0  # tamamlandı ama ziyaretçi konuşmadan ayrıldı
+
+    # ----- Yaşam döngüsü -----
+
+    def initialize(self) -> bool:
+        if not super().initialize():
+            return False
+        self.start()
+        return True
+
+    def start(self):
+        """Event loop thread'ini, HTTP havuzunu ve işçileri başlat"""
+        if self.loop is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = Thread(target=self.loop.run_forever, name="chat-io", daemon=True)
+        self.loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_workers(), self.loop).result(5.0)
+
+    async def _start_workers(self):
+        connector = aiohttp.TCPConnector(limit=self.settings.chat_concurrency, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector, trace_configs=[create_trace_config()])
+        self.queue = BoundedPriorityQueue(self.settings.chat_queue_size)
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.settings.chat_concurrency)]
+
+    def cleanup(self):
+        """İşçileri durdur, HTTP havuzunu kapat ve önbelleği kaydet"""
+        if self.loop is not None:
+            self._stop_loop()
+        super().cleanup()  # işçiler durduktan sonra: son yanıtlar da önbelleğe ve kayda girer
+
+    def _stop_loop(self):
+        """Ön yüklemeleri bırak, işçileri ve event loop'u durdur"""
+        for track_id in list(self.greetings):
+            self._discard_greeting(track_id)
+        try:
+            asyncio.run_coroutine_threadsafe(self._stop_workers(), self.loop).result(5.0)
+        except Exception as e:
+            self.logger.error(f"Chat istemcisi kapatma hatası: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=2.0)
+        self.loop.close()
+        self.loop = None
+
+    async def _stop_workers(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        while self.queue and len(self.queue):
+            request = await self.queue.get()
+            if not request.future.done():
+                request.future.set_result(None)
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+        # Yanıt bekleyen ask() görevlerini de kapat
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # ----- İstekler -----
+
+    async def ask(self, message: str, priority: int = PRIORITY_NORMAL,
+                  deadline: Optional[float] = None, track_id: Optional[Hashable] = None) -> Optional[str]:
+        """İsteği kuyruğa ekle ve yanıtı bekle (chat loop'unda çalışmalı)
+
+        deadline saniye cinsinden toplam süre sınırıdır (kuyruk beklemesi dahil).
+        track_id verilmezse aktif ziyaretçinin geçmişi kullanılır.
+        Süre aşımında, kuyruktan atılınca veya hata durumunda None döner.
+        """
+        history = self._history_for(track_id)
+        cached = self._get_local_reply(message, history, REQUEST_ASYNC)
+        if cached:
+            return cached
+
+        return await self._enqueue(message, priority, deadline, history)
+
+    async def _enqueue(self, message: str, priority: int, deadline: Optional[float],
+                       history: ConversationHistory, record: bool = True) -> Optional[str]:
+        """İsteği kuyruğa ekle ve süre sınırı içinde yanıtı bekle"""
+        deadline = deadline or self.settings.request_timeout
+        request = ChatRequest(priority, next(self.sequence), message,
+                              time.monotonic() + deadline, asyncio.get_running_loop().create_future(),
+                              history, record=record,
+                              sample=RequestSample(self.settings.language,
+                                                   REQUEST_ASYNC if record else REQUEST_GREETING))
+
+        dropped = await self.queue.put(request)
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+        if dropped is not None:
+            self.rejected_requests += 1
+            self._finish_unstarted(dropped)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(request.future), deadline)
+        except asyncio.CancelledError:
+            # Çağıran vazgeçti: kuyruktaysa atlanır, işleniyorsa HTTP isteği iptal edilir
+            request.future.cancel()
+            raise
+        except asyncio.TimeoutError:
+            # Süre doldu: kuyruktaysa işçi bu isteği atlayacak, işleniyorsa
+            # ölçümü işçi yazar
+            if not request.future.done():
+                self.deadline_exceeded += 1
+                if not request.started:
+                    self._finish_unstarted(request)
+                else:
+                    request.future.set_result(None)
+            return request.future.result()
+
+    def _finish_unstarted(self, request: ChatRequest):
+        """İşlenmeden kuyruktan çıkan isteği kapat ve başarısız ölçüm olarak yaz"""
+        if request.future.done():
+            return
+        request.sample.queue_wait = time.monotonic() - request.enqueued_at
+        self.queue_waits.append(request.sample.queue_wait)
+        self.telemetry.add(request.sample.finish(success=False))
+        request.future.set_result(None)
+
+    def submit(self, message: str, priority: int = PRIORITY_NORMAL,
+               deadline: Optional[float] = None, track_id: Optional[Hashable] = None) -> Future:
+        """Başka thread'lerden istek gönder (concurrent.futures.Future döner)"""
+        return asyncio.run_coroutine_threadsafe(self.ask(message, priority, deadline, track_id), self.loop)
+
+    async def _worker(self):
+        openai.aiosession.set(self.session)  # tüm istekler aynı bağlantı havuzunu kullanır
+        while True:
+            request = await self.queue.get()
+            if request.future.done():
+                continue
+
+            request.started = True
+            request.sample.queue_wait = time.monotonic() - request.enqueued_at
+            self.queue_waits.append(request.sample.queue_wait)
+            attempt = asyncio.ensure_future(self._request_with_retries(request))
+            request.future.add_done_callback(
+                lambda future, attempt=attempt: attempt.cancel() if future.cancelled() else None)
+            try:
+                reply = await attempt
+            except asyncio.CancelledError:
+                if not request.future.cancelled():
+                    raise  # işçi durduruluyor
+                self.cancelled_requests += 1
+                continue
+            except Exception as e:
+                self.logger.error(f"OpenAI API hatası: {e}")
+                reply = None
+
+            if reply is None:
+                self.failed_requests += 1
+            else:
+                self.completed_requests += 1
+            self.telemetry.add(request.sample.finish(success=reply is not None))
+            if not request.future.done():
+                request.future.set_result(reply)
+
+    async def _request_with_retries(self, request: ChatRequest) -> Optional[str]:
+        """Süre sınırı içinde, üstel geri çekilme ve jitter ile tekrar dene"""
+        current_sample.set(request.sample)  # bağlantı süresi aiohttp izlemesinden yazılır
+        for attempt in range(self.settings.max_retries + 1):
+            remaining = request.deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                return await asyncio.wait_for(
+                    self._make_request_async(request.message, request.history, request.record,
+                                             request.sample), remaining)
+            except Exception as e:
+                if time.monotonic() >= request.deadline:
+                    break
+                if not is_retryable(e) or attempt == self.settings.max_retries:
+                    self.logger.warning(f"OpenAI isteği başarısız ({attempt + 1} deneme): {e}")
+                    self._update_connection_status(e)
+                    return None
+
+            backoff = self.settings.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if time.monotonic() + backoff >= request.deadline:
+                break
+            self.retry_count += 1
+            await asyncio.sleep(backoff)
+
+        if not request.future.done():  # ask() zaten saydıysa tekrar sayma
+            self.deadline_exceeded += 1
+        return None
+
+    async def _make_request_async(self, message: str, history: ConversationHistory, record: bool = True,
+                                  sample: Optional[RequestSample] = None) -> str:
+        start_time = time.time()
+        context_free = history.is_empty()
+        response = await openai.ChatCompletion.acreate(
+            model=self.settings.model,
+            messages=self._build_messages(message, history=history),
+            max_tokens=self.settings.max_tokens,
+            temperature=self.settings.temperature
+        )
+
+        reply = response.choices[0].message.content.strip()
+        response_time = time.time() - start_time
+
+        self.total_requests += 1
+        self.total_tokens_used += response.usage.total_tokens
+        self.average_response_time += (response_time - self.average_response_time) / self.total_requests
+        if sample is not None:
+            sample.time_to_first_token = time.monotonic() - sample.started  # akışsız: yanıtın tamamı
+            sample.prompt_tokens = response.usage.prompt_tokens
+            sample.completion_tokens = response.usage.completion_tokens
+
+        if record:
+            history.add_turn(message, reply)
+            self._cache_reply(message, reply, response_time, context_free)
+            self._log_exchange(history.session_id, message, reply, SOURCE_LLM, response_time, context_free)
+        self._update_connection_status()
+        return reply
+
+    def get_response(self, user_input: str, track_id: Optional[Hashable] = None,
+                     priority: int = PRIORITY_NORMAL) -> str:
+        """Senkron yanıt (kuyruk üzerinden, süre sınırıyla)"""
+        if not self.client or self.loop is None:
+            return self._get_default_message('error')
+
+        special = self._get_special_response(user_input, track_id)
+        if special:
+            return special
+
+        try:
+            reply = self.submit(user_input, priority, track_id=track_id).result(self.settings.request_timeout + 1.0)
+        except Exception as e:
+            self.logger.error(f"Chat isteği hatası: {e}")
+            reply = None
+
+        return reply or self._get_default_message('error')
+
+    # ----- Selamlama ön yüklemesi -----
+
+    def prefetch_greeting(self, track_id: Hashable, distance: Optional[float] = None) -> bool:
+        """Etkileşim mesafesindeki yeni birincil hedef için selamlamayı arka planda iste
+
+        İstek birincil hedef önceliğiyle kuyruğa girer (sıradaki normal ve arka
+        plan isteklerinin önüne geçer), geçmişe ve önbelleğe yazılmaz.
+        Ziyaretçi konuştuğunda take_greeting() ile beklemeden kullanılır.
+        """
+        if not self.settings.greeting_prefetch or self.loop is None:
+            return False
+        if distance is not None and distance > self.settings.greeting_distance:
+            return False
+
+        history = self.sessions.get(track_id).history
+        if len(history):
+            return False  # zaten konuşuyoruz
+
+        with self.greetings_lock:
+            if track_id in self.greetings:
+                return False
+            future = asyncio.run_coroutine_threadsafe(
+                self._enqueue(self._create_greeting_prompt(distance), PRIORITY_PRIMARY_TARGET,
+                              None, history, record=False), self.loop)
+            self.greetings[track_id] = GreetingPrefetch(track_id, future)
+            self.prefetch_started += 1
+        return True
+
+    def take_greeting(self, user_input: str, track_id: Optional[Hashable] = None) -> Optional[str]:
+        """Hazırlanmış selamlamayı al ve ziyaretçinin selamıyla birlikte geçmişe ekle (hazır değilse None)"""
+        if track_id is None:
+            track_id = self.sessions.active_id
+        with self.greetings_lock:
+            prefetch = self.greetings.get(track_id)
+            if prefetch is None or not prefetch.future.done():
+                return None
+            del self.greetings[track_id]
+
+        reply = None if prefetch.future.cancelled() else prefetch.future.result()
+        if not reply:
+            return None
+        self.sessions.get(track_id).history.add_turn(user_input, reply)
+        self.prefetch_used += 1
+        return reply
+
+    def _discard_greeting(self, track_id: Hashable):
+        """Kullanılmayan ön yüklemeyi bırak (sürüyorsa isteği iptal et)"""
+        with self.greetings_lock:
+            prefetch = self.greetings.pop(track_id, None)
+        if prefetch is None:
+            return
+        if prefetch.future.done():
+            self.prefetch_wasted += 1
+        else:
+            prefetch.future.cancel()
+            self.prefetch_cancelled += 1
+
+    def end_session(self, track_id: Hashable):
+        """Takip biterse hazırlanan selamlama da bırakılır"""
+        self._discard_greeting(track_id)
+        super().end_session(track_id)
+
+    def set_active_visitor(self, track_id: Optional[Hashable]):
+        """Birincil hedef kısa sürede değişirse önceki hedefin ön yüklemesi iptal edilir"""
+        previous = self.sessions.active_id
+        prefetch = self.greetings.get(previous)
+        if (previous != track_id and prefetch is not None and
+                time.monotonic() - prefetch.started < self.settings.greeting_cancel_window):
+            self._discard_greeting(previous)
+        super().set_active_visitor(track_id)
+
+    # ----- İstatistikler -----
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        waits = np.asarray(self.queue_waits) * 1000 if self.queue_waits else np.zeros(1)
+        stats.update({
+            "queue_depth": len(self.queue) if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_wait_ms_avg": round(float(waits.mean()), 1),
+            "queue_wait_ms_p95": round(float(np.percentile(waits, 95)), 1),
+            "completed_requests": self.completed_requests,
+            "failed_requests": self.failed_requests,
+            "deadline_exceeded": self.deadline_exceeded,
+            "retries": self.retry_count,
+            "rejected_requests": self.rejected_requests,
+            "cancelled_requests": self.cancelled_requests,
+            "greeting_prefetch": {
+                "pending": len(self.greetings),
+                "started": self.prefetch_started,
+                "used": self.prefetch_used,
+                "cancelled": self.prefetch_cancelled,
+                "wasted": self.prefetch_wasted
+            }
+        })
+        return stats
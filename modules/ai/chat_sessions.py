@@ -0,0 +1,145 @@
+# =======================
+# modules/ai/chat_sessions.py - Ziyaretçi Başına Sohbet Oturumları
+# =======================
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any, Dict, Hashable, Optional
+
+from modules.ai.conversation_history import ConversationHistory
+
+
+@dataclass
+class ChatSession:
+    """Tek ziyaretçinin (takip ID'si) sohbet oturumu"""
+    track_id: Optional[Hashable]
+    history: ConversationHistory
+    created: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    @property
+    def tokens(self) -> int:
+        return self.history.total_tokens + self.history.summary_token_count
+
+
+class SessionManager:
+    """Takip ID'sine göre sohbet oturumları (LRU + boşta kalma süresi + bellek sınırı)
+
+    Oturumlar hedef göründüğünde açılır, takip bitince kapatılır. Takip
+    olayı kaçırılırsa boşta kalan oturumlar süre dolunca, oturum sayısı
+    veya toplam token sınırı aşılırsa en uzun süredir kullanılmayanlar
+    atılır. Aktif oturum (birincil hedef) hiçbir zaman atılmaz.
+    """
+
+    def __init__(self, max_sessions: int = 32, idle_timeout: float = 300.0,
+                 memory_tokens: int = 16000, token_budget: int = 1000,
+                 summary_tokens: int = 150, max_messages: Optional[int] = None,
+                 language: str = "tr"):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.memory_tokens = memory_tokens  # tüm oturumların toplam token sınırı
+
+        # Yeni oturumların geçmiş ayarları
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.max_messages = max_messages
+        self.language = language
+
+        self.sessions: "OrderedDict[Optional[Hashable], ChatSession]" = OrderedDict()
+        self.active_id: Optional[Hashable] = None
+        self.lock = RLock()  # takip thread'i ve chat thread'i birlikte kullanır
+
+        self.created_sessions = 0
+        self.ended_sessions = 0
+        self.evicted_sessions = 0
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, track_id: Optional[Hashable]) -> bool:
+        return track_id in self.sessions
+
+    def get(self, track_id: Optional[Hashable] = None) -> ChatSession:
+        """Oturumu döndür (yoksa oluştur) ve en yeni olarak işaretle"""
+        with self.lock:
+            session = self.sessions.get(track_id)
+            if session is None:
+                session = ChatSession(track_id, ConversationHistory(
+                    self.token_budget, self.summary_tokens,
+                    max_messages=self.max_messages, language=self.language, session_id=track_id))
+                self.sessions[track_id] = session
+                self.created_sessions += 1
+            else:
+                self.sessions.move_to_end(track_id)
+            session.touch()
+            self._enforce_limits(keep=track_id)
+            return session
+
+    def get_active(self) -> ChatSession:
+        return self.get(self.active_id)
+
+    def set_active(self, track_id: Optional[Hashable]) -> ChatSession:
+        """Konuşulan ziyaretçiyi değiştir"""
+        with self.lock:
+            self.active_id = track_id
+            return self.get(track_id)
+
+    def end(self, track_id: Optional[Hashable]) -> bool:
+        """Takibi biten ziyaretçinin oturumunu kapat"""
+        with self.lock:
+            if self.sessions.pop(track_id, None) is None:
+                return False
+            if self.active_id == track_id:
+                self.active_id = None
+            self.ended_sessions += 1
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.sessions.clear()
+            self.active_id = None
+
+    def set_language(self, language: str):
+        """Dil değişince tüm oturumlar sıfırlanır"""
+        with self.lock:
+            self.language = language
+            self.clear()
+
+    # ----- Sınırlar -----
+
+    def total_tokens(self) -> int:
+        return sum(session.tokens for session in self.sessions.values())
+
+    def _enforce_limits(self, keep: Optional[Hashable]):
+        """Boşta kalanları, sonra sınır aşılırsa en eskileri at (aktif ve istenen hariç)"""
+        protected = (self.active_id, keep)
+        now = time.monotonic()
+        for track_id, session in list(self.sessions.items()):
+            if track_id not in protected and now - session.last_active > self.idle_timeout:
+                self._evict(track_id)
+
+        while len(self.sessions) > self.max_sessions or self.total_tokens() > self.memory_tokens:
+            oldest = next((track_id for track_id in self.sessions if track_id not in protected), None)
+            if oldest is None:
+                break
+            self._evict(oldest)
+
+    def _evict(self, track_id: Optional[Hashable]):
+        del self.sessions[track_id]
+        self.evicted_sessions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "sessions": len(self.sessions),
+                "active_session": self.active_id,
+                "session_tokens": self.total_tokens(),
+                "created_sessions": self.created_sessions,
+                "ended_sessions": self.ended_sessions,
+                "evicted_sessions": self.evicted_sessions
+            }
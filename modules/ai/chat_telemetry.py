@@ -0,0 +1,134 @@
+# =======================
+# modules/ai/chat_telemetry.py - Sohbet Gecikme ve Token Telemetrisi
+# =======================
+
+import contextvars
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+
+# İstek türleri
+REQUEST_CHAT = "chat"  # senkron, tek parça yanıt
+REQUEST_STREAM = "stream"  # akışlı yanıt
+REQUEST_ASYNC = "async"  # asyncio kuyruğu üzerinden
+REQUEST_GREETING = "greeting"  # selamlama ön yüklemesi
+
+PERCENTILES = (50, 95, 99)
+LATENCY_FIELDS = ("queue_wait", "connect_time", "time_to_first_token", "total_time")
+
+# aiohttp izleme geri çağrılarının ölçümü yazacağı örnek (her asyncio görevi kendi kopyasını görür)
+current_sample: contextvars.ContextVar[Optional["RequestSample"]] = contextvars.ContextVar(
+    "current_sample", default=None)
+
+
+@dataclass
+class RequestSample:
+    """Tek sohbet isteğinin ölçümü (süreler saniye; ölçülemeyenler None)"""
+    language: str
+    request_type: str
+    queue_wait: float = 0.0
+    connect_time: Optional[float] = None  # bağlantı hazır olana kadar (havuzdan gelirse ~0)
+    time_to_first_token: Optional[float] = None
+    total_time: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hit: bool = False  # SSS indeksi veya yanıt önbelleğinden
+    success: bool = True
+    started: float = field(default_factory=time.monotonic)
+    http_started: Optional[float] = None
+
+    def finish(self, success: bool = True) -> "RequestSample":
+        """Toplam süreyi kapat (ilk token ölçülmediyse toplam süreye eşitlenir)"""
+        self.total_time = time.monotonic() - self.started
+        if self.time_to_first_token is None and success:
+            self.time_to_first_token = self.total_time
+        self.success = success
+        return self
+
+
+class ChatTelemetry:
+    """Son isteklerin sabit boyutlu halka tamponu; dil ve istek türüne göre p50/p95/p99
+
+    Ortalama, yoğun saatlerdeki kuyruk gecikmesini gizler; yüzdelikler ağa
+    giden isteklerden hesaplanır, önbellekten gelenler yalnızca isabet
+    oranında sayılır.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.samples: Deque[RequestSample] = deque(maxlen=max(1, capacity))
+        self.lock = Lock()  # chat-io thread'i ve GUI thread'i birlikte kullanır
+        self.total_samples = 0
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, sample: RequestSample):
+        with self.lock:
+            self.samples.append(sample)
+            self.total_samples += 1
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """"dil/tür" anahtarlı özet"""
+        with self.lock:
+            samples = list(self.samples)
+
+        groups: Dict[Tuple[str, str], List[RequestSample]] = {}
+        for sample in samples:
+            groups.setdefault((sample.language, sample.request_type), []).append(sample)
+
+        return {f"{language}/{request_type}": self._summarize(group)
+                for (language, request_type), group in sorted(groups.items())}
+
+    @staticmethod
+    def _summarize(samples: List[RequestSample]) -> Dict[str, Any]:
+        network = [sample for sample in samples if not sample.cache_hit and sample.success]
+        summary: Dict[str, Any] = {
+            "count": len(samples),
+            "errors": sum(not sample.success for sample in samples),
+            "cache_hit_rate": round(sum(sample.cache_hit for sample in samples) / len(samples), 3),
+            "prompt_tokens_avg": round(float(np.mean([s.prompt_tokens for s in network])), 1) if network else 0.0,
+            "completion_tokens_avg": round(float(np.mean([s.completion_tokens for s in network])), 1) if network else 0.0
+        }
+        for name in LATENCY_FIELDS:
+            summary[f"{name}_ms"] = _percentiles_ms([getattr(sample, name) for sample in network])
+        return summary
+
+
+def _percentiles_ms(values: List[Optional[float]]) -> Dict[str, float]:
+    measured = [value for value in values if value is not None]
+    if not measured:
+        return {}
+    array = np.asarray(measured) * 1000
+    return {f"p{p}": round(float(np.percentile(array, p)), 1) for p in PERCENTILES}
+
+
+# ----- aiohttp bağlantı ölçümü -----
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """İstek başlangıcından bağlantının hazır olmasına kadar geçen süreyi current_sample'a yazar"""
+
+    async def on_request_start(session, context, params):
+        sample = current_sample.get()
+        if sample is not None:
+            sample.http_started = time.monotonic()
+
+    async def on_connection_ready(session, context, params):
+        sample = current_sample.get()
+        if sample is not None and sample.http_started is not None:
+            sample.connect_time = time.monotonic() - sample.http_started
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_ready)
+    trace_config.on_connection_reuseconn.append(on_connection_ready)
+    return trace_config
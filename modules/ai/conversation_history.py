@@ -0,0 +1,169 @@
+# =======================
+# modules/ai/conversation_history.py - Token Bütçeli Konuşma Geçmişi
+# =======================
+
+import math
+import re
+from typing import Dict, Hashable, Iterator, List, Optional
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+
+# Chat formatında her mesajın rol/ayraç yükü (token)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = {
+    'tr': "Önceki konuşmada ziyaretçinin sorduğu konular: ",
+    'en': "Topics the visitor asked about earlier: "
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin token sayısı (tiktoken varsa tam, yoksa ~3 karakter/token tahmini)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # Türkçe ekler nedeniyle İngilizceden (~4) daha fazla token üretir
+    return max(1, math.ceil(len(text) / 3))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Metni yaklaşık max_tokens token'a kısalt (baş kısmı korunur)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text)[:max_tokens]) + "..."
+    return text[:max_tokens * 3] + "..."
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationHistory:
+    """Token bütçesi içinde tutulan konuşma geçmişi
+
+    Token sayıları mesaj eklenirken bir kez hesaplanır ve toplam artımlı
+    güncellenir. Bütçe aşıldığında en eski kullanıcı/asistan turları
+    çıkarılır; çıkarılan kullanıcı soruları kısa bir özet mesajında
+    (kendi token sınırıyla) saklanır, böylece bağlam tamamen kaybolmaz.
+    """
+
+    def __init__(self, token_budget: int = 1000, summary_tokens: int = 150,
+                 max_messages: Optional[int] = None, language: str = "tr",
+                 session_id: Optional[Hashable] = None):
+        self.language = language
+        self.session_id = session_id  # ziyaretçinin takip ID'si (konuşma kaydı için)
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.max_messages = max_messages
+
+        self.history: List[Dict[str, str]] = []
+        self.history_tokens: List[int] = []
+        self.total_tokens = 0
+
+        self.summary_topics: List[str] = []
+        self.summary_message: Optional[Dict[str, str]] = None
+        self.summary_token_count = 0
+        self.evicted_turns = 0
+
+    # ----- Liste benzeri arayüz -----
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self.history)
+
+    def __getitem__(self, index):
+        return self.history[index]
+
+    def is_empty(self) -> bool:
+        """Bağlam yok mu (ilk tur; yanıt başka ziyaretçiyle paylaşılabilir)"""
+        return not self.history and self.summary_message is None
+
+    @property
+    def max_message_tokens(self) -> int:
+        """Tek mesajın kaplayabileceği en fazla token (uzun monologlar kısaltılır)"""
+        return max(16, self.token_budget // 2)
+
+    def append(self, message: Dict[str, str]):
+        """Tek mesaj ekle ve bütçeyi uygula"""
+        content = truncate_to_tokens(message["content"], self.max_message_tokens)
+        if content is not message["content"]:
+            message = {**message, "content": content}
+        tokens = message_tokens(message)
+        self.history.append(message)
+        self.history_tokens.append(tokens)
+        self.total_tokens += tokens
+        self._enforce_budget()
+
+    def add_turn(self, user_message: str, reply: str):
+        self.append({"role": "user", "content": user_message})
+        self.append({"role": "assistant", "content": reply})
+
+    def clear(self):
+        self.history.clear()
+        self.history_tokens.clear()
+        self.total_tokens = 0
+        self.summary_topics.clear()
+        self.summary_message = None
+        self.summary_token_count = 0
+
+    # ----- Bütçe -----
+
+    def _over_budget(self) -> bool:
+        if self.max_messages is not None and len(self.history) > self.max_messages:
+            return True
+        return self.total_tokens + self.summary_token_count > self.token_budget
+
+    def _enforce_budget(self):
+        # Son tur her zaman korunur
+        while len(self.history) > 2 and self._over_budget():
+            self._evict_oldest_turn()
+
+    def _evict_oldest_turn(self):
+        """En eski turu (kullanıcı + varsa asistan yanıtı) çıkar ve özete ekle"""
+        count = 2 if len(self.history) > 1 and self.history[1]["role"] == "assistant" else 1
+        for message, tokens in zip(self.history[:count], self.history_tokens[:count]):
+            self.total_tokens -= tokens
+            if message["role"] == "user":
+                self._add_to_summary(message["content"])
+
+        del self.history[:count]
+        del self.history_tokens[:count]
+        self.evicted_turns += 1
+
+    def _add_to_summary(self, text: str):
+        """Çıkarılan soruyu özet konulara ekle (ilk cümle, kısaltılmış)"""
+        topic = re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0][:80]
+        self.summary_topics.append(topic)
+
+        while True:
+            prefix = SUMMARY_PREFIX.get(self.language, SUMMARY_PREFIX['tr'])
+            content = prefix + "; ".join(self.summary_topics)
+            self.summary_message = {"role": "system", "content": content}
+            self.summary_token_count = message_tokens(self.summary_message)
+            if self.summary_token_count <= self.summary_tokens or len(self.summary_topics) <= 1:
+                break
+            self.summary_topics.pop(0)
+
+    # ----- İstek -----
+
+    def messages(self) -> List[Dict[str, str]]:
+        """İsteğe eklenecek mesajlar (varsa özet + geçmiş)"""
+        if self.summary_message is not None:
+            return [self.summary_message] + self.history
+        return list(self.history)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "messages": len(self.history),
+            "tokens": self.total_tokens + self.summary_token_count,
+            "token_budget": self.token_budget,
+            "evicted_turns": self.evicted_turns,
+            "summary_topics": len(self.summary_topics)
+        }
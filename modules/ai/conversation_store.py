@@ -0,0 +1,241 @@
+# =======================
+# modules/ai/conversation_store.py - Kalıcı Konuşma Kaydı (SQLite)
+# =======================
+
+import sqlite3
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from modules.ai.response_cache import normalize_question
+from modules.system.logger import SystemLogger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    session TEXT,
+    language TEXT NOT NULL,
+    question TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    reply TEXT NOT NULL,
+    source TEXT NOT NULL,
+    latency REAL NOT NULL DEFAULT 0,
+    prompt_version TEXT,
+    first_turn INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_exchanges_question ON exchanges (language, normalized, created);
+"""
+
+INSERT = ("INSERT INTO exchanges (created, session, language, question, normalized, reply, source, "
+          "latency, prompt_version, first_turn) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+# Yanıt kaynakları
+SOURCE_LLM = "llm"
+SOURCE_FAQ = "faq"
+SOURCE_CACHE = "cache"
+SOURCE_INTENT = "intent"
+
+
+class ConversationStore:
+    """Ziyaretçi soru-cevaplarını SQLite'a (WAL) kaydeden depo
+
+    record() sadece bellekteki kuyruğa ekler; satırlar arka plan
+    thread'inde birkaç saniyede bir tek işlemde toplu yazılır, böylece
+    sohbet yolu diski hiç beklemez. WAL kipinde okuma (analiz, önbellek
+    ısıtma) yazmayı engellemez. Takip ID'leri her çalıştırmada 1'den
+    başladığı için oturumlar çalıştırma ID'siyle öneklenir ("<run>-<id>").
+    """
+
+    def __init__(self, path: str, flush_interval: float = 2.0, max_pending: int = 10000,
+                 logger: Optional[SystemLogger] = None):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.logger = logger
+        self.run_id = uuid.uuid4().hex[:12]
+
+        self.pending: Deque[Tuple] = deque()
+        self.flush_waiters: List[Event] = []
+        self.wake = Event()
+        self.running = False
+        self.writer_thread: Optional[Thread] = None
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_batch_ms = 0.0
+
+    # ----- Yaşam döngüsü -----
+
+    def open(self) -> bool:
+        """Veritabanını hazırla ve yazıcı thread'ini başlat"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._connect()
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(exchanges)")}
+            if "first_turn" not in columns:  # eski kayıtlar bağlamlı sayılır
+                connection.execute("ALTER TABLE exchanges ADD COLUMN first_turn INTEGER NOT NULL DEFAULT 0")
+            connection.close()
+        except (OSError, sqlite3.Error) as e:
+            if self.logger:
+                self.logger.error(f"Konuşma veritabanı açılamadı: {e}")
+            return False
+
+        self.running = True
+        self.writer_thread = Thread(target=self._writer_loop, name="chat-store", daemon=True)
+        self.writer_thread.start()
+        return True
+
+    def close(self):
+        """Bekleyen satırları yaz ve thread'i durdur"""
+        if not self.running:
+            return
+        self.running = False
+        self.wake.set()
+        self.writer_thread.join(timeout=5.0)
+        self.writer_thread = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), timeout=5.0)
+        connection.execute("PRAGMA synchronous=NORMAL")  # WAL'da güvenli, her işlemde fsync yok
+        return connection
+
+    # ----- Yazma -----
+
+    def record(self, session: Optional[Hashable], language: str, question: str, reply: str,
+               source: str, latency: float = 0.0, prompt_version: Optional[str] = None,
+               first_turn: bool = False) -> bool:
+        """Soru-cevabı yazma kuyruğuna ekle (bloklamaz; first_turn: geçmişi boş bağlamsız soru)"""
+        if not self.running:
+            return False
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        session = None if session is None else f"{self.run_id}-{session}"
+        self.pending.append((time.time(), session, language, question,
+                             normalize_question(question, language), reply, source, latency, prompt_version,
+                             int(first_turn)))
+        self.recorded += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktakilerin yazılmasını bekle (test ve kapanış için)"""
+        if not self.running:
+            return False
+        done = Event()
+        self.flush_waiters.append(done)
+        self.wake.set()
+        return done.wait(timeout)
+
+    def _writer_loop(self):
+        connection = self._connect()
+        try:
+            while True:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+                waiters, self.flush_waiters = self.flush_waiters, []
+
+                self._write_batch(connection)
+                for waiter in waiters:
+                    waiter.set()
+                if not self.running:
+                    self._write_batch(connection)
+                    break
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection):
+        rows = []
+        while self.pending:
+            rows.append(self.pending.popleft())
+        if not rows:
+            return
+
+        start = time.perf_counter()
+        try:
+            with connection:
+                connection.executemany(INSERT, rows)
+            self.written += len(rows)
+            self.batches += 1
+            self.last_batch_ms = (time.perf_counter() - start) * 1000
+        except sqlite3.Error as e:
+            self.dropped += len(rows)
+            if self.logger:
+                self.logger.error(f"Konuşma kaydı yazılamadı ({len(rows)} satır): {e}")
+
+    # ----- Analiz -----
+
+    def _query(self, statements: Sequence[Tuple[str, Sequence]]) -> List[List[Tuple]]:
+        """Sorguları tek bağlantıda çalıştır (hata olursa hepsi boş döner)"""
+        try:
+            connection = self._connect()
+            try:
+                return [connection.execute(sql, parameters).fetchall() for sql, parameters in statements]
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            if self.logger:
+                self.logger.warning(f"Konuşma veritabanı okunamadı: {e}")
+            return [[] for _ in statements]
+
+    def frequent_questions(self, language: str, since: float = 0.0, min_count: int = 2,
+                           limit: int = 50, prompt_version: Optional[str] = None,
+                           first_turn_only: bool = False) -> List[Dict[str, Any]]:
+        """En sık sorulan sorular, soruluş biçimleri ve en son GPT yanıtı
+
+        Sayıma tüm kaynaklar (SSS, önbellek, GPT) girer; yanıt olarak
+        sadece GPT'nin (verilirse aynı prompt versiyonundaki) yanıtı döner.
+        first_turn_only ise sadece konuşmanın ilk (bağlamsız) soruları
+        sayılır; "evet", "neden?" gibi devam sorularının yanıtı herkese verilemez.
+        Soru sayısından bağımsız olarak iki gruplanmış sorgu çalışır.
+        """
+        if not self.path.exists():
+            return []
+
+        top = ("WITH top AS (SELECT normalized, COUNT(*) AS asked, MAX(created) AS last FROM exchanges "
+               "WHERE language = ? AND created >= ? AND source != ? AND first_turn >= ? "
+               "GROUP BY normalized HAVING asked >= ? ORDER BY asked DESC, last DESC LIMIT ?) ")
+        top_parameters = (language, since, SOURCE_INTENT, int(first_turn_only), min_count, limit)
+        questions_rows, variant_rows = self._query([
+            (top + "SELECT top.normalized, top.asked, latest.reply, latest.created, latest.latency FROM top "
+                   "LEFT JOIN (SELECT normalized, reply, created, latency, ROW_NUMBER() OVER "
+                   "(PARTITION BY normalized ORDER BY created DESC) AS rank FROM exchanges "
+                   "WHERE language = ? AND source = ? AND created >= ? AND (? IS NULL OR prompt_version = ?) "
+                   "AND first_turn >= ? AND normalized IN (SELECT normalized FROM top)) AS latest "
+                   "ON latest.normalized = top.normalized AND latest.rank = 1 "
+                   "ORDER BY top.asked DESC, top.last DESC",
+             top_parameters + (language, SOURCE_LLM, since, prompt_version, prompt_version, int(first_turn_only))),
+            (top + "SELECT normalized, question FROM exchanges "
+                   "WHERE language = ? AND normalized IN (SELECT normalized FROM top) "
+                   "GROUP BY normalized, question ORDER BY normalized, COUNT(*) DESC",
+             top_parameters + (language,))
+        ])
+
+        variants: Dict[str, List[str]] = {}
+        for normalized, question in variant_rows:
+            forms = variants.setdefault(normalized, [])
+            if len(forms) < 5:
+                forms.append(question)
+
+        return [{"normalized": normalized, "count": asked, "variants": variants.get(normalized, []),
+                 "reply": reply, "created": created, "latency": latency if latency is not None else 0.0}
+                for normalized, asked, reply, created, latency in questions_rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self.pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "last_batch_ms": round(self.last_batch_ms, 3)
+        }
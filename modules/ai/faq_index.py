@@ -0,0 +1,321 @@
+# =======================
+# modules/ai/faq_index.py - Yerel Hazır Yanıt İndeksi (TF-IDF)
+# =======================
+
+import json
+import math
+import os
+import time
+from collections import Counter, deque
+from pathlib import Path
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from modules.ai.response_cache import normalize_question
+from modules.system.logger import SystemLogger
+
+
+# Dosya yoksa oluşturulan varsayılan soru-cevaplar
+DEFAULT_FAQ = [
+    {
+        "language": "tr",
+        "questions": ["sen nesin", "sen kimsin", "nesin sen", "robot musun", "kendini tanıt"],
+        "answer": "Ben Expo-Humanoid, fuar ziyaretçileriyle konuşan interaktif bir robotum."
+    },
+    {
+        "language": "tr",
+        "questions": ["seni kim yaptı", "seni kim tasarladı", "seni kimler geliştirdi", "yapımcın kim"],
+        "answer": "Beni bir mühendis ekibi tasarladı ve geliştirdi."
+    },
+    {
+        "language": "tr",
+        "questions": ["nasıl görüyorsun", "kameran var mı", "beni nasıl görüyorsun", "nasıl algılıyorsun"],
+        "answer": "Derinlik kameramla çevremi görüyor, yapay zeka ile insanları algılayıp takip ediyorum."
+    },
+    {
+        "language": "tr",
+        "questions": ["nasıl hareket ediyorsun", "kollarını nasıl oynatıyorsun", "motorların var mı"],
+        "answer": "Kollarımı ve başımı Arduino ile kontrol edilen servo motorlarla hareket ettiriyorum."
+    },
+    {
+        "language": "tr",
+        "questions": ["ne yapabilirsin", "neler yapabilirsin", "yeteneklerin neler"],
+        "answer": "Ziyaretçileri takip edebilir, sorularını yanıtlayabilir ve el sallayabilirim."
+    },
+    {
+        "language": "en",
+        "questions": ["what are you", "who are you", "are you a robot", "introduce yourself"],
+        "answer": "I'm Expo-Humanoid, an interactive robot talking with visitors at this fair."
+    },
+    {
+        "language": "en",
+        "questions": ["who built you", "who made you", "who created you"],
+        "answer": "A team of engineers designed and built me."
+    },
+    {
+        "language": "en",
+        "questions": ["how do you see", "do you have a camera", "how can you see me"],
+        "answer": "I see with a depth camera and use AI to detect and follow people."
+    },
+    {
+        "language": "en",
+        "questions": ["what can you do", "what are your abilities"],
+        "answer": "I can follow visitors with my eyes, answer questions and wave hello."
+    }
+]
+
+# Soruya anlam katmayan kelimeler (kelime kapsamasında sayılmaz)
+FILLER_WORDS = {
+    "tr": {"acaba", "peki", "ki", "ya", "şey", "hey"},
+    "en": {"please", "so", "hey", "well", "then", "actually"}
+}
+MIN_PREFIX = 4  # ek farkı sayılan ortak kelime başı (kamera/kameran)
+
+
+def _same_word(word: str, other: str) -> bool:
+    return word == other or len(os.path.commonprefix((word, other))) >= MIN_PREFIX
+
+
+def _coverage(words: List[str], variant_words: List[str]) -> float:
+    """Sorgu kelimelerinin varyantta (aynen veya ek farkıyla) geçen oranı"""
+    if not words:
+        return 1.0
+    covered = sum(any(_same_word(word, other) for other in variant_words) for word in words)
+    return covered / len(words)
+
+
+class FAQIndex:
+    """Sık sorulan sorular için ağsız, milisaniye altı yanıt indeksi
+
+    Soru varyantları kelime + karakter n-gram TF-IDF vektörlerine
+    dönüştürülür ve scipy.sparse CSC matrisi (satır = varyant, sütun = terim)
+    olarak tutulur; sorgu skoru sadece sorgudaki terimlerin sütunlarından
+    hesaplanır. Yanıt için kosinüs eşiği yetmez: sorgudaki her anlamlı
+    kelime varyantta da geçmelidir ("what are you doing" -> "what are you"
+    eşleşmez, GPT'ye bırakılır). build() yeni matrisi kilit dışında hazırlar;
+    sorgular ve değiştirme kilitle korunur (arka planda SSS genişletme).
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (3, 5), threshold: float = 0.6,
+                 word_coverage: float = 1.0, logger: Optional[SystemLogger] = None):
+        self.ngram_range = ngram_range
+        self.threshold = threshold  # bu benzerliğin altı GPT'ye bırakılır
+        self.word_coverage = word_coverage  # sorgu kelimelerinin varyantta bulunması gereken oranı
+        self.logger = logger
+        self.lock = Lock()
+
+        self.entries: List[Dict[str, Any]] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.unknown_idf = 1.0  # sözlükte olmayan sorgu terimlerinin ağırlığı
+
+        # Satır = soru varyantı
+        self.row_entry = np.zeros(0, dtype=np.int32)
+        self.row_language = np.zeros(0, dtype=str)
+        self.row_words: List[List[str]] = []
+        self.matrix = sparse.csc_matrix((0, 0), dtype=np.float32)
+
+        self.build_time = 0.0
+        self.query_times: Deque[float] = deque(maxlen=1000)
+        self.hits = 0
+        self.misses = 0
+
+    # ----- Özellik çıkarımı -----
+
+    def _terms(self, text: str, language: str) -> Counter:
+        """Kelime ve karakter n-gram terimleri (ek/yazım farklarına dayanıklı)"""
+        normalized = normalize_question(text, language)
+        terms = Counter(f"w:{word}" for word in normalized.split())
+
+        padded = f" {normalized} "
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            terms.update(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        return terms
+
+    @staticmethod
+    def _tf(count: int) -> float:
+        return 1.0 + math.log(count)
+
+    # ----- Oluşturma -----
+
+    def build(self, entries: List[Dict[str, Any]]):
+        """Girdilerden TF-IDF matrisini oluştur"""
+        start = time.perf_counter()
+        entries = list(entries)
+
+        rows_terms = []
+        row_entry = []
+        row_language = []
+        row_words = []
+        for entry_id, entry in enumerate(entries):
+            language = entry.get("language", "tr")
+            for question in entry["questions"]:
+                rows_terms.append(self._terms(question, language))
+                row_entry.append(entry_id)
+                row_language.append(language)
+                row_words.append(normalize_question(question, language).split())
+
+        # Sözlük ve belge frekansları
+        vocabulary = {}
+        document_frequency = []
+        for terms in rows_terms:
+            for term in terms:
+                index = vocabulary.setdefault(term, len(vocabulary))
+                if index == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[index] += 1
+
+        n_rows = len(rows_terms)
+        idf = (np.log((1 + n_rows) / (1 + np.asarray(document_frequency, dtype=np.float64))) + 1.0).astype(np.float32)
+
+        # Satırları L2 normalize et ve (satır, terim, değer) üçlülerini topla
+        triplets_row, triplets_col, triplets_value = [], [], []
+        for row, terms in enumerate(rows_terms):
+            cols = np.fromiter((vocabulary[term] for term in terms), dtype=np.int64, count=len(terms))
+            values = np.fromiter((self._tf(count) for count in terms.values()), dtype=np.float64, count=len(terms))
+            values *= idf[cols]
+            values /= np.linalg.norm(values) or 1.0
+            triplets_row.append(np.full(len(cols), row, dtype=np.int32))
+            triplets_col.append(cols)
+            triplets_value.append(values)
+
+        if n_rows:
+            matrix = sparse.csc_matrix(
+                (np.concatenate(triplets_value), (np.concatenate(triplets_row), np.concatenate(triplets_col))),
+                shape=(n_rows, len(vocabulary)), dtype=np.float32)
+        else:
+            matrix = sparse.csc_matrix((0, 0), dtype=np.float32)
+
+        with self.lock:
+            self.entries = entries
+            self.vocabulary = vocabulary
+            self.idf = idf
+            self.unknown_idf = float(np.median(idf)) if len(idf) else 1.0
+            self.matrix = matrix
+            self.row_entry = np.asarray(row_entry, dtype=np.int32)
+            self.row_language = np.asarray(row_language, dtype=str)
+            self.row_words = row_words
+
+        self.build_time = time.perf_counter() - start
+
+    def add_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """Yeni girdileri ekleyip indeksi yeniden oluştur (ör. sık sorulan sorulardan)"""
+        if not entries:
+            return 0
+        self.build(self.entries + list(entries))
+        return len(entries)
+    
+    @classmethod
+    def load_or_create(cls, path: str, logger: Optional[SystemLogger] = None, **kwargs) -> "FAQIndex":
+        """Veri dosyasından oluştur; dosya yoksa varsayılan SSS kullanılır (dosya yazılmaz)"""
+        index = cls(logger=logger, **kwargs)
+        file_path = Path(path)
+        entries = DEFAULT_FAQ
+        try:
+            if file_path.exists():
+                entries = json.loads(file_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            if logger:
+                logger.warning(f"SSS dosyası okunamadı, varsayılanlar kullanılıyor: {e}")
+
+        index.build(entries)
+        return index
+
+    # ----- Sorgu -----
+
+    def _scores(self, text: str, language: str) -> Optional[np.ndarray]:
+        """Tüm varyantların kosinüs benzerliği (diğer diller 0; ortak terim yoksa None)"""
+        if not len(self.row_entry):
+            return None
+
+        terms = self._terms(text, language)
+        cols, weights = [], []
+        for term, count in terms.items():
+            col = self.vocabulary.get(term)
+            if col is not None:
+                cols.append(col)
+                weights.append(self._tf(count) * self.idf[col])
+        if not cols:
+            return None
+
+        # Sorgu normu bilinmeyen terimleri de içermeli (aksi halde skor şişer)
+        unknown = sum((self._tf(count) * self.unknown_idf) ** 2 for term, count in terms.items()
+                      if term not in self.vocabulary)
+        weights = np.asarray(weights, dtype=np.float32)
+        norm = math.sqrt(float(weights @ weights) + unknown)
+
+        scores = self.matrix[:, cols] @ weights
+        scores /= norm or 1.0
+        scores[self.row_language != language] = 0.0
+        return scores
+
+    def search(self, text: str, language: str = "tr") -> Tuple[Optional[Dict[str, Any]], float]:
+        """En benzer girdi ve kosinüs benzerliği (dil filtresiyle, kelime kapsaması aranmaz)"""
+        with self.lock:
+            scores = self._scores(text, language)
+            if scores is None:
+                return None, 0.0
+            best = int(np.argmax(scores))
+            return self.entries[self.row_entry[best]], float(scores[best])
+
+    def match(self, text: str, language: str = "tr") -> Tuple[Optional[Dict[str, Any]], float]:
+        """Eşiği ve kelime kapsamasını geçen en benzer girdi (yoksa None)"""
+        fillers = FILLER_WORDS.get(language, set())
+        words = [word for word in normalize_question(text, language).split() if word not in fillers]
+        with self.lock:
+            scores = self._scores(text, language)
+            if scores is None:
+                return None, 0.0
+
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for row in candidates[np.argsort(-scores[candidates], kind="stable")]:
+                if _coverage(words, self.row_words[row]) >= self.word_coverage:
+                    return self.entries[self.row_entry[row]], float(scores[row])
+        return None, 0.0
+
+    def answer(self, text: str, language: str = "tr") -> Optional[str]:
+        """Yüksek güvenli eşleşmede hazır yanıtı döndür, aksi halde None"""
+        start = time.perf_counter()
+        entry, _ = self.match(text, language)
+        self.query_times.append(time.perf_counter() - start)
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["answer"]
+
+    def benchmark(self, questions: List[str], language: str = "tr", repeat: int = 20) -> Dict[str, float]:
+        """Sorgu gecikmesini ölç (milisaniye)"""
+        timings = []
+        for _ in range(repeat):
+            for question in questions:
+                start = time.perf_counter()
+                self.search(question, language)
+                timings.append(time.perf_counter() - start)
+
+        timings = np.asarray(timings) * 1000
+        return {
+            "build_ms": round(self.build_time * 1000, 3),
+            "query_ms_p50": round(float(np.percentile(timings, 50)), 3),
+            "query_ms_p95": round(float(np.percentile(timings, 95)), 3),
+            "query_ms_max": round(float(timings.max()), 3)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        times = np.asarray(self.query_times) * 1000 if self.query_times else np.zeros(1)
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "questions": len(self.row_entry),
+            "features": len(self.vocabulary),
+            "build_ms": round(self.build_time * 1000, 3),
+            "query_ms_avg": round(float(times.mean()), 3),
+            "query_ms_p95": round(float(np.percentile(times, 95)), 3),
+            "hits": self.hits,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
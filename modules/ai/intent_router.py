@@ -0,0 +1,135 @@
+# =======================
+# modules/ai/intent_router.py - Yerel Niyet (Komut) Yönlendirici
+# =======================
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.constants import AUDIO_COMMANDS
+
+
+# Bu uzunluktaki anahtar kelimeler ek alabilir (merhabalar, teşekkürler);
+# daha kısalar tam kelime olmalı ("hi" -> "hiç" eşleşmesin)
+MIN_STEM_LENGTH = 5
+
+
+@dataclass
+class IntentMatch:
+    """Metinde bulunan niyet"""
+    intent: str
+    keyword: str
+    start: int
+    end: int
+    coverage: float = 1.0  # anahtar kelimelerin kapsadığı kelime oranı (tüm cümlede)
+
+
+class AhoCorasick:
+    """Çoklu anahtar kelime eşleyici (metin tek geçişte taranır)
+
+    Trie bir kez kurulur; her düğümün başarısızlık bağlantısı ve çıktı
+    listesi vardır. Tarama süresi anahtar kelime sayısından bağımsızdır.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[str, str]]] = [[]]  # (anahtar kelime, değer)
+
+        for keyword, value in patterns:
+            self._add(keyword, value)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, value: str):
+        node = 0
+        for char in keyword:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        self.outputs[node].append((keyword, value))
+
+    def _build_failure_links(self):
+        """Genişlik öncelikli: her düğüm, en uzun eşleşen son ekin düğümüne bağlanır"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """(başlangıç, bitiş, anahtar kelime, değer) eşleşmelerini sırayla üret"""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for keyword, value in self.outputs[node]:
+                yield index + 1 - len(keyword), index + 1, keyword, value
+
+
+class IntentRouter:
+    """Kullanıcı cümlesini LLM'e gitmeden yerel niyete (selamlama, veda...) eşler
+
+    Anahtar kelimeler config.constants.AUDIO_COMMANDS'tan bir kez derlenir.
+    Birden fazla niyet bulunursa sözlükteki sıra önceliği belirler.
+    """
+
+    def __init__(self, commands: Optional[Dict[str, List[str]]] = None):
+        self.commands = commands if commands is not None else AUDIO_COMMANDS
+        self.priority = {intent: rank for rank, intent in enumerate(self.commands)}
+        self.matcher = AhoCorasick(
+            (keyword.lower(), intent) for intent, keywords in self.commands.items() for keyword in keywords
+        )
+
+        self.routed = 0
+        self.intent_counts: Dict[str, int] = {intent: 0 for intent in self.commands}
+
+    def find(self, text: str) -> List[IntentMatch]:
+        """Kelime sınırlarına uyan tüm eşleşmeler"""
+        text = text.lower()
+        matches = []
+        for start, end, keyword, intent in self.matcher.find_all(text):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if len(keyword) < MIN_STEM_LENGTH and end < len(text) and text[end].isalnum():
+                continue
+            matches.append(IntentMatch(intent, keyword, start, end))
+        return matches
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """En öncelikli niyet (yoksa None)"""
+        matches = self.find(text)
+        if not matches:
+            return None
+
+        best = min(matches, key=lambda match: (self.priority[match.intent], match.start))
+        best.coverage = self._coverage(text, matches)
+        self.routed += 1
+        self.intent_counts[best.intent] += 1
+        return best
+
+    @staticmethod
+    def _coverage(text: str, matches: List[IntentMatch]) -> float:
+        """Herhangi bir eşleşmeyle örtüşen kelimelerin oranı ("teşekkürler, kameran nasıl çalışır" -> 0.25)"""
+        words = [word.span() for word in re.finditer(r"\w+", text)]
+        if not words:
+            return 1.0
+        covered = sum(any(start < match.end and match.start < end for match in matches) for start, end in words)
+        return covered / len(words)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"keywords": sum(len(keywords) for keywords in self.commands.values()),
+                "states": len(self.matcher.goto),
+                "routed": self.routed,
+                **{f"intent_{intent}": count for intent, count in self.intent_counts.items()}}
@@ -5,14 +5,33 @@
 import openai
 import asyncio
 import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Any
 import time
+from threading import Thread
 
 from config.settings import AISettings
+from modules.ai.chat_sessions import SessionManager
+from modules.ai.chat_telemetry import REQUEST_CHAT, REQUEST_STREAM, ChatTelemetry, RequestSample
+from modules.ai.conversation_history import ConversationHistory, estimate_tokens, message_tokens, truncate_to_tokens
+from modules.ai.conversation_store import (
+    SOURCE_CACHE, SOURCE_FAQ, SOURCE_INTENT, SOURCE_LLM, ConversationStore
+)
+from modules.ai.faq_index import FAQIndex
+from modules.ai.intent_router import IntentRouter
+from modules.ai.response_cache import ResponseCache
 from modules.system.logger import SystemLogger
 
 
+# Sistem prompt'u değiştiğinde artırılır (önbellekteki eski yanıtlar kullanılmaz)
+PROMPT_VERSION = "1"
+
+# API bağlantı durumları (başlangıçta arka planda veya ilk istekte doğrulanır)
+CONNECTION_UNKNOWN = "unknown"
+CONNECTION_CHECKING = "checking"
+CONNECTION_OK = "connected"
+CONNECTION_FAILED = "failed"
+
+
 class OpenAIChat:
     """OpenAI GPT-4o ile sohbet sistemi"""
     
@@ -22,72 +41,255 @@ class OpenAIChat:
         
         # OpenAI client
         self.client = None
+        self.connection_status = CONNECTION_UNKNOWN
+        self.connection_error = ""
         
-        # Konuşma geçmişi
-        self.conversation_history = []
+        # Ziyaretçi (takip ID'si) başına konuşma geçmişi; token bütçeli,
+        # mesaj sayısı üst sınır olarak kalır
         self.max_history_length = 10
+        self.sessions = SessionManager(
+            settings.max_chat_sessions, settings.session_idle_timeout, settings.session_memory_tokens,
+            settings.history_token_budget, settings.history_summary_tokens,
+            max_messages=self.max_history_length, language=settings.language
+        )
+        
+        # Dil başına sabit sistem prompt'u (sağlayıcı tarafı prompt önbelleği için değişmez önek)
+        self.system_prompts: Dict[str, str] = {}
         
         # Sistem mesajları
         self.system_messages = {
             'tr': {
                 'greeting': "Merhaba! Ben Expo-Humanoid robotuyum. Size nasıl yardımcı olabilirim?",
                 'goodbye': "Hoşçakalın! Tekrar görüşmek üzere.",
+                'question': "Çok iyiyim, teşekkürler! Ziyaretçilerle sohbet ediyorum. Siz nasılsınız?",
+                'thanks': "Rica ederim! Başka merak ettiğiniz bir şey var mı?",
                 'default': "İlginç bir soru. Size nasıl yardımcı olabilirim?",
                 'error': "Özür dilerim, şu anda size yardımcı olamıyorum."
             },
             'en': {
                 'greeting': "Hello! I'm Expo-Humanoid robot. How can I help you?",
                 'goodbye': "Goodbye! See you next time.",
+                'question': "I'm great, thanks! I'm chatting with visitors. How are you?",
+                'thanks': "You're welcome! Is there anything else you'd like to know?",
                 'default': "That's an interesting question. How can I help you?",
                 'error': "Sorry, I can't help you right now."
             }
         }
         
+        # Selamlama, veda vb. komutlar (LLM'e gitmeden hazır yanıt + animasyon)
+        self.intent_router = IntentRouter()
+        self.on_intent: Optional[Callable[[str], None]] = None
+        
         # İstatistikler
         self.total_requests = 0
         self.total_tokens_used = 0
         self.average_response_time = 0.0
         
+        # Akış (streaming) istatistikleri
+        self.streamed_requests = 0
+        self.average_time_to_first_token = 0.0
+        self.average_tokens_per_second = 0.0
+        
+        # İstek başına gecikme/token kayıtları (yüzdelikler için)
+        self.telemetry = ChatTelemetry(settings.telemetry_size)
+        
+        # Tekrarlanan sorular için yanıt önbelleği
+        self.response_cache = None
+        if settings.response_cache_size > 0:
+            self.response_cache = ResponseCache(
+                settings.response_cache_size, settings.response_cache_ttl,
+                settings.response_cache_file or None, logger
+            )
+        
+        # Sık sorulan sorular için yerel hazır yanıt indeksi (initialize'da yüklenir)
+        self.faq_index = None
+        
+        # Kalıcı konuşma kaydı (initialize'da açılır, geçmiş arka planda uygulanır)
+        self.conversation_store = None
+        self.warmup_thread: Optional[Thread] = None
+        
     def initialize(self) -> bool:
-        """OpenAI client'ını başlat"""
+        """OpenAI client'ını başlat (ağ isteği beklenmez; bağlantı arka planda doğrulanır)"""
         try:
             if not self.settings.openai_api_key:
                 self.logger.error("OpenAI API key bulunamadı")
                 return False
             
+            if self.settings.faq_file:
+                self.faq_index = FAQIndex.load_or_create(
+                    self.settings.faq_file, self.logger, threshold=self.settings.faq_threshold,
+                    word_coverage=self.settings.faq_word_coverage)
+                self.logger.info(f"SSS indeksi yüklendi: {len(self.faq_index.row_entry)} soru, "
+                                 f"{self.faq_index.build_time * 1000:.1f} ms")
+            
+            if self.response_cache and self.response_cache.load():
+                self.logger.info(f"Yanıt önbelleği yüklendi: {len(self.response_cache.entries)} girdi")
+            
+            if self.settings.conversation_db:
+                store = ConversationStore(self.settings.conversation_db,
+                                          self.settings.conversation_flush_interval, logger=self.logger)
+                if store.open():
+                    self.conversation_store = store
+                    self.warmup_thread = Thread(target=self._apply_frequent_questions,
+                                                name="chat-warmup", daemon=True)
+                    self.warmup_thread.start()
+            
             openai.api_key = self.settings.openai_api_key
+            if self.settings.api_base:
+                openai.api_base = self.settings.api_base
             self.client = openai
             
-            # Test isteği gönder
-            test_response = self._make_request("Test message", test=True)
-            
-            if test_response:
-                self.logger.info("OpenAI GPT-4o bağlantısı başarılı")
-                return True
-            else:
-                return False
+            if self.settings.verify_connection:
+                self.verify_connection_async()
+            return True
                 
         except Exception as e:
             self.logger.error(f"OpenAI başlatılamadı: {e}")
             return False
     
-    def _make_request(self, message: str, test: bool = False) -> Optional[str]:
+    def _apply_frequent_questions(self):
+        """Kayıtlardaki sık soruların GPT yanıtlarıyla önbelleği ısıt ve SSS'yi genişlet
+
+        Arka plan thread'inde çalışır. Sadece bu prompt versiyonundaki,
+        önbellek ömründen yeni ve konuşmanın ilk turundaki GPT yanıtları
+        kullanılır (eski veya bağlamlı yanıt SSS'ye kalıcı olarak girmez).
+        """
+        store = self.conversation_store
+        since = time.time() - self.settings.response_cache_ttl
+        try:
+            for language in self.system_messages:
+                if self.response_cache is not None:
+                    questions = store.frequent_questions(
+                        language, since, self.settings.frequent_question_count,
+                        self.response_cache.max_entries, PROMPT_VERSION, first_turn_only=True)
+                    warmed = self.response_cache.warm([
+                        (q["normalized"], language, PROMPT_VERSION, q["reply"], q["created"], q["latency"])
+                        for q in reversed(questions) if q["reply"]
+                    ])
+                    if warmed:
+                        self.logger.info(f"Yanıt önbelleği sık sorulan {warmed} soruyla ısıtıldı ({language})")
+                
+                if self.faq_index is not None and self.settings.faq_promote_count > 0:
+                    entries = [
+                        {"language": language, "questions": q["variants"], "answer": q["reply"]}
+                        for q in store.frequent_questions(language, since, self.settings.faq_promote_count,
+                                                          prompt_version=PROMPT_VERSION, first_turn_only=True)
+                        if q["reply"] and self.faq_index.match(q["normalized"], language)[0] is None
+                    ]
+                    if self.faq_index.add_entries(entries):
+                        self.logger.info(f"SSS indeksine sık sorulan {len(entries)} soru eklendi ({language})")
+        except Exception as e:
+            self.logger.error(f"Sık sorulan sorular uygulanamadı: {e}")
+    
+    def _log_exchange(self, session_id: Optional[Hashable], message: str, reply: str,
+                      source: str, latency: float = 0.0, first_turn: bool = False):
+        """Soru-cevabı konuşma kaydına ekle (yazma arka planda)"""
+        if self.conversation_store is not None:
+            self.conversation_store.record(session_id, self.settings.language, message, reply,
+                                           source, latency, PROMPT_VERSION, first_turn)
+    
+    def verify_connection_async(self):
+        """API anahtarını arka plan thread'inde doğrula (GUI/kamera başlangıcını bekletmez)"""
+        self.connection_status = CONNECTION_CHECKING
+        Thread(target=self.verify_connection, name="chat-verify", daemon=True).start()
+    
+    def verify_connection(self) -> bool:
+        """Model bilgisini sorgulayarak anahtarı doğrula (tamamlama isteği yok, token harcanmaz)"""
+        try:
+            self.client.Model.retrieve(self.settings.model, request_timeout=self.settings.request_timeout)
+            self._update_connection_status()
+            self.logger.info("OpenAI GPT-4o bağlantısı başarılı")
+            return True
+        except Exception as e:
+            self._update_connection_status(e)
+            self.logger.error(f"OpenAI bağlantı doğrulaması başarısız: {e}")
+            return False
+    
+    def _update_connection_status(self, error: Optional[Exception] = None):
+        """Doğrulama veya gerçek istek sonucuna göre bağlantı durumunu güncelle"""
+        if error is None:
+            self.connection_status = CONNECTION_OK
+            self.connection_error = ""
+        else:
+            self.connection_status = CONNECTION_FAILED
+            self.connection_error = str(error)
+    
+    @property
+    def conversation_history(self) -> ConversationHistory:
+        """Aktif ziyaretçinin (birincil hedefin) konuşma geçmişi"""
+        return self.sessions.get_active().history
+    
+    def _history_for(self, track_id: Optional[Hashable]) -> ConversationHistory:
+        """Verilen ziyaretçinin geçmişi (None ise aktif ziyaretçi)"""
+        if track_id is None:
+            return self.conversation_history
+        return self.sessions.get(track_id).history
+    
+    # ----- Oturumlar (TargetTracker olaylarına bağlanır) -----
+    
+    def start_session(self, track_id: Hashable):
+        """Yeni takip edilen ziyaretçi için oturum aç"""
+        self.sessions.get(track_id)
+    
+    def end_session(self, track_id: Hashable):
+        """Takibi biten ziyaretçinin oturumunu kapat"""
+        self.sessions.end(track_id)
+    
+    def set_active_visitor(self, track_id: Optional[Hashable]):
+        """Konuşulan ziyaretçiyi değiştir (birincil hedef değişince)"""
+        self.sessions.set_active(track_id)
+    
+    # ----- Selamlama ön yüklemesi -----
+    
+    def prefetch_greeting(self, track_id: Hashable, distance: Optional[float] = None) -> bool:
+        """Ziyaretçi konuşmadan kişisel selamlamayı arka planda hazırla
+        
+        Senkron istemcide arka plan isteği olmadığından desteklenmez.
+        """
+        return False
+    
+    def take_greeting(self, user_input: str, track_id: Optional[Hashable] = None) -> Optional[str]:
+        """Hazır selamlamayı al (yoksa None)"""
+        return None
+    
+    def _create_greeting_prompt(self, distance: Optional[float] = None) -> str:
+        """Yeni ziyaretçi için selamlama isteği (sistem prompt'u değişmez, bağlam burada)"""
+        hour = time.localtime().tm_hour
+        if self.settings.language == 'tr':
+            part_of_day = "sabah" if hour < 12 else "öğleden sonra" if hour < 18 else "akşam"
+            where = f"yaklaşık {distance:.1f} metre uzakta " if distance else ""
+            return (f"Şu an {part_of_day}. {where}yeni bir ziyaretçi sana doğru geliyor. "
+                    "Onu tek cümleyle sıcak bir şekilde selamla ve sohbeti başlatacak kısa bir soru sor.")
+        
+        part_of_day = "morning" if hour < 12 else "afternoon" if hour < 18 else "evening"
+        where = f"about {distance:.1f} meters away " if distance else ""
+        return (f"It is {part_of_day}. A new visitor {where}is approaching you. "
+                "Greet them warmly in one sentence and ask a short question to start the conversation.")
+    
+    def _build_messages(self, message: str,
+                        history: Optional[ConversationHistory] = None) -> List[Dict[str, str]]:
+        """Sistem prompt'u, geçmiş ve kullanıcı mesajından istek mesajlarını oluştur"""
+        if history is None:
+            history = self.conversation_history
+        messages = [{"role": "system", "content": self.get_system_prompt()}]
+        
+        # Sadece bu ziyaretçinin konuşma geçmişini ekle
+        messages.extend(history.messages())
+        
+        messages.append({"role": "user", "content": truncate_to_tokens(message, history.max_message_tokens)})
+        return messages
+    
+    def _make_request(self, message: str,
+                      history: Optional[ConversationHistory] = None) -> Optional[str]:
         """OpenAI API'ye istek gönder"""
+        sample = RequestSample(self.settings.language, REQUEST_CHAT)
         try:
             start_time = time.time()
+            if history is None:
+                history = self.conversation_history
+            context_free = history.is_empty()
             
-            # Sistem prompt'u oluştur
-            system_prompt = self._create_system_prompt()
-            
-            # Mesaj listesi hazırla
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Konuşma geçmişini ekle
-            if not test:
-                messages.extend(self.conversation_history[-self.max_history_length:])
-            
-            # Kullanıcı mesajını ekle
-            messages.append({"role": "user", "content": message})
+            messages = self._build_messages(message, history)
             
             # API isteği
             response = self.client.ChatCompletion.create(
@@ -104,6 +306,9 @@ class OpenAIChat:
             response_time = time.time() - start_time
             self.total_requests += 1
             self.total_tokens_used += response.usage.total_tokens
+            sample.prompt_tokens = response.usage.prompt_tokens
+            sample.completion_tokens = response.usage.completion_tokens
+            self.telemetry.add(sample.finish())
             
             # Ortalama yanıt süresini güncelle
             self.average_response_time = (
@@ -111,23 +316,115 @@ class OpenAIChat:
                 / self.total_requests
             )
             
-            # Konuşma geçmişini güncelle (test değilse)
-            if not test:
-                self.conversation_history.append({"role": "user", "content": message})
-                self.conversation_history.append({"role": "assistant", "content": reply})
+            # Konuşma geçmişini ve önbelleği güncelle
+            history.add_turn(message, reply)
+            self._cache_reply(message, reply, response_time, context_free)
+            self._log_exchange(history.session_id, message, reply, SOURCE_LLM, response_time, context_free)
             
+            self._update_connection_status()
             return reply
             
         except Exception as e:
             self.logger.error(f"OpenAI API hatası: {e}")
+            self._update_connection_status(e)
+            self.telemetry.add(sample.finish(success=False))
             return None
     
-    def _create_system_prompt(self) -> str:
-        """Sistem prompt'unu oluştur"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _make_request_stream(self, message: str,
+                             history: Optional[ConversationHistory] = None) -> Iterator[str]:
+        """OpenAI API'ye akışlı istek gönder; yanıt parçalarını geldikçe döndür"""
+        if history is None:
+            history = self.conversation_history
+        context_free = history.is_empty()
+        start_time = time.time()
+        first_token_time = None
+        chunk_count = 0
+        parts = []
         
-        if self.settings.language == 'tr':
-            return f"""Sen Expo-Humanoid adında interaktif bir robotsun. Teknoloji fuarında ziyaretçilerle konuşuyorsun.
+        messages = self._build_messages(message, history=history)
+        sample = RequestSample(self.settings.language, REQUEST_STREAM,
+                               prompt_tokens=sum(message_tokens(m) for m in messages))
+        try:
+            response = self.client.ChatCompletion.create(
+                model=self.settings.model,
+                messages=messages,
+                max_tokens=self.settings.max_tokens,
+                temperature=self.settings.temperature,
+                stream=True,
+                request_timeout=self.settings.request_timeout
+            )
+            
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].get("delta", {}).get("content")
+                if not content:
+                    continue
+                
+                if first_token_time is None:
+                    first_token_time = time.time()
+                    sample.time_to_first_token = time.monotonic() - sample.started
+                chunk_count += 1  # her akış parçası yaklaşık bir token
+                parts.append(content)
+                yield content
+                
+        except Exception as e:
+            # Yarıda kesilen yanıt önbelleğe/kayda girmez, bağlantı FAILED kalır;
+            # ziyaretçi duyduğu kısmı bağlamda tutmak için sadece geçmişe eklenir
+            self.logger.error(f"OpenAI API akış hatası: {e}")
+            self._update_connection_status(e)
+            sample.completion_tokens = chunk_count
+            self.telemetry.add(sample.finish(success=False))
+            partial = "".join(parts).strip()
+            if partial:
+                history.add_turn(message, partial)
+            return
+        
+        reply = "".join(parts).strip()
+        sample.completion_tokens = chunk_count
+        self.telemetry.add(sample.finish(success=bool(reply)))
+        if not reply:
+            return
+        
+        self._update_stream_stats(start_time, first_token_time, time.time(), chunk_count)
+        self._update_connection_status()
+        history.add_turn(message, reply)
+        self._cache_reply(message, reply, time.time() - start_time, context_free)
+        self._log_exchange(history.session_id, message, reply, SOURCE_LLM, time.time() - start_time,
+                           context_free)
+    
+    def _update_stream_stats(self, start_time: float, first_token_time: float, end_time: float, tokens: int):
+        """Yanıt süresi, ilk token süresi ve token/s ortalamalarını güncelle"""
+        self.total_requests += 1
+        self.streamed_requests += 1
+        self.total_tokens_used += tokens
+        
+        response_time = end_time - start_time
+        self.average_response_time += (response_time - self.average_response_time) / self.total_requests
+        
+        ttft = first_token_time - start_time
+        generation_time = end_time - first_token_time
+        tokens_per_second = tokens / generation_time if generation_time > 0 else 0.0
+        
+        n = self.streamed_requests
+        self.average_time_to_first_token += (ttft - self.average_time_to_first_token) / n
+        self.average_tokens_per_second += (tokens_per_second - self.average_tokens_per_second) / n
+    
+    def get_system_prompt(self) -> str:
+        """Dilin sistem prompt'u (bir kez oluşturulur, her istekte aynı önek)"""
+        language = self.settings.language
+        if language not in self.system_prompts:
+            self.system_prompts[language] = self._create_system_prompt(language)
+        return self.system_prompts[language]
+    
+    def _create_system_prompt(self, language: str) -> str:
+        """Sistem prompt'unu oluştur
+        
+        İçerik değişmez tutulur (zaman damgası vb. yok); böylece istekler aynı
+        önekle başlar ve sağlayıcı tarafı prompt önbelleği uygulanabilir.
+        """
+        if language == 'tr':
+            return """Sen Expo-Humanoid adında interaktif bir robotsun. Teknoloji fuarında ziyaretçilerle konuşuyorsun.
             
 Özelliklerini:
 - Dostça ve yardımsever
@@ -136,12 +433,10 @@ class OpenAIChat:
 - Kısa ve net cevaplar veriyor
 - Ziyaretçileri eğlendiriyor
 
-Şu anki zaman: {current_time}
-
 Yanıtların 2-3 cümleyi geçmemeli ve konuşma tarzında olmalı."""
 
         else:  # English
-            return f"""You are Expo-Humanoid, an interactive robot at a technology fair talking to visitors.
+            return """You are Expo-Humanoid, an interactive robot at a technology fair talking to visitors.
 
 Your characteristics:
 - Friendly and helpful
@@ -150,60 +445,162 @@ Your characteristics:
 - Giving short and clear answers
 - Entertaining visitors
 
-Current time: {current_time}
-
 Your responses should not exceed 2-3 sentences and should be conversational."""
     
-    def get_response(self, user_input: str) -> str:
-        """Kullanıcı girdisine yanıt üret"""
+    def get_response(self, user_input: str, track_id: Optional[Hashable] = None) -> str:
+        """Kullanıcı girdisine yanıt üret (track_id verilmezse aktif ziyaretçi)"""
         if not self.client:
             return self._get_default_message('error')
         
         # Özel durumları kontrol et
-        user_lower = user_input.lower().strip()
-        
-        # Selamlama
-        greetings = ['merhaba', 'selam', 'hello', 'hi', 'hey']
-        if any(greeting in user_lower for greeting in greetings):
-            return self._get_default_message('greeting')
+        special = self._get_special_response(user_input, track_id)
+        if special:
+            return special
         
-        # Vedalaşma
-        goodbyes = ['güle güle', 'hoşçakal', 'bye', 'goodbye', 'see you']
-        if any(goodbye in user_lower for goodbye in goodbyes):
-            return self._get_default_message('goodbye')
+        # Yerel SSS veya daha önce sorulmuş soru
+        history = self._history_for(track_id)
+        cached = self._get_local_reply(user_input, history)
+        if cached:
+            return cached
         
         # Normal yanıt
-        response = self._make_request(user_input)
+        response = self._make_request(user_input, history=history)
         
         if response:
             return response
         else:
             return self._get_default_message('error')
     
+    def _get_special_response(self, user_input: str, track_id: Optional[Hashable] = None) -> Optional[str]:
+        """Selamlama/vedalaşma gibi ağ gerektirmeyen yanıtlar (animasyon kancası çağrılır)
+        
+        Komut cümlenin küçük bir kısmıysa ("teşekkürler, kameran nasıl çalışır")
+        animasyon yine oynar ama None dönülür, soru GPT'ye gider.
+        """
+        match = self.intent_router.match(user_input)
+        if match is None:
+            return None
+        
+        if self.on_intent is not None:
+            try:
+                self.on_intent(match.intent)
+            except Exception as e:
+                self.logger.error(f"Komut olayı hatası: {e}")
+        
+        if match.coverage < self.settings.intent_min_coverage:
+            return None
+        
+        if match.intent == 'greeting':
+            reply = self.take_greeting(user_input, track_id) or self._get_default_message('greeting')
+        else:
+            reply = self._get_default_message(match.intent)
+        self._log_exchange(self.sessions.active_id if track_id is None else track_id,
+                           user_input, reply, SOURCE_INTENT)
+        return reply
+    
+    def stream_response(self, user_input: str, track_id: Optional[Hashable] = None) -> Iterator[str]:
+        """Yanıtı parça parça üret (konuşma/animasyon katmanı ilk parçayla başlayabilir)"""
+        if not self.client:
+            yield self._get_default_message('error')
+            return
+        
+        special = self._get_special_response(user_input, track_id)
+        if special:
+            yield special
+            return
+        
+        history = self._history_for(track_id)
+        cached = self._get_local_reply(user_input, history, REQUEST_STREAM)
+        if cached:
+            yield cached
+            return
+        
+        received = False
+        for chunk in self._make_request_stream(user_input, history):
+            received = True
+            yield chunk
+        
+        if not received:
+            yield self._get_default_message('error')
+    
+    def _get_local_reply(self, message: str, history: Optional[ConversationHistory] = None,
+                         request_type: str = REQUEST_CHAT) -> Optional[str]:
+        """Ağa gitmeden verilebilecek yanıt (SSS indeksi, sonra önbellek); geçmişe eklenir
+        
+        Önbellek sadece bağlamsız (ilk tur) sorularda kullanılır: "evet",
+        "neden?" gibi devam soruları o ziyaretçinin konuşmasına bağlıdır.
+        """
+        if history is None:
+            history = self.conversation_history
+        sample = RequestSample(self.settings.language, request_type, cache_hit=True)
+        reply = None
+        source = SOURCE_FAQ
+        if self.faq_index is not None:
+            reply = self.faq_index.answer(message, self.settings.language)
+        context_free = history.is_empty()
+        if reply is None and self.response_cache is not None and context_free:
+            reply = self.response_cache.get(message, self.settings.language, PROMPT_VERSION)
+            source = SOURCE_CACHE
+        
+        if reply is not None:
+            history.add_turn(message, reply)
+            self.telemetry.add(sample.finish())
+            self._log_exchange(history.session_id, message, reply, source, sample.total_time, context_free)
+        return reply
+    
+    def _cache_reply(self, message: str, reply: str, latency: float, context_free: bool):
+        """Yanıtı önbelleğe al (geçmişle üretilen yanıt başka ziyaretçiye verilmez)"""
+        if self.response_cache is not None and context_free:
+            self.response_cache.put(message, self.settings.language, PROMPT_VERSION, reply, latency)
+    
     def _get_default_message(self, message_type: str) -> str:
         """Varsayılan mesajları döndür"""
         messages = self.system_messages.get(self.settings.language, self.system_messages['tr'])
         return messages.get(message_type, messages['default'])
     
     def clear_conversation(self):
-        """Konuşma geçmişini temizle"""
-        self.conversation_history.clear()
+        """Konuşma geçmişini temizle (tüm ziyaretçiler)"""
+        self.sessions.clear()
         self.logger.info("Konuşma geçmişi temizlendi")
     
     def set_language(self, language: str):
         """Dil ayarını değiştir"""
         if language in ['tr', 'en']:
             self.settings.language = language
+            self.sessions.set_language(language)
             self.clear_conversation()  # Dil değiştiğinde geçmişi temizle
             self.logger.info(f"Dil ayarı değiştirildi: {language}")
     
+    def cleanup(self):
+        """Önbelleği diske kaydet, bekleyen konuşma kayıtlarını yaz"""
+        if self.response_cache:
+            self.response_cache.save()
+        if self.conversation_store:
+            self.conversation_store.close()
+    
     def get_stats(self) -> Dict[str, Any]:
         """İstatistikleri döndür"""
+        cache_stats = self.response_cache.get_stats() if self.response_cache else {}
         return {
             "total_requests": self.total_requests,
             "total_tokens_used": self.total_tokens_used,
             "average_response_time": round(self.average_response_time, 3),
+            "streamed_requests": self.streamed_requests,
+            "average_time_to_first_token": round(self.average_time_to_first_token, 3),
+            "average_tokens_per_second": round(self.average_tokens_per_second, 1),
             "conversation_length": len(self.conversation_history),
+            "history_tokens": self.conversation_history.get_stats()["tokens"],
+            "prompt_prefix_tokens": estimate_tokens(self.get_system_prompt()),
+            "evicted_turns": self.conversation_history.evicted_turns,
+            "chat_sessions": self.sessions.get_stats(),
             "current_language": self.settings.language,
-            "api_connected": self.client is not None
+            "api_connected": self.connection_status == CONNECTION_OK,
+            "connection_status": self.connection_status,
+            "cache_hit_rate": cache_stats.get("hit_rate", 0.0),
+            "cache_latency_saved": cache_stats.get("latency_saved", 0.0),
+            "response_cache": cache_stats,
+            "faq_index": self.faq_index.get_stats() if self.faq_index else {},
+            "conversation_store": self.conversation_store.get_stats() if self.conversation_store else {},
+            "intent_router": self.intent_router.get_stats(),
+            "telemetry": self.telemetry.summary()
         }
@@ -0,0 +1,166 @@
+# =======================
+# modules/ai/response_cache.py - Yanıt Önbelleği (LRU + TTL)
+# =======================
+
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.system.logger import SystemLogger
+
+
+def normalize_question(text: str, language: str = "tr") -> str:
+    """Soruyu önbellek anahtarı için sadeleştir (büyük/küçük harf, noktalama, boşluk)"""
+    if language == "tr":
+        text = text.replace("I", "ı").replace("İ", "i")
+    text = unicodedata.normalize("NFC", text.lower())
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+class ResponseCache:
+    """Tekrarlanan ziyaretçi soruları için LRU + TTL yanıt önbelleği
+
+    Anahtar: (normalize edilmiş soru, dil, prompt versiyonu). Zaman damgaları
+    duvar saatiyle tutulur, böylece diske kaydedilen girdiler ertesi gün de
+    TTL'e göre geçerli/geçersiz sayılır.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 86400.0,
+                 path: Optional[str] = None, logger: Optional[SystemLogger] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.logger = logger
+
+        # anahtar -> (yanıt, oluşturma zamanı, yanıt üretme süresi)
+        self.entries: "OrderedDict[Tuple[str, str, str], Tuple[str, float, float]]" = OrderedDict()
+        self.lock = Lock()
+        self.dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    @staticmethod
+    def make_key(question: str, language: str, prompt_version: str) -> Tuple[str, str, str]:
+        return normalize_question(question, language), language, str(prompt_version)
+
+    def get(self, question: str, language: str, prompt_version: str) -> Optional[str]:
+        """Geçerli girdi varsa yanıtı döndür ve en yeni olarak işaretle"""
+        key = self.make_key(question, language, prompt_version)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                del self.entries[key]
+                self.dirty = True
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.latency_saved += entry[2]
+            return entry[0]
+
+    def put(self, question: str, language: str, prompt_version: str, reply: str, latency: float = 0.0):
+        """Yanıtı ekle; kapasite aşılırsa en uzun süredir kullanılmayanı at"""
+        key = self.make_key(question, language, prompt_version)
+        if not key[0]:
+            return
+        with self.lock:
+            self.entries[key] = (reply, time.time(), latency)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def warm(self, items: List[Tuple[str, str, str, str, float, float]]) -> int:
+        """Sık sorulan soruları ekle (soru, dil, prompt versiyonu, yanıt, oluşturma zamanı, süre)
+
+        En sık sorulan sonda verilmeli (LRU'da en yeni olur). Var olan ve
+        süresi dolmuş girdilere dokunulmaz, kapasite dolunca durur.
+        """
+        now = time.time()
+        added = 0
+        with self.lock:
+            for question, language, prompt_version, reply, created, latency in items:
+                key = self.make_key(question, language, prompt_version)
+                if not key[0] or key in self.entries or now - created > self.ttl:
+                    continue
+                if len(self.entries) >= self.max_entries:
+                    break
+                self.entries[key] = (reply, created, latency)
+                added += 1
+            self.dirty = self.dirty or added > 0
+        return added
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.dirty = True
+
+    # ----- Kalıcılık -----
+
+    def load(self) -> int:
+        """Diskteki süresi dolmamış girdileri yükle"""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Yanıt önbelleği okunamadı: {e}")
+            return 0
+
+        now = time.time()
+        with self.lock:
+            for item in data.get("entries", []):
+                if now - item["created"] <= self.ttl:
+                    key = (item["question"], item["language"], item["prompt_version"])
+                    self.entries[key] = (item["reply"], item["created"], item.get("latency", 0.0))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = False
+            return len(self.entries)
+
+    def save(self) -> bool:
+        """Değişiklik varsa girdileri diske yaz (LRU sırasıyla)"""
+        if self.path is None or not self.dirty:
+            return False
+
+        with self.lock:
+            items = [
+                {"question": key[0], "language": key[1], "prompt_version": key[2],
+                 "reply": reply, "created": created, "latency": latency}
+                for key, (reply, created, latency) in self.entries.items()
+            ]
+            self.dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"entries": items}, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.path)
+            return True
+        except OSError as e:
+            if self.logger:
+                self.logger.error(f"Yanıt önbelleği kaydedilemedi: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "latency_saved": round(self.latency_saved, 3)
+        }
@@ -0,0 +1,338 @@
+# =======================
+# modules/ai/speech.py - Akışlı Konuşma Ardışık Düzeni
+# =======================
+
+import re
+import time
+from collections import deque
+from queue import Queue
+from threading import Event, Thread
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from config.settings import AISettings
+from modules.ai.speech_backends import (
+    AudioSink, STTBackend, TTSBackend, StubAudioSink, StubSTTBackend, StubTTSBackend,
+    WavFileSink, SoundDeviceSink, OpenAITTSBackend, WhisperSTTBackend
+)
+from modules.system.logger import SystemLogger
+
+
+# Cümle sonu: noktalama + boşluk (ondalık sayılar bölünmez)
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_sentences(chunks: Iterable[str], max_chars: int = 160) -> Iterator[str]:
+    """Akış parçalarını tamamlanan cümleler halinde döndür
+
+    Cümle sonu gelmeden max_chars aşılırsa son virgülden (yoksa boşluktan)
+    bölünür; böylece uzun cümleler ilk sesin gecikmesini artırmaz.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        parts = SENTENCE_END.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+
+        while len(buffer) > max_chars:
+            cut = buffer.rfind(",", 0, max_chars)
+            if cut < 0:
+                cut = buffer.rfind(" ", 0, max_chars)
+            if cut < 0:
+                cut = max_chars - 1
+            yield buffer[:cut + 1].strip()
+            buffer = buffer[cut + 1:]
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class VoiceActivityDetector:
+    """Enerji tabanlı konuşma algılama (uyarlamalı gürültü tabanıyla)
+
+    Konuşma başladıktan sonra silence_ms boyunca sessizlik gelirse söz
+    bitmiş sayılır; STT sabit kayıt süresini beklemeden başlayabilir.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, threshold: float = 0.02,
+                 silence_ms: int = 400, min_speech_ms: int = 120):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.threshold = threshold  # RMS (tam ölçeğe göre)
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.noise_floor: Optional[float] = None
+        self.reset()
+
+    def reset(self):
+        self.triggered = False  # konuşma başladı mı
+        self.ended = False
+        self.speech_run = 0  # art arda konuşma karesi
+        self.silence_run = 0  # konuşmadan sonra art arda sessiz kare
+        self.speech_frames = 0
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean((frame.astype(np.float32) / 32768.0) ** 2))) if len(frame) else 0.0
+        if self.noise_floor is None:
+            self.noise_floor = rms  # ilk kare ortam gürültüsü kabul edilir
+        speech = rms > max(self.threshold, self.noise_floor * 3.0)
+
+        # Gürültü tabanı düşüşe hızlı, yükselişe yavaş uyar (konuşma tabanı şişirmesin)
+        if not speech:
+            self.noise_floor += 0.05 * (rms - self.noise_floor)
+        elif not self.triggered:
+            self.noise_floor += 0.01 * (rms - self.noise_floor)
+        return speech
+
+    def process(self, frame: np.ndarray) -> bool:
+        """Kareyi işle; söz bittiyse True"""
+        speech = self.is_speech(frame)
+
+        if not self.triggered:
+            self.speech_run = self.speech_run + 1 if speech else 0
+            if self.speech_run >= self.min_speech_frames:
+                self.triggered = True
+                self.speech_frames = self.speech_run
+            return False
+
+        if speech:
+            self.speech_frames += 1
+            self.silence_run = 0
+        else:
+            self.silence_run += 1
+            if self.silence_run >= self.silence_frames:
+                self.ended = True
+        return self.ended
+
+
+class SpeechPipeline:
+    """Akışlı sohbet çıktısını cümle cümle seslendiren ve sözü algılayıp metne çeviren düzen
+
+    Metin üretimi (çağıran thread), sentez ve çalma ayrı thread'lerde
+    çalışır: ilk cümle çalınırken sonraki cümleler hâlâ üretiliyor ve
+    sentezleniyor olabilir.
+    """
+
+    def __init__(self, tts: TTSBackend, sink: AudioSink, stt: Optional[STTBackend] = None,
+                 vad: Optional[VoiceActivityDetector] = None, logger: Optional[SystemLogger] = None,
+                 max_sentence_chars: int = 160, max_utterance_seconds: float = 10.0):
+        self.tts = tts
+        self.sink = sink
+        self.stt = stt
+        self.vad = vad or VoiceActivityDetector(tts.sample_rate)
+        self.logger = logger
+        self.max_sentence_chars = max_sentence_chars
+        self.max_utterance_seconds = max_utterance_seconds
+
+        self.stop_event = Event()
+        self.is_speaking = False
+
+        # İstatistikler (saniye)
+        self.last_speech: Dict[str, float] = {}
+        self.last_listen: Dict[str, float] = {}
+        self.first_audio_times: Deque[float] = deque(maxlen=100)
+        self.utterances = 0
+
+    # ----- TTS -----
+
+    def speak(self, text: str) -> Dict[str, float]:
+        return self.speak_stream([text])
+
+    def speak_stream(self, chunks: Iterable[str]) -> Dict[str, float]:
+        """Metin parçalarını cümlelere böl, sentezle ve sırayla çal (bitene kadar bekler)"""
+        start = time.perf_counter()
+        self.stop_event.clear()
+        self.is_speaking = True
+        stats = {"sentences": 0, "audio_seconds": 0.0, "time_to_first_audio": 0.0, "synthesis_time": 0.0}
+
+        text_queue: Queue = Queue()
+        audio_queue: Queue = Queue()
+
+        def synthesize():
+            while True:
+                sentence = text_queue.get()
+                if sentence is None or self.stop_event.is_set():
+                    break
+                synth_start = time.perf_counter()
+                try:
+                    samples = self.tts.synthesize(sentence)
+                except Exception as e:
+                    self._log_error(f"TTS hatası: {e}")
+                    continue
+                stats["synthesis_time"] += time.perf_counter() - synth_start
+                audio_queue.put(samples)
+            audio_queue.put(None)
+
+        def play():
+            while True:
+                samples = audio_queue.get()
+                if samples is None or self.stop_event.is_set():
+                    break
+                if not stats["sentences"]:
+                    stats["time_to_first_audio"] = time.perf_counter() - start
+                stats["sentences"] += 1
+                stats["audio_seconds"] += len(samples) / self.tts.sample_rate
+                try:
+                    self.sink.play(samples, self.tts.sample_rate)
+                except Exception as e:
+                    self._log_error(f"Ses çalma hatası: {e}")
+
+        workers = [Thread(target=synthesize, name="speech-tts", daemon=True),
+                   Thread(target=play, name="speech-play", daemon=True)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for sentence in split_sentences(chunks, self.max_sentence_chars):
+                if self.stop_event.is_set():
+                    break
+                text_queue.put(sentence)
+        finally:
+            text_queue.put(None)
+            for worker in workers:
+                worker.join()
+            self.is_speaking = False
+
+        stats["total_time"] = time.perf_counter() - start
+        self.last_speech = {key: round(value, 4) for key, value in stats.items()}
+        if stats["sentences"]:
+            self.first_audio_times.append(stats["time_to_first_audio"])
+        return self.last_speech
+
+    def stop(self):
+        """Konuşmayı kes (kuyruktaki cümleler atılır)"""
+        self.stop_event.set()
+        self.sink.stop()
+
+    def respond(self, chat, user_input: str, track_id=None) -> Dict[str, float]:
+        """Sohbet yanıtını akış halinde seslendir"""
+        return self.speak_stream(chat.stream_response(user_input, track_id))
+
+    # ----- STT -----
+
+    def listen(self, source: Iterable[np.ndarray], pre_roll_ms: int = 200) -> Optional[str]:
+        """Kaynaktan sözü al; sessizlik gelince erken bitir ve metne çevir
+
+        Konuşma algılanmazsa veya STT yoksa None döner.
+        """
+        if self.stt is None:
+            return None
+
+        self.vad.reset()
+        pre_roll: Deque[np.ndarray] = deque(maxlen=max(1, pre_roll_ms // self.vad.frame_ms))
+        frames: List[np.ndarray] = []
+        max_frames = int(self.max_utterance_seconds * 1000 / self.vad.frame_ms)
+        start = time.perf_counter()
+
+        for frame in source:
+            was_triggered = self.vad.triggered
+            ended = self.vad.process(frame)
+            if self.vad.triggered:
+                if not was_triggered:
+                    frames.extend(pre_roll)  # konuşmanın başı kesilmesin
+                frames.append(frame)
+            else:
+                pre_roll.append(frame)
+            if ended or len(frames) >= max_frames:
+                break
+        capture_time = time.perf_counter() - start
+
+        if not self.vad.triggered:
+            return None
+
+        audio = np.concatenate(frames)
+        stt_start = time.perf_counter()
+        try:
+            text = self.stt.transcribe(audio, self.vad.sample_rate)
+        except Exception as e:
+            self._log_error(f"STT hatası: {e}")
+            return None
+
+        self.utterances += 1
+        self.last_listen = {
+            "utterance_seconds": round(len(audio) / self.vad.sample_rate, 3),
+            "capture_time": round(capture_time, 4),
+            "stt_time": round(time.perf_counter() - stt_start, 4),
+            "ended_by_silence": float(self.vad.ended)
+        }
+        return text
+
+    # ----- Ölçüm -----
+
+    def benchmark(self, text: str, chunk_delay: float = 0.03) -> Dict[str, float]:
+        """Cümle bazlı akış ile tüm yanıtı bekleyip seslendirmeyi karşılaştır (ms)"""
+        def stream() -> Iterator[str]:
+            for word in text.split(" "):
+                time.sleep(chunk_delay)
+                yield word + " "
+
+        # Sıralı: yanıtın tamamı gelsin, tek parça sentezle, çal
+        start = time.perf_counter()
+        full_text = "".join(stream())
+        samples = self.tts.synthesize(full_text.strip())
+        sequential_first_audio = time.perf_counter() - start
+        self.sink.play(samples, self.tts.sample_rate)
+        sequential_total = time.perf_counter() - start
+
+        pipelined = self.speak_stream(stream())
+        return {
+            "sequential_first_audio_ms": round(sequential_first_audio * 1000, 1),
+            "pipelined_first_audio_ms": round(pipelined["time_to_first_audio"] * 1000, 1),
+            "sequential_total_ms": round(sequential_total * 1000, 1),
+            "pipelined_total_ms": round(pipelined["total_time"] * 1000, 1),
+            "sentences": pipelined["sentences"]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        first_audio = np.asarray(self.first_audio_times) * 1000 if self.first_audio_times else np.zeros(1)
+        return {
+            "is_speaking": self.is_speaking,
+            "first_audio_ms_avg": round(float(first_audio.mean()), 1),
+            "first_audio_ms_p95": round(float(np.percentile(first_audio, 95)), 1),
+            "utterances": self.utterances,
+            "last_speech": self.last_speech,
+            "last_listen": self.last_listen
+        }
+
+    def cleanup(self):
+        self.stop()
+        self.sink.close()
+
+    def _log_error(self, message: str):
+        if self.logger:
+            self.logger.error(message)
+
+
+def create_speech_pipeline(settings: AISettings, logger: Optional[SystemLogger] = None) -> Optional[SpeechPipeline]:
+    """Ayarlardaki arka uçlarla konuşma düzenini oluştur (TTS kapalıysa None)
+
+    Arka uçlar: "stub" (donanımsız, gerçek zamanlı bekleme), "wav" (çıktı
+    speech_output_file dosyasına yazılır), "sounddevice" (OpenAI TTS ile
+    hoparlör). stub ve wav ölçüm içindir, ses yerine ton üretir.
+    sounddevice kurulu değilse RuntimeError yükselir.
+    """
+    if not settings.enable_tts:
+        return None
+
+    if settings.speech_backend == "sounddevice":
+        tts = OpenAITTSBackend(settings.openai_api_key, settings.api_base, settings.tts_model,
+                               settings.tts_voice, settings.request_timeout)
+        sink = SoundDeviceSink()
+    elif settings.speech_backend == "wav":
+        tts = StubTTSBackend(settings.speech_sample_rate)
+        sink = WavFileSink(settings.speech_output_file)
+    else:
+        tts = StubTTSBackend(settings.speech_sample_rate)
+        sink = StubAudioSink()
+
+    stt = None
+    if settings.enable_stt:
+        stt = StubSTTBackend() if settings.speech_backend == "stub" else WhisperSTTBackend(settings.language)
+
+    vad = VoiceActivityDetector(settings.speech_sample_rate, threshold=settings.vad_threshold,
+                                silence_ms=settings.vad_silence_ms)
+    return SpeechPipeline(tts, sink, stt, vad, logger, max_utterance_seconds=settings.max_utterance_seconds)
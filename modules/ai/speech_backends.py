@@ -0,0 +1,246 @@
+# =======================
+# modules/ai/speech_backends.py - Konuşma (TTS/STT) Arka Uçları
+# =======================
+
+import io
+import time
+import wave
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import sounddevice
+except ImportError:  # ses donanımı olmayan ortamlar
+    sounddevice = None
+
+
+def to_wav_bytes(samples: np.ndarray, sample_rate: int) -> bytes:
+    """int16 mono örnekleri bellekte WAV dosyasına dönüştür"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+# ----- Arayüzler -----
+
+class TTSBackend(ABC):
+    """Metinden sese dönüştürücü"""
+
+    sample_rate: int = 16000
+
+    @abstractmethod
+    def synthesize(self, text: str) -> np.ndarray:
+        """Metni int16 mono ses örneklerine dönüştür"""
+        pass
+
+
+class STTBackend(ABC):
+    """Sesten metne dönüştürücü"""
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        """int16 mono konuşmayı metne dönüştür"""
+        pass
+
+
+class AudioSink(ABC):
+    """Ses çıkışı (hoparlör, dosya...)"""
+
+    @abstractmethod
+    def play(self, samples: np.ndarray, sample_rate: int):
+        """Sesi çal (çalma bitene kadar bekler)"""
+        pass
+
+    def stop(self):
+        """Çalmayı kes (ziyaretçi söze girdiğinde)"""
+        pass
+
+    def close(self):
+        pass
+
+
+# ----- Test / ölçüm arka uçları -----
+
+class StubTTSBackend(TTSBackend):
+    """Sentez gecikmesini taklit eden TTS (metin uzunluğu kadar kısa bir ton üretir)"""
+
+    def __init__(self, sample_rate: int = 16000, chars_per_second: float = 14.0,
+                 latency: float = 0.05, seconds_per_char: float = 0.002):
+        self.sample_rate = sample_rate
+        self.chars_per_second = chars_per_second  # konuşma hızı
+        self.latency = latency  # sabit sentez gecikmesi
+        self.seconds_per_char = seconds_per_char  # metin uzunluğuyla artan gecikme
+        self.synthesized: List[str] = []
+
+    def synthesize(self, text: str) -> np.ndarray:
+        time.sleep(self.latency + self.seconds_per_char * len(text))
+        self.synthesized.append(text)
+
+        duration = len(text) / self.chars_per_second
+        t = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+        return (np.sin(2 * np.pi * 220.0 * t) * 3000).astype(np.int16)
+
+
+class StubSTTBackend(STTBackend):
+    """Sabit metin döndüren STT"""
+
+    def __init__(self, transcript: str = "", latency: float = 0.0):
+        self.transcript = transcript
+        self.latency = latency
+        self.received_seconds: List[float] = []  # gelen konuşmaların süresi
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        time.sleep(self.latency)
+        self.received_seconds.append(len(samples) / sample_rate)
+        return self.transcript
+
+
+class StubAudioSink(AudioSink):
+    """Çalma süresi kadar bekleyen (realtime) veya hemen dönen çıkış"""
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self.played_seconds: List[float] = []
+        self.stopped = False
+
+    def play(self, samples: np.ndarray, sample_rate: int):
+        duration = len(samples) / sample_rate
+        self.played_seconds.append(duration)
+        if self.realtime:
+            time.sleep(duration)
+
+    def stop(self):
+        self.stopped = True
+
+
+class WavFileSink(AudioSink):
+    """Çalınan sesi WAV dosyasına ekleyen çıkış (donanımsız kayıt/ölçüm)"""
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = Path(path)
+        self.realtime = realtime
+        self.writer: Optional[wave.Wave_write] = None
+        self.sample_rate = 0
+
+    def play(self, samples: np.ndarray, sample_rate: int):
+        if self.writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = wave.open(str(self.path), "wb")
+            self.writer.setnchannels(1)
+            self.writer.setsampwidth(2)
+            self.writer.setframerate(sample_rate)
+            self.sample_rate = sample_rate
+        self.writer.writeframes(samples.astype(np.int16).tobytes())
+        if self.realtime:
+            time.sleep(len(samples) / sample_rate)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class WavFileSource:
+    """WAV dosyasını mikrofon gibi kare kare okuyan kaynak"""
+
+    def __init__(self, path: str, frame_ms: int = 20, realtime: bool = False):
+        self.path = Path(path)
+        self.frame_ms = frame_ms
+        self.realtime = realtime  # True ise kareler gerçek zamanlı hızda gelir
+
+        with wave.open(str(self.path), "rb") as wav:
+            self.sample_rate = wav.getframerate()
+            data = wav.readframes(wav.getnframes())
+        self.samples = np.frombuffer(data, dtype=np.int16)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        frame_size = self.sample_rate * self.frame_ms // 1000
+        for start in range(0, len(self.samples), frame_size):
+            if self.realtime:
+                time.sleep(self.frame_ms / 1000)
+            yield self.samples[start:start + frame_size]
+
+
+# ----- Gerçek arka uçlar -----
+
+class SoundDeviceSink(AudioSink):
+    """Hoparlör çıkışı (sounddevice kurulu olmalı)"""
+
+    def __init__(self):
+        if sounddevice is None:
+            raise RuntimeError("sounddevice kurulu değil")
+
+    def play(self, samples: np.ndarray, sample_rate: int):
+        sounddevice.play(samples, sample_rate)
+        sounddevice.wait()
+
+    def stop(self):
+        sounddevice.stop()
+
+
+class SoundDeviceSource:
+    """Mikrofon girişi (sounddevice kurulu olmalı)"""
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20):
+        if sounddevice is None:
+            raise RuntimeError("sounddevice kurulu değil")
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        frame_size = self.sample_rate * self.frame_ms // 1000
+        with sounddevice.InputStream(samplerate=self.sample_rate, channels=1, dtype="int16",
+                                     blocksize=frame_size) as stream:
+            while True:
+                frame, _ = stream.read(frame_size)
+                yield frame[:, 0].copy()
+
+
+class OpenAITTSBackend(TTSBackend):
+    """OpenAI konuşma sentezi (audio/speech, ham 24 kHz int16 PCM)"""
+
+    sample_rate = 24000  # "pcm" yanıt biçiminin sabit örnekleme hızı
+
+    def __init__(self, api_key: str, api_base: str = "", model: str = "tts-1", voice: str = "alloy",
+                 timeout: float = 10.0):
+        self.api_key = api_key
+        self.api_base = (api_base or "https://api.openai.com/v1").rstrip("/")
+        self.model = model
+        self.voice = voice
+        self.timeout = timeout
+
+    def synthesize(self, text: str) -> np.ndarray:
+        import requests  # openai paketinin bağımlılığı
+
+        response = requests.post(
+            f"{self.api_base}/audio/speech",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"model": self.model, "voice": self.voice, "input": text, "response_format": "pcm"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.content
+        return np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16)
+
+
+class WhisperSTTBackend(STTBackend):
+    """OpenAI Whisper API ile konuşma tanıma"""
+
+    def __init__(self, language: str = "tr", model: str = "whisper-1"):
+        self.language = language
+        self.model = model
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> str:
+        import openai
+
+        audio_file = io.BytesIO(to_wav_bytes(samples, sample_rate))
+        audio_file.name = "speech.wav"
+        result = openai.Audio.transcribe(self.model, audio_file, language=self.language)
+        return result["text"].strip()
@@ -30,6 +30,7 @@ class RealSenseManager:
         self.depth_frame = None
         self.colorized_depth = None
         self.intrinsics = None
+        self.frame_timestamp = 0.0  # son frame'in yakalanma zamanı (time.time)
         
         # Thread kontrolü
         self.is_running = False
@@ -227,6 +228,7 @@ class RealSenseManager:
             try:
                 # Frame'leri al - timeout süresi artırıldı
                 frames = self.pipeline.wait_for_frames(timeout_ms=5000)
+                capture_time = time.time()
                 
                 # Frame atlama (performans için)
                 if self.skip_frames > 0:
@@ -254,6 +256,7 @@ class RealSenseManager:
                         rgb_data = np.asanyarray(color_frame.get_data())
                         with self.frame_lock:
                             self.rgb_frame = rgb_data.copy()
+                            self.frame_timestamp = capture_time
                     except Exception as e:
                         self.logger.warning(f"RGB frame işleme hatası: {e}")
                 
@@ -329,6 +332,11 @@ class RealSenseManager:
                 self.colorized_depth.copy() if self.colorized_depth is not None else None
             )
     
+    def get_frame_timestamp(self) -> float:
+        """Son RGB frame'in yakalanma zamanını döndür (gecikme ölçümü için)"""
+        with self.frame_lock:
+            return self.frame_timestamp
+    
     def get_rgb_frame(self) -> Optional[np.ndarray]:
         """Sadece RGB frame'i döndür"""
         with self.frame_lock:
@@ -3,6 +3,7 @@
 # =======================
 
 import sys
+import time
 import traceback
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
@@ -11,14 +12,20 @@ import cv2
 import numpy as np
 
 from config.settings import Settings
+from config.constants import INTENT_ANIMATIONS
 from modules.system.logger import SystemLogger
 from modules.system.monitor import SystemMonitor
+from modules.system.vision_processes import VisionProcessManager
 from modules.camera.realsense_manager import RealSenseManager
 from modules.camera.camera_interface import MockCamera, WebcamCamera
 from modules.ai.yolo_detector import YOLODetector
 from modules.ai.openai_chat import OpenAIChat
+from modules.ai.async_chat import AsyncOpenAIChat
+from modules.ai.speech import create_speech_pipeline
 from modules.servo.servo_controller import ServoController
 from modules.tracking.target_tracker import TargetTracker
+from modules.tracking.latency_compensator import LatencyCompensator
+from modules.tracking.gaze_filter import GazeFilter
 
 # Widget import'ları
 from modules.gui.widgets.camera_widget import CameraWidget, DualCameraWidget
@@ -39,9 +46,13 @@ class MainWindow(QMainWindow):
         self.system_monitor = SystemMonitor()
         self.camera = None
         self.yolo_detector = None
+        self.vision_processes = None  # çok süreçli modda kamera + YOLO
         self.chat_system = None
+        self.speech_pipeline = None
         self.servo_controller = None
         self.target_tracker = None
+        self.latency_compensator = None
+        self.gaze_filter = None
         
         # GUI bileşenleri
         self.central_widget = None
@@ -63,6 +74,7 @@ class MainWindow(QMainWindow):
         self.current_frame = None
         self.detections = []
         self.primary_target = None
+        self.greeting_target_id = None  # etkileşim mesafesinde selamlaması denenen hedef
         self.camera_type = "none"  # "realsense", "mock", "webcam", "none"
         
         # Hata sayacı
@@ -311,11 +323,10 @@ class MainWindow(QMainWindow):
         self.add_log("Sistem başlatılıyor...")
         
         try:
-            # Kamerayı başlat
-            self.initialize_camera()
-            
-            # YOLO'yu başlat
-            self.initialize_yolo()
+            # Kamera ve YOLO: ayrı süreçlerde ya da bu süreçte
+            if not (self.settings.system.multiprocess and self.initialize_vision_processes()):
+                self.initialize_camera()
+                self.initialize_yolo()
             
             # Servo kontrolcüyü başlat
             self.initialize_servo()
@@ -385,12 +396,33 @@ class MainWindow(QMainWindow):
             self.add_log(f"YOLO başlatma hatası: {e}")
             self.yolo_detector = None
     
+    def initialize_vision_processes(self, camera_type: str = "auto") -> bool:
+        """Kamera ve YOLO'yu paylaşılan bellek halkalı ayrı süreçlerde başlat"""
+        if self.vision_processes:
+            self.vision_processes.stop()
+        
+        self.vision_processes = VisionProcessManager(
+            self.settings.camera, self.settings.yolo, self.settings.system, self.logger, camera_type
+        )
+        if not self.vision_processes.start():
+            self.add_log("Görüntü süreçleri başlatılamadı - tek süreçli moda geçiliyor")
+            self.vision_processes = None
+            return False
+        
+        self.vision_processes.supervisor.on_restart = (
+            lambda name, event: self.logger.warning(f"Görüntü süreci yeniden başlatıldı: {name}")
+        )
+        self.camera_type = "multiprocess"
+        self.add_log("Kamera ve YOLO ayrı süreçlerde başlatıldı")
+        return True
+    
     def initialize_servo(self):
         """Servo kontrolcüyü başlat"""
         try:
             self.servo_controller = ServoController(self.settings.servo, self.logger)
             if self.servo_controller.initialize():
                 self.add_log("Servo kontrolcüsü başlatıldı")
+                self.apply_camera_calibration()
             else:
                 self.add_log("Servo kontrolcüsü başlatılamadı - Mock mode")
                 # Mock servo controller oluşturabilirsiniz
@@ -398,28 +430,101 @@ class MainWindow(QMainWindow):
             self.add_log(f"Servo başlatma hatası: {e}")
             self.servo_controller = None
     
+    def apply_camera_calibration(self):
+        """Kamera iç parametrelerini servo bakış tablosuna aktar"""
+        if not self.servo_controller:
+            return
+        
+        camera_info = None
+        if self.vision_processes:
+            # Kamera süreci halkanın başlığında yayınlar (açılınca gelir, her karede kontrol edilir)
+            camera_info = self.vision_processes.get_camera_info()
+        elif self.camera_type == "realsense" and self.camera:
+            camera_info = self.camera.get_camera_info()
+        self.servo_controller.set_camera_calibration(camera_info)
+    
     def initialize_chat(self):
         """Chat sistemini başlat"""
         try:
-            self.chat_system = OpenAIChat(self.settings.ai, self.logger)
+            chat_class = AsyncOpenAIChat if self.settings.ai.async_client else OpenAIChat
+            self.chat_system = chat_class(self.settings.ai, self.logger)
             if self.chat_system.initialize():
-                self.add_log("AI Chat sistemi başlatıldı")
+                self.add_log("AI Chat sistemi başlatıldı (bağlantı arka planda doğrulanıyor)")
+                self.chat_system.on_intent = self.on_chat_intent
             else:
                 self.add_log("AI Chat sistemi başlatılamadı")
                 self.chat_system = None
         except Exception as e:
             self.add_log(f"Chat başlatma hatası: {e}")
             self.chat_system = None
+        
+        if self.chat_system:
+            self.initialize_speech()
+    
+    def initialize_speech(self):
+        """Konuşma sistemini başlat (hata sohbeti kapatmaz)"""
+        try:
+            self.speech_pipeline = create_speech_pipeline(self.settings.ai, self.logger)
+            if self.speech_pipeline:
+                self.add_log(f"Konuşma sistemi başlatıldı: {self.settings.ai.speech_backend}")
+        except Exception as e:
+            self.add_log(f"Konuşma başlatma hatası: {e} - sohbet metin olarak devam ediyor")
+            self.speech_pipeline = None
     
     def initialize_tracking(self):
         """Takip sistemini başlat"""
         try:
             self.target_tracker = TargetTracker(self.settings.tracking, self.logger)
+            self.latency_compensator = LatencyCompensator(self.settings.tracking)
+            self.gaze_filter = GazeFilter(self.settings.tracking)
+            self.connect_chat_sessions()
             self.add_log("Hedef takip sistemi başlatıldı")
         except Exception as e:
             self.add_log(f"Takip başlatma hatası: {e}")
             self.target_tracker = None
     
+    def connect_chat_sessions(self):
+        """Takip olaylarını ziyaretçi başına sohbet oturumlarına bağla"""
+        if not self.chat_system or not self.target_tracker:
+            return
+        
+        chat = self.chat_system
+        self.target_tracker.on_track_started = lambda target: chat.start_session(target.track_id)
+        self.target_tracker.on_track_lost = lambda target: chat.end_session(target.track_id)
+        self.target_tracker.on_primary_changed = self.on_primary_target_changed
+    
+    def on_primary_target_changed(self, target):
+        """Konuşulan ziyaretçiyi değiştir; yakındaysa selamlamayı önceden hazırla"""
+        # Bakış eski ziyaretçiden yenisine kaymasın, yeni hedefe doğrudan dönsün
+        if self.gaze_filter:
+            self.gaze_filter.reset()
+        
+        if not self.chat_system:
+            return
+        self.chat_system.set_active_visitor(target.track_id if target else None)
+        self.check_greeting_prefetch(target)
+    
+    def check_greeting_prefetch(self, target):
+        """Birincil hedef etkileşim mesafesine girdiğinde selamlamayı önceden hazırla
+
+        Hedef birincil olduğunda uzaktaysa yaklaştıkça tekrar denenir; mesafe
+        içinde kaldığı sürece aynı hedef için bir kez denenir.
+        """
+        if target is None or target.distance > self.settings.ai.greeting_distance:
+            self.greeting_target_id = None
+            return
+        if target.track_id == self.greeting_target_id:
+            return
+        self.greeting_target_id = target.track_id
+        if self.chat_system.prefetch_greeting(target.track_id, target.distance):
+            self.add_log(f"Selamlama hazırlanıyor: hedef {target.track_id}, {target.distance:.1f}m")
+    
+    def on_chat_intent(self, intent: str):
+        """Sesli komuta (selamlama, veda...) eşlik eden animasyonu oynat (chat thread'inden çağrılır)"""
+        animation_name = INTENT_ANIMATIONS.get(intent)
+        if animation_name and self.servo_controller:
+            self.servo_controller.play_animation(animation_name)
+    
     def change_camera_type(self, camera_type_text: str):
         """Kamera tipini değiştir"""
         if not self.is_system_running:
@@ -427,6 +532,14 @@ class MainWindow(QMainWindow):
             
         self.add_log(f"Kamera tipi değiştiriliyor: {camera_type_text}")
         
+        if self.vision_processes:
+            camera_types = {"RealSense D435i": "realsense", "Mock Camera": "mock", "Webcam": "webcam"}
+            if self.initialize_vision_processes(camera_types.get(camera_type_text, "auto")):
+                return
+            # Süreçler başlamadı: kamera ve YOLO bu süreçte açılır
+            if not self.yolo_detector:
+                self.initialize_yolo()
+        
         # Mevcut kamerayı kapat
         if self.camera:
             self.camera.cleanup()
@@ -445,11 +558,13 @@ class MainWindow(QMainWindow):
                 self.camera_type = "webcam"
             else:  # Auto Detect
                 self.initialize_camera()
+                self.apply_camera_calibration()
                 return
             
             if self.camera.initialize():
                 self.camera.start_capture()
                 self.add_log(f"{camera_type_text} başarıyla başlatıldı")
+                self.apply_camera_calibration()
             else:
                 self.add_log(f"{camera_type_text} başlatılamadı")
                 
@@ -471,38 +586,43 @@ class MainWindow(QMainWindow):
             rgb_frame = None
             depth_frame = None
             
-            if self.camera and self.system_control_widget.camera_cb.isChecked():
-                if self.camera_type == "realsense":
-                    rgb_frame, depth_frame, _ = self.camera.get_frames()
-                else:
-                    rgb_frame = self.camera.get_rgb_frame()
-                    depth_frame = self.camera.get_depth_frame()
+            if ((self.camera or self.vision_processes) and
+                self.system_control_widget.camera_cb.isChecked()):
+                rgb_frame, depth_frame, capture_time = self._read_frames()
                 
                 if rgb_frame is not None:
                     self.current_frame = rgb_frame.copy()
                     
                     # YOLO tespiti
-                    if (self.yolo_detector and 
+                    if ((self.yolo_detector or self.vision_processes) and 
                         self.system_control_widget.yolo_cb.isChecked()):
                         try:
-                            self.detections = self.yolo_detector.detect_people(rgb_frame)
+                            detected = self._detect_people(rgb_frame, depth_frame, capture_time)
                             
-                            # Takip güncelle
-                            if (self.target_tracker and 
+                            # Takip güncelle (sadece yeni tespit geldiğinde)
+                            if (detected is not None and self.target_tracker and 
                                 self.system_control_widget.tracking_cb.isChecked()):
+                                target_depth, capture_time = detected
                                 self.primary_target = self.target_tracker.update_targets(
-                                    self.detections, depth_frame
+                                    self.detections, target_depth
                                 )
+                                if self.chat_system:
+                                    self.check_greeting_prefetch(self.primary_target)
                                 
                                 # Servo kontrolü
                                 if (self.servo_controller and 
                                     self.system_control_widget.servo_cb.isChecked() and 
                                     self.primary_target):
+                                    target_x, target_y = self._predict_target_position(
+                                        self.primary_target, capture_time,
+                                        rgb_frame.shape[1], rgb_frame.shape[0]
+                                    )
                                     self.servo_controller.point_to_position(
-                                        self.primary_target.detection.center_x,
-                                        self.primary_target.detection.center_y,
+                                        target_x,
+                                        target_y,
                                         rgb_frame.shape[1],
-                                        rgb_frame.shape[0]
+                                        rgb_frame.shape[0],
+                                        depth=self.primary_target.distance
                                     )
                         except Exception as e:
                             self.add_log(f"YOLO/Tracking hatası: {e}")
@@ -530,23 +650,82 @@ class MainWindow(QMainWindow):
                 self.add_log("Çok fazla hata! Timer durduruluyor.")
                 self.update_timer.stop()
     
+    def _read_frames(self):
+        """(RGB, derinlik, yakalanma zamanı) - çok süreçli modda paylaşılan halkadan"""
+        if self.vision_processes:
+            frame = self.vision_processes.get_frame()
+            if frame is None:
+                return None, None, time.time()
+            self.apply_camera_calibration()  # değişmediyse tablolar korunur
+            return frame.rgb, frame.depth, frame.timestamp
+        
+        capture_time = time.time()
+        if self.camera_type == "realsense":
+            rgb_frame, depth_frame, _ = self.camera.get_frames()
+            capture_time = self.camera.get_frame_timestamp() or capture_time
+        else:
+            rgb_frame = self.camera.get_rgb_frame()
+            depth_frame = self.camera.get_depth_frame()
+        return rgb_frame, depth_frame, capture_time
+    
+    def _detect_people(self, rgb_frame, depth_frame, capture_time: float):
+        """self.detections'ı güncelle; takip için (derinlik, yakalanma zamanı), yeni tespit yoksa None
+        
+        Çok süreçli modda tespit, gösterilen kareden birkaç kare eski olabilir;
+        derinlik ve zaman tespitin yapıldığı kareden alınır. O kare halkada
+        üzerine yazıldıysa tespit sadece gösterilir, takip güncellenmez
+        (başka karenin derinliği yanlış mesafe verir).
+        """
+        if not self.vision_processes:
+            self.detections = self.yolo_detector.detect_people(rgb_frame)
+            return depth_frame, capture_time
+        
+        result = self.vision_processes.get_detections()
+        if result is None:
+            return None
+        self.detections = result.detections
+        frame = self.vision_processes.get_detection_frame(result.seq)
+        if frame is None:
+            return None
+        return frame.depth, result.timestamp
+    
+    def _predict_target_position(self, target, capture_time: float,
+                                 frame_width: int, frame_height: int):
+        """Hedefi ölçülen uçtan uca gecikme kadar ileri tahmin et ve yumuşat"""
+        if not self.latency_compensator:
+            return target.detection.center_x, target.detection.center_y
+        
+        self.latency_compensator.record_pipeline_latency(capture_time)
+        self.latency_compensator.set_actuator_latency(self.servo_controller.get_actuator_latency())
+        target_x, target_y = self.latency_compensator.predict(target, frame_width, frame_height)
+        
+        # Frame-frame titreşimini servo komutlarına taşımamak için yumuşat
+        if self.gaze_filter:
+            target_x, target_y = self.gaze_filter.update(target_x, target_y, capture_time)
+        return target_x, target_y
+    
     def update_status_widgets(self):
         """Durum widget'larını güncelle"""
         try:
             # Sistem durumu
             system_status = self.system_monitor.get_system_status()
+            frame_source = self.vision_processes or self.camera
             status_dict = {
                 'cpu_usage': system_status.cpu_usage,
                 'gpu_usage': system_status.gpu_usage,
                 'memory_usage': system_status.memory_usage,
                 'temperature': system_status.temperature,
-                'fps': self.camera.get_fps() if self.camera else 0
+                'fps': frame_source.get_fps() if frame_source else 0,
+                'ai_status': self.chat_system.connection_status if self.chat_system else 'disabled',
+                'ai_error': self.chat_system.connection_error if self.chat_system else ""
             }
             self.system_status_widget.update_status(status_dict)
             
             # Tespit durumu
             inference_time = 0
-            if self.yolo_detector:
+            if self.vision_processes:
+                inference_time = self.vision_processes.get_inference_time()
+            elif self.yolo_detector:
                 inference_time = self.yolo_detector.get_inference_time()
             
             self.detection_status_widget.update_detections(
@@ -756,9 +935,18 @@ SORUN GİDERME:
         if self.camera:
             self.camera.cleanup()
         
+        if self.vision_processes:
+            self.vision_processes.stop()
+        
         if self.servo_controller:
             self.servo_controller.cleanup()
         
+        if self.speech_pipeline:
+            self.speech_pipeline.cleanup()
+        
+        if self.chat_system:
+            self.chat_system.cleanup()
+        
         self.add_log("Sistem kapatıldı")
     
     def closeEvent(self, event):
@@ -11,6 +11,15 @@ from typing import Dict, Any
 class SystemStatusWidget(QGroupBox):
     """Sistem durumu widget'ı"""
     
+    # Chat bağlantı durumu -> (metin, renk)
+    AI_STATUS_STYLES = {
+        'connected': ("Bağlı", "green"),
+        'checking': ("Doğrulanıyor...", "orange"),
+        'unknown': ("İlk istekte doğrulanacak", "gray"),
+        'failed': ("Bağlantı hatası", "red"),
+        'disabled': ("Kapalı", "gray")
+    }
+    
     def __init__(self, parent=None):
         super().__init__("Sistem Durumu", parent)
         
@@ -53,6 +62,11 @@ class SystemStatusWidget(QGroupBox):
         layout.addWidget(QLabel("FPS:"), 4, 0)
         layout.addWidget(self.fps_label, 4, 1, 1, 2)
         
+        # AI (OpenAI) bağlantısı
+        self.ai_label = QLabel("Kapalı")
+        layout.addWidget(QLabel("AI:"), 5, 0)
+        layout.addWidget(self.ai_label, 5, 1, 1, 2)
+        
     def update_status(self, status_dict: Dict[str, Any]):
         """Durum bilgilerini güncelle"""
         if 'cpu_usage' in status_dict:
@@ -85,6 +99,12 @@ class SystemStatusWidget(QGroupBox):
         if 'fps' in status_dict:
             fps = status_dict['fps']
             self.fps_label.setText(f"FPS: {fps}")
+        
+        if 'ai_status' in status_dict:
+            text, color = self.AI_STATUS_STYLES.get(status_dict['ai_status'], self.AI_STATUS_STYLES['unknown'])
+            self.ai_label.setText(text)
+            self.ai_label.setStyleSheet(f"color: {color};")
+            self.ai_label.setToolTip(status_dict.get('ai_error', ""))
 
 
 class DetectionStatusWidget(QGroupBox):
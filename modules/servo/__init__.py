@@ -2,12 +2,30 @@
 # modules/servo/__init__.py - Güncellenmiş
 # =======================
 
+from .servo_pose import ServoPose
+from .servo_limits import ServoLimits
+from .servo_journal import ServoJournal, JournalReplayer, read_journal
+from .arduino_simulator import ArduinoSimulator
+from .async_serial import AsyncArduinoComm, SerialLineTransport, get_servo_loop
 from .arduino_comm import ArduinoComm
+from .servo_bus import ServoBus
+from .head_control_loop import HeadControlLoop, PIDAxis
+from .gaze_lookup import GazeLookupTable
+from .arm_ik import ArmReachabilityGrid
+from .servo_state import ServoStateSnapshot
 from .servo_controller import ServoController, ArmPosition, ServoPosition
 from .animation_engine import AnimationEngine, KeyFrame, Animation
+from .animation_watcher import AnimationWatcher
 
 __all__ = [
-    'ArduinoComm',
+    'ServoPose', 'ServoLimits',
+    'ServoJournal', 'JournalReplayer', 'read_journal', 'ArduinoSimulator',
+    'AsyncArduinoComm', 'SerialLineTransport', 'get_servo_loop',
+    'ArduinoComm', 'ServoBus',
+    'HeadControlLoop', 'PIDAxis',
+    'GazeLookupTable', 'ArmReachabilityGrid',
+    'ServoStateSnapshot',
     'ServoController', 'ArmPosition', 'ServoPosition',
-    'AnimationEngine', 'KeyFrame', 'Animation'
+    'AnimationEngine', 'KeyFrame', 'Animation',
+    'AnimationWatcher'
 ]
\ No newline at end of file
@@ -7,11 +7,13 @@ import time
 import math
 from threading import Thread, Event
 from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from config.constants import ServoIDs
 from modules.servo.servo_controller import ServoController, ArmPosition
+from modules.servo.animation_watcher import AnimationWatcher
+from modules.servo.servo_pose import ServoPose
 from modules.system.logger import SystemLogger
 
 
@@ -22,6 +24,12 @@ class KeyFrame:
     servo_positions: Dict[int, int]  # servo_id: angle
     duration: float = 0.5  # bu frame'e geçiş süresi
     easing: str = "linear"  # linear, ease_in, ease_out, ease_in_out
+    pose: Optional[ServoPose] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # JSON'dan gelen str anahtarlar dahil, pozu bir kez derle
+        if self.pose is None:
+            self.pose = ServoPose.from_dict(self.servo_positions)
 
 
 @dataclass
@@ -49,6 +57,10 @@ class AnimationEngine:
         self.animations: Dict[str, Animation] = {}
         self.animation_path = Path("data/animations")
         
+        # Hot-reload: dosya -> animasyon adı eşlemesi ve dizin izleyicisi
+        self._file_animation_names: Dict[Path, str] = {}
+        self.watcher: Optional[AnimationWatcher] = None
+        
         # Oynatma kontrolü
         self.current_animation: Optional[Animation] = None
         self.is_playing = False
@@ -190,8 +202,40 @@ class AnimationEngine:
             ]
         }
         
+        # Onaylama (baş sallama) animasyonu - kısa sesli komut yanıtları için
+        nod_animation = {
+            "name": "nod",
+            "description": "Baş sallama hareketi",
+            "loop": False,
+            "keyframes": [
+                {
+                    "timestamp": 0.0,
+                    "servo_positions": {ServoIDs.HEAD_TILT.value: 90},
+                    "duration": 0.3
+                },
+                {
+                    "timestamp": 0.4,
+                    "servo_positions": {ServoIDs.HEAD_TILT.value: 105},
+                    "duration": 0.3,
+                    "easing": "ease_in_out"
+                },
+                {
+                    "timestamp": 0.8,
+                    "servo_positions": {ServoIDs.HEAD_TILT.value: 80},
+                    "duration": 0.3,
+                    "easing": "ease_in_out"
+                },
+                {
+                    "timestamp": 1.2,
+                    "servo_positions": {ServoIDs.HEAD_TILT.value: 90},
+                    "duration": 0.3,
+                    "easing": "ease_out"
+                }
+            ]
+        }
+        
         # Dosyalara kaydet
-        animations = [greeting_animation, goodbye_animation, thinking_animation]
+        animations = [greeting_animation, goodbye_animation, thinking_animation, nod_animation]
         
         for anim_data in animations:
             file_path = self.animation_path / f"{anim_data['name']}.json"
@@ -201,6 +245,16 @@ class AnimationEngine:
     
     def load_animation_from_file(self, file_path: Path) -> bool:
         """Dosyadan animasyon yükle"""
+        animation = self._compile_animation(file_path)
+        if animation is None:
+            return False
+        
+        self._register_animation(Path(file_path), animation)
+        self.logger.info(f"Animasyon yüklendi: {animation.name}")
+        return True
+    
+    def _compile_animation(self, file_path: Path) -> Optional[Animation]:
+        """Animasyon dosyasını ayrıştırıp Animation nesnesine dönüştür"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -217,31 +271,76 @@ class AnimationEngine:
                 keyframes.append(keyframe)
             
             # Animation nesnesi oluştur
-            animation = Animation(
+            return Animation(
                 name=data['name'],
                 description=data.get('description', ''),
                 keyframes=keyframes,
                 loop=data.get('loop', False)
             )
             
-            self.animations[animation.name] = animation
-            self.logger.info(f"Animasyon yüklendi: {animation.name}")
-            return True
-            
         except Exception as e:
             self.logger.error(f"Animasyon yükleme hatası {file_path}: {e}")
-            return False
+            return None
+    
+    def _register_animation(self, file_path: Path, animation: Animation):
+        """Animasyonu tek atamayla yerine koy (oynayan klip eski nesneyi kullanmaya devam eder)"""
+        previous_name = self._file_animation_names.get(file_path)
+        
+        self.animations[animation.name] = animation
+        self._file_animation_names[file_path] = animation.name
+        
+        # Dosyadaki animasyon adı değiştiyse eski kaydı kaldır
+        if previous_name and previous_name != animation.name:
+            self.animations.pop(previous_name, None)
+    
+    def start_hot_reload(self, poll_interval: float = 1.0) -> bool:
+        """Animasyon dizinini izlemeye başla"""
+        if self.watcher and self.watcher.is_running:
+            return True
+        
+        self.watcher = AnimationWatcher(
+            self.animation_path,
+            self._on_animation_files_changed,
+            self.logger,
+            poll_interval=poll_interval
+        )
+        return self.watcher.start()
+    
+    def stop_hot_reload(self):
+        """Animasyon dizini izlemeyi durdur"""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+    
+    def _on_animation_files_changed(self, changed: List[Path], removed: List[Path]):
+        """Sadece değişen klipleri yeniden derle (izleyici thread'inde çalışır)"""
+        for file_path in changed:
+            animation = self._compile_animation(file_path)
+            if animation is None:
+                # Yarım yazılmış/bozuk dosya: eski sürüm kullanılmaya devam eder
+                continue
+            
+            self._register_animation(file_path, animation)
+            self.logger.info(f"Animasyon yeniden yüklendi: {animation.name}")
+        
+        for file_path in removed:
+            animation_name = self._file_animation_names.pop(file_path, None)
+            if animation_name and animation_name not in self._file_animation_names.values():
+                self.animations.pop(animation_name, None)
+                self.logger.info(f"Animasyon kaldırıldı: {animation_name}")
     
     def play_animation(self, animation_name: str, blocking: bool = False) -> bool:
         """Animasyon oynat"""
-        if animation_name not in self.animations:
+        # Hot-reload thread'i sözlüğü değiştirebilir, tek okuma yap
+        animation = self.animations.get(animation_name)
+        if animation is None:
             self.logger.error(f"Animasyon bulunamadı: {animation_name}")
             return False
         
         if self.is_playing:
             self.stop_animation()
         
-        self.current_animation = self.animations[animation_name]
+        self.current_animation = animation
         self.is_playing = True
         self.stop_event.clear()
         
@@ -319,24 +418,13 @@ class AnimationEngine:
         # Easing fonksiyonu uygula
         eased_progress = self._apply_easing(progress, next_kf.easing)
         
-        # Servo pozisyonlarını interpolate et
-        interpolated_positions = {}
-        
-        for servo_id in current_kf.servo_positions:
-            current_angle = current_kf.servo_positions[servo_id]
-            next_angle = next_kf.servo_positions.get(servo_id, current_angle)
-            
-            interpolated_angle = int(current_angle + (next_angle - current_angle) * eased_progress)
-            interpolated_positions[servo_id] = interpolated_angle
-        
-        # Pozisyonları uygula
-        for servo_id, angle in interpolated_positions.items():
-            self.servo_controller.set_servo_angle(servo_id, angle, check_limits=True)
+        # Servo pozisyonlarını tek dizi işlemiyle interpolate et
+        interpolated_pose = current_kf.pose.interpolate(next_kf.pose, eased_progress)
+        self.servo_controller.set_pose(interpolated_pose, check_limits=True)
     
     def _apply_keyframe(self, keyframe: KeyFrame):
         """Keyframe'i direkt uygula"""
-        for servo_id, angle in keyframe.servo_positions.items():
-            self.servo_controller.set_servo_angle(servo_id, angle, check_limits=True)
+        self.servo_controller.set_pose(keyframe.pose, check_limits=True)
     
     def _apply_easing(self, progress: float, easing: str) -> float:
         """Easing fonksiyonu uygula"""
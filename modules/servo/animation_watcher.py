@@ -0,0 +1,163 @@
+# =======================
+# modules/servo/animation_watcher.py - Animasyon Dizini İzleyicisi
+# =======================
+
+import os
+import sys
+import time
+from pathlib import Path
+from threading import Thread, Event
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = sys.platform.startswith("linux")
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+from modules.system.logger import SystemLogger
+
+
+# (mtime_ns, size) - dosya içeriği değişti mi kontrolü için
+FileSignature = Tuple[int, int]
+
+
+class AnimationWatcher:
+    """Animasyon dizinini izler, değişen/silinen dosyaları bildirir
+
+    Linux'ta inotify (inotify_simple) ile olay tabanlı çalışır, yoksa
+    belirli aralıklarla dizini tarar. Her iki durumda da değişiklik
+    kararı dosya imzalarının (mtime, boyut) karşılaştırılmasıyla verilir.
+    """
+
+    def __init__(self, directory: Path,
+                 on_change: Callable[[List[Path], List[Path]], None],
+                 logger: SystemLogger,
+                 poll_interval: float = 1.0,
+                 settle_time: float = 0.1,
+                 pattern: str = "*.json",
+                 use_inotify: bool = True):
+        self.directory = Path(directory)
+        self.on_change = on_change
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time  # Editörlerin çoklu yazmalarını birleştir
+        self.pattern = pattern
+        self.use_inotify = use_inotify and INOTIFY_AVAILABLE
+
+        # Bilinen dosya imzaları
+        self._signatures: Dict[Path, FileSignature] = {}
+
+        # Thread kontrolü
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+        self._inotify = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self) -> bool:
+        """İzleme thread'ini başlat"""
+        if self.is_running:
+            return True
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._signatures = self._snapshot()
+            self._inotify = self._create_inotify() if self.use_inotify else None
+
+            self._stop_event.clear()
+            self._thread = Thread(target=self._watch_loop, daemon=True)
+            self._thread.start()
+
+            self.logger.info(f"Animasyon izleyici başlatıldı ({self.mode}): {self.directory}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Animasyon izleyici başlatılamadı: {e}")
+            return False
+
+    def stop(self):
+        """İzleme thread'ini durdur"""
+        self._stop_event.set()
+
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+        if self._inotify is not None:
+            try:
+                self._inotify.close()
+            except Exception:
+                pass
+            self._inotify = None
+
+    def _create_inotify(self):
+        """inotify izleyicisini oluştur (başarısızsa polling'e düş)"""
+        try:
+            inotify = INotify()
+            watch_flags = (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO |
+                           inotify_flags.MOVED_FROM | inotify_flags.DELETE |
+                           inotify_flags.CREATE)
+            inotify.add_watch(str(self.directory), watch_flags)
+            return inotify
+        except Exception as e:
+            self.logger.warning(f"inotify kullanılamıyor, polling moduna geçiliyor: {e}")
+            return None
+
+    def _watch_loop(self):
+        """Ana izleme döngüsü"""
+        while not self._stop_event.is_set():
+            try:
+                if self._inotify is not None:
+                    # Olay gelene kadar bekle (stop kontrolü için timeout'lu)
+                    events = self._inotify.read(timeout=int(self.poll_interval * 1000))
+                    if not events:
+                        continue
+
+                    # Aynı kaydetmeye ait olayları topla
+                    time.sleep(self.settle_time)
+                    self._inotify.read(timeout=0)
+                else:
+                    if self._stop_event.wait(self.poll_interval):
+                        break
+
+                self.scan()
+
+            except Exception as e:
+                self.logger.error(f"Animasyon izleme hatası: {e}")
+                self._stop_event.wait(self.poll_interval)
+
+    def scan(self) -> Tuple[List[Path], List[Path]]:
+        """Dizini tara, değişiklik varsa callback'i çağır"""
+        current = self._snapshot()
+
+        changed = [path for path, signature in current.items()
+                   if self._signatures.get(path) != signature]
+        removed = [path for path in self._signatures if path not in current]
+
+        self._signatures = current
+
+        if changed or removed:
+            self.on_change(sorted(changed), sorted(removed))
+
+        return changed, removed
+
+    def _snapshot(self) -> Dict[Path, FileSignature]:
+        """Dizindeki dosyaların imzalarını topla"""
+        signatures = {}
+
+        for file_path in self.directory.glob(self.pattern):
+            try:
+                stat = os.stat(file_path)
+                signatures[file_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                # Tarama sırasında silinmiş olabilir
+                continue
+
+        return signatures
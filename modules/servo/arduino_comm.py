@@ -2,203 +2,191 @@
 # modules/servo/arduino_comm.py - Arduino İletişimi
 # =======================
 
-import serial
+import asyncio
 import time
-import json
-from threading import Thread, Lock
-from typing import Dict, List, Optional, Tuple
-import queue
+from concurrent.futures import Future
+from typing import Dict, List
 
 from config.settings import ServoSettings
-from config.constants import ServoIDs, ARDUINO_COMMANDS
+from config.constants import ARDUINO_COMMANDS
+from modules.servo.async_serial import (
+    AsyncArduinoComm, get_servo_loop, run_on_servo_loop, await_on_servo_loop
+)
+from modules.servo.servo_pose import ServoPose
 from modules.system.logger import SystemLogger
 
 
 class ArduinoComm:
-    """Arduino ile seri port iletişimi"""
-    
+    """Arduino ile seri port iletişimi (senkron API)
+
+    AsyncArduinoComm üzerinde ince bir katmandır: komutlar portun kendi servo
+    event loop'una (ayrı I/O thread'i) bırakılır ve beklenmeden dönülür (eski kuyruk davranışı).
+    Onayı beklemek isteyen çağıranlar *_async metodlarını kullanır.
+    """
+
     def __init__(self, settings: ServoSettings, logger: SystemLogger):
         self.settings = settings
         self.logger = logger
-        
-        # Seri port
-        self.serial_port = None
-        self.is_connected = False
-        
-        # Komut kuyruğu
-        self.command_queue = queue.Queue()
-        self.response_queue = queue.Queue()
-        
-        # Thread kontrolü
-        self.comm_thread = None
-        self.is_running = False
-        self.lock = Lock()
-        
-        # Durum takibi
-        self.last_servo_positions = {}
-        self.arduino_status = {
-            'connected': False,
-            'last_ping': 0,
-            'error_count': 0
-        }
-    
+
+        self.core = AsyncArduinoComm(settings, logger)
+
+    # ----- Durum alanları (async çekirdekte tutulur) -----
+
+    @property
+    def is_connected(self) -> bool:
+        return self.core.is_connected
+
+    @is_connected.setter
+    def is_connected(self, value: bool):
+        self.core.is_connected = value
+
+    @property
+    def serial_port(self):
+        return self.core.serial_port
+
+    @property
+    def arduino_status(self) -> Dict:
+        return self.core.arduino_status
+
+    @property
+    def last_servo_positions(self) -> ServoPose:
+        return self.core.last_servo_positions
+
+    @last_servo_positions.setter
+    def last_servo_positions(self, pose: ServoPose):
+        self.core.last_servo_positions = pose
+
+    # ----- Bağlantı -----
+
     def connect(self) -> bool:
         """Arduino'ya bağlan"""
         try:
-            self.serial_port = serial.Serial(
-                port=self.settings.port,
-                baudrate=self.settings.baudrate,
-                timeout=self.settings.timeout,
-                write_timeout=self.settings.timeout
-            )
-            
-            # Bağlantıyı test et
-            time.sleep(2)  # Arduino reset bekleme
-            
-            if self._ping_arduino():
-                self.is_connected = True
-                self.arduino_status['connected'] = True
-                self.start_communication()
+            if not run_on_servo_loop(self.core.open(), timeout=5.0, endpoint=self.settings.port):
+                return False
+
+            # Bağlantıyı test et (reset olduysa açılana kadar yokla)
+            if self._wait_for_arduino(timeout=3.0):
+                run_on_servo_loop(self.core.activate(), timeout=1.0, endpoint=self.settings.port)
                 self.logger.info(f"Arduino bağlandı: {self.settings.port}")
                 return True
             else:
-                self.serial_port.close()
+                run_on_servo_loop(self.core.disconnect(), timeout=1.0, endpoint=self.settings.port)
                 return False
-                
+
         except Exception as e:
             self.logger.error(f"Arduino bağlantı hatası: {e}")
             return False
-    
+
     def disconnect(self):
         """Arduino bağlantısını kes"""
-        self.is_running = False
-        self.is_connected = False
-        
-        if self.comm_thread:
-            self.comm_thread.join(timeout=2.0)
-        
-        if self.serial_port and self.serial_port.is_open:
-            self.serial_port.close()
-        
-        self.logger.info("Arduino bağlantısı kesildi")
-    
-    def start_communication(self):
-        """İletişim thread'ini başlat"""
-        self.is_running = True
-        self.comm_thread = Thread(target=self._communication_loop, daemon=True)
-        self.comm_thread.start()
-    
-    def _communication_loop(self):
-        """Ana iletişim döngüsü"""
-        while self.is_running and self.is_connected:
-            try:
-                # Komut kuyruğunu kontrol et
-                if not self.command_queue.empty():
-                    command = self.command_queue.get_nowait()
-                    self._send_command(command)
-                
-                # Arduino'dan gelen yanıtları oku
-                if self.serial_port.in_waiting > 0:
-                    response = self._read_response()
-                    if response:
-                        self.response_queue.put(response)
-                
-                # Periyodik ping
-                current_time = time.time()
-                if current_time - self.arduino_status['last_ping'] > 5.0:
-                    self._ping_arduino()
-                
-                time.sleep(0.01)  # CPU kullanımını azalt
-                
-            except Exception as e:
-                self.logger.error(f"Arduino iletişim hatası: {e}")
-                self.arduino_status['error_count'] += 1
-                time.sleep(0.1)
-    
-    def _send_command(self, command: str):
-        """Arduino'ya komut gönder"""
         try:
-            with self.lock:
-                if self.serial_port and self.serial_port.is_open:
-                    self.serial_port.write((command + '\n').encode())
-                    self.serial_port.flush()
+            run_on_servo_loop(self.core.disconnect(), timeout=2.0, endpoint=self.settings.port)
         except Exception as e:
-            self.logger.error(f"Komut gönderme hatası: {e}")
-    
-    def _read_response(self) -> Optional[str]:
-        """Arduino'dan yanıt oku"""
-        try:
-            if self.serial_port and self.serial_port.is_open:
-                line = self.serial_port.readline().decode().strip()
-                return line if line else None
-        except Exception as e:
-            self.logger.error(f"Yanıt okuma hatası: {e}")
-            return None
-    
-    def _ping_arduino(self) -> bool:
-        """Arduino bağlantısını test et"""
+            self.logger.error(f"Arduino bağlantı kesme hatası: {e}")
+
+        self.logger.info("Arduino bağlantısı kesildi")
+
+    def _wait_for_arduino(self, timeout: float) -> bool:
+        """Arduino PONG verene kadar kısa aralıklarla ping at
+
+        Port açılışında reset olmadıysa (sıcak başlatma) hemen döner, olduysa
+        bootloader süresi kadar bekler.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self._ping_arduino(timeout=0.25):
+                return True
+        return False
+
+    def _ping_arduino(self, timeout: float = 1.0) -> bool:
+        """Arduino bağlantısını test et ve gidiş-dönüş süresini ölç"""
         try:
-            self._send_command(ARDUINO_COMMANDS['PING'])
-            
-            # Yanıt bekle
-            start_time = time.time()
-            while time.time() - start_time < 1.0:
-                if not self.response_queue.empty():
-                    response = self.response_queue.get_nowait()
-                    if "PONG" in response:
-                        self.arduino_status['last_ping'] = time.time()
-                        return True
-                time.sleep(0.01)
-            
-            return False
-            
+            return run_on_servo_loop(self.core.ping(timeout), timeout=timeout + 1.0, endpoint=self.settings.port)
         except Exception:
             return False
-    
+
+    def get_serial_latency(self) -> float:
+        """Tek yönlü seri port gecikmesi tahmini (saniye, ping RTT/2)"""
+        return self.core.get_serial_latency()
+
+    # ----- Komutlar (beklemeden) -----
+
+    def _submit(self, commands: List[str]) -> Future:
+        """Komutları servo loop'una bırak; onay sonucu Future ile izlenebilir"""
+        future = asyncio.run_coroutine_threadsafe(self.core.send_and_check(commands),
+                                                  get_servo_loop(self.settings.port))
+        future.add_done_callback(self._on_commands_done)
+        return future
+
+    def _on_commands_done(self, future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Komut gönderme hatası: {future.exception()}")
+
     def set_servo_angle(self, servo_id: int, angle: int):
         """Servo açısını ayarla"""
         if not self.is_connected:
             return False
-        
-        # Açı sınırlarını kontrol et
-        if not (0 <= angle <= 180):
-            self.logger.warning(f"Geçersiz servo açısı: {angle}")
+
+        command = self.core.prepare_servo_angle(servo_id, angle)
+        if command is None:
             return False
-        
-        # Komut oluştur
-        command = f"{ARDUINO_COMMANDS['SET_SERVO']}{servo_id},{angle}"
-        self.command_queue.put(command)
-        
-        # Pozisyonu kaydet
-        self.last_servo_positions[servo_id] = angle
-        
+
+        self._submit([command])
+        return True
+
+    def set_pose(self, pose: ServoPose) -> bool:
+        """Pozdaki değişen servoları tek yazmada gönder"""
+        if not self.is_connected:
+            return False
+
+        commands = self.core.prepare_pose(pose)
+        if commands is None:
+            return False
+
+        if commands:
+            self._submit(commands)
         return True
-    
+
     def set_servo_speed(self, speed: int):
         """Servo hızını ayarla (1-10)"""
         if not self.is_connected:
             return False
-        
+
         if not (1 <= speed <= 10):
             return False
-        
-        command = f"{ARDUINO_COMMANDS['SET_SPEED']}{speed}"
-        self.command_queue.put(command)
+
+        self._submit([f"{ARDUINO_COMMANDS['SET_SPEED']}{speed}"])
         return True
-    
+
     def calibrate_servos(self):
         """Servoları kalibre et (90 derece ortala)"""
         if not self.is_connected:
             return False
-        
-        command = ARDUINO_COMMANDS['CALIBRATE']
-        self.command_queue.put(command)
+
+        self._submit([self.core.prepare_calibration()])
         return True
-    
+
+    # ----- Komutlar (onay beklenir) -----
+
+    async def set_pose_async(self, pose: ServoPose) -> bool:
+        """Pozu gönder; Arduino tüm servoları onayladığında True döner"""
+        return await await_on_servo_loop(self.core.set_pose(pose), self.settings.port)
+
+    async def set_servo_angle_async(self, servo_id: int, angle: int) -> bool:
+        return await await_on_servo_loop(self.core.set_servo_angle(servo_id, angle), self.settings.port)
+
+    async def set_servo_speed_async(self, speed: int) -> bool:
+        return await await_on_servo_loop(self.core.set_servo_speed(speed), self.settings.port)
+
+    async def calibrate_servos_async(self) -> bool:
+        return await await_on_servo_loop(self.core.calibrate_servos(), self.settings.port)
+
+    # ----- Durum -----
+
     def get_status(self) -> Dict:
         """Arduino durumunu döndür"""
-        return self.arduino_status.copy()
-    
+        return self.core.get_status()
+
     def get_servo_positions(self) -> Dict[int, int]:
         """Mevcut servo pozisyonlarını döndür"""
-        return self.last_servo_positions.copy()
+        return self.last_servo_positions.to_dict()
@@ -0,0 +1,85 @@
+# =======================
+# modules/servo/arduino_simulator.py - Sanal Arduino (pty)
+# =======================
+
+import os
+import time
+from threading import Thread
+from typing import List, Optional
+
+
+class ArduinoSimulator:
+    """arduino_code.ino seri protokolünü bir pseudo-terminal üzerinde taklit eder
+
+    Gerçek karta ihtiyaç duymadan ArduinoComm'u test etmek ve servo
+    günlüklerini tekrar oynatmak için kullanılır (sadece POSIX).
+    `port` ArduinoComm ayarlarına port adı olarak verilir.
+    """
+
+    def __init__(self, command_delay: float = 0.0):
+        import tty
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.command_delay = command_delay  # komut başına işleme süresi (saniye)
+        self.silent = False  # True ise onay göndermez (zaman aşımı testi)
+        self.received: List[str] = []
+        self.servo_angles = [90] * 16
+        self.speed = 5
+
+        self.running = True
+        self.thread: Optional[Thread] = Thread(target=self._serve, name="arduino-sim", daemon=True)
+        self.thread.start()
+
+    def _reply(self, line: str) -> str:
+        """Firmware ile aynı yanıtlar"""
+        if line == "P":
+            return "PONG"
+        if line.startswith("S") and "," in line:
+            servo_id, angle = (int(value) for value in line[1:].split(","))
+            if not (0 <= servo_id < len(self.servo_angles)):
+                return "ERROR:Invalid servo ID"
+            if not (0 <= angle <= 180):
+                return "ERROR:Invalid angle"
+            self.servo_angles[servo_id] = angle
+            return f"OK:{servo_id}:{angle}"
+        if line.startswith("V"):
+            self.speed = int(line[1:])
+            return f"OK:SPEED:{self.speed}"
+        if line == "C":
+            self.servo_angles = [90] * len(self.servo_angles)
+            return "OK:CALIBRATE:ALL"
+        return "ERROR:Unknown command"
+
+    def _serve(self):
+        buffer = b""
+        while self.running:
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                text = line.decode(errors="replace").strip()
+                if not text:
+                    continue
+                self.received.append(text)
+                if self.command_delay:
+                    time.sleep(self.command_delay)
+                if not self.silent:
+                    try:
+                        reply = self._reply(text)
+                    except ValueError:
+                        reply = "ERROR:Parse error"
+                    os.write(self.master, (reply + "\n").encode())
+
+    def close(self):
+        self.running = False
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
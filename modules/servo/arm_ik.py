@@ -0,0 +1,262 @@
+# =======================
+# modules/servo/arm_ik.py - Kol İşaret Etme IK (Önceden Hesaplanmış Izgara)
+# =======================
+
+import hashlib
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from config.constants import ServoIDs
+from modules.system.logger import SystemLogger
+
+
+# Izgara formatı değişirse artırılır (eski önbellek dosyaları geçersiz olur)
+IK_GRID_VERSION = 1
+
+# Kol geometrisi (metre, kamera koordinatları: x sağ, y aşağı, z ileri)
+UPPER_ARM_LENGTH = 0.3
+FOREARM_LENGTH = 0.25
+SHOULDER_POSITIONS = {
+    'left': (-0.2, 0.35, 0.0),
+    'right': (0.2, 0.35, 0.0)
+}
+
+ARM_JOINT_IDS = {
+    'left': (ServoIDs.LEFT_SHOULDER.value, ServoIDs.LEFT_ELBOW.value, ServoIDs.LEFT_WRIST.value),
+    'right': (ServoIDs.RIGHT_SHOULDER.value, ServoIDs.RIGHT_ELBOW.value, ServoIDs.RIGHT_WRIST.value)
+}
+
+
+def _direction(yaw: np.ndarray, elevation: np.ndarray) -> np.ndarray:
+    """Yaw/yükselme açılarından (radyan) birim yön vektörü"""
+    return np.stack([np.sin(yaw) * np.cos(elevation),
+                     -np.sin(elevation),
+                     np.cos(yaw) * np.cos(elevation)], axis=-1)
+
+
+def forward_kinematics(arm: str, joint_angles: np.ndarray) -> np.ndarray:
+    """(N, 3) omuz/dirsek/bilek servo açılarından parmak ucu konumları (N, 3)
+
+    Omuz yatay dönüş (90 = ileri), dirsek kolun yükselmesi (iki kolda
+    ayna simetrik), bilek ön kolun ek eğimi olarak modellenir.
+    """
+    joint_angles = np.asarray(joint_angles, dtype=np.float64)
+    shoulder, elbow, wrist = joint_angles[..., 0], joint_angles[..., 1], joint_angles[..., 2]
+
+    yaw = np.radians(shoulder - 90)
+    elevation = np.radians(elbow - 90 if arm == 'left' else 90 - elbow)
+    forearm_elevation = elevation + np.radians(wrist - 90)
+
+    return (np.asarray(SHOULDER_POSITIONS[arm]) +
+            UPPER_ARM_LENGTH * _direction(yaw, elevation) +
+            FOREARM_LENGTH * _direction(yaw, forearm_elevation))
+
+
+class ArmReachabilityGrid:
+    """Robotun önündeki 3D ızgara için her kolun işaret etme açıları
+
+    Her ızgara noktası için omuzdan hedefe olan yönle en iyi hizalanan
+    servo açıları başlangıçta (veya önbellekten) bulunur. Çalışma anında
+    hedefler vektörel olarak en yakın hücreye eşlenir ve açılar komşu
+    erişilebilir hücrelerden trilineer interpolasyonla iyileştirilir.
+    """
+
+    def __init__(self, joint_limits: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 x_range: Tuple[float, float] = (-3.0, 3.0),
+                 y_range: Tuple[float, float] = (-2.0, 1.5),
+                 z_range: Tuple[float, float] = (0.5, 5.0),
+                 step: float = 0.25,
+                 joint_step: float = 5.0,
+                 tolerance: float = 10.0):
+        self.joint_limits = {arm: (np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64))
+                             for arm, (lo, hi) in joint_limits.items()}
+        self.origin = np.array([x_range[0], y_range[0], z_range[0]], dtype=np.float64)
+        self.step = step
+        self.shape = tuple(int(round((r[1] - r[0]) / step)) + 1 for r in (x_range, y_range, z_range))
+        self.joint_step = joint_step
+        self.tolerance = tolerance  # derece - bu hatadan büyükse erişilemez
+
+        self.angles: Dict[str, np.ndarray] = {}
+        self.reachable: Dict[str, np.ndarray] = {}
+        self.errors: Dict[str, np.ndarray] = {}
+        self.loaded_from_cache = False
+
+    @classmethod
+    def from_limit_arrays(cls, min_angles: np.ndarray, max_angles: np.ndarray,
+                          **kwargs) -> 'ArmReachabilityGrid':
+        """ServoLimits min/max dizilerinden kol limitlerini al"""
+        joint_limits = {
+            arm: (min_angles[list(ids)], max_angles[list(ids)])
+            for arm, ids in ARM_JOINT_IDS.items()
+        }
+        return cls(joint_limits, **kwargs)
+
+    @property
+    def calibration_key(self) -> str:
+        """Izgarayı üreten tüm parametrelerin özeti"""
+        params = {
+            "version": IK_GRID_VERSION,
+            "origin": self.origin.round(4).tolist(),
+            "shape": list(self.shape),
+            "step": self.step,
+            "joint_step": self.joint_step,
+            "tolerance": self.tolerance,
+            "limits": {arm: [lo.tolist(), hi.tolist()] for arm, (lo, hi) in sorted(self.joint_limits.items())},
+            "geometry": [UPPER_ARM_LENGTH, FOREARM_LENGTH, SHOULDER_POSITIONS]
+        }
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def grid_points(self) -> np.ndarray:
+        """Tüm ızgara noktaları (nx, ny, nz, 3)"""
+        axes = [self.origin[i] + np.arange(self.shape[i]) * self.step for i in range(3)]
+        return np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1)
+
+    # ----- Üretim / önbellek -----
+
+    def _joint_samples(self, arm: str) -> np.ndarray:
+        """Limitler içindeki servo açı örnekleri (N, 3)"""
+        lo, hi = self.joint_limits[arm]
+        shoulder = np.arange(lo[0], hi[0] + 1e-6, self.joint_step)
+        elbow = np.arange(lo[1], hi[1] + 1e-6, self.joint_step)
+        wrist = np.arange(max(lo[2], 45), min(hi[2], 135) + 1e-6, self.joint_step * 3)
+        if wrist.size == 0:
+            wrist = np.array([np.clip(90, lo[2], hi[2])])
+        return np.stack(np.meshgrid(shoulder, elbow, wrist, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    def build(self, chunk_size: int = 512):
+        """Her ızgara noktası için en iyi açıları kaba kuvvet vektörel arama ile bul"""
+        points = self.grid_points().reshape(-1, 3)
+
+        for arm in ARM_JOINT_IDS:
+            samples = self._joint_samples(arm)
+            shoulder_position = np.asarray(SHOULDER_POSITIONS[arm])
+
+            pointing = forward_kinematics(arm, samples) - shoulder_position
+            pointing = (pointing / np.linalg.norm(pointing, axis=1, keepdims=True)).astype(np.float32)
+            # Eşit hizalamada bileği düz tutmayı tercih et
+            wrist_penalty = (0.05 * np.abs(samples[:, 2] - 90)).astype(np.float32)
+
+            targets = points - shoulder_position
+            targets = (targets / np.linalg.norm(targets, axis=1, keepdims=True)).astype(np.float32)
+
+            best = np.empty(len(points), dtype=np.int64)
+            best_error = np.empty(len(points), dtype=np.float64)
+            for start in range(0, len(points), chunk_size):
+                dots = targets[start:start + chunk_size] @ pointing.T
+                error = np.degrees(np.arccos(np.clip(dots, -1.0, 1.0)))
+                cost = error + wrist_penalty
+                index = np.argmin(cost, axis=1)
+                best[start:start + chunk_size] = index
+                best_error[start:start + chunk_size] = error[np.arange(len(index)), index]
+
+            self.angles[arm] = samples[best].reshape(*self.shape, 3).astype(np.float32)
+            self.errors[arm] = best_error.reshape(self.shape).astype(np.float32)
+            self.reachable[arm] = self.errors[arm] <= self.tolerance
+
+        self.loaded_from_cache = False
+
+    def cache_path(self, cache_dir: str) -> Path:
+        return Path(cache_dir) / f"arm_ik_{self.calibration_key}.npz"
+
+    def load(self, cache_dir: str) -> bool:
+        """Önbellekten yükle"""
+        path = self.cache_path(cache_dir)
+        if not path.exists():
+            return False
+
+        try:
+            with np.load(path) as data:
+                if str(data["calibration_key"]) != self.calibration_key:
+                    return False
+                for arm in ARM_JOINT_IDS:
+                    self.angles[arm] = data[f"{arm}_angles"]
+                    self.errors[arm] = data[f"{arm}_errors"]
+                    self.reachable[arm] = self.errors[arm] <= self.tolerance
+        except Exception:
+            return False
+
+        self.loaded_from_cache = True
+        return True
+
+    def save(self, cache_dir: str):
+        """Önbelleğe yaz; eski parametrelerle üretilmiş ızgaraları sil"""
+        path = self.cache_path(cache_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        for stale in path.parent.glob("arm_ik_*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+        arrays = {}
+        for arm in ARM_JOINT_IDS:
+            arrays[f"{arm}_angles"] = self.angles[arm]
+            arrays[f"{arm}_errors"] = self.errors[arm]
+
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, calibration_key=self.calibration_key, **arrays)
+        tmp_path.replace(path)
+
+    def load_or_build(self, cache_dir: Optional[str] = None, logger: Optional[SystemLogger] = None):
+        """Önbellekte varsa yükle, yoksa üret ve kaydet"""
+        if cache_dir and self.load(cache_dir):
+            return
+
+        self.build()
+        if cache_dir:
+            try:
+                self.save(cache_dir)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"IK ızgarası kaydedilemedi: {e}")
+
+        if logger:
+            coverage = {arm: f"{reach.mean() * 100:.0f}%" for arm, reach in self.reachable.items()}
+            logger.info(f"Kol IK ızgarası oluşturuldu: {self.shape}, erişim {coverage}")
+
+    # ----- Sorgu -----
+
+    def solve(self, arm: str, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(K, 3) hedef noktaları için (K, 3) servo açıları ve erişilebilirlik maskesi"""
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        shape = np.array(self.shape)
+        angles_grid = self.angles[arm]
+        reach_grid = self.reachable[arm]
+
+        # En yakın hücre: ızgara içinde ve erişilebilir mi
+        position = (points - self.origin) / self.step
+        nearest = np.rint(position).astype(np.int64)
+        inside = np.all((nearest >= 0) & (nearest < shape), axis=1)
+        nearest = np.clip(nearest, 0, shape - 1)
+        reachable = inside & reach_grid[nearest[:, 0], nearest[:, 1], nearest[:, 2]]
+
+        # İyileştirme: erişilebilir 8 komşu hücre arasında trilineer interpolasyon
+        base = np.clip(np.floor(position).astype(np.int64), 0, shape - 2)
+        frac = np.clip(position - base, 0.0, 1.0)
+
+        weighted = np.zeros((len(points), 3), dtype=np.float64)
+        weight_sum = np.zeros(len(points), dtype=np.float64)
+        for corner in np.ndindex(2, 2, 2):
+            offset = np.array(corner)
+            index = base + offset
+            weight = np.prod(np.where(offset, frac, 1.0 - frac), axis=1)
+            weight = weight * reach_grid[index[:, 0], index[:, 1], index[:, 2]]
+            weighted += weight[:, np.newaxis] * angles_grid[index[:, 0], index[:, 1], index[:, 2]]
+            weight_sum += weight
+
+        nearest_angles = angles_grid[nearest[:, 0], nearest[:, 1], nearest[:, 2]].astype(np.float64)
+        has_weight = weight_sum > 1e-9
+        angles = np.where(has_weight[:, np.newaxis],
+                          weighted / np.where(has_weight, weight_sum, 1.0)[:, np.newaxis],
+                          nearest_angles)
+
+        return angles, reachable
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "shape": self.shape,
+            "step": self.step,
+            "from_cache": self.loaded_from_cache,
+            "coverage": {arm: round(float(reach.mean()), 3) for arm, reach in self.reachable.items()}
+        }
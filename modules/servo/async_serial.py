@@ -0,0 +1,465 @@
+# =======================
+# modules/servo/async_serial.py - asyncio Tabanlı Arduino İletişimi
+# =======================
+
+import asyncio
+import os
+import time
+from collections import deque
+from threading import Thread, Lock
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import serial
+
+from config.settings import ServoSettings
+from config.constants import ARDUINO_COMMANDS
+from modules.servo.servo_journal import ServoJournal, DIRECTION_TX, DIRECTION_RX
+from modules.servo.servo_pose import ServoPose
+from modules.system.logger import SystemLogger
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
+
+# Arduino yanıt önekleri (arduino_code.ino): her komut sırayla tek satır onay üretir
+ACK_PREFIXES = ("OK:", "ERROR:", "PONG")
+
+_servo_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+_servo_loop_lock = Lock()
+
+
+def get_servo_loop(endpoint: str = "") -> asyncio.AbstractEventLoop:
+    """Seri uç noktasının (port) event loop'u; her uç nokta kendi arka plan thread'inde
+
+    Kartlar birbirini beklemez: yoklama kipi veya yavaş bir geri çağırma
+    sadece kendi kartını geciktirir.
+    """
+    with _servo_loop_lock:
+        loop = _servo_loops.get(endpoint)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            name = f"servo-io-{endpoint}" if endpoint else "servo-io"
+            Thread(target=loop.run_forever, name=name, daemon=True).start()
+            _servo_loops[endpoint] = loop
+        return loop
+
+
+def run_on_servo_loop(coro: Awaitable, timeout: Optional[float] = None, endpoint: str = ""):
+    """Coroutine'i uç noktanın servo loop'unda çalıştır ve sonucu bekle (senkron çağıranlar için)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_servo_loop(endpoint)).result(timeout)
+
+
+async def await_on_servo_loop(coro: Awaitable, endpoint: str = ""):
+    """Başka bir event loop'tan uç noktanın servo loop'undaki coroutine'i bekle"""
+    servo_loop = get_servo_loop(endpoint)
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is servo_loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, servo_loop))
+
+
+class SerialLineTransport:
+    """Bloklamayan seri port transportu (satır bazlı)
+
+    POSIX'te dosya tanımlayıcısı event loop'a okuyucu/yazıcı olarak eklenir;
+    desteklenmeyen platformlarda kısa aralıklı yoklama görevi kullanılır.
+    """
+
+    def __init__(self, serial_port, loop: asyncio.AbstractEventLoop, on_line: Callable[[str], None]):
+        self.serial_port = serial_port
+        self.loop = loop
+        self.on_line = on_line
+
+        self.read_buffer = bytearray()
+        self.write_buffer = bytearray()
+        self.fd: Optional[int] = None
+        self.poll_task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self):
+        try:
+            fd = self.serial_port.fileno()
+            self.loop.add_reader(fd, self._on_readable)
+            self.fd = fd
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            self.poll_task = self.loop.create_task(self._poll())
+
+    async def _poll(self):
+        while not self.closed:
+            self._on_readable()
+            self._flush_writes()
+            await asyncio.sleep(0.002)
+
+    def _on_readable(self):
+        try:
+            waiting = self.serial_port.in_waiting
+            data = self.serial_port.read(waiting or 1)
+        except (serial.SerialException, OSError):
+            return
+        if not data:
+            return
+
+        self.read_buffer.extend(data)
+        while b"\n" in self.read_buffer:
+            line, _, rest = self.read_buffer.partition(b"\n")
+            self.read_buffer = bytearray(rest)
+            text = line.decode(errors="replace").strip()
+            if text:
+                self.on_line(text)
+
+    def write(self, data: bytes):
+        """Veriyi yazma tamponuna ekle ve mümkün olduğunca hemen gönder"""
+        self.write_buffer.extend(data)
+        self._flush_writes()
+
+    def _flush_writes(self):
+        if not self.write_buffer or self.closed:
+            return
+        try:
+            written = self.serial_port.write(bytes(self.write_buffer)) or 0
+        except serial.SerialTimeoutException:
+            written = 0
+        del self.write_buffer[:written]
+
+        if self.fd is not None:
+            if self.write_buffer:
+                self.loop.add_writer(self.fd, self._flush_writes)
+            else:
+                self.loop.remove_writer(self.fd)
+
+    def close(self):
+        self.closed = True
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.loop.remove_writer(self.fd)
+        if self.poll_task:
+            self.poll_task.cancel()
+        if self.serial_port and self.serial_port.is_open:
+            self.serial_port.close()
+
+
+class AsyncArduinoComm:
+    """Arduino ile asyncio tabanlı iletişim
+
+    Her komut satırı için bir Future oluşturulur; Arduino komutları sırayla
+    işleyip tek satır onay (OK:/ERROR:/PONG) döndürdüğü için gelen onaylar
+    bekleyen Future'ları FIFO sırasıyla çözer. Tüm coroutine'ler portun
+    kendi servo loop'unda (get_servo_loop(settings.port)) çalışmalıdır.
+    """
+
+    def __init__(self, settings: ServoSettings, logger: SystemLogger, ack_timeout: float = 0.5):
+        self.settings = settings
+        self.logger = logger
+        self.ack_timeout = ack_timeout
+
+        self.serial_port = None
+        self.transport: Optional[SerialLineTransport] = None
+        self.is_connected = False
+
+        # Onay bekleyen komutlar (gönderim sırasıyla)
+        self.pending_acks: Deque[Tuple[asyncio.Future, float, str]] = deque()
+        self.unsolicited: Deque[str] = deque(maxlen=100)
+
+        self.ping_task: Optional[asyncio.Task] = None
+        self.pose_lock = Lock()
+
+        # İsteğe bağlı komut/yanıt günlüğü (journal_dir boşsa kapalı)
+        self.journal: Optional[ServoJournal] = None
+
+        # Durum takibi
+        self.last_servo_positions = ServoPose.empty()
+        self.arduino_status = {
+            'connected': False,
+            'last_ping': 0,
+            'ping_rtt': 0.0,
+            'error_count': 0,
+            'commands_sent': 0,
+            'ack_latency_ms': 0.0,  # komut -> onay süresi (EMA)
+            'ack_timeouts': 0
+        }
+
+    # ----- Bağlantı -----
+
+    async def open(self) -> bool:
+        """Seri portu aç ve transportu başlat (ping yapmadan)"""
+        try:
+            self.serial_port = serial.Serial(
+                baudrate=self.settings.baudrate,
+                timeout=0,
+                write_timeout=0
+            )
+            self.serial_port.port = self.settings.port
+            if os.name == "nt":
+                self.serial_port.dtr = False  # Windows'ta DTR açılışta hiç kaldırılmaz (sıcak başlatma)
+            self.serial_port.open()
+            self._disable_hangup_reset()
+
+            if self.settings.journal_dir and self.journal is None:
+                self.journal = ServoJournal(
+                    ServoJournal.default_path(self.settings.journal_dir, self.settings.port), self.logger)
+                if not self.journal.start():
+                    self.journal = None
+
+            self.transport = SerialLineTransport(self.serial_port, asyncio.get_running_loop(), self._on_line)
+            self.transport.start()
+            return True
+        except Exception as e:
+            self.logger.error(f"Arduino bağlantı hatası: {e}")
+            if self.serial_port is not None and getattr(self.serial_port, 'is_open', False):
+                self.serial_port.close()
+            self.transport = None
+            return False
+
+    def _disable_hangup_reset(self):
+        """Port kapanınca DTR'nin düşmesini engelle (termios HUPCL)
+
+        Linux'ta sürücü açılışta DTR'yi her zaman kaldırır; dtr=False bunu
+        önlemez. HUPCL kapalıysa DTR kapanışta da açık kalır, sonraki açılışta
+        kenar oluşmaz ve Arduino resetlenmez. Sınır: bayrak porta bu açılışta
+        yazılır, yani açılıştan/USB takılmasından sonraki ilk bağlantı yine
+        resetler; o durumda connect() bootloader'ı ping ile bekler ve poz
+        servo_state dosyasından geri yüklenir. Reset hiç istenmiyorsa
+        Arduino'da RESET-GND arasına 10 µF kondansatör gerekir.
+        """
+        if termios is None:
+            return
+        try:
+            fd = self.serial_port.fileno()
+            attrs = termios.tcgetattr(fd)
+            if attrs[2] & termios.HUPCL:
+                attrs[2] &= ~termios.HUPCL
+                termios.tcsetattr(fd, termios.TCSANOW, attrs)
+        except (termios.error, OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Seri port HUPCL kapatılamadı (yeniden bağlanınca Arduino resetlenebilir): {e}")
+
+    async def connect(self, timeout: float = 3.0) -> bool:
+        """Portu aç ve Arduino PONG verene kadar yokla"""
+        if not await self.open():
+            return False
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if await self.ping(timeout=0.25):
+                await self.activate()
+                return True
+
+        await self.disconnect()
+        return False
+
+    async def activate(self):
+        """Ping başarılı: bağlantıyı etkinleştir ve periyodik ping'i başlat"""
+        self.is_connected = True
+        self.arduino_status['connected'] = True
+        if self.ping_task is None:
+            self.ping_task = asyncio.get_running_loop().create_task(self._ping_loop())
+
+    async def disconnect(self):
+        self.is_connected = False
+        self.arduino_status['connected'] = False
+
+        if self.ping_task:
+            self.ping_task.cancel()
+            self.ping_task = None
+
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+
+        while self.pending_acks:
+            future, _, _ = self.pending_acks.popleft()
+            if not future.done():
+                future.set_result(None)
+
+        if self.journal:
+            self.journal.stop()
+            self.journal = None
+
+    async def _ping_loop(self):
+        """Periyodik ping (RTT ölçümü)"""
+        while self.is_connected:
+            await asyncio.sleep(5.0)
+            await self.ping()
+
+    # ----- Komut / onay -----
+
+    @staticmethod
+    def _expected_ack(command: str) -> str:
+        """Komutun başarılı onay satırının öneki"""
+        if command.startswith(ARDUINO_COMMANDS['SET_SERVO']):
+            return "OK:" + command[1:].split(",")[0] + ":"
+        if command.startswith(ARDUINO_COMMANDS['SET_SPEED']):
+            return "OK:SPEED:"
+        if command.startswith(ARDUINO_COMMANDS['CALIBRATE']):
+            return "OK:CALIBRATE"
+        if command.startswith(ARDUINO_COMMANDS['PING']):
+            return "PONG"
+        return "OK:"
+
+    def _on_line(self, line: str):
+        """Gelen onay satırını bekleyen en eski uygun komutla eşle
+
+        Onayı hiç gelmeyen komutlar (ör. reset sırasında gönderilen ping)
+        sonraki uyuşan onayda kayıp sayılıp atlanır; zaman aşımından sonra
+        gelen geç onaylar ise kendi komutlarını tüketir.
+        """
+        if self.journal:
+            self.journal.record(DIRECTION_RX, line)
+
+        if not line.startswith(ACK_PREFIXES):
+            self.unsolicited.append(line)
+            return
+
+        is_error = line.startswith("ERROR:")
+        if is_error:
+            self.arduino_status['error_count'] += 1
+
+        while self.pending_acks:
+            future, sent_time, expected = self.pending_acks.popleft()
+            if not (is_error or line.startswith(expected)):
+                if not future.done():
+                    future.set_result(None)  # onay kayboldu
+                continue
+
+            if not future.done():
+                latency = (time.perf_counter() - sent_time) * 1000
+                self.arduino_status['ack_latency_ms'] += 0.1 * (latency - self.arduino_status['ack_latency_ms'])
+                future.set_result(line)
+            return
+
+        self.unsolicited.append(line)
+
+    def _write_commands(self, commands: List[str]) -> List[asyncio.Future]:
+        """Komutları tek yazımda gönder, her biri için onay Future'ı döndür"""
+        loop = asyncio.get_running_loop()
+        sent_time = time.perf_counter()
+        futures = []
+        for command in commands:
+            future = loop.create_future()
+            self.pending_acks.append((future, sent_time, self._expected_ack(command)))
+            futures.append(future)
+
+        if self.journal:
+            timestamp_ns = time.monotonic_ns()
+            for command in commands:
+                self.journal.record(DIRECTION_TX, command, timestamp_ns)
+
+        self.transport.write(("\n".join(commands) + "\n").encode())
+        self.arduino_status['commands_sent'] += len(commands)
+        return futures
+
+    async def send_commands(self, commands: List[str], timeout: Optional[float] = None) -> List[Optional[str]]:
+        """Komutları gönder ve onay satırlarını bekle (zaman aşımında None)"""
+        if not commands:
+            return []
+        if self.transport is None:
+            return [None] * len(commands)
+
+        futures = self._write_commands(commands)
+        done, not_done = await asyncio.wait(futures, timeout=timeout or self.ack_timeout)
+        for future in not_done:
+            future.cancel()  # kayıt kuyrukta kalır, geç gelen onay onu tüketir
+        if not_done:
+            self.arduino_status['ack_timeouts'] += len(not_done)
+
+        return [future.result() if future in done else None for future in futures]
+
+    async def ping(self, timeout: float = 1.0) -> bool:
+        """Bağlantıyı test et ve gidiş-dönüş süresini ölç"""
+        ping_start = time.time()
+        response, = await self.send_commands([ARDUINO_COMMANDS['PING']], timeout=timeout)
+        if response != "PONG":
+            return False
+
+        now = time.time()
+        self.arduino_status['last_ping'] = now
+        self.arduino_status['ping_rtt'] = now - ping_start
+        return True
+
+    # ----- Servo komutları -----
+
+    def prepare_pose(self, pose: ServoPose) -> Optional[List[str]]:
+        """Pozu doğrula, değişen servoların komutlarını üret ve son pozisyonu kaydet
+
+        Geçersiz pozda None döner. Senkron API'den de çağrılabilir.
+        """
+        invalid = pose.out_of_range(0, 180)
+        if invalid.any():
+            self.logger.warning(f"Geçersiz servo açıları: {pose.int_angles()[invalid].tolist()}")
+            return None
+
+        with self.pose_lock:
+            changed_ids = pose.changed_from(self.last_servo_positions).nonzero()[0]
+            angles = pose.int_angles()
+            commands = [
+                f"{ARDUINO_COMMANDS['SET_SERVO']}{servo_id},{angle}"
+                for servo_id, angle in zip(changed_ids.tolist(), angles[changed_ids].tolist())
+            ]
+            self.last_servo_positions.update(pose)
+        return commands
+
+    async def send_and_check(self, commands: List[str]) -> bool:
+        """Komutları gönder; tümü OK ile onaylanırsa True"""
+        responses = await self.send_commands(commands)
+        return all(response is not None and response.startswith("OK:") for response in responses)
+
+    async def set_pose(self, pose: ServoPose) -> bool:
+        """Pozu gönder; tüm servolar onaylandığında True ile tamamlanır"""
+        if not self.is_connected:
+            return False
+        commands = self.prepare_pose(pose)
+        if commands is None:
+            return False
+        return await self.send_and_check(commands)
+
+    def prepare_servo_angle(self, servo_id: int, angle: int) -> Optional[str]:
+        """Tek servo komutunu doğrula ve üret (geçersizse None)"""
+        if not (0 <= angle <= 180):
+            self.logger.warning(f"Geçersiz servo açısı: {angle}")
+            return None
+
+        with self.pose_lock:
+            self.last_servo_positions.set(servo_id, angle)
+        return f"{ARDUINO_COMMANDS['SET_SERVO']}{servo_id},{angle}"
+
+    def prepare_calibration(self) -> str:
+        with self.pose_lock:
+            self.last_servo_positions = ServoPose.full(90)
+        return ARDUINO_COMMANDS['CALIBRATE']
+
+    async def set_servo_angle(self, servo_id: int, angle: int) -> bool:
+        if not self.is_connected:
+            return False
+        command = self.prepare_servo_angle(servo_id, angle)
+        if command is None:
+            return False
+        return await self.send_and_check([command])
+
+    async def set_servo_speed(self, speed: int) -> bool:
+        if not self.is_connected or not (1 <= speed <= 10):
+            return False
+        return await self.send_and_check([f"{ARDUINO_COMMANDS['SET_SPEED']}{speed}"])
+
+    async def calibrate_servos(self) -> bool:
+        if not self.is_connected:
+            return False
+        return await self.send_and_check([self.prepare_calibration()])
+
+    # ----- Durum -----
+
+    def get_serial_latency(self) -> float:
+        """Tek yönlü seri port gecikmesi tahmini (saniye, ping RTT/2)"""
+        return self.arduino_status.get('ping_rtt', 0.0) / 2
+
+    def get_status(self) -> Dict:
+        status = self.arduino_status.copy()
+        status['port'] = self.settings.port
+        status['pending_acks'] = len(self.pending_acks)
+        if self.journal:
+            status['journal'] = self.journal.get_stats()
+        return status
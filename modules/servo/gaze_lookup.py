@@ -0,0 +1,215 @@
+# =======================
+# modules/servo/gaze_lookup.py - Piksel -> Pan/Tilt Tablosu
+# =======================
+
+import hashlib
+import json
+import math
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from modules.system.logger import SystemLogger
+
+
+# Tablo formatı değişirse artırılır (eski önbellek dosyaları geçersiz olur)
+LUT_VERSION = 1
+
+# Kalibrasyon yokken kullanılan görüş alanı (eski doğrusal eşleme ile aynı uçlar)
+DEFAULT_HFOV = 60.0  # derece
+DEFAULT_VFOV = 40.0  # derece
+
+
+class GazeLookupTable:
+    """Belirli çözünürlük ve kamera iç parametreleri için piksel -> kafa açısı tablosu
+
+    Derinliksiz sorgular önceden hesaplanmış (yükseklik x genişlik) pan/tilt
+    dizilerinden tek indeksleme ile yanıtlanır. Derinlik verilirse, önceden
+    hesaplanmış normalize ışın yönleri kamera-kafa ofsetiyle düzeltilir.
+    """
+
+    def __init__(self, width: int, height: int, intrinsics: Dict[str, float],
+                 pan_range: Tuple[float, float] = (30, 150),
+                 tilt_range: Tuple[float, float] = (60, 120),
+                 head_offset: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
+        self.width = int(width)
+        self.height = int(height)
+        self.intrinsics = {k: float(intrinsics[k]) for k in ("fx", "fy", "ppx", "ppy")}
+        self.pan_range = tuple(pan_range)
+        self.tilt_range = tuple(tilt_range)
+        self.head_offset = tuple(head_offset)
+
+        self.pan_table: Optional[np.ndarray] = None
+        self.tilt_table: Optional[np.ndarray] = None
+        self.ray_x: Optional[np.ndarray] = None
+        self.ray_y: Optional[np.ndarray] = None
+        self.loaded_from_cache = False
+
+    # ----- Kalibrasyon -----
+
+    @staticmethod
+    def intrinsics_from_fov(width: int, height: int,
+                            hfov: float = DEFAULT_HFOV, vfov: float = DEFAULT_VFOV) -> Dict[str, float]:
+        """Görüş alanından pinhole iç parametreleri tahmin et"""
+        return {
+            "fx": (width / 2) / math.tan(math.radians(hfov / 2)),
+            "fy": (height / 2) / math.tan(math.radians(vfov / 2)),
+            "ppx": width / 2,
+            "ppy": height / 2
+        }
+
+    @staticmethod
+    def scale_intrinsics(intrinsics: Dict[str, float], source_size: Tuple[int, int],
+                         target_size: Tuple[int, int]) -> Dict[str, float]:
+        """Başka çözünürlük için kalibre edilmiş iç parametreleri ölçekle"""
+        scale_x = target_size[0] / source_size[0]
+        scale_y = target_size[1] / source_size[1]
+        return {
+            "fx": intrinsics["fx"] * scale_x,
+            "fy": intrinsics["fy"] * scale_y,
+            "ppx": intrinsics["ppx"] * scale_x,
+            "ppy": intrinsics["ppy"] * scale_y
+        }
+
+    @property
+    def calibration_key(self) -> str:
+        """Tabloyu üreten tüm parametrelerin özeti"""
+        params = {
+            "version": LUT_VERSION,
+            "size": [self.width, self.height],
+            "intrinsics": {k: round(v, 4) for k, v in self.intrinsics.items()},
+            "pan_range": list(self.pan_range),
+            "tilt_range": list(self.tilt_range),
+            "head_offset": list(self.head_offset)
+        }
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    # ----- Üretim / önbellek -----
+
+    def build(self):
+        """Tabloyu hesapla"""
+        fx, fy = self.intrinsics["fx"], self.intrinsics["fy"]
+        ppx, ppy = self.intrinsics["ppx"], self.intrinsics["ppy"]
+
+        self.ray_x = ((np.arange(self.width, dtype=np.float64) - ppx) / fx).astype(np.float32)
+        self.ray_y = ((np.arange(self.height, dtype=np.float64) - ppy) / fy).astype(np.float32)
+
+        # Derinliksiz tablo: hedef uzakta kabul edilir, kamera-kafa ofseti ihmal edilir
+        pan_table, tilt_table = self._angles_for_rays(self.ray_x[np.newaxis, :],
+                                                      self.ray_y[:, np.newaxis],
+                                                      1.0, (0.0, 0.0, 0.0))
+        self.pan_table = np.ascontiguousarray(np.broadcast_to(pan_table, (self.height, self.width)),
+                                              dtype=np.float32)
+        self.tilt_table = tilt_table.astype(np.float32)
+        self.loaded_from_cache = False
+
+    def _angles_for_rays(self, ray_x, ray_y, depth,
+                         head_offset: Tuple[float, float, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalize ışın + derinlikten kafa açıları (kafa dönme merkezine göre)"""
+        offset_x, offset_y, offset_z = head_offset
+        point_x = ray_x * depth - offset_x
+        point_y = ray_y * depth - offset_y
+        point_z = depth - offset_z
+
+        pan = 90 + np.degrees(np.arctan2(point_x, point_z))
+        tilt = 90 - np.degrees(np.arctan2(point_y, np.hypot(point_x, point_z)))
+
+        return (np.clip(pan, self.pan_range[0], self.pan_range[1]),
+                np.clip(tilt, self.tilt_range[0], self.tilt_range[1]))
+
+    def cache_path(self, cache_dir: str) -> Path:
+        return Path(cache_dir) / f"gaze_lut_{self.width}x{self.height}_{self.calibration_key}.npz"
+
+    def load(self, cache_dir: str) -> bool:
+        """Önbellekten yükle (anahtar eşleşmezse False)"""
+        path = self.cache_path(cache_dir)
+        if not path.exists():
+            return False
+
+        try:
+            with np.load(path) as data:
+                if str(data["calibration_key"]) != self.calibration_key:
+                    return False
+                pan_table, tilt_table = data["pan_table"], data["tilt_table"]
+                ray_x, ray_y = data["ray_x"], data["ray_y"]
+        except Exception:
+            return False
+
+        if pan_table.shape != (self.height, self.width) or tilt_table.shape != (self.height, self.width):
+            return False
+
+        self.pan_table, self.tilt_table = pan_table, tilt_table
+        self.ray_x, self.ray_y = ray_x, ray_y
+        self.loaded_from_cache = True
+        return True
+
+    def save(self, cache_dir: str):
+        """Önbelleğe yaz; aynı çözünürlüğün eski kalibrasyon dosyalarını sil"""
+        path = self.cache_path(cache_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        for stale in path.parent.glob(f"gaze_lut_{self.width}x{self.height}_*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, calibration_key=self.calibration_key,
+                 pan_table=self.pan_table, tilt_table=self.tilt_table,
+                 ray_x=self.ray_x, ray_y=self.ray_y)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load_or_build(cls, width: int, height: int, intrinsics: Dict[str, float],
+                      cache_dir: Optional[str] = None, logger: Optional[SystemLogger] = None,
+                      **kwargs) -> 'GazeLookupTable':
+        """Önbellekte varsa yükle, yoksa üret ve kaydet"""
+        table = cls(width, height, intrinsics, **kwargs)
+        if cache_dir and table.load(cache_dir):
+            return table
+
+        table.build()
+        if cache_dir:
+            try:
+                table.save(cache_dir)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Bakış tablosu kaydedilemedi: {e}")
+
+        if logger:
+            logger.info(f"Bakış tablosu oluşturuldu: {width}x{height} ({table.calibration_key})")
+        return table
+
+    # ----- Sorgu -----
+
+    def lookup(self, x: float, y: float, depth: Optional[float] = None) -> Tuple[float, float]:
+        """Pikseli (isteğe bağlı derinlik, metre) pan/tilt açısına çevir"""
+        col = min(max(int(x), 0), self.width - 1)
+        row = min(max(int(y), 0), self.height - 1)
+
+        if not depth or depth <= 0 or not any(self.head_offset):
+            return float(self.pan_table[row, col]), float(self.tilt_table[row, col])
+
+        pan, tilt = self._angles_for_rays(float(self.ray_x[col]), float(self.ray_y[row]),
+                                          depth, self.head_offset)
+        return float(pan), float(tilt)
+
+    def deproject(self, x: float, y: float, depth: float) -> np.ndarray:
+        """Piksel + derinlikten kamera koordinatlarında 3D nokta (metre)"""
+        col = min(max(int(x), 0), self.width - 1)
+        row = min(max(int(y), 0), self.height - 1)
+        return np.array([self.ray_x[col] * depth, self.ray_y[row] * depth, depth], dtype=np.float64)
+
+    def lookup_many(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Birden çok pikseli tek indekslemeyle çevir"""
+        cols = np.clip(np.asarray(xs, dtype=np.int64), 0, self.width - 1)
+        rows = np.clip(np.asarray(ys, dtype=np.int64), 0, self.height - 1)
+        return self.pan_table[rows, cols], self.tilt_table[rows, cols]
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "resolution": (self.width, self.height),
+            "calibration_key": self.calibration_key,
+            "from_cache": self.loaded_from_cache,
+            "size_kb": round((self.pan_table.nbytes + self.tilt_table.nbytes) / 1024, 1)
+            if self.pan_table is not None else 0
+        }
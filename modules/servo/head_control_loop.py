@@ -0,0 +1,287 @@
+# =======================
+# modules/servo/head_control_loop.py - Yüksek Frekanslı Kafa PID Döngüsü
+# =======================
+
+import math
+import time
+from collections import deque
+from threading import Thread, Lock, Event
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import ServoSettings
+from config.constants import ServoIDs
+from modules.system.logger import SystemLogger
+
+
+# Arduino yumuşak hareket döngüsü periyodu (servo_controller ile aynı model)
+SERVO_STEP_INTERVAL = 0.02
+
+
+class PIDAxis:
+    """Tek eksen PID kontrolcüsü (çıkış: derece/saniye)"""
+
+    def __init__(self, kp: float, ki: float, kd: float, integral_limit: float = 30.0):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.integral_limit = integral_limit
+
+        self.integral = 0.0
+        self.prev_error: Optional[float] = None
+
+    def reset(self):
+        self.integral = 0.0
+        self.prev_error = None
+
+    def update(self, error: float, dt: float) -> float:
+        """Hata ve zaman adımından hız komutu üret"""
+        self.integral = max(-self.integral_limit,
+                            min(self.integral_limit, self.integral + error * dt))
+        derivative = 0.0 if self.prev_error is None else (error - self.prev_error) / dt
+        self.prev_error = error
+        return self.kp * error + self.ki * self.integral + self.kd * derivative
+
+
+class HeadControlLoop:
+    """Tespit hızından bağımsız çalışan pan/tilt kontrol döngüsü
+
+    Tespitler yalnızca hedef açıyı (setpoint) günceller. Döngü sabit
+    frekansta, Arduino'nun servo hareketini modelleyen host tarafı açı
+    tahminine göre PID + ileri besleme uygular ve sadece tamsayı açı
+    değiştiğinde komut gönderir. Animasyon oynarken döngü boşta bekler
+    (klip kafa servolarını da sürer), bitince gerçek pozisyondan devam eder.
+    """
+
+    def __init__(self, servo_controller, settings: ServoSettings, logger: SystemLogger):
+        self.servo_controller = servo_controller
+        self.settings = settings
+        self.logger = logger
+
+        self.period = 1.0 / max(1.0, settings.pid_rate_hz)
+        self.setpoint_timeout = 1.0  # bu süre tespit gelmezse döngü boşta bekler
+
+        self.pan_pid = PIDAxis(settings.pid_kp, settings.pid_ki, settings.pid_kd)
+        self.tilt_pid = PIDAxis(settings.pid_kp, settings.pid_ki, settings.pid_kd)
+
+        # Limitler
+        limits = servo_controller.servo_limits
+        self.pan_limits = limits.get(ServoIDs.HEAD_PAN.value, (0, 180))
+        self.tilt_limits = limits.get(ServoIDs.HEAD_TILT.value, (0, 180))
+
+        # Setpoint (tespit thread'inden yazılır)
+        self.setpoint_lock = Lock()
+        self.setpoint: Optional[Tuple[float, float]] = None
+        self.setpoint_velocity = (0.0, 0.0)
+        self.setpoint_time = 0.0
+
+        # Döngü durumu (sadece döngü thread'i yazar)
+        self.estimate: Optional[Tuple[float, float]] = None
+        self.command: Optional[Tuple[float, float]] = None
+        self.sent_command: Optional[Tuple[int, int]] = None
+
+        # Thread kontrolü
+        self.loop_thread: Optional[Thread] = None
+        self.stop_event = Event()
+
+        # İstatistikler
+        self.stats_lock = Lock()
+        self.loop_periods: deque = deque(maxlen=500)
+        self.tracking_errors: deque = deque(maxlen=500)
+        self.overrun_count = 0
+        self.iteration_count = 0
+        self.commands_sent = 0
+
+    # ----- Setpoint -----
+
+    def set_setpoint(self, pan: float, tilt: float, timestamp: Optional[float] = None):
+        """Yeni hedef açı (tespit geldikçe çağrılır)"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        pan = max(self.pan_limits[0], min(self.pan_limits[1], pan))
+        tilt = max(self.tilt_limits[0], min(self.tilt_limits[1], tilt))
+
+        with self.setpoint_lock:
+            # İleri besleme için setpoint hızını tahmin et (EMA)
+            if self.setpoint is not None and timestamp > self.setpoint_time:
+                dt = timestamp - self.setpoint_time
+                if dt < self.setpoint_timeout:
+                    pan_rate = (pan - self.setpoint[0]) / dt
+                    tilt_rate = (tilt - self.setpoint[1]) / dt
+                    self.setpoint_velocity = (
+                        0.5 * self.setpoint_velocity[0] + 0.5 * pan_rate,
+                        0.5 * self.setpoint_velocity[1] + 0.5 * tilt_rate
+                    )
+                else:
+                    self.setpoint_velocity = (0.0, 0.0)
+
+            self.setpoint = (pan, tilt)
+            self.setpoint_time = timestamp
+
+    def clear_setpoint(self):
+        """Hedefi bırak (döngü boşta bekler)"""
+        with self.setpoint_lock:
+            self.setpoint = None
+            self.setpoint_velocity = (0.0, 0.0)
+
+    def _get_setpoint(self, now: float):
+        with self.setpoint_lock:
+            if self.setpoint is None or now - self.setpoint_time > self.setpoint_timeout:
+                return None, (0.0, 0.0)
+            return self.setpoint, self.setpoint_velocity
+
+    # ----- Döngü -----
+
+    def start(self):
+        """Kontrol döngüsünü başlat"""
+        if self.is_running():
+            return
+        self.stop_event.clear()
+        self.loop_thread = Thread(target=self._control_loop, daemon=True)
+        self.loop_thread.start()
+        if self.logger:
+            self.logger.info(f"Kafa kontrol döngüsü başlatıldı ({1.0 / self.period:.0f} Hz)")
+
+    def stop(self):
+        """Kontrol döngüsünü durdur"""
+        self.stop_event.set()
+        if self.loop_thread:
+            self.loop_thread.join(timeout=1.0)
+            self.loop_thread = None
+
+    def is_running(self) -> bool:
+        return self.loop_thread is not None and self.loop_thread.is_alive()
+
+    def _control_loop(self):
+        """Sabit periyotlu ana döngü"""
+        next_tick = time.perf_counter()
+        last_tick = next_tick
+
+        while not self.stop_event.is_set():
+            now = time.perf_counter()
+            dt = now - last_tick
+            last_tick = now
+
+            try:
+                if dt > 0:
+                    self.step(dt, time.time())
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Kafa kontrol döngüsü hatası: {e}")
+
+            self._record_period(dt)
+
+            next_tick += self.period
+            sleep_time = next_tick - time.perf_counter()
+            if sleep_time > 0:
+                self.stop_event.wait(sleep_time)
+            else:
+                # Gecikmeli tur: birikmiş periyotları atla
+                with self.stats_lock:
+                    self.overrun_count += 1
+                next_tick = time.perf_counter()
+
+    def step(self, dt: float, now: float):
+        """Tek kontrol adımı (test için doğrudan çağrılabilir)"""
+        setpoint, setpoint_velocity = self._get_setpoint(now)
+        if setpoint is None or self.servo_controller.is_animating():
+            # Boşta (veya klip oynuyor): bir sonraki hedefte gerçek pozisyondan yeniden başla
+            if self.estimate is not None:
+                self.estimate = None
+                self.command = None
+                self.sent_command = None
+                self.pan_pid.reset()
+                self.tilt_pid.reset()
+            return
+
+        if self.estimate is None:
+            self._sync_from_controller()
+
+        # Host tarafı servo tahmini: Arduino komuta movement_speed derece/20ms ile yaklaşır
+        max_travel = self.servo_controller.movement_speed * dt / SERVO_STEP_INTERVAL
+        self.estimate = tuple(
+            est + max(-max_travel, min(max_travel, cmd - est))
+            for est, cmd in zip(self.estimate, self.command)
+        )
+
+        pan_error = setpoint[0] - self.estimate[0]
+        tilt_error = setpoint[1] - self.estimate[1]
+        self._record_error(pan_error, tilt_error)
+
+        # PID (derece/saniye) + setpoint hızından ileri besleme
+        feed_forward = self.settings.pid_feed_forward
+        pan_rate = self.pan_pid.update(pan_error, dt) + feed_forward * setpoint_velocity[0]
+        tilt_rate = self.tilt_pid.update(tilt_error, dt) + feed_forward * setpoint_velocity[1]
+
+        # Komut tahminden bir servo adımından fazla öne geçmesin (windup önleme)
+        max_lead = max(max_travel, self.servo_controller.movement_speed)
+        pan_command = self.estimate[0] + max(-max_lead, min(max_lead,
+                      self.command[0] - self.estimate[0] + pan_rate * dt))
+        tilt_command = self.estimate[1] + max(-max_lead, min(max_lead,
+                       self.command[1] - self.estimate[1] + tilt_rate * dt))
+
+        pan_command = max(self.pan_limits[0], min(self.pan_limits[1], pan_command))
+        tilt_command = max(self.tilt_limits[0], min(self.tilt_limits[1], tilt_command))
+        self.command = (pan_command, tilt_command)
+
+        # Sadece tamsayı açı değişince gönder
+        int_command = (int(round(pan_command)), int(round(tilt_command)))
+        if int_command != self.sent_command:
+            if self.servo_controller.set_head_position(*int_command, update_travel_time=False):
+                self.sent_command = int_command
+                with self.stats_lock:
+                    self.commands_sent += 1
+
+    def _sync_from_controller(self):
+        """Tahmini ServoController'ın bilinen pozisyonundan başlat"""
+        positions = self.servo_controller.get_current_pose()
+        pan = float(positions.get(ServoIDs.HEAD_PAN.value, 90))
+        tilt = float(positions.get(ServoIDs.HEAD_TILT.value, 90))
+        self.estimate = (pan, tilt)
+        self.command = (pan, tilt)
+        self.sent_command = (int(round(pan)), int(round(tilt)))
+
+    # ----- İstatistikler -----
+
+    def _record_period(self, dt: float):
+        with self.stats_lock:
+            self.iteration_count += 1
+            self.loop_periods.append(dt)
+
+    def _record_error(self, pan_error: float, tilt_error: float):
+        with self.stats_lock:
+            self.tracking_errors.append((pan_error, tilt_error))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Döngü zamanlaması ve takip hatası istatistikleri"""
+        with self.stats_lock:
+            periods = list(self.loop_periods)[1:]
+            errors = list(self.tracking_errors)
+            stats = {
+                "running": self.is_running(),
+                "target_rate_hz": round(1.0 / self.period, 1),
+                "iterations": self.iteration_count,
+                "overruns": self.overrun_count,
+                "commands_sent": self.commands_sent
+            }
+
+        if periods:
+            mean_period = sum(periods) / len(periods)
+            stats["actual_rate_hz"] = round(1.0 / mean_period, 1) if mean_period > 0 else 0.0
+            stats["period_jitter_ms"] = round(
+                math.sqrt(sum((p - mean_period) ** 2 for p in periods) / len(periods)) * 1000, 3)
+            stats["max_period_ms"] = round(max(periods) * 1000, 3)
+
+        if errors:
+            for axis, index in (("pan", 0), ("tilt", 1)):
+                values = [error[index] for error in errors]
+                stats[f"{axis}_error_rms"] = round(math.sqrt(sum(v * v for v in values) / len(values)), 2)
+                stats[f"{axis}_error_max"] = round(max(abs(v) for v in values), 2)
+
+        return stats
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.loop_periods.clear()
+            self.tracking_errors.clear()
+            self.overrun_count = 0
+            self.iteration_count = 0
+            self.commands_sent = 0
@@ -0,0 +1,167 @@
+# =======================
+# modules/servo/servo_bus.py - Çoklu Kart Servo Veri Yolu
+# =======================
+
+import asyncio
+import dataclasses
+from threading import Thread
+from typing import Dict, List, Any
+
+import numpy as np
+
+from config.settings import ServoSettings
+from modules.servo.arduino_comm import ArduinoComm
+from modules.servo.servo_pose import ServoPose, SERVO_COUNT
+from modules.system.logger import SystemLogger
+
+
+class ServoBus:
+    """Servo ID'lerini birden fazla seri porta (Arduino kartına) dağıtır
+
+    ArduinoComm ile aynı arayüzü sunar. Her kartın kendi ArduinoComm'u
+    vardır; bir poz güncellemesi kart maskelerine bölünüp tüm kartlara
+    aynı anda bırakılır. Her kart kendi I/O thread'inde (port başına servo
+    loop'u) çalışır; yavaş bir kart diğerlerinin onayını geciktirmez.
+    """
+
+    def __init__(self, settings: ServoSettings, logger: SystemLogger, bus_config: List[Dict[str, Any]]):
+        self.settings = settings
+        self.logger = logger
+
+        self.board_names: List[str] = []
+        self.boards: List[ArduinoComm] = []
+        self.board_masks: List[np.ndarray] = []
+        self.servo_board = np.full(SERVO_COUNT, -1, dtype=np.int64)
+
+        for index, config in enumerate(bus_config):
+            board_settings = dataclasses.replace(
+                settings,
+                port=config["port"],
+                baudrate=config.get("baudrate", settings.baudrate)
+            )
+            mask = np.zeros(SERVO_COUNT, dtype=bool)
+            for servo_id in config["servos"]:
+                servo_id = int(servo_id)
+                if self.servo_board[servo_id] != -1:
+                    raise ValueError(f"Servo {servo_id} birden fazla karta atanmış")
+                mask[servo_id] = True
+                self.servo_board[servo_id] = index
+
+            self.board_names.append(config.get("name", config["port"]))
+            self.boards.append(ArduinoComm(board_settings, logger))
+            self.board_masks.append(mask)
+
+    @property
+    def is_connected(self) -> bool:
+        """En az bir kart bağlı mı (kısmi kesinti için is_fully_connected)"""
+        return any(board.is_connected for board in self.boards)
+
+    @property
+    def is_fully_connected(self) -> bool:
+        return all(board.is_connected for board in self.boards)
+
+    def connect(self) -> bool:
+        """Tüm kartlara paralel bağlan (en az biri bağlanırsa True)"""
+        threads = [Thread(target=board.connect, daemon=True) for board in self.boards]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name, board, mask in zip(self.board_names, self.boards, self.board_masks):
+            if not board.is_connected:
+                self.logger.warning(f"Servo kartı bağlanamadı: {name} (servolar {np.flatnonzero(mask).tolist()})")
+
+        return self.is_connected
+
+    def disconnect(self):
+        for board in self.boards:
+            if board.is_connected:
+                board.disconnect()
+
+    def set_servo_angle(self, servo_id: int, angle: int) -> bool:
+        """Servoyu ait olduğu karta yönlendir"""
+        if not 0 <= servo_id < SERVO_COUNT or self.servo_board[servo_id] < 0:
+            return False
+        return self.boards[self.servo_board[servo_id]].set_servo_angle(servo_id, angle)
+
+    def set_pose_boards(self, pose: ServoPose) -> Dict[str, bool]:
+        """Pozu kartlara böl ve tüm kartlara aynı anda bırak; kart adı -> başarılı mı"""
+        return {
+            name: board.set_pose(ServoPose(pose.angles, pose.mask & mask))
+            for name, board, mask in zip(self.board_names, self.boards, self.board_masks)
+            if (pose.mask & mask).any()
+        }
+
+    async def set_pose_boards_async(self, pose: ServoPose) -> Dict[str, bool]:
+        """Pozu tüm kartlara paralel gönder; kart adı -> onaylandı mı"""
+        names, tasks = [], []
+        for name, board, mask in zip(self.board_names, self.boards, self.board_masks):
+            if (pose.mask & mask).any():
+                names.append(name)
+                tasks.append(board.set_pose_async(ServoPose(pose.angles, pose.mask & mask)))
+        return dict(zip(names, await asyncio.gather(*tasks)))
+
+    def accepted_pose(self, pose: ServoPose, results: Dict[str, bool]) -> ServoPose:
+        """Pozun başarılı kartlara düşen kısmı (bir kart hata verse de diğerleri hareket etmiştir)"""
+        accepted = np.zeros(SERVO_COUNT, dtype=bool)
+        for name, mask in zip(self.board_names, self.board_masks):
+            if results.get(name):
+                accepted |= mask
+        return ServoPose(pose.angles, pose.mask & accepted)
+
+    def set_pose(self, pose: ServoPose) -> bool:
+        """Pozu kartlara böl ve tüm kartlara aynı anda bırak (hepsi başarılıysa True)"""
+        results = self.set_pose_boards(pose)
+        return not (pose.mask & (self.servo_board < 0)).any() and all(results.values())
+
+    async def set_pose_async(self, pose: ServoPose) -> bool:
+        """Pozu tüm kartlara paralel gönder; hepsi onaylayınca tamamlanır"""
+        if (pose.mask & (self.servo_board < 0)).any():
+            return False
+        results = await self.set_pose_boards_async(pose)
+        return all(results.values())
+
+    async def set_servo_angle_async(self, servo_id: int, angle: int) -> bool:
+        if not 0 <= servo_id < SERVO_COUNT or self.servo_board[servo_id] < 0:
+            return False
+        return await self.boards[self.servo_board[servo_id]].set_servo_angle_async(servo_id, angle)
+
+    def set_servo_speed(self, speed: int) -> bool:
+        results = [board.set_servo_speed(speed) for board in self.boards if board.is_connected]
+        return bool(results) and all(results)
+
+    def calibrate_servos(self) -> bool:
+        results = [board.calibrate_servos() for board in self.boards if board.is_connected]
+        return bool(results) and all(results)
+
+    def get_serial_latency(self) -> float:
+        """En yavaş bağlı kartın tek yönlü gecikmesi"""
+        latencies = [board.get_serial_latency() for board in self.boards if board.is_connected]
+        return max(latencies) if latencies else 0.0
+
+    @property
+    def last_servo_positions(self) -> ServoPose:
+        merged = ServoPose.empty()
+        for board in self.boards:
+            merged.update(board.last_servo_positions)
+        return merged
+
+    def get_servo_positions(self) -> Dict[int, int]:
+        return self.last_servo_positions.to_dict()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Kart bazlı gecikme ve hata istatistikleri"""
+        boards = {}
+        for name, board, mask in zip(self.board_names, self.boards, self.board_masks):
+            status = board.get_status()
+            status['servos'] = np.flatnonzero(mask).tolist()
+            boards[name] = status
+
+        return {
+            'connected': self.is_connected,
+            'degraded': self.is_connected and not self.is_fully_connected,
+            'connected_boards': [name for name, board in zip(self.board_names, self.boards) if board.is_connected],
+            'error_count': sum(status['error_count'] for status in boards.values()),
+            'boards': boards
+        }
@@ -4,12 +4,20 @@
 
 import math
 import time
+from threading import Lock, Thread
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
 from config.settings import ServoSettings
 from config.constants import ServoIDs
 from modules.servo.arduino_comm import ArduinoComm
+from modules.servo.servo_bus import ServoBus
+from modules.servo.servo_pose import ServoPose
+from modules.servo.servo_limits import ServoLimits
+from modules.servo.head_control_loop import HeadControlLoop
+from modules.servo.gaze_lookup import GazeLookupTable
+from modules.servo.arm_ik import ArmReachabilityGrid
+from modules.servo.servo_state import ServoStateSnapshot
 from modules.system.logger import SystemLogger
 
 
@@ -31,6 +39,13 @@ class ArmPosition:
     index: int = 90
 
 
+# Arduino yumuşak hareket döngüsü: her 20ms'de movement_speed derece
+SERVO_UPDATE_INTERVAL = 0.02
+
+# Derinlik bilinmiyorsa işaret edilen hedefin varsayılan uzaklığı (metre)
+DEFAULT_POINTING_DEPTH = 2.0
+
+
 class ServoController:
     """14 DOF servo motor kontrolcüsü - Animation Engine Entegrasyonlu"""
     
@@ -38,24 +53,49 @@ class ServoController:
         self.settings = settings
         self.logger = logger
         
-        # Arduino iletişimi
-        self.arduino = ArduinoComm(settings, logger)
+        # Arduino iletişimi (tek port veya kartlara bölünmüş veri yolu)
+        if settings.servo_buses:
+            self.arduino = ServoBus(settings, logger, settings.servo_buses)
+        else:
+            self.arduino = ArduinoComm(settings, logger)
         
-        # Mevcut pozisyonlar
-        self.current_positions = {}
-        self.target_positions = {}
+        # Mevcut pozisyonlar (kafa döngüsü, tespit ve GUI thread'leri birlikte kullanır)
+        self.pose_lock = Lock()
+        self.current_positions = ServoPose.empty()
+        self.target_positions = ServoPose.empty()
         
         # Hareket kontrolü
         self.is_moving = False
         self.movement_speed = settings.movement_speed
         self.last_command = None
         
+        # Kafa hareket süresi tahmini (gecikme telafisi için, EMA)
+        self.head_travel_time = 0.0
+        
         # Güvenlik limitleri
         self.servo_limits = self._load_servo_limits()
+        self.limits = ServoLimits(self.servo_limits, logger, settings.limit_log_interval)
+        self.limit_min, self.limit_max = self.limits.min_angles, self.limits.max_angles
+        
+        # Piksel -> pan/tilt tabloları (çözünürlük başına, lazy)
+        self.camera_calibration: Optional[Dict[str, float]] = None
+        self.gaze_tables: Dict[Tuple[int, int], GazeLookupTable] = {}
+        
+        # Kalıcı poz kaydı (sıcak yeniden başlatma)
+        self.state_snapshot = ServoStateSnapshot(settings.state_file, logger, settings.state_save_interval)
+        
+        # Kafa PID döngüsü (initialize içinde başlatılır)
+        self.head_loop = HeadControlLoop(self, settings, logger)
         
         # Animation engine (lazy loading)
         self._animation_engine = None
         
+        # Kol işaret etme IK ızgarası (lazy loading; initialize arka planda hazırlar)
+        self._arm_ik = None
+        self._arm_ik_lock = Lock()
+        self.arm_ik_failed = False  # arka plan hazırlığı başarısız: kollar işaret etmez
+        self.arm_ik_thread: Optional[Thread] = None
+        
         # Mock mode (Arduino yoksa)
         self.mock_mode = False
         
@@ -67,23 +107,53 @@ class ServoController:
                 from modules.servo.animation_engine import AnimationEngine
                 self._animation_engine = AnimationEngine(self, self.logger)
                 self.logger.info("Animation engine yüklendi")
+                
+                if self.settings.animation_hot_reload:
+                    self._animation_engine.start_hot_reload(self.settings.animation_reload_interval)
             except ImportError as e:
                 self.logger.warning(f"Animation engine yüklenemedi: {e}")
                 # Mock animation engine
                 self._animation_engine = MockAnimationEngine(self.logger)
         return self._animation_engine
         
+    @property
+    def arm_ik(self) -> ArmReachabilityGrid:
+        """Kol IK ızgarasını lazy loading ile al (önbellekten veya üreterek)"""
+        with self._arm_ik_lock:
+            if self._arm_ik is None:
+                arm_ik = ArmReachabilityGrid.from_limit_arrays(self.limit_min, self.limit_max)
+                arm_ik.load_or_build(self.settings.gaze_lut_cache_dir, self.logger)
+                self._arm_ik = arm_ik
+        return self._arm_ik
+    
+    def _prepare_arm_ik(self):
+        """IK ızgarasını arka planda hazırla (soğuk önbellekte ~1 s sürer)"""
+        try:
+            self.arm_ik
+        except Exception as e:
+            self.arm_ik_failed = True
+            self.logger.error(f"Kol IK ızgarası hazırlanamadı, kollar işaret etmeyecek: {e}")
+        
     def initialize(self) -> bool:
         """Servo kontrolcüsünü başlat"""
+        # Kol IK ızgarası bağlantıyı bekletmeden hazırlanır; hazır olana kadar sadece kafa döner
+        if self._arm_ik is None:
+            self.arm_ik_thread = Thread(target=self._prepare_arm_ik, name="arm-ik", daemon=True)
+            self.arm_ik_thread.start()
+        
         try:
             if not self.arduino.connect():
                 self.logger.warning("Arduino bağlanamadı, mock mode aktif")
                 self.mock_mode = True
                 self._initialize_mock_positions()
+                self._start_head_loop()
                 return True
             
-            # Servolar merkez pozisyona al
-            self.calibrate_all_servos()
+            # Son kaydedilen pozdan devam et, yoksa servoları merkez pozisyona al
+            if not self._resume_from_snapshot():
+                self.calibrate_all_servos()
+            self.state_snapshot.start(self.get_current_pose)
+            self._start_head_loop()
             self.logger.info("Servo kontrolcüsü başlatıldı")
             return True
             
@@ -91,13 +161,41 @@ class ServoController:
             self.logger.error(f"Servo başlatma hatası: {e}")
             self.mock_mode = True
             self._initialize_mock_positions()
+            self._start_head_loop()
             return True
     
+    def _resume_from_snapshot(self) -> bool:
+        """Kayıtlı son pozu bloklamadan yeniden gönder (merkeze sıçrama olmadan)"""
+        if not self.settings.warm_restart:
+            return False
+        
+        pose = self.state_snapshot.load()
+        if pose is None or len(pose) == 0:
+            return False
+        
+        pose = self.limits.clamp(pose)
+        with self.pose_lock:
+            self.current_positions = pose.copy()
+            self.target_positions = pose.copy()
+        
+        # Arduino kendi hız limitiyle bu poza yumuşak geçer; sleep gerekmez
+        self.arduino.set_pose(pose)
+        
+        age = self.state_snapshot.get_age()
+        age_text = f", {age:.0f}s önce" if age is not None else ""
+        self.logger.info(f"Servo durumu kayıttan yüklendi ({len(pose)} servo{age_text})")
+        return True
+    
+    def _start_head_loop(self):
+        """Ayarlarda etkinse kafa PID döngüsünü başlat"""
+        if self.settings.enable_pid:
+            self.head_loop.start()
+    
     def _initialize_mock_positions(self):
         """Mock pozisyonları başlat"""
-        for servo_id in ServoIDs:
-            self.current_positions[servo_id.value] = 90
-            self.target_positions[servo_id.value] = 90
+        with self.pose_lock:
+            self.current_positions = ServoPose.full(90)
+            self.target_positions = ServoPose.full(90)
     
     def _load_servo_limits(self) -> Dict[int, Tuple[int, int]]:
         """Servo açı limitlerini yükle"""
@@ -141,35 +239,112 @@ class ServoController:
         self.arduino.calibrate_servos()
         
         # Mevcut pozisyonları güncelle
-        for servo_id in ServoIDs:
-            self.current_positions[servo_id.value] = 90
-            self.target_positions[servo_id.value] = 90
+        with self.pose_lock:
+            self.current_positions = ServoPose.full(90)
+            self.target_positions = ServoPose.full(90)
         
         time.sleep(2)  # Hareket tamamlanana kadar bekle
         self.logger.info("Tüm servolar kalibre edildi")
     
     def set_servo_angle(self, servo_id: int, angle: int, check_limits: bool = True) -> bool:
         """Tekil servo açısını ayarla"""
-        if check_limits and servo_id in self.servo_limits:
-            min_angle, max_angle = self.servo_limits[servo_id]
-            if not (min_angle <= angle <= max_angle):
-                self.logger.warning(f"Servo {servo_id} için açı limit dışı: {angle}")
-                return False
+        # Limit ihlalleri her seferinde loglanmaz, ServoLimits istatistiğine eklenir
+        if check_limits and not self.limits.check(servo_id, angle):
+            return False
         
         if self.mock_mode:
             # Mock mode
-            self.current_positions[servo_id] = angle
+            with self.pose_lock:
+                self.current_positions.set(servo_id, angle)
             self.last_command = f"Mock: Servo {servo_id} -> {angle}°"
             self.logger.debug(f"Mock servo {servo_id}: {angle}°")
             return True
         
         success = self.arduino.set_servo_angle(servo_id, angle)
         if success:
-            self.current_positions[servo_id] = angle
+            with self.pose_lock:
+                self.current_positions.set(servo_id, angle)
             self.last_command = f"Servo {servo_id} -> {angle}°"
         
         return success
     
+    def set_pose(self, pose: ServoPose, check_limits: bool = True) -> bool:
+        """Poz içindeki tüm tanımlı servoları tek seferde ayarla"""
+        if check_limits:
+            pose = self.limits.clamp(pose)
+        
+        with self.pose_lock:
+            self.target_positions.update(pose)
+        
+        if self.mock_mode:
+            with self.pose_lock:
+                self.current_positions.update(pose)
+            self.last_command = f"Mock: Poz -> {len(pose)} servo"
+            return True
+        
+        if isinstance(self.arduino, ServoBus):
+            # Kart bazlı sonuç: hata veren kart dışındakiler hareket etmiştir
+            applied = self.arduino.accepted_pose(pose, self.arduino.set_pose_boards(pose))
+        else:
+            applied = pose if self.arduino.set_pose(pose) else ServoPose.empty()
+        return self._apply_sent_pose(pose, applied)
+    
+    async def set_servo_angle_async(self, servo_id: int, angle: int, check_limits: bool = True) -> bool:
+        """Tekil servo açısını ayarla; Arduino onayladığında tamamlanır"""
+        if check_limits and not self.limits.check(servo_id, angle):
+            return False
+        
+        if self.mock_mode:
+            with self.pose_lock:
+                self.current_positions.set(servo_id, angle)
+            self.last_command = f"Mock: Servo {servo_id} -> {angle}°"
+            return True
+        
+        success = await self.arduino.set_servo_angle_async(servo_id, angle)
+        if success:
+            with self.pose_lock:
+                self.current_positions.set(servo_id, angle)
+            self.last_command = f"Servo {servo_id} -> {angle}°"
+        
+        return success
+    
+    async def set_pose_async(self, pose: ServoPose, check_limits: bool = True) -> bool:
+        """Pozu gönder; tüm servolar onaylandığında True ile tamamlanır"""
+        if check_limits:
+            pose = self.limits.clamp(pose)
+        
+        with self.pose_lock:
+            self.target_positions.update(pose)
+        
+        if self.mock_mode:
+            with self.pose_lock:
+                self.current_positions.update(pose)
+            self.last_command = f"Mock: Poz -> {len(pose)} servo"
+            return True
+        
+        if isinstance(self.arduino, ServoBus):
+            applied = self.arduino.accepted_pose(pose, await self.arduino.set_pose_boards_async(pose))
+        else:
+            applied = pose if await self.arduino.set_pose_async(pose) else ServoPose.empty()
+        return self._apply_sent_pose(pose, applied)
+    
+    def _apply_sent_pose(self, pose: ServoPose, applied: ServoPose) -> bool:
+        """Gönderilen pozun kabul edilen kısmını mevcut pozisyonlara işle (hepsi kabul edildiyse True)"""
+        if len(applied):
+            with self.pose_lock:
+                self.current_positions.update(applied)
+            self.last_command = f"Poz -> {len(applied)} servo"
+        return len(applied) == len(pose)
+    
+    async def set_head_position_async(self, pan: int, tilt: int) -> bool:
+        """Kafa pozisyonunu ayarla; onay gelince tamamlanır"""
+        self._update_head_travel_time(pan, tilt)
+        
+        pose = ServoPose.empty()
+        pose.set(ServoIDs.HEAD_PAN.value, pan)
+        pose.set(ServoIDs.HEAD_TILT.value, tilt)
+        return await self.set_pose_async(pose)
+    
     def set_arm_position(self, arm: str, position: ArmPosition) -> bool:
         """Kol pozisyonunu ayarla (left/right)"""
         if arm not in ['left', 'right']:
@@ -214,8 +389,15 @@ class ServoController:
         
         return success
     
-    def set_head_position(self, pan: int, tilt: int) -> bool:
-        """Kafa pozisyonunu ayarla"""
+    def set_head_position(self, pan: int, tilt: int, update_travel_time: bool = True) -> bool:
+        """Kafa pozisyonunu ayarla
+        
+        Kafa döngüsü her turda ~1° adım gönderir; bu adımlar hareket süresi
+        tahminine katılmaz (update_travel_time=False), tahmin setpoint değişince güncellenir.
+        """
+        if update_travel_time:
+            self._update_head_travel_time(pan, tilt)
+        
         success = True
         success &= self.set_servo_angle(ServoIDs.HEAD_PAN.value, pan)
         success &= self.set_servo_angle(ServoIDs.HEAD_TILT.value, tilt)
@@ -225,41 +407,108 @@ class ServoController:
         
         return success
     
-    def point_to_position(self, x: int, y: int, frame_width: int, frame_height: int):
-        """Ekrandaki bir noktaya doğru kafa ve kolları yönlendir"""
+    def _update_head_travel_time(self, pan: int, tilt: int):
+        """Yeni kafa komutunun Arduino tarafında tamamlanma süresini tahmin et"""
+        with self.pose_lock:
+            current_pan = self.current_positions.get(ServoIDs.HEAD_PAN.value, pan)
+            current_tilt = self.current_positions.get(ServoIDs.HEAD_TILT.value, tilt)
+        delta = max(abs(pan - current_pan), abs(tilt - current_tilt))
+        
+        travel_time = delta / max(1, self.movement_speed) * SERVO_UPDATE_INTERVAL
+        self.head_travel_time = 0.8 * self.head_travel_time + 0.2 * travel_time
+    
+    def get_actuator_latency(self) -> float:
+        """Komuttan servo hareketine kadar geçen süre tahmini (seri port + hareket)"""
+        serial_latency = 0.0 if self.mock_mode else self.arduino.get_serial_latency()
+        return serial_latency + self.head_travel_time
+    
+    def set_camera_calibration(self, camera_info: Optional[Dict]):
+        """Kamera iç parametrelerini ayarla (RealSenseManager.get_camera_info())
+        
+        Kalibrasyon değişirse bakış tabloları yeniden oluşturulur.
+        """
+        calibration = None
+        if camera_info and all(k in camera_info for k in ("width", "height", "fx", "fy", "ppx", "ppy")):
+            calibration = {k: float(camera_info[k]) for k in ("width", "height", "fx", "fy", "ppx", "ppy")}
+        
+        if calibration != self.camera_calibration:
+            self.camera_calibration = calibration
+            self.gaze_tables.clear()
+    
+    def get_gaze_table(self, frame_width: int, frame_height: int) -> GazeLookupTable:
+        """Çözünürlüğe ait bakış tablosunu döndür (gerekirse önbellekten yükle / üret)"""
+        key = (int(frame_width), int(frame_height))
+        table = self.gaze_tables.get(key)
+        if table is not None:
+            return table
+        
+        calibration = self.camera_calibration
+        if calibration:
+            intrinsics = GazeLookupTable.scale_intrinsics(
+                calibration, (calibration["width"], calibration["height"]), key
+            )
+        else:
+            intrinsics = GazeLookupTable.intrinsics_from_fov(*key)
+        
+        table = GazeLookupTable.load_or_build(
+            key[0], key[1], intrinsics,
+            cache_dir=self.settings.gaze_lut_cache_dir,
+            logger=self.logger,
+            head_offset=self.settings.camera_head_offset
+        )
+        self.gaze_tables[key] = table
+        return table
+    
+    def point_to_position(self, x: int, y: int, frame_width: int, frame_height: int,
+                          depth: Optional[float] = None):
+        """Ekrandaki bir noktaya doğru kafa ve kolları yönlendir
+        
+        Takip sırasında x, y gecikme telafili tahmini hedef konumudur
+        (bkz. LatencyCompensator). PID döngüsü çalışıyorsa kafa açısı
+        doğrudan gönderilmez, sadece döngünün hedefi güncellenir. Animasyon
+        oynarken klibin kafa/kol hareketlerinin üzerine yazılmaz.
+        """
+        if self.is_animating():
+            return
         try:
-            # Kafa için pan/tilt hesapla
-            pan_angle = int(90 + (x - frame_width/2) / frame_width * 60)  # ±30 derece
-            tilt_angle = int(90 - (y - frame_height/2) / frame_height * 40)  # ±20 derece
-            
-            # Limitleri kontrol et
-            pan_angle = max(30, min(150, pan_angle))
-            tilt_angle = max(60, min(120, tilt_angle))
+            # Kafa için pan/tilt (kalibrasyonlu tablodan, limitler dahil)
+            pan_angle, tilt_angle = self.get_gaze_table(frame_width, frame_height).lookup(x, y, depth)
             
             # Kafa pozisyonunu ayarla
-            self.set_head_position(pan_angle, tilt_angle)
+            if self.head_loop.is_running():
+                self._update_head_travel_time(pan_angle, tilt_angle)
+                self.head_loop.set_setpoint(pan_angle, tilt_angle)
+            else:
+                self.set_head_position(int(round(pan_angle)), int(round(tilt_angle)))
             
             # İşaret etme hareketi (isteğe bağlı)
-            if x < frame_width / 2:  # Sol taraf
-                self._point_with_arm('left', x, y, frame_width, frame_height)
-            else:  # Sağ taraf
-                self._point_with_arm('right', x, y, frame_width, frame_height)
+            arm = 'left' if x < frame_width / 2 else 'right'
+            self._point_with_arm(arm, x, y, frame_width, frame_height, depth)
                 
         except Exception as e:
             self.logger.error(f"Point to position hatası: {e}")
     
-    def _point_with_arm(self, arm: str, x: int, y: int, frame_width: int, frame_height: int):
-        """Belirli bir kolla işaret etme"""
+    def _point_with_arm(self, arm: str, x: int, y: int, frame_width: int, frame_height: int,
+                        depth: Optional[float] = None):
+        """Belirli bir kolla işaret etme (IK ızgarasından)
+        
+        Tespit thread'inde çalışır: ızgara burada asla üretilmez. Arka planda
+        hazırlanıyorsa veya hazırlık başarısız olduysa sadece kafa döner.
+        """
+        arm_ik = self._arm_ik
+        if arm_ik is None:
+            return
+        
         try:
-            # Basit işaret etme pozisyonu
-            if arm == 'left':
-                shoulder_angle = 45 if x < frame_width / 3 else 60
-                elbow_angle = 135
-                wrist_angle = 90
-            else:  # right
-                shoulder_angle = 135 if x > 2 * frame_width / 3 else 120
-                elbow_angle = 45
-                wrist_angle = 90
+            # Pikseli 3D hedefe çevir ve ızgaradan kol açılarını al
+            target = self.get_gaze_table(frame_width, frame_height).deproject(
+                x, y, depth if depth and depth > 0 else DEFAULT_POINTING_DEPTH
+            )
+            angles, reachable = arm_ik.solve(arm, target)
+            if not reachable[0]:
+                return
+            
+            shoulder_angle, elbow_angle, wrist_angle = (int(round(a)) for a in angles[0])
             
             pointing_position = ArmPosition(
                 shoulder=shoulder_angle,
@@ -345,6 +594,11 @@ class ServoController:
         except Exception as e:
             self.logger.error(f"Animasyon durdurma hatası: {e}")
     
+    def is_animating(self) -> bool:
+        """Animasyon oynuyor mu (engine yüklenmediyse yüklemeden False)"""
+        engine = self._animation_engine
+        return bool(engine is not None and getattr(engine, 'is_playing', False))
+    
     def get_available_animations(self) -> List[str]:
         """Kullanılabilir animasyonları listele"""
         try:
@@ -366,7 +620,13 @@ class ServoController:
     
     def get_current_positions(self) -> Dict[int, int]:
         """Mevcut servo pozisyonlarını döndür"""
-        return self.current_positions.copy()
+        with self.pose_lock:
+            return self.current_positions.to_dict()
+    
+    def get_current_pose(self) -> ServoPose:
+        """Mevcut servo pozisyonlarını ServoPose olarak döndür"""
+        with self.pose_lock:
+            return self.current_positions.copy()
     
     def is_arduino_connected(self) -> bool:
         """Arduino bağlantı durumunu döndür"""
@@ -382,15 +642,26 @@ class ServoController:
             "is_moving": self.is_moving,
             "movement_speed": self.movement_speed,
             "last_command": self.last_command,
-            "servo_count": len(self.current_positions),
+            "servo_count": len(self.get_current_pose()),
+            "limit_stats": self.limits.get_stats(),
+            "state_snapshot": self.state_snapshot.get_stats(),
+            "serial": None if self.mock_mode else self.arduino.get_status(),
+            "head_loop": self.head_loop.get_stats(),
+            "arm_ik": "ready" if self._arm_ik is not None else ("failed" if self.arm_ik_failed else "preparing"),
             "animation_engine_loaded": self._animation_engine is not None
         }
     
     def cleanup(self):
         """Kaynakları temizle"""
         try:
-            # Animasyonu durdur
-            self.stop_animation()
+            # Kafa döngüsünü, animasyonu ve dosya izleyicisini durdur
+            # (animasyon motoru hiç yüklenmediyse sırf durdurmak için oluşturma)
+            self.head_loop.stop()
+            self.state_snapshot.stop()
+            if self._animation_engine is not None:
+                self.stop_animation()
+                if hasattr(self._animation_engine, 'stop_hot_reload'):
+                    self._animation_engine.stop_hot_reload()
             
             # Arduino bağlantısını kapat
             if not self.mock_mode:
@@ -0,0 +1,283 @@
+# =======================
+# modules/servo/servo_journal.py - Servo Komut Günlüğü ve Tekrar Oynatma
+# =======================
+
+import asyncio
+import struct
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import Thread, Event, Lock
+from typing import Dict, Any, Iterator, List, Optional
+
+import numpy as np
+
+from modules.system.logger import SystemLogger
+
+
+JOURNAL_MAGIC = b"SRVJ"
+JOURNAL_VERSION = 1
+
+# Dosya başlığı: magic, versiyon, başlangıç zamanı (duvar saati, bilgi amaçlı)
+FILE_HEADER_FORMAT = "<4sHd"
+FILE_HEADER_SIZE = struct.calcsize(FILE_HEADER_FORMAT)
+
+# Kayıt: yön, monotonic zaman (ns), veri uzunluğu | veri (ASCII satır)
+RECORD_FORMAT = "<BQH"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+DIRECTION_TX = 1  # host -> Arduino
+DIRECTION_RX = 2  # Arduino -> host
+
+
+@dataclass
+class JournalRecord:
+    """Günlükteki tek satır"""
+    direction: int
+    timestamp_ns: int
+    line: str
+
+    @property
+    def is_tx(self) -> bool:
+        return self.direction == DIRECTION_TX
+
+
+class ServoJournal:
+    """Giden komutları ve gelen yanıtları ikili, sadece eklemeli dosyaya yazar
+
+    record() sadece bellek içi tampona ekler (I/O thread'ini bloklamaz);
+    diske yazma ayrı bir thread'de periyodik olarak veya tampon dolunca yapılır.
+    """
+
+    def __init__(self, path: str, logger: Optional[SystemLogger] = None,
+                 flush_interval: float = 0.2, max_buffer: int = 64 * 1024):
+        self.path = Path(path)
+        self.logger = logger
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self.buffer = bytearray()
+        self.buffer_lock = Lock()
+        self.flush_event = Event()
+        self.stop_event = Event()
+        self.writer_thread: Optional[Thread] = None
+        self.file = None
+
+        self.record_count = 0
+        self.bytes_written = 0
+        self.dropped = 0
+
+    @staticmethod
+    def default_path(journal_dir: str, port: str) -> Path:
+        """Port ve başlangıç zamanına göre dosya adı"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return Path(journal_dir) / f"servo_{Path(port).name}_{stamp}.jrn"
+
+    # ----- Yazma -----
+
+    def start(self) -> bool:
+        """Dosyayı aç (yoksa başlık yaz) ve yazıcı thread'ini başlat"""
+        if self.writer_thread and self.writer_thread.is_alive():
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.exists() or self.path.stat().st_size == 0
+            self.file = open(self.path, "ab")
+            if is_new:
+                self.file.write(struct.pack(FILE_HEADER_FORMAT, JOURNAL_MAGIC, JOURNAL_VERSION, time.time()))
+        except OSError as e:
+            if self.logger:
+                self.logger.error(f"Servo günlüğü açılamadı: {e}")
+            self.file = None
+            return False
+
+        self.stop_event.clear()
+        self.writer_thread = Thread(target=self._writer_loop, name="servo-journal", daemon=True)
+        self.writer_thread.start()
+        return True
+
+    def record(self, direction: int, line: str, timestamp_ns: Optional[int] = None):
+        """Satırı tampona ekle (bloklamaz)"""
+        if self.file is None:
+            return
+        data = line.encode(errors="replace")[:0xFFFF]
+        packed = struct.pack(RECORD_FORMAT, direction, timestamp_ns or time.monotonic_ns(), len(data)) + data
+
+        with self.buffer_lock:
+            if len(self.buffer) >= self.max_buffer * 4:
+                self.dropped += 1  # disk yetişemiyor; I/O'yu bekletmek yerine kaydı at
+                return
+            self.buffer.extend(packed)
+            self.record_count += 1
+            if len(self.buffer) >= self.max_buffer:
+                self.flush_event.set()
+
+    def _take_buffer(self) -> bytes:
+        with self.buffer_lock:
+            data = bytes(self.buffer)
+            self.buffer.clear()
+        return data
+
+    def _write_pending(self):
+        data = self._take_buffer()
+        if not data or self.file is None:
+            return
+        try:
+            self.file.write(data)
+            self.file.flush()
+            self.bytes_written += len(data)
+        except OSError as e:
+            if self.logger:
+                self.logger.error(f"Servo günlüğü yazma hatası: {e}")
+
+    def _writer_loop(self):
+        while not self.stop_event.is_set():
+            self.flush_event.wait(self.flush_interval)
+            self.flush_event.clear()
+            self._write_pending()
+
+    def stop(self):
+        """Kalan kayıtları yaz ve dosyayı kapat"""
+        self.stop_event.set()
+        self.flush_event.set()
+        if self.writer_thread:
+            self.writer_thread.join(timeout=1.0)
+            self.writer_thread = None
+
+        self._write_pending()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "records": self.record_count,
+            "bytes_written": self.bytes_written,
+            "dropped": self.dropped,
+            "running": self.writer_thread is not None and self.writer_thread.is_alive()
+        }
+
+
+def read_journal(path: str) -> Iterator[JournalRecord]:
+    """Günlük kayıtlarını sırayla oku (yarım kalan son kayıt yok sayılır)"""
+    with open(path, "rb") as file:
+        header = file.read(FILE_HEADER_SIZE)
+        if len(header) < FILE_HEADER_SIZE:
+            return
+        magic, version, _ = struct.unpack(FILE_HEADER_FORMAT, header)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            raise ValueError(f"Geçersiz servo günlüğü: {path}")
+
+        while True:
+            record_header = file.read(RECORD_SIZE)
+            if len(record_header) < RECORD_SIZE:
+                return
+            direction, timestamp_ns, length = struct.unpack(RECORD_FORMAT, record_header)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield JournalRecord(direction, timestamp_ns, data.decode(errors="replace"))
+
+
+def _percentiles_ms(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    array = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(array, 50)), 3),
+        "p95": round(float(np.percentile(array, 95)), 3),
+        "max": round(float(array.max()), 3)
+    }
+
+
+def analyze_journal(records: List[JournalRecord]) -> Dict[str, Any]:
+    """Kaydedilen oturumun komut aralıkları ve onay gecikmeleri"""
+    tx_times = [record.timestamp_ns for record in records if record.is_tx]
+    gaps = np.diff(np.unique(tx_times)) / 1e9 if len(tx_times) > 1 else []
+
+    # Arduino komutları sırayla onayladığı için FIFO eşleme yeterli
+    pending: List[int] = []
+    ack_latencies = []
+    for record in records:
+        if record.is_tx:
+            pending.append(record.timestamp_ns)
+        elif pending and record.line.startswith(("OK:", "ERROR:", "PONG")):
+            ack_latencies.append((record.timestamp_ns - pending.pop(0)) / 1e9)
+
+    duration = (records[-1].timestamp_ns - records[0].timestamp_ns) / 1e9 if records else 0.0
+    return {
+        "commands": len(tx_times),
+        "responses": sum(1 for record in records if not record.is_tx),
+        "duration": round(duration, 3),
+        "command_gap_ms": _percentiles_ms(list(gaps)),
+        "ack_latency_ms": _percentiles_ms(ack_latencies),
+        "unacked": len(pending)
+    }
+
+
+class JournalReplayer:
+    """Günlükteki komutları bir karta (gerçek veya simülatör) tekrar gönderir
+
+    speed=1.0 orijinal zamanlamayı korur, speed=0 beklemeden gönderir.
+    Aynı zaman damgasına sahip komutlar (tek yazımda gönderilmiş poz)
+    yine tek yazımda gönderilir. Gönderim sapması ve onay gecikmeleri ölçülür.
+    """
+
+    def __init__(self, records: List[JournalRecord], speed: float = 1.0):
+        self.batches: List[tuple] = []
+        for record in records:
+            if not record.is_tx:
+                continue
+            if self.batches and self.batches[-1][0] == record.timestamp_ns:
+                self.batches[-1][1].append(record.line)
+            else:
+                self.batches.append((record.timestamp_ns, [record.line]))
+        self.speed = speed
+
+    async def replay(self, core, ack_timeout: float = 1.0) -> Dict[str, Any]:
+        """AsyncArduinoComm üzerinden oynat (servo loop'unda çalıştırılmalı)"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        first_ns = self.batches[0][0] if self.batches else 0
+
+        send_jitter = []
+        ack_latencies = []
+        futures = []
+
+        def on_ack(future: asyncio.Future, sent: float):
+            if not future.cancelled() and future.result() is not None:
+                ack_latencies.append(time.perf_counter() - sent)
+
+        for timestamp_ns, commands in self.batches:
+            if self.speed > 0:
+                target = start + (timestamp_ns - first_ns) / 1e9 / self.speed
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                send_jitter.append(time.perf_counter() - target)
+
+            sent = time.perf_counter()
+            for future in core._write_commands(commands):
+                future.add_done_callback(lambda f, sent=sent: on_ack(f, sent))
+                futures.append(future)
+            await asyncio.sleep(0)  # gelen onayların işlenmesine izin ver
+
+        timeouts = 0
+        if futures:
+            _, not_done = await asyncio.wait(futures, timeout=ack_timeout)
+            for future in not_done:
+                future.cancel()
+            timeouts = len(not_done)
+
+        return {
+            "commands": len(futures),
+            "batches": len(self.batches),
+            "speed": self.speed,
+            "duration": round(time.perf_counter() - start, 3),
+            "send_jitter_ms": _percentiles_ms(send_jitter),
+            "ack_latency_ms": _percentiles_ms(ack_latencies),
+            "ack_timeouts": timeouts
+        }
@@ -0,0 +1,123 @@
+# =======================
+# modules/servo/servo_limits.py - Vektörel Servo Limitleri
+# =======================
+
+import time
+import numpy as np
+from threading import Lock
+from typing import Dict, Any, Tuple
+
+from modules.servo.servo_pose import ServoPose, SERVO_COUNT
+from modules.system.logger import SystemLogger
+
+
+class ServoLimits:
+    """Başlangıçta derlenen min/max dizileri ve limit ihlali istatistikleri
+
+    İhlaller her olayda loglanmaz; servo bazlı sayaçlara vektörel olarak
+    eklenir ve en fazla summary_interval saniyede bir özet loglanır.
+    """
+
+    def __init__(self, servo_limits: Dict[int, Tuple[int, int]], logger: SystemLogger,
+                 summary_interval: float = 10.0):
+        self.logger = logger
+        self.summary_interval = summary_interval
+
+        # Derlenmiş limit dizileri
+        self.min_angles, self.max_angles = ServoPose.limit_arrays(servo_limits)
+
+        # İstatistikler (servo bazlı)
+        self.stats_lock = Lock()
+        self.checked_commands = 0
+        self.hit_counts = np.zeros(SERVO_COUNT, dtype=np.int64)
+        self.overshoot_sum = np.zeros(SERVO_COUNT, dtype=np.float64)
+        self.max_overshoot = np.zeros(SERVO_COUNT, dtype=np.float64)
+
+        # Periyodik özet
+        self.last_summary_time = time.time()
+        self.hits_at_last_summary = 0
+
+    def clamp(self, pose: ServoPose) -> ServoPose:
+        """Pozu tek işlemle limitlere kırp ve ihlalleri kaydet"""
+        clamped = pose.clamp(self.min_angles, self.max_angles)
+        self._record(np.where(pose.mask, np.abs(pose.angles - clamped.angles), 0.0))
+        return clamped
+
+    def check(self, servo_id: int, angle: float) -> bool:
+        """Tek servo açısı limit içinde mi (ihlal istatistiğe eklenir)"""
+        if not 0 <= servo_id < SERVO_COUNT:
+            return True
+
+        min_angle = self.min_angles[servo_id]
+        max_angle = self.max_angles[servo_id]
+        if min_angle <= angle <= max_angle:
+            with self.stats_lock:
+                self.checked_commands += 1
+            return True
+
+        overshoot = np.zeros(SERVO_COUNT, dtype=np.float64)
+        overshoot[servo_id] = min_angle - angle if angle < min_angle else angle - max_angle
+        self._record(overshoot)
+        return False
+
+    def _record(self, overshoot: np.ndarray):
+        """Taşma miktarlarını sayaçlara ekle"""
+        hits = overshoot > 0
+
+        with self.stats_lock:
+            self.checked_commands += 1
+            if not hits.any():
+                return
+
+            self.hit_counts += hits
+            self.overshoot_sum += overshoot
+            np.maximum(self.max_overshoot, overshoot, out=self.max_overshoot)
+
+        self._maybe_log_summary()
+
+    def _maybe_log_summary(self):
+        """Son özetten bu yana ihlal varsa ve süre dolduysa tek satır logla"""
+        now = time.time()
+        if now - self.last_summary_time < self.summary_interval:
+            return
+
+        with self.stats_lock:
+            total_hits = int(self.hit_counts.sum())
+            new_hits = total_hits - self.hits_at_last_summary
+            self.hits_at_last_summary = total_hits
+            self.last_summary_time = now
+            top_servos = np.argsort(self.hit_counts)[::-1][:3]
+            summary = ", ".join(
+                f"servo {servo_id}: {self.hit_counts[servo_id]}x (max {self.max_overshoot[servo_id]:.0f}°)"
+                for servo_id in top_servos if self.hit_counts[servo_id] > 0
+            )
+
+        if new_hits > 0 and self.logger:
+            self.logger.warning(f"Servo limit ihlalleri (son {self.summary_interval:.0f}s: {new_hits}) - {summary}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limit istatistiklerini döndür"""
+        with self.stats_lock:
+            servos = {}
+            for servo_id in np.flatnonzero(self.hit_counts).tolist():
+                hits = int(self.hit_counts[servo_id])
+                servos[servo_id] = {
+                    "hits": hits,
+                    "mean_overshoot": round(float(self.overshoot_sum[servo_id] / hits), 2),
+                    "max_overshoot": round(float(self.max_overshoot[servo_id]), 2)
+                }
+
+            return {
+                "checked_commands": self.checked_commands,
+                "total_hits": int(self.hit_counts.sum()),
+                "servos": servos
+            }
+
+    def reset_stats(self):
+        """İstatistikleri sıfırla"""
+        with self.stats_lock:
+            self.checked_commands = 0
+            self.hit_counts[:] = 0
+            self.overshoot_sum[:] = 0.0
+            self.max_overshoot[:] = 0.0
+            self.hits_at_last_summary = 0
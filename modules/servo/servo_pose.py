@@ -0,0 +1,149 @@
+# =======================
+# modules/servo/servo_pose.py - 14 DOF Poz Veri Yapısı
+# =======================
+
+import numpy as np
+from typing import Dict, Optional, Tuple, Union
+
+from config.constants import ServoIDs
+
+
+SERVO_COUNT = len(ServoIDs)
+DEFAULT_ANGLE = 90
+
+
+class ServoPose:
+    """Sabit boyutlu (14) açı dizisi + geçerlilik maskesi
+
+    Maske False olan servolar bu pozda "tanımsız" kabul edilir; örneğin
+    sadece kafa servolarını içeren bir keyframe. Tüm işlemler (limit,
+    fark, interpolasyon) tek numpy işlemiyle yapılır.
+    """
+
+    __slots__ = ('angles', 'mask')
+
+    def __init__(self, angles: Optional[np.ndarray] = None, mask: Optional[np.ndarray] = None):
+        if angles is None:
+            angles = np.full(SERVO_COUNT, DEFAULT_ANGLE, dtype=np.float64)
+        if mask is None:
+            mask = np.zeros(SERVO_COUNT, dtype=bool)
+
+        self.angles = np.asarray(angles, dtype=np.float64)
+        self.mask = np.asarray(mask, dtype=bool)
+
+        if self.angles.shape != (SERVO_COUNT,) or self.mask.shape != (SERVO_COUNT,):
+            raise ValueError(f"ServoPose {SERVO_COUNT} elemanlı olmalı")
+
+    # ----- Oluşturucular -----
+
+    @classmethod
+    def empty(cls) -> 'ServoPose':
+        """Hiçbir servosu tanımlı olmayan poz"""
+        return cls()
+
+    @classmethod
+    def full(cls, angle: float = DEFAULT_ANGLE) -> 'ServoPose':
+        """Tüm servoları aynı açıda olan poz"""
+        return cls(np.full(SERVO_COUNT, angle, dtype=np.float64), np.ones(SERVO_COUNT, dtype=bool))
+
+    @classmethod
+    def from_dict(cls, positions: Dict[Union[int, str], float]) -> 'ServoPose':
+        """{servo_id: açı} sözlüğünden poz oluştur (JSON'dan gelen str anahtarlar dahil)"""
+        pose = cls()
+        for servo_id, angle in positions.items():
+            pose.set(int(servo_id), angle)
+        return pose
+
+    # ----- Erişim -----
+
+    def set(self, servo_id: int, angle: float):
+        """Tek servo açısını ayarla"""
+        if not 0 <= servo_id < SERVO_COUNT:
+            raise KeyError(f"Geçersiz servo ID: {servo_id}")
+        self.angles[servo_id] = angle
+        self.mask[servo_id] = True
+
+    def get(self, servo_id: int, default: Optional[int] = None) -> Optional[int]:
+        """Tek servo açısını döndür (tanımsızsa default)"""
+        if 0 <= servo_id < SERVO_COUNT and self.mask[servo_id]:
+            return int(round(self.angles[servo_id]))
+        return default
+
+    def __contains__(self, servo_id: int) -> bool:
+        return 0 <= servo_id < SERVO_COUNT and bool(self.mask[servo_id])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.mask))
+
+    def servo_ids(self) -> np.ndarray:
+        """Tanımlı servo ID'leri"""
+        return np.flatnonzero(self.mask)
+
+    def int_angles(self) -> np.ndarray:
+        """Seri porta gönderilecek tamsayı açılar"""
+        return np.rint(self.angles).astype(np.int32)
+
+    def to_dict(self) -> Dict[int, int]:
+        """Tanımlı servoları {servo_id: açı} olarak döndür"""
+        ids = self.servo_ids()
+        return dict(zip(ids.tolist(), self.int_angles()[ids].tolist()))
+
+    def copy(self) -> 'ServoPose':
+        return ServoPose(self.angles.copy(), self.mask.copy())
+
+    # ----- Vektörel işlemler -----
+
+    def update(self, other: 'ServoPose'):
+        """Diğer pozun tanımlı servolarını bu pozun üzerine yaz (yerinde)"""
+        np.copyto(self.angles, other.angles, where=other.mask)
+        self.mask |= other.mask
+
+    def clamp(self, min_angles: np.ndarray, max_angles: np.ndarray) -> 'ServoPose':
+        """Açıları servo bazlı limitlere kırp"""
+        return ServoPose(np.clip(self.angles, min_angles, max_angles), self.mask.copy())
+
+    def out_of_range(self, min_angles: np.ndarray, max_angles: np.ndarray) -> np.ndarray:
+        """Limit dışı tanımlı servoların maskesi"""
+        return self.mask & ((self.angles < min_angles) | (self.angles > max_angles))
+
+    def changed_from(self, other: 'ServoPose', threshold: float = 0.0) -> np.ndarray:
+        """Diğer poza göre gönderilmesi gereken servoların maskesi
+
+        Bu pozda tanımlı olup diğerinde tanımsız olan ya da tamsayı açısı
+        threshold'dan fazla değişen servolar True döner.
+        """
+        delta = np.abs(self.int_angles() - other.int_angles())
+        return self.mask & (~other.mask | (delta > threshold))
+
+    def diff(self, other: 'ServoPose') -> np.ndarray:
+        """İki pozun ortak servolarındaki açı farkı (diğerleri 0)"""
+        both = self.mask & other.mask
+        return np.where(both, other.angles - self.angles, 0.0)
+
+    def interpolate(self, other: 'ServoPose', t: float) -> 'ServoPose':
+        """Bu pozdan diğerine t (0-1) oranında geçiş
+
+        Diğer pozda tanımsız servolar mevcut açılarında kalır.
+        """
+        target = np.where(other.mask, other.angles, self.angles)
+        return ServoPose(self.angles + (target - self.angles) * t, self.mask.copy())
+
+    @staticmethod
+    def limit_arrays(servo_limits: Dict[int, Tuple[int, int]],
+                     default: Tuple[int, int] = (0, 180)) -> Tuple[np.ndarray, np.ndarray]:
+        """{servo_id: (min, max)} sözlüğünden min/max dizileri oluştur"""
+        min_angles = np.full(SERVO_COUNT, default[0], dtype=np.float64)
+        max_angles = np.full(SERVO_COUNT, default[1], dtype=np.float64)
+        for servo_id, (min_angle, max_angle) in servo_limits.items():
+            min_angles[servo_id] = min_angle
+            max_angles[servo_id] = max_angle
+        return min_angles, max_angles
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ServoPose):
+            return NotImplemented
+        return (np.array_equal(self.mask, other.mask) and
+                np.array_equal(self.int_angles()[self.mask], other.int_angles()[other.mask]))
+
+    def __repr__(self) -> str:
+        return f"ServoPose({self.to_dict()})"
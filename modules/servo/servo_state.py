@@ -0,0 +1,175 @@
+# =======================
+# modules/servo/servo_state.py - Kalıcı Servo Durumu (Sıcak Yeniden Başlatma)
+# =======================
+
+import mmap
+import struct
+import time
+import zlib
+from pathlib import Path
+from threading import Thread, Event, Lock
+from typing import Callable, Dict, Any, Optional
+
+import numpy as np
+
+from modules.servo.servo_pose import ServoPose, SERVO_COUNT
+from modules.system.logger import SystemLogger
+
+
+STATE_MAGIC = b"SRVS"
+STATE_VERSION = 1
+
+# magic, version, servo sayısı, zaman damgası, sıra no | açılar | maske | crc32
+HEADER_FORMAT = "<4sHHdI"
+BODY_FORMAT = f"<{SERVO_COUNT}f{SERVO_COUNT}B"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+BODY_SIZE = struct.calcsize(BODY_FORMAT)
+STATE_SIZE = HEADER_SIZE + BODY_SIZE + 4
+
+
+class ServoStateSnapshot:
+    """Son komut edilen pozu küçük bir bellek eşlemeli dosyada tutar
+
+    Yazıcı thread düşük frekansta pozu kontrol eder ve sadece değiştiğinde
+    mmap alanına yazar (disk senkronizasyonunu işletim sistemi yapar).
+    CRC sayesinde yarım kalmış yazım yeniden başlatmada yok sayılır.
+    """
+
+    def __init__(self, path: str, logger: SystemLogger, interval: float = 0.5):
+        self.path = Path(path)
+        self.logger = logger
+        self.interval = interval
+
+        self.map: Optional[mmap.mmap] = None
+        self.file = None
+        self.map_lock = Lock()
+        self.sequence = 0
+        self.last_written: Optional[ServoPose] = None
+
+        self.writer_thread: Optional[Thread] = None
+        self.stop_event = Event()
+        self.pose_source: Optional[Callable[[], ServoPose]] = None
+
+        self.write_count = 0
+
+    # ----- Okuma -----
+
+    def load(self) -> Optional[ServoPose]:
+        """Dosyadaki son pozu oku (yoksa veya bozuksa None)"""
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None
+
+        if len(data) != STATE_SIZE:
+            return None
+
+        crc, = struct.unpack_from("<I", data, STATE_SIZE - 4)
+        if zlib.crc32(data[:STATE_SIZE - 4]) != crc:
+            return None
+
+        magic, version, count, timestamp, sequence = struct.unpack_from(HEADER_FORMAT, data, 0)
+        if magic != STATE_MAGIC or version != STATE_VERSION or count != SERVO_COUNT:
+            return None
+
+        values = struct.unpack_from(BODY_FORMAT, data, HEADER_SIZE)
+        angles = np.array(values[:SERVO_COUNT], dtype=np.float64)
+        mask = np.array(values[SERVO_COUNT:], dtype=bool)
+
+        self.sequence = sequence
+        return ServoPose(angles, mask)
+
+    def get_age(self) -> Optional[float]:
+        """Son kaydın yaşı (saniye)"""
+        try:
+            data = self.path.read_bytes()
+            timestamp = struct.unpack_from(HEADER_FORMAT, data, 0)[3]
+            return time.time() - timestamp
+        except (OSError, struct.error):
+            return None
+
+    # ----- Yazma -----
+
+    def _open(self):
+        """Dosyayı sabit boyutta oluştur ve eşle"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size != STATE_SIZE:
+            self.path.write_bytes(b"\x00" * STATE_SIZE)
+
+        self.file = open(self.path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), STATE_SIZE)
+
+    def write(self, pose: ServoPose):
+        """Pozu eşlenmiş alana yaz"""
+        with self.map_lock:
+            if self.map is None:
+                self._open()
+
+            self.sequence += 1
+            buffer = bytearray(STATE_SIZE)
+            struct.pack_into(HEADER_FORMAT, buffer, 0, STATE_MAGIC, STATE_VERSION,
+                             SERVO_COUNT, time.time(), self.sequence)
+            struct.pack_into(BODY_FORMAT, buffer, HEADER_SIZE,
+                             *pose.angles.astype(np.float32).tolist(),
+                             *pose.mask.astype(np.uint8).tolist())
+            struct.pack_into("<I", buffer, STATE_SIZE - 4, zlib.crc32(bytes(buffer[:STATE_SIZE - 4])))
+
+            self.map[:] = bytes(buffer)
+            self.last_written = pose.copy()
+            self.write_count += 1
+
+    def write_if_changed(self, pose: ServoPose) -> bool:
+        """Son yazımdan farklıysa yaz"""
+        if self.last_written is not None and pose == self.last_written:
+            return False
+        self.write(pose)
+        return True
+
+    # ----- Arka plan yazıcı -----
+
+    def start(self, pose_source: Callable[[], ServoPose]):
+        """Düşük frekanslı yazıcı thread'ini başlat"""
+        if self.writer_thread and self.writer_thread.is_alive():
+            return
+        self.pose_source = pose_source
+        self.stop_event.clear()
+        self.writer_thread = Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def stop(self):
+        """Yazıcıyı durdur, son pozu yaz ve dosyayı kapat"""
+        self.stop_event.set()
+        if self.writer_thread:
+            self.writer_thread.join(timeout=1.0)
+            self.writer_thread = None
+
+        if self.pose_source is not None:
+            self._flush()
+
+        with self.map_lock:
+            if self.map is not None:
+                self.map.flush()
+                self.map.close()
+                self.map = None
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def _flush(self):
+        try:
+            self.write_if_changed(self.pose_source())
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Servo durum kaydı hatası: {e}")
+
+    def _writer_loop(self):
+        while not self.stop_event.wait(self.interval):
+            self._flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "writes": self.write_count,
+            "sequence": self.sequence,
+            "running": self.writer_thread is not None and self.writer_thread.is_alive()
+        }
@@ -5,10 +5,18 @@
 from .logger import SystemLogger
 from .monitor import SystemMonitor
 from .performance import PerformanceMonitor, PerformanceMetrics
+from .shared_frames import FrameRingSpec, SharedFrameRing
+from .process_supervisor import ProcessSupervisor
+from .vision_processes import VisionProcessManager, DetectionResult
 
 __all__ = [
     'SystemLogger', 
     'SystemMonitor', 
     'PerformanceMonitor', 
-    'PerformanceMetrics'
-]
\ No newline at end of file
+    'PerformanceMetrics',
+    'FrameRingSpec',
+    'SharedFrameRing',
+    'ProcessSupervisor',
+    'VisionProcessManager',
+    'DetectionResult'
+]
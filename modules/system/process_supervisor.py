@@ -0,0 +1,252 @@
+# =======================
+# modules/system/process_supervisor.py - Alt Süreç Gözetmeni
+# =======================
+
+import multiprocessing
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+from modules.system.logger import SystemLogger
+
+
+# Alt süreç bu kodla çıkarsa yeniden başlatılmaz (ayar/donanım hatası; tekrar denemek anlamsız)
+EXIT_NO_RESTART = 3
+
+
+class StopFlag:
+    """Süreçler arası dur bayrağı (Event arayüzü)
+
+    multiprocessing.Event içinde bekleyen süreç öldürülürse Event'in kilidi
+    bırakılmaz ve diğer süreçler kilitlenir; bu bayrak kilitsiz paylaşılan
+    bir bayttır, wait() kısa aralıklarla yoklar.
+    """
+
+    def __init__(self, context):
+        self.flag = context.RawValue("b", 0)
+
+    def set(self):
+        self.flag.value = 1
+
+    def clear(self):
+        self.flag.value = 0
+
+    def is_set(self) -> bool:
+        return bool(self.flag.value)
+
+    def wait(self, timeout: Optional[float] = None, poll_interval: float = 0.005) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.flag.value:
+            if deadline is None:
+                time.sleep(poll_interval)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+        return True
+
+
+@dataclass
+class ChildProcess:
+    """Gözetilen alt süreç ve yeniden başlatma durumu
+
+    target(stop_event, heartbeat, *args) imzasıyla çalışır; döngüsünde
+    heartbeat.value'yu time.time() ile günceller. args çağrılabilirse her
+    başlatmada yeniden üretilir (ör. öldürülen sürecin kilidini tutabilecek
+    kuyruk yerine yenisi).
+    """
+    name: str
+    target: Callable
+    args: Union[Tuple, Callable[[], Tuple]] = ()
+    restart: bool = True
+    process: Optional[multiprocessing.Process] = None
+    heartbeat: Any = None  # paylaşılan double (RawValue)
+    started: float = 0.0
+    restart_times: Deque[float] = field(default_factory=deque)
+    next_restart: float = 0.0
+    restarts: int = 0
+    failed: bool = False
+    last_exitcode: Optional[int] = None
+
+
+class ProcessSupervisor:
+    """Alt süreçleri başlatır, çökme ve donmaları izler, yeniden başlatır, kapatır
+
+    Çöken (beklenmedik çıkış) veya kalp atışı hang_timeout'tan uzun süre
+    gelmeyen süreç üstel geri çekilmeyle yeniden başlatılır. restart_window
+    içinde max_restarts aşılırsa süreç başarısız sayılır ve kapalı kalır.
+    Süreçler "spawn" ile başlatılır (Qt ve thread'lerle fork güvenli değil).
+    """
+
+    def __init__(self, logger: SystemLogger, max_restarts: int = 5, restart_window: float = 60.0,
+                 hang_timeout: float = 5.0, startup_timeout: float = 60.0,
+                 restart_backoff: float = 0.5, start_method: str = "spawn"):
+        self.logger = logger
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.hang_timeout = hang_timeout
+        self.startup_timeout = startup_timeout  # ilk kalp atışına kadar (model yükleme dahil)
+        self.restart_backoff = restart_backoff
+
+        self.context = multiprocessing.get_context(start_method)
+        self.stop_event = StopFlag(self.context)
+        self.children: Dict[str, ChildProcess] = {}
+        self.lock = Lock()
+
+        self.monitor_thread: Optional[Thread] = None
+        self.monitor_stop = Event()
+        self.running = False
+
+        # Olay kancası (GUI log'u vb.)
+        self.on_restart: Optional[Callable[[str, str], None]] = None
+
+    def add(self, name: str, target: Callable, args: Union[Tuple, Callable[[], Tuple]] = (),
+            restart: bool = True):
+        """Süreç tanımı ekle (start() ile başlar)"""
+        self.children[name] = ChildProcess(name, target, args if callable(args) else tuple(args), restart)
+
+    # ----- Yaşam döngüsü -----
+
+    def start(self, monitor_interval: float = 0.5) -> bool:
+        """Tüm süreçleri ve izleme thread'ini başlat"""
+        self.stop_event.clear()
+        self.running = True
+        for child in self.children.values():
+            self._spawn(child)
+
+        if monitor_interval > 0:
+            self.monitor_stop.clear()
+            self.monitor_thread = Thread(target=self._monitor_loop, args=(monitor_interval,),
+                                         name="process-supervisor", daemon=True)
+            self.monitor_thread.start()
+        return all(child.process.is_alive() or child.process.exitcode == 0 for child in self.children.values())
+
+    def stop(self, timeout: float = 3.0):
+        """Süreçlere dur sinyali ver; süresinde çıkmayanları sonlandır"""
+        if not self.running:
+            return
+        self.running = False
+        self.monitor_stop.set()
+        if self.monitor_thread:
+            self.monitor_thread.join(timeout=2.0)
+            self.monitor_thread = None
+
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            for child in self.children.values():
+                if child.process is not None:
+                    child.process.join(max(0.0, deadline - time.monotonic()))
+                    self._terminate(child)
+
+    def _spawn(self, child: ChildProcess):
+        child.heartbeat = self.context.RawValue("d", 0.0)
+        args = child.args() if callable(child.args) else child.args
+        child.process = self.context.Process(target=child.target, name=child.name, daemon=True,
+                                             args=(self.stop_event, child.heartbeat, *args))
+        child.process.start()
+        child.started = time.time()
+        self.logger.info(f"Süreç başlatıldı: {child.name} (pid {child.process.pid})")
+
+    def _terminate(self, child: ChildProcess):
+        """Çıkmayan süreci önce SIGTERM, sonra SIGKILL ile sonlandır"""
+        process = child.process
+        if process.is_alive():
+            process.terminate()
+            process.join(1.0)
+        if process.is_alive():
+            process.kill()
+            process.join(1.0)
+        child.last_exitcode = process.exitcode
+        process.close()
+        child.process = None
+
+    # ----- İzleme -----
+
+    def _monitor_loop(self, interval: float):
+        while not self.monitor_stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Süreç izleme hatası: {e}")
+
+    def check(self):
+        """Çöken/donan süreçleri bul ve gerekirse yeniden başlat"""
+        if not self.running:
+            return
+        now = time.time()
+        with self.lock:
+            for child in self.children.values():
+                if child.failed:
+                    continue
+
+                if child.process is not None:
+                    reason = self._problem(child, now)
+                    if reason is None:
+                        continue
+                    self._terminate(child)
+                    self.logger.error(f"Süreç {child.name} {reason}")
+
+                    if not child.restart or child.last_exitcode == EXIT_NO_RESTART:
+                        child.failed = True
+                        continue
+                    if not self._allow_restart(child, now):
+                        child.failed = True
+                        self.logger.error(f"Süreç {child.name} çok sık çöktü, yeniden başlatılmayacak")
+                        continue
+                    child.next_restart = now + self.restart_backoff * 2 ** (len(child.restart_times) - 1)
+
+                if child.process is None and now >= child.next_restart:
+                    self._spawn(child)
+                    child.restarts += 1
+                    self._emit(child.name, "restarted")
+
+    def _problem(self, child: ChildProcess, now: float) -> Optional[str]:
+        process = child.process
+        if not process.is_alive():
+            return f"çıktı (çıkış kodu {process.exitcode})"
+        heartbeat = child.heartbeat.value
+        if heartbeat == 0.0 and now - child.started > self.startup_timeout:
+            return f"{self.startup_timeout:.0f} s içinde başlamadı"
+        if heartbeat > 0.0 and now - heartbeat > self.hang_timeout:
+            return f"yanıt vermiyor ({now - heartbeat:.1f} s kalp atışı yok)"
+        return None
+
+    def _allow_restart(self, child: ChildProcess, now: float) -> bool:
+        while child.restart_times and now - child.restart_times[0] > self.restart_window:
+            child.restart_times.popleft()
+        if len(child.restart_times) >= self.max_restarts:
+            return False
+        child.restart_times.append(now)
+        return True
+
+    def _emit(self, name: str, event: str):
+        if self.on_restart is None:
+            return
+        try:
+            self.on_restart(name, event)
+        except Exception as e:
+            self.logger.error(f"Süreç olayı hatası: {e}")
+
+    def is_alive(self, name: str) -> bool:
+        child = self.children.get(name)
+        return bool(child and child.process is not None and child.process.is_alive())
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        with self.lock:
+            return {
+                name: {
+                    "pid": child.process.pid if child.process is not None else None,
+                    "alive": child.process is not None and child.process.is_alive(),
+                    "restarts": child.restarts,
+                    "failed": child.failed,
+                    "last_exitcode": child.last_exitcode,
+                    "heartbeat_age": round(now - child.heartbeat.value, 3)
+                    if child.heartbeat is not None and child.heartbeat.value else None
+                }
+                for name, child in self.children.items()
+            }
@@ -0,0 +1,201 @@
+# =======================
+# modules/system/shared_frames.py - Paylaşılan Bellek Kare Halkası
+# =======================
+
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Başlık: [son yazılan sıra no, slot sıra no'ları...] (int64) + slot zaman damgaları (float64)
+# + kamera iç parametreleri (float64; genişlik 0 ise yok)
+HEADER_LATEST = 0
+HEADER_FIELDS = 1
+CAMERA_INFO_FIELDS = ("width", "height", "fx", "fy", "ppx", "ppy")
+WRITING = -1  # slot yazılırken sıra no'su
+READ_RETRIES = 3
+
+
+@dataclass(frozen=True)
+class FrameRingSpec:
+    """Halkanın adı ve boyutları (alt süreçlere bu gönderilir, kareler değil)"""
+    name: str
+    width: int
+    height: int
+    slots: int = 4
+    depth: bool = True
+
+    @property
+    def rgb_shape(self):
+        return self.height, self.width, 3
+
+    @property
+    def depth_shape(self):
+        return self.height, self.width
+
+    @property
+    def header_bytes(self) -> int:
+        raw = (HEADER_FIELDS + self.slots) * 8 + self.slots * 8 + len(CAMERA_INFO_FIELDS) * 8
+        return (raw + 63) // 64 * 64  # kare verisi 64 bayta hizalı başlasın
+
+    @property
+    def slot_bytes(self) -> int:
+        rgb = self.height * self.width * 3
+        depth = self.height * self.width * 2 if self.depth else 0
+        return (rgb + depth + 63) // 64 * 64
+
+    @property
+    def size(self) -> int:
+        return self.header_bytes + self.slots * self.slot_bytes
+
+
+@dataclass
+class SharedFrame:
+    """Halkadan okunan kare"""
+    seq: int
+    timestamp: float
+    rgb: Optional[np.ndarray]
+    depth: Optional[np.ndarray]
+
+
+class SharedFrameRing:
+    """Tek yazıcılı, çok okuyuculu kare halkası (multiprocessing.shared_memory)
+
+    Yazıcı (kamera süreci) kareyi sıradaki slota kopyalar; slotun sıra
+    no'su yazma sırasında WRITING olur, bitince karenin sıra no'su yazılır.
+    Okuyucu kopyalamadan önce ve sonra sıra no'sunu karşılaştırır; arada
+    slot üzerine yazıldıysa tekrar dener (seqlock). Süreçler arasında
+    sadece sıra no'ları ve zaman damgaları paylaşılır, kare pickle edilmez.
+    Kamera süreci iç parametreleri de başlığa yazar (kilit yok; süreç
+    öldürülse de okuyucu etkilenmez).
+    """
+
+    def __init__(self, spec: FrameRingSpec, shm: shared_memory.SharedMemory, owner: bool):
+        self.spec = spec
+        self.shm = shm
+        self.owner = owner
+
+        buffer = shm.buf
+        self.header = np.ndarray((HEADER_FIELDS + spec.slots,), dtype=np.int64, buffer=buffer)
+        self.timestamps = np.ndarray((spec.slots,), dtype=np.float64, buffer=buffer,
+                                     offset=(HEADER_FIELDS + spec.slots) * 8)
+        self.slot_seqs = self.header[HEADER_FIELDS:]
+        self.camera_fields = np.ndarray((len(CAMERA_INFO_FIELDS),), dtype=np.float64, buffer=buffer,
+                                        offset=(HEADER_FIELDS + spec.slots) * 8 + spec.slots * 8)
+
+        self.rgb = []
+        self.depth = []
+        for slot in range(spec.slots):
+            offset = spec.header_bytes + slot * spec.slot_bytes
+            self.rgb.append(np.ndarray(spec.rgb_shape, dtype=np.uint8, buffer=buffer, offset=offset))
+            if spec.depth:
+                self.depth.append(np.ndarray(spec.depth_shape, dtype=np.uint16, buffer=buffer,
+                                             offset=offset + spec.height * spec.width * 3))
+
+        self.torn_reads = 0
+
+    @classmethod
+    def create(cls, spec: FrameRingSpec) -> "SharedFrameRing":
+        """Halkayı oluştur (ana süreç; kapanışta unlink eder)"""
+        shm = shared_memory.SharedMemory(name=spec.name, create=True, size=spec.size)
+        ring = cls(spec, shm, owner=True)
+        ring.header[HEADER_LATEST] = -1
+        ring.slot_seqs[:] = WRITING
+        ring.camera_fields[:] = 0.0
+        return ring
+
+    @classmethod
+    def attach(cls, spec: FrameRingSpec) -> "SharedFrameRing":
+        """Var olan halkaya bağlan (alt süreçler)"""
+        return cls(spec, shared_memory.SharedMemory(name=spec.name), owner=False)
+
+    # ----- Yazma -----
+
+    def write(self, rgb: np.ndarray, depth: Optional[np.ndarray] = None,
+              timestamp: Optional[float] = None) -> int:
+        """Kareyi sıradaki slota kopyala ve sıra no'sunu döndür (boyut halkayla aynı olmalı)"""
+        seq = int(self.header[HEADER_LATEST]) + 1  # yeniden başlayan yazıcı kaldığı yerden devam eder
+        slot = seq % self.spec.slots
+
+        self.slot_seqs[slot] = WRITING
+        np.copyto(self.rgb[slot], rgb)
+        if self.spec.depth:
+            if depth is None:
+                self.depth[slot].fill(0)
+            else:
+                np.copyto(self.depth[slot], depth, casting="unsafe")
+        self.timestamps[slot] = time.time() if timestamp is None else timestamp
+        self.slot_seqs[slot] = seq
+        self.header[HEADER_LATEST] = seq
+        return seq
+
+    def set_camera_info(self, camera_info: Optional[Dict]):
+        """Kamera iç parametrelerini yayınla (RealSenseManager.get_camera_info(); yoksa temizler)"""
+        self.camera_fields[0] = 0.0  # yazılırken okuyucu yok saysın
+        if not camera_info or not all(k in camera_info for k in CAMERA_INFO_FIELDS):
+            return
+        self.camera_fields[1:] = [float(camera_info[k]) for k in CAMERA_INFO_FIELDS[1:]]
+        self.camera_fields[0] = float(camera_info["width"])
+
+    # ----- Okuma -----
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self.header[HEADER_LATEST])
+
+    def camera_info(self) -> Optional[Dict[str, float]]:
+        """Kamera sürecinin yayınladığı iç parametreler (yoksa None)"""
+        values = self.camera_fields.copy()
+        if values[0] <= 0:
+            return None
+        return dict(zip(CAMERA_INFO_FIELDS, values.tolist()))
+
+    def read(self, seq: int, rgb: bool = True) -> Optional[SharedFrame]:
+        """Belirli kareyi kopyala (üzerine yazıldıysa None; rgb=False ise sadece derinlik)"""
+        copy_rgb = rgb
+        slot = seq % self.spec.slots
+        for _ in range(READ_RETRIES):
+            if seq < 0 or self.slot_seqs[slot] != seq:
+                return None
+            rgb = self.rgb[slot].copy() if copy_rgb else None
+            depth = self.depth[slot].copy() if self.spec.depth else None
+            timestamp = float(self.timestamps[slot])
+            if self.slot_seqs[slot] == seq:
+                return SharedFrame(seq, timestamp, rgb, depth)
+            self.torn_reads += 1
+        return None
+
+    def read_latest(self) -> Optional[SharedFrame]:
+        """En son tamamlanmış kareyi kopyala"""
+        for _ in range(READ_RETRIES):
+            frame = self.read(self.latest_seq)
+            if frame is not None:
+                return frame
+        return None
+
+    def wait_for_new(self, after_seq: int, timeout: float = 0.1,
+                     poll_interval: float = 0.002) -> Optional[SharedFrame]:
+        """after_seq'ten yeni kare gelene kadar bekle (süreçler arası bildirim yerine kısa yoklama)"""
+        deadline = time.monotonic() + timeout
+        while self.latest_seq <= after_seq:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+        return self.read_latest()
+
+    # ----- Kapatma -----
+
+    def close(self):
+        """Bu sürecin bağlantısını kapat (numpy görünümleri önce bırakılmalı)"""
+        self.header = self.timestamps = self.slot_seqs = self.camera_fields = None
+        self.rgb = []
+        self.depth = []
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,325 @@
+# =======================
+# modules/system/vision_processes.py - Çok Süreçli Kamera ve Tespit Hattı
+# =======================
+
+import math
+import os
+import queue
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import CameraSettings, SystemSettings, YOLOSettings
+from modules.system.logger import SystemLogger
+from modules.system.process_supervisor import EXIT_NO_RESTART, ProcessSupervisor
+from modules.system.shared_frames import FrameRingSpec, SharedFrame, SharedFrameRing
+from modules.utils.data_structures import Detection
+
+
+CAPTURE_PROCESS = "capture"
+DETECTOR_PROCESS = "detector"
+RESULT_QUEUE_SIZE = 8
+
+
+@dataclass
+class DetectionResult:
+    """Tespit sürecinin yayınladığı sonuç (kare değil, sadece sıra no'su taşınır)"""
+    seq: int
+    timestamp: float  # karenin yakalanma zamanı
+    detections: List[Detection]
+    inference_ms: float
+
+
+# ----- Alt süreç giriş noktaları (spawn için modül seviyesinde) -----
+
+def open_camera(camera_settings: CameraSettings, logger: SystemLogger,
+                camera_type: str = "auto") -> Tuple[Optional[Any], str]:
+    """MainWindow.initialize_camera ile aynı sıra: RealSense, Webcam, Mock"""
+    from modules.camera.camera_interface import MockCamera, WebcamCamera
+    from modules.camera.realsense_manager import RealSenseManager
+
+    if camera_type in ("auto", "realsense"):
+        try:
+            camera = RealSenseManager(camera_settings, logger)
+            if camera.initialize() and camera.start_capture():
+                return camera, "realsense"
+        except Exception as e:
+            logger.warning(f"RealSense başlatılamadı: {e}")
+        if camera_type == "realsense":
+            return None, camera_type
+
+    if camera_type in ("auto", "webcam"):
+        try:
+            camera = WebcamCamera(0, camera_settings.width, camera_settings.height)
+            if camera.initialize() and camera.start_capture():
+                return camera, "webcam"
+        except Exception as e:
+            logger.warning(f"Webcam başlatılamadı: {e}")
+        if camera_type == "webcam":
+            return None, camera_type
+
+    camera = MockCamera(camera_settings.width, camera_settings.height)
+    camera.initialize()
+    camera.start_capture()
+    return camera, "mock"
+
+
+def _fit(frame: Optional[np.ndarray], width: int, height: int, interpolation: int) -> Optional[np.ndarray]:
+    if frame is None or frame.shape[:2] == (height, width):
+        return frame
+    return cv2.resize(frame, (width, height), interpolation=interpolation)
+
+
+def capture_worker(stop_event, heartbeat, spec: FrameRingSpec, camera_settings: CameraSettings,
+                   camera_type: str = "auto", log_level: str = "INFO"):
+    """Kamera süreci: kareleri paylaşılan halkaya yazar"""
+    logger = SystemLogger(log_level)
+    try:
+        ring = SharedFrameRing.attach(spec)
+    except FileNotFoundError:
+        logger.error(f"Kare halkası bulunamadı: {spec.name}")
+        sys.exit(EXIT_NO_RESTART)
+
+    camera, camera_type = open_camera(camera_settings, logger, camera_type)
+    if camera is None:
+        ring.close()
+        sys.exit(1)
+    ring.set_camera_info(camera.get_camera_info() if camera_type == "realsense" else None)
+    logger.info(f"Kamera süreci hazır: {camera_type} (pid {os.getpid()})")
+
+    frame_interval = 1.0 / max(1, camera_settings.fps)
+    last_timestamp = None
+    try:
+        while not stop_event.is_set():
+            started = time.monotonic()
+            heartbeat.value = time.time()
+
+            if camera_type == "realsense":
+                rgb, depth, _ = camera.get_frames()
+                timestamp = camera.get_frame_timestamp()
+            else:
+                rgb, depth = camera.get_rgb_frame(), camera.get_depth_frame()
+                timestamp = time.time()
+
+            # RealSense kendi thread'inde yakalar; aynı kareyi iki kez yazma
+            if rgb is not None and timestamp != last_timestamp:
+                last_timestamp = timestamp
+                ring.write(_fit(rgb, spec.width, spec.height, cv2.INTER_LINEAR),
+                           _fit(depth, spec.width, spec.height, cv2.INTER_NEAREST), timestamp)
+
+            stop_event.wait(max(0.0, frame_interval - (time.monotonic() - started)))
+    finally:
+        camera.cleanup()
+        ring.close()
+
+
+def detector_worker(stop_event, heartbeat, spec: FrameRingSpec, yolo_settings: YOLOSettings,
+                    results, log_level: str = "INFO", mock: bool = False):
+    """Tespit süreci: halkadaki en yeni kareyi işler, sonucu kuyruğa koyar"""
+    from modules.ai.yolo_detector import YOLODetector
+
+    logger = SystemLogger(log_level)
+    try:
+        ring = SharedFrameRing.attach(spec)
+    except FileNotFoundError:
+        logger.error(f"Kare halkası bulunamadı: {spec.name}")
+        sys.exit(EXIT_NO_RESTART)
+
+    detector = YOLODetector(yolo_settings, logger)
+    if mock:
+        detector.set_mock_mode(True)
+    else:
+        detector.initialize()
+    logger.info(f"Tespit süreci hazır (pid {os.getpid()})")
+
+    last_seq = -1
+    try:
+        while not stop_event.is_set():
+            heartbeat.value = time.time()
+            # Tespit kameradan yavaşsa aradaki kareler atlanır, hep en yenisi işlenir
+            frame = ring.wait_for_new(last_seq, timeout=0.1)
+            if frame is None:
+                continue
+            last_seq = frame.seq
+
+            detections = detector.detect_people(frame.rgb)
+            try:
+                results.put_nowait(DetectionResult(frame.seq, frame.timestamp, detections,
+                                                   detector.get_inference_time()))
+            except queue.Full:
+                pass  # GUI yetişemiyor; eski sonuçlar zaten tüketilince atılacak
+    finally:
+        detector.cleanup()
+        ring.close()
+
+
+# ----- Ana süreç tarafı -----
+
+class VisionProcessManager:
+    """Kamera ve YOLO'yu ayrı süreçlerde çalıştırır; GUI kareleri halkadan okur
+
+    Kareler paylaşılan bellekte kalır, kuyruktan sadece tespitler geçer.
+    Süreçler ProcessSupervisor ile izlenir: çöken veya donan süreç yeniden
+    başlatılır, kamera süreci yeniden başlasa da halka ve sıra no'ları korunur.
+    Tespit süreci her başlatmada yeni kuyruk alır: öldürülen süreç eski
+    kuyruğun yazma kilidini tutuyor olabilir.
+    """
+
+    def __init__(self, camera_settings: CameraSettings, yolo_settings: YOLOSettings,
+                 system_settings: SystemSettings, logger: SystemLogger,
+                 camera_type: str = "auto", mock_detector: bool = False):
+        self.camera_settings = camera_settings
+        self.yolo_settings = yolo_settings
+        self.system_settings = system_settings
+        self.logger = logger
+        self.camera_type = camera_type
+        self.mock_detector = mock_detector
+
+        self.spec = FrameRingSpec(
+            name=f"expo_frames_{os.getpid()}_{int(time.time() * 1000) % 100000}",
+            width=camera_settings.width,
+            height=camera_settings.height,
+            slots=self.ring_slots(camera_settings, system_settings),
+            depth=camera_settings.enable_depth
+        )
+        self.ring: Optional[SharedFrameRing] = None
+        self.supervisor: Optional[ProcessSupervisor] = None
+        self.results = None
+
+        self.last_frame_seq = -1
+        self.last_result: Optional[DetectionResult] = None
+        self.results_received = 0
+        self.results_stale = 0  # karesi halkada üzerine yazılmış tespitler
+
+        # Kamera FPS'i (halkanın sıra no'su artışından)
+        self.fps = 0
+        self.fps_window_start = time.monotonic()
+        self.fps_window_seq = -1
+
+    @staticmethod
+    def ring_slots(camera_settings: CameraSettings, system_settings: SystemSettings) -> int:
+        """Tespit gecikmesi boyunca yazılan kareleri tutacak slot sayısı"""
+        in_flight = math.ceil(camera_settings.fps * system_settings.frame_ring_latency)
+        return max(system_settings.frame_ring_slots, in_flight + 2)  # +2: yazılan ve GUI'nin okuduğu
+
+    def start(self) -> bool:
+        """Halkayı oluştur ve süreçleri başlat"""
+        try:
+            self.ring = SharedFrameRing.create(self.spec)
+        except OSError as e:
+            self.logger.error(f"Paylaşılan bellek oluşturulamadı: {e}")
+            return False
+
+        settings = self.system_settings
+        self.supervisor = ProcessSupervisor(
+            self.logger,
+            max_restarts=settings.process_max_restarts,
+            restart_window=settings.process_restart_window,
+            hang_timeout=settings.process_hang_timeout,
+            startup_timeout=settings.process_startup_timeout
+        )
+
+        self.supervisor.add(CAPTURE_PROCESS, capture_worker,
+                            (self.spec, self.camera_settings, self.camera_type, settings.log_level))
+        self.supervisor.add(DETECTOR_PROCESS, detector_worker, self._detector_args)
+
+        if not self.supervisor.start():
+            self.logger.error("Görüntü süreçleri başlatılamadı")
+            self.stop()
+            return False
+        self.logger.info(f"Çok süreçli görüntü hattı başlatıldı ({self.spec.width}x{self.spec.height}, "
+                         f"{self.spec.slots} slot, {self.spec.size // 1024} KB)")
+        return True
+
+    def _detector_args(self) -> Tuple:
+        """Tespit süreci argümanları (her başlatmada yeni sonuç kuyruğu)"""
+        results, self.results = self.results, self.supervisor.context.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self._close_queue(results)
+        return (self.spec, self.yolo_settings, self.results, self.system_settings.log_level, self.mock_detector)
+
+    @staticmethod
+    def _close_queue(results):
+        if results is not None:
+            results.close()
+            results.join_thread()
+
+    def stop(self):
+        """Süreçleri durdur, kuyruğu ve paylaşılan belleği bırak"""
+        if self.supervisor:
+            self.supervisor.stop()
+            self.supervisor = None
+        self._close_queue(self.results)
+        self.results = None
+        if self.ring:
+            self.ring.close()
+            self.ring = None
+
+    def get_frame(self) -> Optional[SharedFrame]:
+        """En yeni kare (kopya; yeni kare yoksa da son kareyi döndürür)"""
+        if self.ring is None:
+            return None
+        frame = self.ring.read_latest()
+        if frame is not None:
+            self.last_frame_seq = frame.seq
+            self._update_fps(frame.seq)
+        return frame
+
+    def _update_fps(self, seq: int):
+        now = time.monotonic()
+        if self.fps_window_seq < 0:
+            self.fps_window_start, self.fps_window_seq = now, seq
+        elif now - self.fps_window_start >= 1.0:
+            self.fps = int((seq - self.fps_window_seq) / (now - self.fps_window_start))
+            self.fps_window_start, self.fps_window_seq = now, seq
+
+    def get_fps(self) -> int:
+        return self.fps
+
+    def get_inference_time(self) -> float:
+        """Son tespitin inference süresi (ms)"""
+        return self.last_result.inference_ms if self.last_result else 0.0
+
+    def get_detections(self) -> Optional[DetectionResult]:
+        """Birikmiş sonuçlardan en yenisi (yeni sonuç yoksa None)"""
+        results = self.results  # tespit süreci yeniden başlarsa izleme thread'i değiştirir
+        if results is None:
+            return None
+        latest = None
+        while True:
+            try:
+                latest = results.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            self.results_received += 1
+        if latest is not None:
+            self.last_result = latest
+        return latest
+
+    def get_detection_frame(self, seq: int) -> Optional[SharedFrame]:
+        """Tespitin yapıldığı kare, RGB'siz (halkada üzerine yazıldıysa None; tespit bayat)"""
+        if self.ring is None:
+            return None
+        frame = self.ring.read(seq, rgb=False)
+        if frame is None:
+            self.results_stale += 1
+        return frame
+
+    def get_camera_info(self) -> Optional[Dict[str, float]]:
+        """Kamera sürecinin yayınladığı iç parametreler (RealSense değilse None)"""
+        return self.ring.camera_info() if self.ring else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "frame_seq": self.ring.latest_seq if self.ring else -1,
+            "fps": self.fps,
+            "detection_seq": self.last_result.seq if self.last_result else -1,
+            "inference_ms": round(self.last_result.inference_ms, 1) if self.last_result else 0.0,
+            "results_received": self.results_received,
+            "results_stale": self.results_stale,
+            "torn_reads": self.ring.torn_reads if self.ring else 0,
+            "processes": self.supervisor.get_stats() if self.supervisor else {}
+        }
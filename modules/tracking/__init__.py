@@ -5,9 +5,13 @@
 from .target_tracker import TargetTracker, TrackedTarget
 from .distance_calculator import DistanceCalculator
 from .tracking_interface import TrackingInterface, DistanceInterface
+from .latency_compensator import LatencyCompensator
+from .gaze_filter import GazeFilter, OneEuroFilter
 
 __all__ = [
     'TargetTracker', 'TrackedTarget', 
     'DistanceCalculator',
-    'TrackingInterface', 'DistanceInterface'
+    'TrackingInterface', 'DistanceInterface',
+    'LatencyCompensator',
+    'GazeFilter', 'OneEuroFilter'
 ]
\ No newline at end of file
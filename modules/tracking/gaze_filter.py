@@ -0,0 +1,132 @@
+# =======================
+# modules/tracking/gaze_filter.py - Bakış Yumuşatma Filtresi
+# =======================
+
+import math
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import TrackingSettings
+
+
+class OneEuroFilter:
+    """Tek eksenli One-Euro filtresi (Casiez ve ark., 2012)
+
+    Hareket yavaşken kesim frekansı min_cutoff'a iner ve titreşim bastırılır;
+    hız arttıkça kesim frekansı beta ile büyür ve gecikme azalır.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        self.x_prev: Optional[float] = None
+        self.dx_prev = 0.0
+        self.t_prev: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        self.x_prev = None
+        self.dx_prev = 0.0
+        self.t_prev = None
+
+    def filter(self, x: float, timestamp: float) -> float:
+        """Yeni ölçümü filtrele"""
+        if self.x_prev is None or self.t_prev is None:
+            self.x_prev = x
+            self.t_prev = timestamp
+            return x
+
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            return self.x_prev
+
+        # Türevi (hız) filtrele
+        dx = (x - self.x_prev) / dt
+        dx_hat = self.dx_prev + self._alpha(self.d_cutoff, dt) * (dx - self.dx_prev)
+
+        # Hıza göre uyarlanan kesim frekansı
+        cutoff = self.min_cutoff + self.beta * abs(dx_hat)
+        x_hat = self.x_prev + self._alpha(cutoff, dt) * (x - self.x_prev)
+
+        self.x_prev = x_hat
+        self.dx_prev = dx_hat
+        self.t_prev = timestamp
+        return x_hat
+
+
+class GazeFilter:
+    """Takip çıkışı ile servo komutu arasındaki x/y yumuşatma katmanı"""
+
+    def __init__(self, settings: TrackingSettings):
+        self.settings = settings
+
+        self.filter_x = OneEuroFilter(settings.smoothing_min_cutoff_x,
+                                      settings.smoothing_beta_x,
+                                      settings.smoothing_d_cutoff)
+        self.filter_y = OneEuroFilter(settings.smoothing_min_cutoff_y,
+                                      settings.smoothing_beta_y,
+                                      settings.smoothing_d_cutoff)
+
+        # Hedef bu süreden uzun kaybolursa filtre sıfırlanır (eski konuma kaymasın)
+        self.reset_timeout = 0.5
+        self.last_update_time: Optional[float] = None
+
+        # İstatistikler
+        self.raw_jitter = 0.0
+        self.filtered_jitter = 0.0
+        self.last_raw: Optional[Tuple[float, float]] = None
+        self.last_filtered: Optional[Tuple[float, float]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.tracking_smoothing > 0
+
+    def reset(self):
+        """Filtre durumunu sıfırla (yeni hedef)"""
+        self.filter_x.reset()
+        self.filter_y.reset()
+        self.last_update_time = None
+        self.last_raw = None
+        self.last_filtered = None
+
+    def update(self, x: float, y: float, timestamp: Optional[float] = None) -> Tuple[int, int]:
+        """Ham hedef noktasını filtrele"""
+        if not self.enabled:
+            return int(x), int(y)
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        if self.last_update_time is not None and timestamp - self.last_update_time > self.reset_timeout:
+            self.reset()
+        self.last_update_time = timestamp
+
+        filtered_x = self.filter_x.filter(x, timestamp)
+        filtered_y = self.filter_y.filter(y, timestamp)
+
+        self._update_jitter((x, y), (filtered_x, filtered_y))
+        return int(round(filtered_x)), int(round(filtered_y))
+
+    def _update_jitter(self, raw: Tuple[float, float], filtered: Tuple[float, float]):
+        """Kare başına ortalama hareket (ham / filtreli)"""
+        if self.last_raw is not None and self.last_filtered is not None:
+            raw_step = math.hypot(raw[0] - self.last_raw[0], raw[1] - self.last_raw[1])
+            filtered_step = math.hypot(filtered[0] - self.last_filtered[0],
+                                       filtered[1] - self.last_filtered[1])
+            self.raw_jitter += 0.1 * (raw_step - self.raw_jitter)
+            self.filtered_jitter += 0.1 * (filtered_step - self.filtered_jitter)
+
+        self.last_raw = raw
+        self.last_filtered = filtered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Filtre istatistiklerini döndür"""
+        return {
+            "enabled": self.enabled,
+            "raw_step_px": round(self.raw_jitter, 2),
+            "filtered_step_px": round(self.filtered_jitter, 2)
+        }
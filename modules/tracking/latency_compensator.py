@@ -0,0 +1,80 @@
+# =======================
+# modules/tracking/latency_compensator.py - Gecikme Telafisi
+# =======================
+
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import TrackingSettings
+from modules.tracking.target_tracker import TrackedTarget
+
+
+class LatencyCompensator:
+    """Uçtan uca gecikmeyi ölçer ve hedefi bu gecikme kadar ileri tahmin eder
+
+    Gecikme iki parçadan oluşur:
+    - pipeline: frame yakalama -> tespit -> takip -> servo komutu (canlı ölçülür)
+    - actuator: seri port + servo hareket süresi (ServoController'dan alınır)
+    """
+
+    def __init__(self, settings: TrackingSettings, smoothing: float = 0.1):
+        self.settings = settings
+        self.smoothing = smoothing
+
+        # Gecikme tahminleri (saniye)
+        self.pipeline_latency = 0.0
+        self.actuator_latency = 0.0
+        self.latency_samples: deque = deque(maxlen=100)
+
+        # Son tahmin (istatistik için)
+        self.last_prediction_offset = (0.0, 0.0)
+
+    @property
+    def total_latency(self) -> float:
+        return self.pipeline_latency + self.actuator_latency
+
+    def record_pipeline_latency(self, capture_time: float, command_time: Optional[float] = None):
+        """Frame yakalama anından servo komutuna kadar geçen süreyi kaydet"""
+        command_time = command_time if command_time is not None else time.time()
+        latency = command_time - capture_time
+        if latency < 0:
+            return
+
+        self.latency_samples.append(latency)
+        if len(self.latency_samples) == 1:
+            self.pipeline_latency = latency
+        else:
+            self.pipeline_latency += self.smoothing * (latency - self.pipeline_latency)
+
+    def set_actuator_latency(self, latency: float):
+        """Seri port + servo hareket gecikmesini güncelle"""
+        self.actuator_latency = max(0.0, latency)
+
+    def predict(self, target: TrackedTarget, frame_width: int, frame_height: int) -> Tuple[int, int]:
+        """Hedefin servo hareketi tamamlandığında olacağı konumu tahmin et"""
+        detection = target.detection
+        if not self.settings.enable_prediction:
+            return detection.center_x, detection.center_y
+
+        horizon = min(self.total_latency, self.settings.max_prediction_time)
+        offset_x = target.velocity_x * horizon
+        offset_y = target.velocity_y * horizon
+        self.last_prediction_offset = (offset_x, offset_y)
+
+        predicted_x = int(max(0, min(frame_width - 1, detection.center_x + offset_x)))
+        predicted_y = int(max(0, min(frame_height - 1, detection.center_y + offset_y)))
+        return predicted_x, predicted_y
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gecikme istatistiklerini döndür (ms)"""
+        samples = sorted(self.latency_samples)
+        p95 = samples[int(len(samples) * 0.95) - 1] if samples else 0.0
+
+        return {
+            "pipeline_latency_ms": round(self.pipeline_latency * 1000, 1),
+            "pipeline_latency_p95_ms": round(p95 * 1000, 1),
+            "actuator_latency_ms": round(self.actuator_latency * 1000, 1),
+            "total_latency_ms": round(self.total_latency * 1000, 1),
+            "prediction_offset_px": tuple(round(v, 1) for v in self.last_prediction_offset)
+        }
@@ -2,9 +2,10 @@
 # modules/tracking/target_tracker.py - Hedef Takibi
 # =======================
 
+import itertools
 import math
 import time
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from modules.utils.data_structures import Detection
@@ -20,6 +21,9 @@ class TrackedTarget:
     last_seen: float
     track_duration: float
     is_primary: bool = False
+    velocity_x: float = 0.0  # piksel/saniye
+    velocity_y: float = 0.0  # piksel/saniye
+    track_id: int = 0  # hedef takip edildiği sürece sabit kalır
 
 
 class TargetTracker:
@@ -36,6 +40,13 @@ class TargetTracker:
         # Takip parametreleri
         self.last_update_time = time.time()
         self.target_lost_threshold = 2.0  # saniye
+        self.velocity_smoothing = 0.5  # hız EMA katsayısı
+        self.track_ids = itertools.count(1)
+        
+        # Olay kancaları (ör. ziyaretçi başına sohbet oturumu açma/kapatma)
+        self.on_track_started: Optional[Callable[[TrackedTarget], None]] = None
+        self.on_track_lost: Optional[Callable[[TrackedTarget], None]] = None
+        self.on_primary_changed: Optional[Callable[[Optional[TrackedTarget]], None]] = None
         
     def update_targets(self, detections: List[Detection], depth_frame) -> Optional[TrackedTarget]:
         """Hedefleri güncelle ve birincil hedefi döndür"""
@@ -60,7 +71,7 @@ class TargetTracker:
         self._update_tracked_targets(targets_with_distance, current_time)
         
         # Birincil hedefi belirle
-        self._select_primary_target()
+        self._select_primary_target(current_time)
         
         return self.primary_target
     
@@ -98,10 +109,13 @@ class TargetTracker:
     def _update_tracked_targets(self, new_targets: List[TrackedTarget], current_time: float):
         """Mevcut hedefleri yeni tespitlerle güncelle"""
         # Eski hedefleri temizle (uzun süre görülmeyen)
-        self.tracked_targets = [
-            target for target in self.tracked_targets
-            if current_time - target.last_seen < self.target_lost_threshold
-        ]
+        active_targets = []
+        for target in self.tracked_targets:
+            if current_time - target.last_seen < self.target_lost_threshold:
+                active_targets.append(target)
+            else:
+                self._emit(self.on_track_lost, target)
+        self.tracked_targets = active_targets
         
         # Yeni hedefleri mevcut hedeflerle eşleştir
         updated_targets = []
@@ -112,6 +126,9 @@ class TargetTracker:
             for existing_target in self.tracked_targets:
                 # Pozisyon ve boyut benzerliği kontrol et
                 if self._targets_match(new_target, existing_target):
+                    # Hızı güncelle (gecikme telafisi tahmini için)
+                    self._update_velocity(existing_target, new_target.detection, current_time)
+                    
                     # Mevcut hedefi güncelle
                     existing_target.detection = new_target.detection
                     existing_target.distance = new_target.distance
@@ -125,10 +142,40 @@ class TargetTracker:
             if not matched:
                 # Yeni hedef ekle
                 new_target.track_duration = 0.0
+                new_target.track_id = next(self.track_ids)
                 updated_targets.append(new_target)
+                self._emit(self.on_track_started, new_target)
         
+        # Bu karede görülmeyen hedefler kayıp eşiğine kadar korunur
+        # (kısa tespit kesintilerinde takip ID'si değişmesin)
+        updated_targets.extend(
+            target for target in self.tracked_targets
+            if all(target is not updated for updated in updated_targets)
+        )
         self.tracked_targets = updated_targets
     
+    def _emit(self, callback: Optional[Callable], target: Optional[TrackedTarget]):
+        """Olay kancasını çağır (hatalar takibi durdurmaz)"""
+        if callback is None:
+            return
+        try:
+            callback(target)
+        except Exception as e:
+            self.logger.error(f"Takip olayı hatası: {e}")
+    
+    def _update_velocity(self, target: TrackedTarget, detection: Detection, current_time: float):
+        """Hedefin piksel hızını yumuşatılmış olarak güncelle"""
+        dt = current_time - target.last_seen
+        if dt <= 0:
+            return
+        
+        raw_vx = (detection.center_x - target.detection.center_x) / dt
+        raw_vy = (detection.center_y - target.detection.center_y) / dt
+        
+        alpha = self.velocity_smoothing
+        target.velocity_x = alpha * raw_vx + (1 - alpha) * target.velocity_x
+        target.velocity_y = alpha * raw_vy + (1 - alpha) * target.velocity_y
+    
     def _targets_match(self, target1: TrackedTarget, target2: TrackedTarget) -> bool:
         """İki hedefin aynı kişi olup olmadığını kontrol et"""
         det1, det2 = target1.detection, target2.detection
@@ -148,15 +195,30 @@ class TargetTracker:
         
         return center_distance < max_center_distance and size_diff < max_size_difference
     
-    def _select_primary_target(self):
-        """Birincil hedefi seç"""
+    def _select_primary_target(self, current_time: Optional[float] = None):
+        """Birincil hedefi seç (sadece bu karede görülen hedefler arasından)"""
         if not self.tracked_targets:
-            self.primary_target = None
+            if self.primary_target is not None:
+                self.primary_target = None
+                self._emit(self.on_primary_changed, None)
+            return
+        
+        # Görülmeyen hedeflerin konum/mesafesi eskidir, seçime katılmaz;
+        # kimse görünmüyorsa mevcut birincil hedef kayıp eşiğine kadar korunur
+        visible_targets = [
+            target for target in self.tracked_targets
+            if current_time is None or target.last_seen >= current_time
+        ]
+        if not visible_targets:
+            if self.primary_target is not None and self.primary_target not in self.tracked_targets:
+                self.primary_target.is_primary = False
+                self.primary_target = None
+                self._emit(self.on_primary_changed, None)
             return
         
-        # Mevcut birincil hedef hala var mı?
+        # Mevcut birincil hedef hala görünüyor mu?
         current_primary_exists = any(
-            target == self.primary_target for target in self.tracked_targets
+            target == self.primary_target for target in visible_targets
         ) if self.primary_target else False
         
         # Otomatik hedef değiştirme kapalıysa mevcut hedefle devam et
@@ -167,16 +229,16 @@ class TargetTracker:
         if self.settings.face_priority:
             # Önce kameraya bakan kişileri tercih et
             facing_targets = [
-                target for target in self.tracked_targets
+                target for target in visible_targets
                 if self._is_facing_camera(target.detection)
             ]
             
             if facing_targets:
                 candidates = facing_targets
             else:
-                candidates = self.tracked_targets
+                candidates = visible_targets
         else:
-            candidates = self.tracked_targets
+            candidates = visible_targets
         
         # En yakın hedefi seç
         primary_candidate = min(candidates, key=lambda t: t.distance)
@@ -190,6 +252,7 @@ class TargetTracker:
             self.primary_target.is_primary = True
             
             self.logger.info(f"Yeni birincil hedef: mesafe {primary_candidate.distance:.2f}m")
+            self._emit(self.on_primary_changed, primary_candidate)
     
     def _is_facing_camera(self, detection: Detection) -> bool:
         """Kişinin kameraya bakıp bakmadığını tahmin et (basit heuristic)"""
@@ -213,6 +276,7 @@ class TargetTracker:
                 self.primary_target = target
                 target.is_primary = True
                 self.logger.info(f"Hedef manuel olarak değiştirildi: ID {detection_id}")
+                self._emit(self.on_primary_changed, target)
                 return True
         
         return False
@@ -227,7 +291,11 @@ class TargetTracker:
     
     def clear_targets(self):
         """Tüm hedefleri temizle"""
+        for target in self.tracked_targets:
+            self._emit(self.on_track_lost, target)
         self.tracked_targets.clear()
-        self.primary_target = None
+        if self.primary_target is not None:
+            self.primary_target = None
+            self._emit(self.on_primary_changed, None)
         self.logger.info("Tüm hedefler temizlendi")
 
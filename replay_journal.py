@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# =======================
+# replay_journal.py - Servo Günlüğünü Tekrar Oynat
+# =======================
+
+"""
+ServoSettings.journal_dir ile kaydedilen servo komut günlüğünü sanal Arduino'ya
+veya gerçek karta tekrar gönderir; kayıttaki ve tekrar oynatmadaki zamanlama,
+sapma (jitter) ve onay gecikmelerini raporlar.
+
+Kullanım:
+    python replay_journal.py logs/servo/servo_ttyUSB0_20260101_120000.jrn
+    python replay_journal.py <günlük> --fast            # Beklemeden gönder
+    python replay_journal.py <günlük> --speed 2.0       # 2x hızda
+    python replay_journal.py <günlük> --port /dev/ttyUSB0  # Gerçek karta
+    python replay_journal.py <günlük> --analyze         # Sadece kaydı analiz et
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import ServoSettings
+from modules.servo.arduino_comm import ArduinoComm
+from modules.servo.async_serial import run_on_servo_loop
+from modules.servo.servo_journal import read_journal, analyze_journal, JournalReplayer
+from modules.system.logger import SystemLogger
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servo komut günlüğünü tekrar oynat")
+    parser.add_argument('journal', help='Günlük dosyası (.jrn)')
+    parser.add_argument('--port', help='Gerçek kart portu (verilmezse sanal Arduino kullanılır)')
+    parser.add_argument('--baudrate', type=int, default=115200)
+    parser.add_argument('--speed', type=float, default=1.0, help='Oynatma hızı çarpanı (1.0 = gerçek zaman)')
+    parser.add_argument('--fast', action='store_true', help='Beklemeden, olabildiğince hızlı gönder')
+    parser.add_argument('--analyze', action='store_true', help='Sadece kaydı analiz et, gönderme')
+    parser.add_argument('--command-delay', type=float, default=0.0,
+                        help='Sanal Arduino komut işleme süresi (saniye)')
+
+    args = parser.parse_args()
+
+    records = list(read_journal(args.journal))
+    print(f"📼 {len(records)} kayıt okundu: {args.journal}")
+    print("Kayıt:", json.dumps(analyze_journal(records), indent=2))
+
+    if args.analyze:
+        return 0
+
+    simulator = None
+    if args.port:
+        port = args.port
+    else:
+        from modules.servo.arduino_simulator import ArduinoSimulator
+        simulator = ArduinoSimulator(command_delay=args.command_delay)
+        port = simulator.port
+
+    arduino = ArduinoComm(ServoSettings(port=port, baudrate=args.baudrate), SystemLogger())
+    if not arduino.connect():
+        print(f"❌ Karta bağlanılamadı: {port}")
+        return 1
+
+    try:
+        replayer = JournalReplayer(records, speed=0.0 if args.fast else args.speed)
+        duration = (replayer.batches[-1][0] - replayer.batches[0][0]) / 1e9 if replayer.batches else 0.0
+        timeout = 60.0 + (duration / replayer.speed if replayer.speed > 0 else 0.0)
+        result = run_on_servo_loop(replayer.replay(arduino.core), timeout=timeout, endpoint=port)
+        print("Tekrar oynatma:", json.dumps(result, indent=2))
+    finally:
+        arduino.disconnect()
+        if simulator:
+            simulator.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
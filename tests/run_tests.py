@@ -17,8 +17,11 @@ def run_all_tests():
     # Test modüllerini import et
     from tests.test_camera import TestCameraModules, TestCameraSettings
     from tests.test_yolo import TestYOLODetector
-    from tests.test_servo import TestServoController, TestArmPosition
-    from tests.test_integration import TestSystemIntegration, TestDataFlow
+    from tests.test_servo import TestServoController, TestArmPosition, TestServoPose, TestServoLimits, TestHeadControlLoop, TestGazeLookupTable, TestArmReachabilityGrid, TestServoStateSnapshot, TestAsyncArduinoComm, TestServoJournal, TestServoBus, TestAnimationHotReload
+    from tests.test_chat import TestOpenAIChatStreaming, TestAsyncOpenAIChat, TestResponseCache, TestFAQIndex, TestConversationHistory, TestSessionManager, TestChatTelemetry, TestIntentRouter, TestConversationStore
+    from tests.test_speech import TestSentenceSplitting, TestSpeechPipeline
+    from tests.test_multiprocess import TestSharedFrameRing, TestProcessSupervisor, TestVisionProcesses
+    from tests.test_integration import TestSystemIntegration, TestDataFlow, TestLatencyCompensation, TestGazeFilter, TestVisitorSessions
     
     # Test suite oluştur
     test_suite = unittest.TestSuite()
@@ -30,8 +33,35 @@ def run_all_tests():
         TestYOLODetector,
         TestServoController,
         TestArmPosition,
+        TestServoPose,
+        TestServoLimits,
+        TestHeadControlLoop,
+        TestGazeLookupTable,
+        TestArmReachabilityGrid,
+        TestServoStateSnapshot,
+        TestAsyncArduinoComm,
+        TestServoJournal,
+        TestServoBus,
+        TestAnimationHotReload,
+        TestOpenAIChatStreaming,
+        TestAsyncOpenAIChat,
+        TestResponseCache,
+        TestFAQIndex,
+        TestConversationHistory,
+        TestSessionManager,
+        TestChatTelemetry,
+        TestIntentRouter,
+        TestConversationStore,
+        TestSentenceSplitting,
+        TestSpeechPipeline,
+        TestSharedFrameRing,
+        TestProcessSupervisor,
+        TestVisionProcesses,
         TestSystemIntegration,
-        TestDataFlow
+        TestDataFlow,
+        TestLatencyCompensation,
+        TestGazeFilter,
+        TestVisitorSessions
     ]
     
     for test_class in test_classes:
@@ -51,6 +81,9 @@ def run_specific_test(test_name):
         'camera': 'tests.test_camera',
         'yolo': 'tests.test_yolo',
         'servo': 'tests.test_servo',
+        'chat': 'tests.test_chat',
+        'speech': 'tests.test_speech',
+        'multiprocess': 'tests.test_multiprocess',
         'integration': 'tests.test_integration'
     }
     
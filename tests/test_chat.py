@@ -0,0 +1,887 @@
+# =======================
+# tests/test_chat.py - Sohbet Testleri
+# =======================
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from modules.ai.openai_chat import OpenAIChat, PROMPT_VERSION
+from modules.ai.response_cache import ResponseCache, normalize_question
+from modules.ai.faq_index import FAQIndex, DEFAULT_FAQ
+from modules.ai.intent_router import AhoCorasick, IntentRouter
+from modules.ai.chat_sessions import SessionManager
+from modules.ai.chat_telemetry import ChatTelemetry, RequestSample
+from modules.ai.conversation_history import ConversationHistory, estimate_tokens
+from modules.ai.conversation_store import ConversationStore
+from modules.ai.async_chat import AsyncOpenAIChat, PRIORITY_PRIMARY_TARGET, PRIORITY_BACKGROUND
+from config.settings import AISettings
+from modules.system.logger import SystemLogger
+
+
+class StubOpenAIServer:
+    """Chat Completions API'sini taklit eden yerel HTTP sunucusu"""
+
+    def __init__(self, reply: str = "Ben bir robotum. Fuardayım.", chunk_delay: float = 0.01,
+                 first_token_delay: float = 0.05):
+        self.reply = reply
+        self.chunk_delay = chunk_delay
+        self.first_token_delay = first_token_delay
+        self.requests = []
+        self.fail_statuses = []  # sıradaki isteklere dönülecek hata kodları
+        self.model_requests = []  # bağlantı doğrulaması (GET /models/<model>)
+        self.model_status = 200
+        self.abort_after = None  # akışı bu kadar parçadan sonra yarıda kes
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _write_chunk(self, data: bytes):
+                """HTTP chunked kodlamasıyla yaz (OpenAI akışı gibi)"""
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stub.model_requests.append(self.path)
+                time.sleep(stub.first_token_delay)
+                if stub.model_status != 200:
+                    self._send_json(stub.model_status, {"error": {"message": "Incorrect API key provided",
+                                                                  "type": "invalid_request_error"}})
+                    return
+                self._send_json(200, {"id": self.path.rsplit("/", 1)[-1], "object": "model", "owned_by": "stub"})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+
+                if stub.fail_statuses:
+                    error = json.dumps({"error": {"message": "overloaded", "type": "server_error"}}).encode()
+                    self.send_response(stub.fail_statuses.pop(0))
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(error)))
+                    self.end_headers()
+                    self.wfile.write(error)
+                    return
+
+                time.sleep(stub.first_token_delay)
+
+                words = stub.reply.split(" ")
+                tokens = [word + " " for word in words[:-1]] + [words[-1]]
+
+                if body.get("stream"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for index, token in enumerate(tokens):
+                        if stub.abort_after is not None and index >= stub.abort_after:
+                            self.close_connection = True
+                            return
+                        chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                        self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                        time.sleep(stub.chunk_delay)
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self._write_chunk(b"")
+                    return
+
+                data = json.dumps({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": stub.reply}}],
+                    "usage": {"prompt_tokens": 50, "completion_tokens": len(tokens),
+                              "total_tokens": 50 + len(tokens)}
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.api_base = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestOpenAIChatStreaming(unittest.TestCase):
+    """Akışlı GPT yanıtı testleri (yerel sahte sunucu ile)"""
+
+    def setUp(self):
+        self.server = StubOpenAIServer()
+        self.settings = AISettings(openai_api_key="test-key", api_base=self.server.api_base,
+                                   response_cache_file="", conversation_db="", faq_file="")
+        self.chat = OpenAIChat(self.settings, SystemLogger())
+        self.assertTrue(self.chat.initialize())
+        self.server.requests.clear()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_stream_yields_chunks(self):
+        """Yanıt parça parça gelmeli ve geçmişe tam haliyle eklenmeli"""
+        chunks = list(self.chat.stream_response("Sen nesin?"))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), self.server.reply)
+        self.assertTrue(self.server.requests[0]["stream"])
+        self.assertEqual(self.chat.conversation_history[-1]["content"], self.server.reply)
+
+    def test_first_chunk_arrives_before_completion(self):
+        """İlk parça tüm yanıt bitmeden alınmalı"""
+        self.server.chunk_delay = 0.05
+        start = time.perf_counter()
+        stream = self.chat.stream_response("Seni kim yaptı?")
+        next(stream)
+        first_chunk_time = time.perf_counter() - start
+        list(stream)
+        total_time = time.perf_counter() - start
+
+        self.assertLess(first_chunk_time, total_time - 0.1)
+
+    def test_stream_stats(self):
+        """İlk token süresi ve token/s istatistiklere eklenmeli"""
+        list(self.chat.stream_response("Ne yapabilirsin?"))
+        stats = self.chat.get_stats()
+
+        self.assertEqual(stats["streamed_requests"], 1)
+        self.assertGreaterEqual(stats["average_time_to_first_token"], self.server.first_token_delay)
+        self.assertGreater(stats["average_tokens_per_second"], 0)
+        self.assertIn("average_response_time", stats)
+
+    def test_special_and_error_paths(self):
+        """Selamlama ağsız yanıtlanmalı, sunucu yoksa hata mesajı dönmeli"""
+        self.assertEqual(list(self.chat.stream_response("Merhaba")), [self.chat._get_default_message('greeting')])
+        self.assertEqual(self.server.requests, [])
+
+        self.chat.client.api_base = "http://127.0.0.1:9/v1"  # kapalı port
+        self.chat.settings.request_timeout = 1.0
+        self.assertEqual(list(self.chat.stream_response("Sen nesin?")), [self.chat._get_default_message('error')])
+        self.assertEqual(len(self.chat.conversation_history), 0)
+
+    def test_interrupted_stream_is_not_cached(self):
+        """Yarıda kesilen akış önbelleğe girmemeli, bağlantı durumu hatalı kalmalı"""
+        self.server.abort_after = 2
+        chunks = list(self.chat.stream_response("Sen nesin?"))
+
+        partial = "".join(chunks).strip()
+        self.assertEqual(partial, "Ben bir")
+        self.assertEqual(self.chat.connection_status, "failed")
+        self.assertIsNone(self.chat.response_cache.get("Sen nesin?", "tr", PROMPT_VERSION))
+        self.assertEqual(self.chat.conversation_history[-1]["content"], partial)
+        self.assertEqual(self.chat.get_stats()["streamed_requests"], 0)
+
+    def test_initialize_does_not_block(self):
+        """Başlatma ağ yanıtını beklememeli ve tamamlama isteği göndermemeli"""
+        self.server.first_token_delay = 0.5
+        chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=self.server.api_base,
+                                     response_cache_file="", conversation_db="", faq_file=""), SystemLogger())
+        start = time.perf_counter()
+        self.assertTrue(chat.initialize())
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(chat.connection_status, "checking")
+
+        deadline = time.monotonic() + 5.0
+        while chat.connection_status == "checking" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(chat.connection_status, "connected")
+        self.assertTrue(chat.get_stats()["api_connected"])
+        self.assertEqual(self.server.model_requests[-1], "/v1/models/gpt-4o")
+        self.assertEqual(self.server.requests, [])
+
+    def test_invalid_key_and_first_use(self):
+        """Geçersiz anahtar durumda görünmeli; doğrulama kapalıysa ilk istek doğrulamalı"""
+        self.server.model_status = 401
+        self.assertFalse(self.chat.verify_connection())
+        self.assertEqual(self.chat.connection_status, "failed")
+        self.assertIn("API key", self.chat.connection_error)
+
+        chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=self.server.api_base,
+                                     response_cache_file="", conversation_db="", faq_file="",
+                                     verify_connection=False), SystemLogger())
+        self.assertTrue(chat.initialize())
+        self.assertEqual(chat.connection_status, "unknown")
+        self.assertEqual(chat.get_response("Sen nesin?"), self.server.reply)
+        self.assertEqual(chat.connection_status, "connected")
+
+
+class TestAsyncOpenAIChat(unittest.TestCase):
+    """asyncio GPT istemcisi testleri (kuyruk, süre sınırı, yeniden deneme)"""
+
+    def setUp(self):
+        self.server = StubOpenAIServer(first_token_delay=0.05)
+        self.settings = AISettings(openai_api_key="test-key", api_base=self.server.api_base,
+                                   chat_concurrency=1, chat_queue_size=4, retry_backoff=0.01,
+                                   response_cache_file="", conversation_db="", faq_file="")
+        self.chat = AsyncOpenAIChat(self.settings, SystemLogger())
+        self.assertTrue(self.chat.initialize())
+        self.server.requests.clear()
+
+    def tearDown(self):
+        self.chat.cleanup()
+        self.server.close()
+
+    def test_response_through_queue(self):
+        """Senkron API kuyruk üzerinden yanıt dönmeli"""
+        self.assertEqual(self.chat.get_response("Sen nesin?"), self.server.reply)
+        self.assertEqual(self.chat.get_response("Seni kim yaptı?"), self.server.reply)
+
+        stats = self.chat.get_stats()
+        self.assertEqual(stats["completed_requests"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertIn("queue_wait_ms_p95", stats)
+
+    def test_primary_target_goes_first(self):
+        """Birincil hedef isteği bekleyen arka plan isteklerinin önüne geçmeli"""
+        futures = [self.chat.submit(f"arka plan {i}", PRIORITY_BACKGROUND) for i in range(3)]
+        time.sleep(0.01)
+        futures.append(self.chat.submit("birincil", PRIORITY_PRIMARY_TARGET))
+        for future in futures:
+            future.result(5.0)
+
+        order = [request["messages"][-1]["content"] for request in self.server.requests]
+        self.assertLess(order.index("birincil"), order.index("arka plan 2"))
+        self.assertGreaterEqual(self.chat.get_stats()["max_queue_depth"], 2)
+
+    def test_full_queue_evicts_background(self):
+        """Kuyruk doluyken yüksek öncelikli istek en düşük öncelikliyi atmalı"""
+        self.server.first_token_delay = 0.2
+        background = [self.chat.submit(f"arka plan {i}", PRIORITY_BACKGROUND) for i in range(5)]
+        time.sleep(0.05)
+        primary = self.chat.submit("birincil", PRIORITY_PRIMARY_TARGET)
+
+        self.assertEqual(primary.result(5.0), self.server.reply)
+        self.assertIsNone(background[-1].result(5.0))
+        rejected = self.chat.get_stats()["rejected_requests"]
+        self.assertGreaterEqual(rejected, 1)
+
+        # Atılan istekler de kuyruk beklemesiyle başarısız ölçüm olarak yazılmalı
+        failed = [sample for sample in self.chat.telemetry.samples if not sample.success]
+        self.assertEqual(len(failed), rejected)
+        self.assertTrue(all(sample.queue_wait > 0.0 for sample in failed))
+
+    def test_queue_timeout_is_recorded(self):
+        """Kuyrukta süresi dolan istek başarısız ölçüm olarak yazılmalı"""
+        self.server.first_token_delay = 0.3
+        busy = self.chat.submit("meşgul")
+        time.sleep(0.05)
+        self.assertIsNone(self.chat.submit("bekleyen", deadline=0.1).result(5.0))
+        busy.result(5.0)
+
+        samples = list(self.chat.telemetry.samples)
+        self.assertEqual(len(samples), 2)
+        timed_out = next(sample for sample in samples if not sample.success)
+        self.assertGreaterEqual(timed_out.queue_wait, 0.09)
+        self.assertEqual(self.chat.get_stats()["deadline_exceeded"], 1)
+
+    def test_retry_on_server_error(self):
+        """503 yanıtları jitter'lı geri çekilmeyle tekrar denenmeli"""
+        self.server.fail_statuses = [503, 500]
+        self.assertEqual(self.chat.get_response("Sen nesin?"), self.server.reply)
+        self.assertEqual(self.chat.get_stats()["retries"], 2)
+
+    def test_deadline(self):
+        """Süre sınırı aşılırsa None dönmeli ve sayılmalı"""
+        self.server.first_token_delay = 0.5
+        start = time.perf_counter()
+        self.assertIsNone(self.chat.submit("yavaş", deadline=0.2).result(5.0))
+
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(self.chat.get_stats()["deadline_exceeded"], 1)
+
+    def test_greeting_prefetch(self):
+        """Hazırlanan selamlama ziyaretçi selam verince beklemeden dönmeli"""
+        self.assertFalse(self.chat.prefetch_greeting(7, distance=4.0))  # etkileşim mesafesi dışında
+        self.assertTrue(self.chat.prefetch_greeting(7, distance=1.2))
+        self.assertFalse(self.chat.prefetch_greeting(7, distance=1.2))
+        self.chat.greetings[7].future.result(5.0)
+
+        self.assertIn("1.2", self.server.requests[0]["messages"][-1]["content"])
+        self.assertEqual(len(self.chat.sessions.get(7).history), 0)  # istek geçmişe yazılmaz
+
+        self.assertEqual(self.chat.get_response("Merhaba", track_id=7), self.server.reply)
+        history = self.chat.sessions.get(7).history
+        self.assertEqual([m["role"] for m in history.messages()], ["user", "assistant"])
+        self.assertEqual(history[0]["content"], "Merhaba")
+        self.assertEqual(history[-1]["content"], self.server.reply)
+        self.assertEqual(self.chat.get_response("Merhaba", track_id=7), self.chat._get_default_message('greeting'))
+        self.assertEqual(self.chat.get_stats()["greeting_prefetch"]["used"], 1)
+
+    def test_greeting_prefetch_goes_first(self):
+        """Birincil hedefin selamlaması sıradaki normal ve arka plan isteklerinin önüne geçmeli"""
+        self.server.first_token_delay = 0.1
+        busy = self.chat.submit("meşgul")
+        time.sleep(0.05)
+        waiting = [self.chat.submit("normal soru"), self.chat.submit("arka plan", PRIORITY_BACKGROUND)]
+        self.assertTrue(self.chat.prefetch_greeting(9, distance=1.5))
+        for future in [busy, self.chat.greetings[9].future] + waiting:
+            future.result(5.0)
+
+        order = [request["messages"][-1]["content"] for request in self.server.requests]
+        greeting = next(i for i, content in enumerate(order) if "1.5" in content)
+        self.assertEqual(greeting, 1)  # meşgul istekten hemen sonra
+        self.assertLess(greeting, order.index("normal soru"))
+
+    def test_greeting_prefetch_cancelled(self):
+        """Hedef ayrılırsa veya kısa sürede değişirse ön yükleme iptal edilmeli"""
+        self.server.first_token_delay = 0.3
+        self.chat.set_active_visitor(1)
+        self.assertTrue(self.chat.prefetch_greeting(1, distance=1.0))
+        time.sleep(0.1)
+        self.chat.end_session(1)
+
+        self.chat.set_active_visitor(2)
+        self.assertTrue(self.chat.prefetch_greeting(2, distance=1.0))
+        self.chat.set_active_visitor(3)
+        time.sleep(0.4)
+
+        stats = self.chat.get_stats()
+        self.assertEqual(stats["greeting_prefetch"]["cancelled"], 2)
+        self.assertEqual(stats["greeting_prefetch"]["pending"], 0)
+        self.assertEqual(stats["completed_requests"], 0)
+        self.assertGreaterEqual(stats["cancelled_requests"], 1)
+
+
+
+class TestResponseCache(unittest.TestCase):
+    """LRU + TTL yanıt önbelleği testleri"""
+
+    def test_normalized_key(self):
+        """Büyük/küçük harf ve noktalama farkı aynı anahtarı vermeli"""
+        self.assertEqual(normalize_question("  Sen NESİN?! ", "tr"), "sen nesin")
+        self.assertEqual(normalize_question("IŞIK", "tr"), "ışık")
+
+        cache = ResponseCache()
+        cache.put("Sen nesin?", "tr", "1", "Robotum.", latency=1.5)
+        self.assertEqual(cache.get("sen nesin", "tr", "1"), "Robotum.")
+        self.assertIsNone(cache.get("sen nesin", "en", "1"))
+        self.assertIsNone(cache.get("sen nesin", "tr", "2"))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["latency_saved"], 1.5)
+
+    def test_lru_and_ttl(self):
+        """Kapasite aşılınca en eski kullanılmayan, TTL dolunca girdi silinmeli"""
+        cache = ResponseCache(max_entries=2, ttl=0.05)
+        cache.put("a", "tr", "1", "A")
+        cache.put("b", "tr", "1", "B")
+        cache.get("a", "tr", "1")
+        cache.put("c", "tr", "1", "C")
+
+        self.assertIsNone(cache.get("b", "tr", "1"))
+        self.assertEqual(cache.get("a", "tr", "1"), "A")
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("c", "tr", "1"))
+
+    def test_persistence(self):
+        """Kaydedilen girdiler yeni önbellekte yüklenmeli"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "responses.json")
+            cache = ResponseCache(path=path)
+            cache.put("Seni kim yaptı?", "tr", "1", "Bir ekip.")
+            self.assertTrue(cache.save())
+
+            loaded = ResponseCache(path=path)
+            self.assertEqual(loaded.load(), 1)
+            self.assertEqual(loaded.get("seni kim yaptı", "tr", "1"), "Bir ekip.")
+
+    def test_chat_uses_cache(self):
+        """Başka ziyaretçinin aynı ilk sorusu ağa gitmemeli"""
+        server = StubOpenAIServer()
+        try:
+            chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                         response_cache_file="", conversation_db="", faq_file=""), SystemLogger())
+            self.assertTrue(chat.initialize())
+            server.requests.clear()
+
+            self.assertEqual(chat.get_response("Sen nesin?", track_id=1), server.reply)
+            self.assertEqual(chat.get_response("sen nesin", track_id=2), server.reply)
+            self.assertEqual(len(server.requests), 1)
+
+            stats = chat.get_stats()
+            self.assertEqual(stats["cache_hit_rate"], 0.5)
+            self.assertGreater(stats["cache_latency_saved"], 0.0)
+        finally:
+            server.close()
+
+    def test_follow_ups_bypass_cache(self):
+        """Konuşma içindeki soru önbellekten alınmamalı, yanıtı da önbelleğe girmemeli"""
+        server = StubOpenAIServer()
+        try:
+            chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                         response_cache_file="", conversation_db="", faq_file=""), SystemLogger())
+            self.assertTrue(chat.initialize())
+            server.requests.clear()
+
+            chat.get_response("Neden?", track_id=1)  # bağlamsız: önbelleğe girer
+            chat.get_response("Robotlar nasıl çalışır?", track_id=2)
+            chat.get_response("Neden?", track_id=2)  # devam sorusu: önbellekteki yanıt başka konuşmanın
+            self.assertEqual(len(server.requests), 3)
+            self.assertEqual(server.requests[-1]["messages"][-2]["content"], server.reply)
+
+            chat.get_response("Peki ya kameran?", track_id=2)
+            chat.get_response("Peki ya kameran?", track_id=3)  # 2'nin bağlamlı yanıtı önbellekte olmamalı
+            self.assertEqual(len(server.requests), 5)
+            self.assertEqual(len(chat.response_cache.entries), 3)  # neden, robotlar, kameran (3. ziyaretçiden)
+        finally:
+            server.close()
+
+
+
+class TestFAQIndex(unittest.TestCase):
+    """Yerel SSS indeksi testleri"""
+
+    def setUp(self):
+        self.index = FAQIndex()
+        self.index.build(DEFAULT_FAQ)
+
+    def test_matches_question_variants(self):
+        """Yazım ve ek farklılıklarında aynı yanıt bulunmalı"""
+        self.assertEqual(self.index.answer("Sen NESİN?", "tr"), DEFAULT_FAQ[0]["answer"])
+        self.assertEqual(self.index.answer("Seni kim yaptı acaba?", "tr"), DEFAULT_FAQ[1]["answer"])
+        self.assertEqual(self.index.answer("What are you?", "en"), DEFAULT_FAQ[5]["answer"])
+        self.assertEqual(self.index.answer("Kameranız var mı?", "tr"), DEFAULT_FAQ[2]["answer"])
+
+    def test_low_confidence_falls_through(self):
+        """İlgisiz sorular ve diğer dil None dönmeli"""
+        self.assertIsNone(self.index.answer("Bugün hava nasıl?", "tr"))
+        self.assertIsNone(self.index.answer("İstanbul'un nüfusu kaç?", "tr"))
+        self.assertIsNone(self.index.answer("sen nesin", "en"))
+
+        # Bilinen soruyu içeren ama başka şey soran cümleler de GPT'ye kalmalı
+        self.assertIsNone(self.index.answer("What are you doing?", "en"))
+        self.assertIsNone(self.index.answer("Who made you cry?", "en"))
+        self.assertIsNone(self.index.answer("How do you see the future of AI?", "en"))
+        self.assertIsNone(self.index.answer("Neler yapabilirsin bugün?", "tr"))
+
+        stats = self.index.get_stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertGreater(stats["features"], 0)
+
+    def test_query_latency(self):
+        """Sorgular 5 ms altında yanıtlanmalı"""
+        result = self.index.benchmark(["Sen nesin?", "Bugün hava nasıl?", "neler yapabilirsin"], repeat=50)
+        self.assertLess(result["query_ms_p95"], 5.0)
+        self.assertGreater(result["build_ms"], 0.0)
+
+    def test_load_or_create_and_chat(self):
+        """Dosya yoksa varsayılanlar kullanılmalı (dosya yazılmadan); eşleşen soru ağa gitmemeli"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "faq.json")
+            index = FAQIndex.load_or_create(path)
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(len(index.entries), len(DEFAULT_FAQ))
+
+            server = StubOpenAIServer()
+            try:
+                chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                             response_cache_file="", conversation_db="", faq_file=path), SystemLogger())
+                self.assertTrue(chat.initialize())
+                server.requests.clear()
+
+                self.assertEqual(chat.get_response("Sen nesin?"), DEFAULT_FAQ[0]["answer"])
+                self.assertEqual(chat.get_response("Bugün hava nasıl?"), server.reply)
+                self.assertEqual(len(server.requests), 1)
+                self.assertEqual(chat.get_stats()["faq_index"]["hits"], 1)
+            finally:
+                server.close()
+
+
+class TestConversationHistory(unittest.TestCase):
+    """Token bütçeli konuşma geçmişi testleri"""
+
+    def test_budget_evicts_old_turns_into_summary(self):
+        """Bütçe aşılınca eski turlar özete taşınmalı, son tur korunmalı"""
+        history = ConversationHistory(token_budget=120, summary_tokens=40)
+        for i in range(10):
+            history.add_turn(f"Soru numarası {i} hakkında bilgi verir misin?", "Elbette, " + "uzun bir yanıt " * 5)
+
+        stats = history.get_stats()
+        self.assertLessEqual(stats["tokens"], 120)
+        self.assertGreater(stats["evicted_turns"], 0)
+        self.assertIn("numarası 9", history[-2]["content"])
+
+        messages = history.messages()
+        self.assertEqual(messages[0]["role"], "system")
+        self.assertIn("numarası", messages[0]["content"])
+        self.assertLessEqual(estimate_tokens(messages[0]["content"]), 40)
+
+    def test_incremental_token_total(self):
+        """Artımlı toplam, mesajların yeniden sayımıyla aynı olmalı"""
+        history = ConversationHistory(token_budget=100000)
+        for i in range(5):
+            history.add_turn(f"soru {i}", f"yanıt {i}")
+        expected = sum(estimate_tokens(m["content"]) + 4 for m in history)
+        self.assertEqual(history.total_tokens, expected)
+
+        history.clear()
+        self.assertEqual(history.total_tokens, 0)
+        self.assertEqual(history.messages(), [])
+
+    def test_long_monologue_is_truncated(self):
+        """Tek uzun mesaj bütçenin yarısına kısaltılmalı"""
+        history = ConversationHistory(token_budget=200)
+        history.add_turn("çok uzun bir konuşma " * 200, "Anladım.")
+        self.assertLessEqual(estimate_tokens(history[0]["content"]), 110)
+
+    def test_requests_share_stable_prefix(self):
+        """Sistem prompt'u istekler arasında aynı kalmalı, özet isteğe eklenmeli"""
+        server = StubOpenAIServer()
+        try:
+            chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                         response_cache_file="", conversation_db="", faq_file="",
+                                         history_token_budget=60, history_summary_tokens=30), SystemLogger())
+            self.assertTrue(chat.initialize())
+            server.requests.clear()
+
+            for question in ["Robotlar nasıl çalışır?", "Servo motor nedir?", "Kamera ne işe yarar?"]:
+                chat.get_response(question)
+
+            prefixes = [request["messages"][0] for request in server.requests]
+            self.assertEqual(len(server.requests), 3)
+            self.assertTrue(all(prefix == prefixes[0] for prefix in prefixes))
+            self.assertIn("Robotlar", server.requests[-1]["messages"][1]["content"])
+
+            stats = chat.get_stats()
+            self.assertGreater(stats["evicted_turns"], 0)
+            self.assertLessEqual(stats["history_tokens"], 60)
+            self.assertGreater(stats["prompt_prefix_tokens"], 0)
+        finally:
+            server.close()
+
+
+class TestSessionManager(unittest.TestCase):
+    """Ziyaretçi başına oturum testleri"""
+
+    def test_lru_and_memory_cap(self):
+        """Sınır aşılınca en eski oturum atılmalı, aktif oturum korunmalı"""
+        sessions = SessionManager(max_sessions=3, memory_tokens=100000)
+        sessions.set_active(1)
+        for track_id in (2, 3, 4):
+            sessions.get(track_id)
+        self.assertEqual(list(sessions.sessions), [1, 3, 4])
+
+        sessions.get(3)
+        sessions.get(5)
+        self.assertEqual(list(sessions.sessions), [1, 3, 5])
+        self.assertEqual(sessions.get_stats()["evicted_sessions"], 2)
+
+        small = SessionManager(max_sessions=10, memory_tokens=60)
+        for track_id in range(4):
+            small.get(track_id).history.add_turn("merhaba robot", "merhaba ziyaretçi")
+        small.get(4)
+        self.assertLessEqual(small.total_tokens(), 60)
+        self.assertIn(4, small)
+
+    def test_idle_sessions_expire(self):
+        """Boşta kalan oturumlar yeni oturum açılırken atılmalı"""
+        sessions = SessionManager(idle_timeout=0.05)
+        sessions.get(1)
+        time.sleep(0.1)
+        sessions.get(2)
+        self.assertNotIn(1, sessions)
+
+    def test_requests_carry_own_history(self):
+        """İstek sadece ilgili ziyaretçinin geçmişini taşımalı"""
+        server = StubOpenAIServer()
+        try:
+            chat = AsyncOpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                              response_cache_file="", conversation_db="", faq_file=""), SystemLogger())
+            self.assertTrue(chat.initialize())
+            server.requests.clear()
+
+            chat.get_response("Robotlar nasıl çalışır?", track_id=1)
+            chat.get_response("Kamera ne işe yarar?", track_id=2)
+            chat.set_active_visitor(1)
+            chat.get_response("Servo motor nedir?")
+
+            contents = [[m["content"] for m in request["messages"][1:]] for request in server.requests]
+            self.assertEqual(contents[1], ["Kamera ne işe yarar?"])
+            self.assertIn("Robotlar nasıl çalışır?", contents[2])
+            self.assertNotIn("Kamera ne işe yarar?", contents[2])
+            self.assertEqual(chat.get_stats()["chat_sessions"]["sessions"], 2)
+        finally:
+            chat.cleanup()
+            server.close()
+
+
+class TestChatTelemetry(unittest.TestCase):
+    """İstek başına gecikme/token telemetrisi testleri"""
+
+    def test_ring_buffer_percentiles(self):
+        """Tampon sabit boyutta kalmalı, yüzdelikler dil/tür bazında hesaplanmalı"""
+        telemetry = ChatTelemetry(capacity=100)
+        for i in range(150):
+            telemetry.add(RequestSample("tr", "chat", time_to_first_token=i / 1000, total_time=i / 1000))
+        for i in range(10):
+            telemetry.add(RequestSample("en", "stream", total_time=1.0, cache_hit=i < 5))
+
+        summary = telemetry.summary()
+        self.assertEqual(len(telemetry), 100)
+        self.assertEqual(telemetry.total_samples, 160)
+        self.assertEqual(set(summary), {"tr/chat", "en/stream"})
+
+        chat = summary["tr/chat"]
+        self.assertEqual(chat["count"], 90)
+        self.assertLess(chat["total_time_ms"]["p50"], chat["total_time_ms"]["p95"])
+        self.assertLessEqual(chat["total_time_ms"]["p95"], chat["total_time_ms"]["p99"])
+        self.assertEqual(chat["total_time_ms"]["p99"], 148.1)  # son 90 örnek: 60..149 ms
+        self.assertEqual(chat["connect_time_ms"], {})
+        self.assertEqual(summary["en/stream"]["cache_hit_rate"], 0.5)
+
+    def test_async_requests_are_recorded(self):
+        """Kuyruk beklemesi, bağlantı süresi, ilk token ve token sayıları kaydedilmeli"""
+        server = StubOpenAIServer(first_token_delay=0.05)
+        chat = AsyncOpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                          response_cache_file="", conversation_db="", faq_file="",
+                                          verify_connection=False), SystemLogger())
+        try:
+            self.assertTrue(chat.initialize())
+            chat.get_response("Sen nesin?", track_id=1)
+            chat.get_response("Seni kim yaptı?", track_id=2)
+            chat.get_response("Sen nesin?", track_id=3)  # önbellekten
+
+            group = chat.get_stats()["telemetry"]["tr/async"]
+            self.assertEqual(group["count"], 3)
+            self.assertAlmostEqual(group["cache_hit_rate"], 0.333, places=3)
+            self.assertEqual(group["prompt_tokens_avg"], 50)
+            self.assertGreater(group["completion_tokens_avg"], 0)
+            self.assertIn("p99", group["connect_time_ms"])
+            self.assertIn("p50", group["queue_wait_ms"])
+            self.assertGreaterEqual(group["time_to_first_token_ms"]["p50"], 50)
+        finally:
+            chat.cleanup()
+            server.close()
+
+    def test_stream_first_token(self):
+        """Akışlı istekte ilk token toplam süreden önce ölçülmeli"""
+        server = StubOpenAIServer(chunk_delay=0.03, first_token_delay=0.05)
+        try:
+            chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                         response_cache_file="", conversation_db="", faq_file="",
+                                         verify_connection=False), SystemLogger())
+            self.assertTrue(chat.initialize())
+            list(chat.stream_response("Ne yapabilirsin?"))
+
+            group = chat.get_stats()["telemetry"]["tr/stream"]
+            self.assertEqual(group["errors"], 0)
+            self.assertGreater(group["prompt_tokens_avg"], 0)
+            self.assertLess(group["time_to_first_token_ms"]["p50"], group["total_time_ms"]["p50"] - 50)
+        finally:
+            server.close()
+
+
+class TestIntentRouter(unittest.TestCase):
+    """Aho-Corasick tabanlı yerel komut yönlendirici testleri"""
+
+    def test_automaton_finds_overlapping_keywords(self):
+        """Tek geçişte iç içe geçen tüm anahtar kelimeler bulunmalı"""
+        matcher = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+        found = [(start, end, value) for start, end, _, value in matcher.find_all("ushers")]
+        self.assertEqual(found, [(1, 4, 2), (2, 4, 1), (2, 6, 4)])
+
+    def test_word_boundaries_and_priority(self):
+        """Ekli Türkçe kelimeler eşleşmeli, kelime içindeki kısa kalıplar eşleşmemeli"""
+        router = IntentRouter()
+        self.assertEqual(router.match("Merhabalar robot!").intent, "greeting")
+        self.assertEqual(router.match("Çok teşekkürler").intent, "thanks")
+        self.assertEqual(router.match("Teşekkürler, hoşçakal").intent, "goodbye")
+        self.assertEqual(router.match("HOW ARE YOU today?").intent, "question")
+        self.assertIsNone(router.match("Hiç robot gördün mü?"))
+        self.assertIsNone(router.match("This robot is cool"))
+        self.assertIsNone(router.match("Kameran ne işe yarar?"))
+
+        self.assertEqual(router.match("Merhabalar robot!").coverage, 0.5)
+        self.assertEqual(router.match("Güle güle").coverage, 1.0)
+        self.assertAlmostEqual(router.match("Teşekkürler, kameran nasıl çalışır?").coverage, 0.25)
+
+        stats = router.get_stats()
+        self.assertEqual(stats["routed"], 7)
+        self.assertEqual(stats["intent_thanks"], 2)
+
+    def test_chat_routes_without_llm(self):
+        """Komutlar hazır yanıtla dönmeli, API çağrılmamalı, animasyon kancası çağrılmalı"""
+        server = StubOpenAIServer()
+        try:
+            chat = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                         response_cache_file="", conversation_db="", faq_file="",
+                                         verify_connection=False), SystemLogger())
+            self.assertTrue(chat.initialize())
+            intents = []
+            chat.on_intent = intents.append
+
+            self.assertEqual(chat.get_response("Teşekkür ederim!"), chat._get_default_message('thanks'))
+            self.assertEqual(chat.get_response("Nasılsın?"), chat._get_default_message('question'))
+            self.assertEqual(list(chat.stream_response("Güle güle")), [chat._get_default_message('goodbye')])
+            self.assertEqual(intents, ["thanks", "question", "goodbye"])
+            self.assertEqual(server.requests, [])
+
+            def broken_hook(intent):
+                raise RuntimeError("servo yok")
+            chat.on_intent = broken_hook
+            self.assertEqual(chat.get_response("Selam"), chat._get_default_message('greeting'))
+
+            self.assertEqual(chat.get_response("Sen nesin?"), server.reply)
+            self.assertEqual(len(server.requests), 1)
+
+            # Komut cümlenin küçük bir kısmıysa animasyon oynamalı, soru GPT'ye gitmeli
+            chat.on_intent = intents.append
+            self.assertEqual(chat.get_response("Thanks, how does your camera work?"), server.reply)
+            self.assertEqual(intents[-1], "thanks")
+            self.assertEqual(len(server.requests), 2)
+        finally:
+            server.close()
+
+
+class TestConversationStore(unittest.TestCase):
+    """SQLite konuşma kaydı testleri"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "conversations.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_batched_writes_in_wal_mode(self):
+        """record() diski beklememeli; satırlar tek işlemde toplu yazılmalı"""
+        store = ConversationStore(self.path, flush_interval=10.0)
+        self.assertTrue(store.open())
+        try:
+            start = time.perf_counter()
+            for i in range(200):
+                store.record(i % 3, "tr", f"Soru {i}?", "Yanıt.", "llm", 0.5, "1")
+            self.assertLess(time.perf_counter() - start, 0.05)
+            self.assertEqual(store.written, 0)
+
+            self.assertTrue(store.flush())
+            self.assertEqual(store.get_stats()["written"], 200)
+            self.assertEqual(store.batches, 1)
+        finally:
+            store.close()
+
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM exchanges WHERE session = ?",
+                                            (f"{store.run_id}-1",)).fetchone()[0], 67)
+        connection.close()
+
+        # Takip ID'leri her çalıştırmada 1'den başlar; oturumlar karışmamalı
+        self.assertNotEqual(ConversationStore(self.path).run_id, store.run_id)
+
+    def test_frequent_questions(self):
+        """Sıklık tüm kaynaklardan sayılmalı, yanıt en son GPT yanıtı olmalı"""
+        store = ConversationStore(self.path)
+        self.assertTrue(store.open())
+        for question, source, reply in [("Sen nesin?", "llm", "eski"), ("sen nesin", "cache", "önbellek"),
+                                        ("Sen nesin?", "llm", "yeni"), ("Kameran var mı?", "llm", "var"),
+                                        ("Merhaba", "intent", "selam"), ("Merhaba", "intent", "selam")]:
+            store.record(None, "tr", question, reply, source)
+            time.sleep(0.001)
+        store.close()
+
+        questions = store.frequent_questions("tr", min_count=2)
+        self.assertEqual(len(questions), 1)  # komutlar sayılmaz
+        self.assertEqual(questions[0]["count"], 3)
+        self.assertEqual(questions[0]["reply"], "yeni")
+        self.assertEqual(questions[0]["variants"], ["Sen nesin?", "sen nesin"])
+        self.assertEqual(store.frequent_questions("en"), [])
+        self.assertEqual(store.frequent_questions("tr", min_count=1, first_turn_only=True), [])
+
+    def test_old_database_gets_first_turn_column(self):
+        """Eski şemalı veritabanına first_turn sütunu eklenmeli, eski satırlar bağlamlı sayılmalı"""
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute("CREATE TABLE exchanges (id INTEGER PRIMARY KEY, created REAL NOT NULL, "
+                               "session TEXT, language TEXT NOT NULL, question TEXT NOT NULL, "
+                               "normalized TEXT NOT NULL, reply TEXT NOT NULL, source TEXT NOT NULL, "
+                               "latency REAL NOT NULL DEFAULT 0, prompt_version TEXT)")
+            connection.execute("INSERT INTO exchanges (created, language, question, normalized, reply, source) "
+                               "VALUES (?, 'tr', 'Evet', 'evet', 'Harika!', 'llm')", (time.time(),))
+        connection.close()
+
+        store = ConversationStore(self.path)
+        self.assertTrue(store.open())
+        store.record(1, "tr", "Evet", "Süper!", "llm", first_turn=True)
+        store.close()
+
+        self.assertEqual(len(store.frequent_questions("tr", min_count=2)), 1)
+        self.assertEqual(store.frequent_questions("tr", min_count=2, first_turn_only=True), [])
+        self.assertEqual(store.frequent_questions("tr", min_count=1, first_turn_only=True)[0]["reply"], "Süper!")
+
+    def test_history_feeds_cache_and_faq(self):
+        """Önceki çalışmanın sık soruları önbelleği ısıtmalı ve SSS'ye eklenmeli"""
+        server = StubOpenAIServer()
+        faq_path = os.path.join(self.temp_dir.name, "faq.json")
+        try:
+            first = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                          response_cache_size=0, conversation_db=self.path, faq_file="",
+                                          verify_connection=False), SystemLogger())
+            self.assertTrue(first.initialize())
+            for track_id in (1, 2, 3):
+                first.get_response("Robotlar nasıl çalışır?", track_id=track_id)
+            first.get_response("Selam", track_id=3)
+            first.cleanup()
+            self.assertEqual(first.get_stats()["conversation_store"]["written"], 4)
+            self.assertEqual(len(server.requests), 3)
+
+            # Eski prompt versiyonunun veya önbellek ömründen eski yanıtları SSS'ye girmemeli
+            store = ConversationStore(self.path)
+            self.assertTrue(store.open())
+            for track_id in (4, 5, 6):
+                store.record(track_id, "tr", "Hava nasıl?", "Eski prompt yanıtı.", "llm",
+                             prompt_version="0-old", first_turn=True)
+                # Devam sorusunun yanıtı o ziyaretçinin konuşmasına bağlı
+                store.record(track_id, "tr", "Neden?", "Çünkü o konuşmada öyleydi.", "llm",
+                             prompt_version=PROMPT_VERSION)
+            store.close()
+            connection = sqlite3.connect(self.path)
+            with connection:
+                connection.executemany(
+                    "INSERT INTO exchanges (created, language, question, normalized, reply, source, prompt_version, "
+                    "first_turn) VALUES (?, 'tr', 'Saat kaç?', 'saat kaç', 'Eski yanıt.', 'llm', ?, 1)",
+                    [(time.time() - 30 * 86400, PROMPT_VERSION)] * 3)
+            connection.close()
+
+            second = OpenAIChat(AISettings(openai_api_key="test-key", api_base=server.api_base,
+                                           response_cache_file="", conversation_db=self.path, faq_file=faq_path,
+                                           frequent_question_count=2, faq_promote_count=3,
+                                           verify_connection=False), SystemLogger())
+            self.assertTrue(second.initialize())
+            second.warmup_thread.join(timeout=5.0)  # geçmiş GUI'yi bekletmeden arka planda uygulanır
+            self.assertEqual(len(second.response_cache.entries), 1)
+            self.assertEqual(second.faq_index.entries[-1]["answer"], server.reply)
+            self.assertNotIn("Eski prompt yanıtı.", [entry["answer"] for entry in second.faq_index.entries])
+            self.assertNotIn("Eski yanıt.", [entry["answer"] for entry in second.faq_index.entries])
+            self.assertNotIn("Çünkü o konuşmada öyleydi.", [entry["answer"] for entry in second.faq_index.entries])
+            self.assertIsNone(second.response_cache.get("Neden?", "tr", PROMPT_VERSION))
+
+            self.assertEqual(second.get_response("robotlar nasıl çalışır"), server.reply)
+            self.assertEqual(len(server.requests), 3)
+            second.cleanup()
+        finally:
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
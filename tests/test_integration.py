@@ -10,7 +10,10 @@ from config.settings import Settings
 from modules.system.logger import SystemLogger
 from modules.camera.camera_interface import MockCamera
 from modules.ai.yolo_detector import YOLODetector
-from modules.tracking.target_tracker import TargetTracker
+from modules.ai.openai_chat import OpenAIChat
+from modules.tracking.target_tracker import TargetTracker, TrackedTarget
+from modules.tracking.latency_compensator import LatencyCompensator
+from modules.tracking.gaze_filter import GazeFilter
 from modules.utils.data_structures import Detection, BoundingBox
 
 
@@ -137,4 +140,177 @@ class TestDataFlow(unittest.TestCase):
         self.assertGreaterEqual(pan_angle, 30)
         self.assertLessEqual(pan_angle, 150)
         self.assertGreaterEqual(tilt_angle, 60)
-        self.assertLessEqual(tilt_angle, 120)
\ No newline at end of file
+        self.assertLessEqual(tilt_angle, 120)
+
+
+class TestLatencyCompensation(unittest.TestCase):
+    """Gecikme telafisi testleri"""
+    
+    def setUp(self):
+        self.settings = Settings()
+        self.logger = SystemLogger()
+    
+    def _detection(self, center_x: int, center_y: int = 240) -> Detection:
+        return Detection(
+            id=1,
+            bbox=BoundingBox(center_x - 50, center_y - 100, center_x + 50, center_y + 100, 100, 200),
+            confidence=0.9,
+            class_name="person",
+            center_x=center_x,
+            center_y=center_y
+        )
+    
+    def test_tracker_estimates_velocity(self):
+        """Eşleşen hedefin hızı tahmin edilmeli"""
+        tracker = TargetTracker(self.settings.tracking, self.logger)
+        tracker.velocity_smoothing = 1.0
+        target = TrackedTarget(detection=self._detection(300), distance=1.5,
+                               last_seen=10.0, track_duration=0.0)
+        tracker.tracked_targets = [target]
+        
+        new_target = TrackedTarget(detection=self._detection(320), distance=1.5,
+                                   last_seen=10.1, track_duration=0.0)
+        with patch('time.time', return_value=10.1):
+            tracker._update_tracked_targets([new_target], 10.1)
+        
+        self.assertAlmostEqual(target.velocity_x, 200.0, places=3)
+        self.assertAlmostEqual(target.velocity_y, 0.0, places=3)
+    
+    def test_prediction_extrapolates_by_measured_latency(self):
+        """Tahmin, ölçülen toplam gecikme kadar ileri olmalı"""
+        compensator = LatencyCompensator(self.settings.tracking)
+        compensator.record_pipeline_latency(capture_time=5.0, command_time=5.15)
+        compensator.set_actuator_latency(0.05)
+        
+        target = TrackedTarget(detection=self._detection(300), distance=1.5,
+                               last_seen=0.0, track_duration=0.0, velocity_x=200.0)
+        
+        predicted_x, predicted_y = compensator.predict(target, 640, 480)
+        
+        self.assertAlmostEqual(compensator.total_latency, 0.2, places=6)
+        self.assertEqual(predicted_x, 340)
+        self.assertEqual(predicted_y, 240)
+    
+    def test_prediction_is_bounded(self):
+        """Tahmin ufku ve frame sınırları aşılmamalı"""
+        compensator = LatencyCompensator(self.settings.tracking)
+        compensator.record_pipeline_latency(capture_time=0.0, command_time=3.0)
+        
+        target = TrackedTarget(detection=self._detection(600), distance=1.5,
+                               last_seen=0.0, track_duration=0.0, velocity_x=1000.0)
+        
+        predicted_x, _ = compensator.predict(target, 640, 480)
+        
+        self.assertEqual(predicted_x, 639)
+
+
+
+class TestGazeFilter(unittest.TestCase):
+    """Bakış yumuşatma filtresi testleri"""
+    
+    def setUp(self):
+        self.settings = Settings()
+    
+    def test_jitter_is_suppressed(self):
+        """Durağan hedefteki piksel titreşimi bastırılmalı"""
+        gaze_filter = GazeFilter(self.settings.tracking)
+        
+        outputs = [gaze_filter.update(320 + (3 if i % 2 else -3), 240, i / 30.0)
+                   for i in range(60)]
+        
+        xs = [x for x, _ in outputs[30:]]
+        self.assertLessEqual(max(xs) - min(xs), 1)
+    
+    def test_fast_motion_follows(self):
+        """Hızlı hareket kısa sürede takip edilmeli"""
+        gaze_filter = GazeFilter(self.settings.tracking)
+        
+        for i in range(10):
+            gaze_filter.update(100, 240, i / 30.0)
+        for i in range(10, 25):
+            x, _ = gaze_filter.update(500, 240, i / 30.0)
+        
+        self.assertGreater(x, 480)
+    
+    def test_disabled_and_reset(self):
+        """tracking_smoothing=0 filtreyi kapatmalı, uzun boşluk sıfırlamalı"""
+        gaze_filter = GazeFilter(self.settings.tracking)
+        gaze_filter.update(100, 100, 0.0)
+        self.assertEqual(gaze_filter.update(400, 300, 5.0), (400, 300))
+        
+        self.settings.tracking.tracking_smoothing = 0
+        self.assertEqual(gaze_filter.update(123, 45, 5.1), (123, 45))
+
+
+class TestVisitorSessions(unittest.TestCase):
+    """Takip olaylarıyla ziyaretçi başına sohbet oturumları"""
+    
+    def setUp(self):
+        self.settings = Settings()
+        self.settings.ai.response_cache_file = ""
+        self.settings.ai.faq_file = ""
+        self.logger = SystemLogger()
+        self.depth_frame = np.full((480, 640), 1500, dtype=np.uint16)
+        
+        self.tracker = TargetTracker(self.settings.tracking, self.logger)
+        self.chat = OpenAIChat(self.settings.ai, self.logger)
+        self.tracker.on_track_started = lambda target: self.chat.start_session(target.track_id)
+        self.tracker.on_track_lost = lambda target: self.chat.end_session(target.track_id)
+        self.tracker.on_primary_changed = (
+            lambda target: self.chat.set_active_visitor(target.track_id if target else None))
+    
+    def _detection(self, center_x: int) -> Detection:
+        return Detection(
+            id=1,
+            bbox=BoundingBox(center_x - 50, 140, center_x + 50, 340, 100, 200),
+            confidence=0.9,
+            class_name="person",
+            center_x=center_x,
+            center_y=240
+        )
+    
+    def _update(self, detections, now: float):
+        with patch('time.time', return_value=now):
+            return self.tracker.update_targets(detections, self.depth_frame)
+    
+    def test_sessions_follow_tracks(self):
+        """Hedef görününce oturum açılmalı, kayıp eşiği aşılınca kapanmalı"""
+        primary = self._update([self._detection(200)], 100.0)
+        track_id = primary.track_id
+        self.assertIn(track_id, self.chat.sessions)
+        self.assertEqual(self.chat.sessions.active_id, track_id)
+        
+        # Kısa tespit kesintisi takip ID'sini değiştirmemeli
+        self._update([], 100.5)
+        self.assertEqual(self._update([self._detection(210)], 101.0).track_id, track_id)
+        
+        self._update([], 104.0)
+        self.assertNotIn(track_id, self.chat.sessions)
+        self.assertIsNone(self.chat.sessions.active_id)
+    
+    def test_unseen_target_is_not_primary(self):
+        """Bu karede görülmeyen (eski mesafeli) hedef birincil seçilmemeli"""
+        self.depth_frame[:, 400:] = 1000  # sağdaki ziyaretçi daha yakın
+        near = self._update([self._detection(200), self._detection(500)], 100.0)
+        self.assertEqual(near.detection.center_x, 500)
+        
+        primary = self._update([self._detection(200)], 100.5)
+        self.assertEqual(primary.detection.center_x, 200)
+        self.assertIn(near, self.tracker.get_all_targets())  # kayıp eşiğine kadar korunur
+        
+        # Kimse görünmüyorsa mevcut birincil hedef değişmemeli
+        self.assertIs(self._update([], 101.0), primary)
+    
+    def test_visitors_do_not_share_history(self):
+        """Her ziyaretçi sadece kendi geçmişini görmeli"""
+        first = self._update([self._detection(200)], 100.0)
+        self.chat.conversation_history.add_turn("Adım Ayşe", "Memnun oldum Ayşe!")
+        
+        self._update([], 103.0)
+        second = self._update([self._detection(500)], 103.1)
+        self.assertNotEqual(first.track_id, second.track_id)
+        
+        self.assertEqual(len(self.chat.conversation_history), 0)
+        messages = self.chat._build_messages("Benim adım ne?")
+        self.assertFalse(any("Ayşe" in message["content"] for message in messages))
+
@@ -0,0 +1,228 @@
+# =======================
+# tests/test_multiprocess.py - Çok Süreçli Görüntü Hattı Testleri
+# =======================
+
+import os
+import signal
+import time
+import unittest
+from multiprocessing import shared_memory
+from unittest.mock import Mock
+
+import numpy as np
+
+from config.settings import CameraSettings, SystemSettings, YOLOSettings
+from modules.system.process_supervisor import EXIT_NO_RESTART, ProcessSupervisor
+from modules.system.shared_frames import FrameRingSpec, SharedFrameRing
+from modules.system.vision_processes import CAPTURE_PROCESS, DETECTOR_PROCESS, VisionProcessManager
+
+
+# Alt süreç hedefleri (spawn ile çalıştıkları için modül seviyesinde)
+
+def steady_child(stop_event, heartbeat):
+    while not stop_event.is_set():
+        heartbeat.value = time.time()
+        stop_event.wait(0.05)
+
+
+def crashing_child(stop_event, heartbeat):
+    heartbeat.value = time.time()
+    time.sleep(0.2)
+    os._exit(1)
+
+
+def config_error_child(stop_event, heartbeat):
+    os._exit(EXIT_NO_RESTART)
+
+
+def hanging_child(stop_event, heartbeat):
+    heartbeat.value = time.time()
+    while True:
+        time.sleep(1.0)  # dur sinyalini de dinlemez
+
+
+def wait_until(predicate, timeout: float = 30.0, interval: float = 0.05) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Paylaşılan bellek kare halkası testleri"""
+
+    def setUp(self):
+        self.spec = FrameRingSpec(name=f"test_ring_{os.getpid()}", width=8, height=6, slots=3)
+        self.ring = SharedFrameRing.create(self.spec)
+        self.reader = SharedFrameRing.attach(self.spec)
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+
+    def test_write_and_read_latest(self):
+        """Başka bağlantıdan en son kare ve derinliği kopya olarak okunmalı"""
+        self.assertIsNone(self.reader.read_latest())
+
+        for value in range(5):
+            rgb = np.full(self.spec.rgb_shape, value, dtype=np.uint8)
+            depth = np.full(self.spec.depth_shape, value * 100, dtype=np.uint16)
+            seq = self.ring.write(rgb, depth, timestamp=100.0 + value)
+
+        frame = self.reader.read_latest()
+        self.assertEqual(seq, 4)
+        self.assertEqual(frame.seq, 4)
+        self.assertEqual(frame.timestamp, 104.0)
+        self.assertTrue((frame.rgb == 4).all())
+        self.assertTrue((frame.depth == 400).all())
+
+        # Okunan kare halkadan bağımsız olmalı
+        self.ring.write(np.zeros(self.spec.rgb_shape, dtype=np.uint8))
+        self.assertTrue((frame.rgb == 4).all())
+
+    def test_overwritten_and_in_progress_slots(self):
+        """Üzerine yazılan veya yazılmakta olan kare okunmamalı"""
+        for _ in range(4):
+            self.ring.write(np.zeros(self.spec.rgb_shape, dtype=np.uint8))
+        self.assertIsNone(self.reader.read(0))  # 3 slot: 0 yerine 3 yazıldı
+        self.assertIsNotNone(self.reader.read(1))
+
+        self.ring.slot_seqs[1] = -1  # yazıcı bu slota yazıyor
+        self.assertIsNone(self.reader.read(1))
+
+        self.assertIsNone(self.reader.wait_for_new(self.reader.latest_seq, timeout=0.05))
+
+        depth_only = self.reader.read(2, rgb=False)
+        self.assertIsNone(depth_only.rgb)
+        self.assertEqual(depth_only.depth.shape, self.spec.depth_shape)
+
+    def test_camera_info_in_header(self):
+        """Kamera süreci iç parametreleri başlıkta yayınlamalı; kare verisini bozmamalı"""
+        self.assertIsNone(self.reader.camera_info())
+        self.ring.write(np.full(self.spec.rgb_shape, 7, dtype=np.uint8))
+
+        info = {"width": 640, "height": 480, "fx": 615.0, "fy": 615.5, "ppx": 320.1, "ppy": 240.2,
+                "model": "distortion.brown_conrady"}
+        self.ring.set_camera_info(info)
+        self.assertEqual(self.reader.camera_info(),
+                         {"width": 640.0, "height": 480.0, "fx": 615.0, "fy": 615.5, "ppx": 320.1, "ppy": 240.2})
+        self.assertTrue((self.reader.read_latest().rgb == 7).all())
+
+        self.ring.set_camera_info({"fps": 30})  # RealSense değil / iç parametre yok
+        self.assertIsNone(self.reader.camera_info())
+
+    def test_writer_reattach_continues_sequence(self):
+        """Yeniden başlayan yazıcı sıra no'larına kaldığı yerden devam etmeli"""
+        self.ring.write(np.zeros(self.spec.rgb_shape, dtype=np.uint8))
+        restarted = SharedFrameRing.attach(self.spec)
+        try:
+            self.assertEqual(restarted.write(np.ones(self.spec.rgb_shape, dtype=np.uint8)), 1)
+        finally:
+            restarted.close()
+        self.assertEqual(self.reader.read_latest().seq, 1)
+
+
+class TestProcessSupervisor(unittest.TestCase):
+    """Alt süreç gözetmeni testleri"""
+
+    def setUp(self):
+        self.supervisor = ProcessSupervisor(Mock(), max_restarts=2, restart_window=60.0,
+                                            hang_timeout=0.5, restart_backoff=0.05)
+        self.restarted = []
+        self.supervisor.on_restart = lambda name, event: self.restarted.append(name)
+
+    def tearDown(self):
+        self.supervisor.stop()
+
+    def test_crash_restart_and_give_up(self):
+        """Çöken süreç sınır kadar yeniden başlatılmalı; ayar hatasıyla çıkan başlatılmamalı"""
+        self.supervisor.add("steady", steady_child)
+        self.supervisor.add("crashing", crashing_child)
+        self.supervisor.add("config", config_error_child)
+        self.supervisor.start(monitor_interval=0.1)
+
+        children = self.supervisor.children
+        self.assertTrue(wait_until(lambda: children["crashing"].failed and children["config"].failed, 60.0))
+
+        stats = self.supervisor.get_stats()
+        self.assertEqual(stats["crashing"]["restarts"], 2)
+        self.assertEqual(stats["config"]["restarts"], 0)
+        self.assertEqual(stats["config"]["last_exitcode"], EXIT_NO_RESTART)
+        self.assertTrue(stats["steady"]["alive"])
+        self.assertEqual(self.restarted, ["crashing", "crashing"])
+
+    def test_hung_process_is_restarted(self):
+        """Kalp atışı kesilen süreç sonlandırılıp yeniden başlatılmalı; stop() asılı süreci de kapatmalı"""
+        self.supervisor.add("hanging", hanging_child)
+        self.supervisor.start(monitor_interval=0.1)
+
+        self.assertTrue(wait_until(lambda: self.supervisor.children["hanging"].restarts >= 1, 30.0))
+        self.assertTrue(self.supervisor.children["hanging"].last_exitcode < 0)  # sinyalle sonlandı
+
+        self.supervisor.stop(timeout=0.5)
+        self.assertIsNone(self.supervisor.children["hanging"].process)
+
+
+class TestVisionProcesses(unittest.TestCase):
+    """Kamera ve tespit süreçleri uçtan uca testleri"""
+
+    def test_ring_slots_cover_detection_latency(self):
+        """Halka, tespit gecikmesi boyunca yazılan kareleri tutmalı"""
+        self.assertEqual(VisionProcessManager.ring_slots(
+            CameraSettings(fps=30), SystemSettings(frame_ring_slots=4, frame_ring_latency=0.5)), 17)
+        self.assertEqual(VisionProcessManager.ring_slots(
+            CameraSettings(fps=5), SystemSettings(frame_ring_slots=8, frame_ring_latency=0.5)), 8)
+
+    def test_pipeline_and_crash_recovery(self):
+        """Kareler halkadan, tespitler kuyruktan gelmeli; öldürülen kamera ve tespit süreçleri geri gelmeli"""
+        manager = VisionProcessManager(
+            CameraSettings(width=160, height=120, fps=30), YOLOSettings(),
+            SystemSettings(process_hang_timeout=5.0), Mock(), camera_type="mock", mock_detector=True
+        )
+        self.assertTrue(manager.start())
+        try:
+            self.assertTrue(wait_until(lambda: manager.get_detections() is not None, 60.0))
+            result = manager.last_result
+            self.assertIsInstance(result.detections, list)
+            self.assertLessEqual(result.seq, manager.ring.latest_seq)
+
+            frame = manager.get_frame()
+            self.assertEqual(frame.rgb.shape, (120, 160, 3))
+            self.assertEqual(frame.depth.shape, (120, 160))
+
+            # Kamera süreci öldürülünce yeniden başlatılmalı ve sıra no'ları devam etmeli
+            pid = manager.supervisor.children[CAPTURE_PROCESS].process.pid
+            seq_before = manager.ring.latest_seq
+            os.kill(pid, signal.SIGKILL)
+            self.assertTrue(wait_until(
+                lambda: manager.supervisor.children[CAPTURE_PROCESS].restarts == 1, 30.0))
+            self.assertTrue(wait_until(lambda: manager.ring.latest_seq > seq_before + 5, 60.0))
+            self.assertTrue(wait_until(lambda: (manager.get_detections() or result).seq > seq_before, 30.0))
+            self.assertIsNone(manager.get_camera_info())  # mock kamerada iç parametre yok
+
+            # Öldürülen tespit süreci kuyruğun kilidini tutuyor olabilir; yenisi yeni kuyruk almalı
+            results = manager.results
+            pid = manager.supervisor.children[DETECTOR_PROCESS].process.pid
+            os.kill(pid, signal.SIGKILL)
+            self.assertTrue(wait_until(
+                lambda: manager.supervisor.children[DETECTOR_PROCESS].restarts == 1, 30.0))
+            self.assertIsNot(manager.results, results)
+            seq_before = manager.ring.latest_seq
+            self.assertTrue(wait_until(lambda: (manager.get_detections() or result).seq > seq_before, 60.0))
+
+            # Karesi halkada üzerine yazılmış tespit bayat sayılmalı
+            self.assertIsNone(manager.get_detection_frame(manager.ring.latest_seq - manager.spec.slots))
+            self.assertEqual(manager.get_stats()["results_stale"], 1)
+        finally:
+            name = manager.spec.name
+            manager.stop()
+
+        # Kapanışta paylaşılan bellek silinmeli
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,31 @@
 # tests/test_servo.py - Servo Testleri
 # =======================
 
+import asyncio
+import json
+import math
+import os
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from unittest.mock import Mock, patch
 
+import numpy as np
+
 from modules.servo.servo_controller import ServoController, ArmPosition
 from modules.servo.arduino_comm import ArduinoComm
+from modules.servo.async_serial import get_servo_loop, run_on_servo_loop
+from modules.servo.animation_engine import AnimationEngine
+from modules.servo.animation_watcher import AnimationWatcher
+from modules.servo.servo_pose import ServoPose
+from modules.servo.servo_limits import ServoLimits
+from modules.servo.gaze_lookup import GazeLookupTable
+from modules.servo.servo_bus import ServoBus
+from modules.servo.arduino_simulator import ArduinoSimulator
+from modules.servo.servo_journal import ServoJournal, JournalReplayer, read_journal, analyze_journal, DIRECTION_TX, DIRECTION_RX
+from modules.servo.servo_state import ServoStateSnapshot, STATE_SIZE
+from modules.servo.arm_ik import ArmReachabilityGrid, forward_kinematics, SHOULDER_POSITIONS
 from config.settings import ServoSettings
 from config.constants import ServoIDs
 from modules.system.logger import SystemLogger
@@ -16,13 +36,20 @@ class TestServoController(unittest.TestCase):
     """Servo kontrolcü testleri"""
     
     def setUp(self):
+        # Bakış tablosu, IK ızgarası ve poz kaydı depoya değil geçici dizine yazılsın
+        self.temp_dir = tempfile.TemporaryDirectory()
         self.servo_settings = ServoSettings(
             port="/dev/ttyUSB0",
             baudrate=115200,
-            movement_speed=5
+            movement_speed=5,
+            gaze_lut_cache_dir=self.temp_dir.name,
+            state_file=str(Path(self.temp_dir.name) / "servo_state.bin")
         )
         self.logger = SystemLogger()
     
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
     @patch('serial.Serial')
     def test_arduino_comm_mock(self, mock_serial):
         """Arduino iletişim testi (mock)"""
@@ -30,6 +57,10 @@ class TestServoController(unittest.TestCase):
         mock_serial_instance = Mock()
         mock_serial.return_value = mock_serial_instance
         mock_serial_instance.is_open = True
+        # Asenkron okuma/yazma görevleri gerçek değer beklediği için Mock yerine değer döndür
+        mock_serial_instance.in_waiting = 0
+        mock_serial_instance.read.return_value = b""
+        mock_serial_instance.write.side_effect = len
         
         arduino = ArduinoComm(self.servo_settings, self.logger)
         
@@ -38,6 +69,7 @@ class TestServoController(unittest.TestCase):
             result = arduino.connect()
             # Gerçek donanım olmadan test etmek zor
             mock_serial.assert_called_once()
+        arduino.disconnect()
     
     def test_servo_angle_limits(self):
         """Servo açı limitleri testi"""
@@ -114,4 +146,671 @@ class TestArmPosition(unittest.TestCase):
         self.assertEqual(position.elbow, 90)
         self.assertEqual(position.wrist, 135)
         self.assertEqual(position.hand, 90)  # Default value
-        self.assertEqual(position.thumb, 90)  # Default value
\ No newline at end of file
+        self.assertEqual(position.thumb, 90)  # Default value
+
+
+class TestServoPose(unittest.TestCase):
+    """ServoPose veri yapısı testleri"""
+    
+    def test_from_dict_accepts_json_keys(self):
+        """JSON round-trip sonrası str anahtarlar int'e dönmeli"""
+        pose = ServoPose.from_dict({"12": 100, 13: 80})
+        
+        self.assertEqual(pose.to_dict(), {12: 100, 13: 80})
+        self.assertEqual(len(pose), 2)
+        self.assertNotIn(0, pose)
+    
+    def test_clamp_to_limits(self):
+        """Limitler tek işlemle uygulanmalı"""
+        controller = ServoController(ServoSettings(gaze_lut_cache_dir=""), Mock())
+        pose = ServoPose.from_dict({ServoIDs.HEAD_TILT.value: 170, ServoIDs.HEAD_PAN.value: 90})
+        
+        clamped = pose.clamp(controller.limit_min, controller.limit_max)
+        
+        self.assertEqual(clamped.get(ServoIDs.HEAD_TILT.value), 150)
+        self.assertEqual(clamped.get(ServoIDs.HEAD_PAN.value), 90)
+    
+    def test_interpolate_keeps_undefined_targets(self):
+        """Hedefte tanımsız servolar yerinde kalmalı"""
+        start = ServoPose.from_dict({0: 0, 1: 100})
+        end = ServoPose.from_dict({0: 100})
+        
+        middle = start.interpolate(end, 0.5)
+        
+        self.assertEqual(middle.to_dict(), {0: 50, 1: 100})
+    
+    def test_changed_from_only_reports_differences(self):
+        """Sadece değişen servolar gönderilmeli"""
+        last = ServoPose.from_dict({0: 90, 1: 90})
+        pose = ServoPose.from_dict({0: 90, 1: 95, 2: 90})
+        
+        changed = pose.changed_from(last)
+        
+        self.assertEqual(changed.nonzero()[0].tolist(), [1, 2])
+    
+    def test_arduino_set_pose_single_write(self):
+        """Tam poz tek yazım olarak gönderilmeli"""
+        arduino = ArduinoComm(ServoSettings(), Mock())
+        arduino.is_connected = True
+        
+        with patch.object(arduino, '_submit') as mock_submit:
+            self.assertTrue(arduino.set_pose(ServoPose.full(90)))
+            mock_submit.assert_called_once()
+            self.assertEqual(len(mock_submit.call_args[0][0]), 14)
+            
+            # Değişiklik yoksa komut gönderilmemeli
+            self.assertTrue(arduino.set_pose(ServoPose.full(90)))
+            mock_submit.assert_called_once()
+
+
+class TestServoLimits(unittest.TestCase):
+    """Vektörel limit ve istatistik testleri"""
+    
+    def setUp(self):
+        self.logger = Mock()
+        self.limits = ServoLimits({ServoIDs.HEAD_TILT.value: (30, 150)}, self.logger,
+                                  summary_interval=60.0)
+    
+    def test_clamp_records_overshoot(self):
+        """Kırpılan servolar istatistiğe eklenmeli"""
+        pose = ServoPose.from_dict({ServoIDs.HEAD_TILT.value: 160, ServoIDs.HEAD_PAN.value: 90})
+        
+        clamped = self.limits.clamp(pose)
+        self.limits.clamp(ServoPose.from_dict({ServoIDs.HEAD_TILT.value: 155}))
+        
+        self.assertEqual(clamped.get(ServoIDs.HEAD_TILT.value), 150)
+        stats = self.limits.get_stats()
+        tilt_stats = stats["servos"][ServoIDs.HEAD_TILT.value]
+        self.assertEqual(stats["checked_commands"], 2)
+        self.assertEqual(tilt_stats["hits"], 2)
+        self.assertEqual(tilt_stats["max_overshoot"], 10)
+        self.assertEqual(tilt_stats["mean_overshoot"], 7.5)
+        self.assertNotIn(ServoIDs.HEAD_PAN.value, stats["servos"])
+    
+    def test_violations_are_not_logged_per_event(self):
+        """Her ihlalde warning loglanmamalı"""
+        for _ in range(100):
+            self.assertFalse(self.limits.check(ServoIDs.HEAD_TILT.value, 10))
+        
+        self.logger.warning.assert_not_called()
+        self.assertEqual(self.limits.get_stats()["total_hits"], 100)
+
+
+class TestHeadControlLoop(unittest.TestCase):
+    """Kafa PID döngüsü testleri"""
+    
+    def setUp(self):
+        self.controller = ServoController(ServoSettings(movement_speed=5, gaze_lut_cache_dir=""),
+                                          SystemLogger())
+        self.controller.mock_mode = True
+        self.controller._initialize_mock_positions()
+        self.loop = self.controller.head_loop
+    
+    def _run(self, seconds: float, start_time: float = 0.0, dt: float = 0.01):
+        steps = int(seconds / dt)
+        for i in range(steps):
+            self.loop.step(dt, start_time + i * dt)
+    
+    def test_converges_to_setpoint(self):
+        """Döngü setpoint'e yakınsamalı ve sadece değişimde komut göndermeli"""
+        self.loop.set_setpoint(110, 100, timestamp=0.0)
+        self._run(1.0)
+        
+        self.assertEqual(self.controller.current_positions.get(ServoIDs.HEAD_PAN.value), 110)
+        self.assertEqual(self.controller.current_positions.get(ServoIDs.HEAD_TILT.value), 100)
+        
+        # Setpoint'e ulaştıktan sonra trafik olmamalı
+        sent = self.loop.commands_sent
+        self._run(0.5, start_time=1.0)
+        self.assertEqual(self.loop.commands_sent, sent)
+    
+    def test_setpoint_timeout_idles_loop(self):
+        """Eski setpoint ile komut gönderilmemeli"""
+        self.loop.set_setpoint(130, 90, timestamp=0.0)
+        self._run(0.2, start_time=5.0)
+        
+        self.assertEqual(self.loop.commands_sent, 0)
+        self.assertEqual(self.controller.current_positions.get(ServoIDs.HEAD_PAN.value), 90)
+    
+    def test_loop_yields_during_animation(self):
+        """Klip oynarken döngü komut göndermemeli, bitince klibin bıraktığı pozisyondan devam etmeli"""
+        self.loop.set_setpoint(110, 90, timestamp=0.0)
+        self._run(0.5)
+        sent = self.loop.commands_sent
+
+        # 'nod' klibi sadece tilt'i sürer
+        self.controller._animation_engine = Mock(is_playing=True)
+        self.controller.set_head_position(110, 60)
+        self.loop.set_setpoint(110, 90, timestamp=0.5)
+        self._run(0.3, start_time=0.5)
+        self.assertEqual(self.loop.commands_sent, sent)
+        self.assertEqual(self.controller.current_positions.get(ServoIDs.HEAD_TILT.value), 60)
+
+        # Klip sürerken gelen tespit kafayı/kolları sürmemeli
+        with patch.object(self.controller, 'set_arm_position') as set_arm:
+            self.controller.point_to_position(0, 0, 640, 480)
+        set_arm.assert_not_called()
+        self.assertEqual(self.loop.setpoint, (110, 90))
+
+        self.controller._animation_engine.is_playing = False
+        self.loop.set_setpoint(110, 90, timestamp=0.8)
+        self._run(1.0, start_time=0.8)
+        self.assertGreater(self.loop.commands_sent, sent)
+        self.assertEqual(self.controller.current_positions.get(ServoIDs.HEAD_TILT.value), 90)
+
+    def test_loop_steps_keep_travel_time_estimate(self):
+        """Döngünün ~1°'lik adımları hareket süresi tahminini (gecikme telafisi) sıfıra çekmemeli"""
+        self.controller._update_head_travel_time(130, 90)
+        travel_time = self.controller.head_travel_time
+        self.assertGreater(travel_time, 0.0)
+        
+        self.loop.set_setpoint(130, 90, timestamp=0.0)
+        self._run(1.0)
+        
+        self.assertEqual(self.controller.get_current_positions()[ServoIDs.HEAD_PAN.value], 130)
+        self.assertGreater(self.loop.commands_sent, 5)
+        self.assertEqual(self.controller.head_travel_time, travel_time)
+    
+    def test_point_to_position_updates_setpoint(self):
+        """Döngü çalışırken tespit sadece setpoint'i güncellemeli"""
+        self.controller.settings.enable_pid = True
+        self.controller._start_head_loop()
+        try:
+            with patch.object(self.controller, 'set_arm_position'):
+                self.controller.point_to_position(640, 240, 640, 480)
+            self.assertAlmostEqual(self.loop.setpoint[0], 120.0, delta=0.2)
+            self.assertAlmostEqual(self.loop.setpoint[1], 90.0, delta=0.2)
+            
+            time.sleep(0.3)
+            stats = self.loop.get_stats()
+            self.assertTrue(stats["running"])
+            self.assertGreater(stats["iterations"], 10)
+            self.assertIn("pan_error_rms", stats)
+        finally:
+            self.controller.head_loop.stop()
+
+
+class TestGazeLookupTable(unittest.TestCase):
+    """Piksel -> pan/tilt tablosu testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.intrinsics = {"fx": 600.0, "fy": 600.0, "ppx": 320.0, "ppy": 240.0}
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_lookup_matches_pinhole_model(self):
+        """Tablo değerleri pinhole modeli ile aynı olmalı"""
+        table = GazeLookupTable.load_or_build(640, 480, self.intrinsics)
+        
+        self.assertEqual(table.lookup(320, 240), (90.0, 90.0))
+        pan, tilt = table.lookup(620, 240)
+        self.assertAlmostEqual(pan, 90 + math.degrees(math.atan(300 / 600)), places=3)
+        self.assertAlmostEqual(tilt, 90.0, places=3)
+        
+        # Limitler tabloya gömülü
+        pans, tilts = table.lookup_many(np.array([0, 639]), np.array([0, 479]))
+        self.assertTrue(np.all((pans >= 30) & (pans <= 150)))
+        self.assertTrue(np.all((tilts >= 60) & (tilts <= 120)))
+    
+    def test_depth_uses_head_offset(self):
+        """Derinlik verilirse kamera-kafa ofseti hesaba katılmalı"""
+        table = GazeLookupTable.load_or_build(640, 480, self.intrinsics, head_offset=(0.1, 0.0, 0.0))
+        
+        far_pan, _ = table.lookup(320, 240)
+        near_pan, _ = table.lookup(320, 240, depth=1.0)
+        
+        self.assertEqual(far_pan, 90.0)
+        self.assertAlmostEqual(near_pan, 90 - math.degrees(math.atan(0.1)), places=3)
+    
+    def test_disk_cache_and_invalidation(self):
+        """Tablo önbellekten yüklenmeli, kalibrasyon değişince yenilenmeli"""
+        cache_dir = self.temp_dir.name
+        GazeLookupTable.load_or_build(640, 480, self.intrinsics, cache_dir=cache_dir)
+        
+        cached = GazeLookupTable.load_or_build(640, 480, self.intrinsics, cache_dir=cache_dir)
+        self.assertTrue(cached.loaded_from_cache)
+        
+        recalibrated = dict(self.intrinsics, fx=610.0)
+        rebuilt = GazeLookupTable.load_or_build(640, 480, recalibrated, cache_dir=cache_dir)
+        self.assertFalse(rebuilt.loaded_from_cache)
+        self.assertEqual(len(list(Path(cache_dir).glob("gaze_lut_640x480_*.npz"))), 1)
+    
+    def test_controller_uses_camera_calibration(self):
+        """ServoController kamera bilgisine göre tablo seçmeli"""
+        controller = ServoController(ServoSettings(gaze_lut_cache_dir=self.temp_dir.name), SystemLogger())
+        default_table = controller.get_gaze_table(640, 480)
+        
+        controller.set_camera_calibration(dict(self.intrinsics, width=1280, height=960, fx=1200.0,
+                                               fy=1200.0, ppx=640.0, ppy=480.0))
+        table = controller.get_gaze_table(640, 480)
+        
+        self.assertIsNot(table, default_table)
+        self.assertEqual(table.intrinsics, self.intrinsics)
+
+
+class TestArmReachabilityGrid(unittest.TestCase):
+    """Kol IK ızgarası testleri"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.grid = ArmReachabilityGrid.from_limit_arrays(np.zeros(14), np.full(14, 180.0))
+        cls.grid.load_or_build()
+    
+    def _pointing_error(self, arm: str, angles: np.ndarray, points: np.ndarray) -> np.ndarray:
+        shoulder = np.asarray(SHOULDER_POSITIONS[arm])
+        pointing = forward_kinematics(arm, angles) - shoulder
+        targets = points - shoulder
+        cos = np.sum(pointing * targets, axis=1) / (
+            np.linalg.norm(pointing, axis=1) * np.linalg.norm(targets, axis=1))
+        return np.degrees(np.arccos(np.clip(cos, -1, 1)))
+    
+    def test_solve_points_at_targets(self):
+        """Çözülen açılar hedefe yönelmeli (vektörel, iki kol)"""
+        points = np.array([[-1.0, 0.0, 2.0], [1.2, -0.6, 3.1], [0.1, 0.3, 1.4]])
+        
+        for arm in ('left', 'right'):
+            angles, reachable = self.grid.solve(arm, points)
+            self.assertEqual(angles.shape, (3, 3))
+            self.assertTrue(reachable.all())
+            self.assertTrue(np.all(self._pointing_error(arm, angles, points) < 5.0))
+    
+    def test_out_of_grid_is_unreachable(self):
+        """Izgara dışındaki hedefler erişilemez olmalı"""
+        _, reachable = self.grid.solve('left', np.array([[0.0, 0.0, 20.0], [0.0, 0.0, 2.0]]))
+        self.assertEqual(reachable.tolist(), [False, True])
+    
+    def test_cache_roundtrip(self):
+        """Izgara önbellekten aynı sonuçla yüklenmeli"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.grid.save(cache_dir)
+            cached = ArmReachabilityGrid.from_limit_arrays(np.zeros(14), np.full(14, 180.0))
+            cached.load_or_build(cache_dir)
+            
+            self.assertTrue(cached.loaded_from_cache)
+            np.testing.assert_array_equal(cached.angles['right'], self.grid.angles['right'])
+
+
+class TestServoStateSnapshot(unittest.TestCase):
+    """Kalıcı servo durumu testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_file = str(Path(self.temp_dir.name) / "servo_state.bin")
+        self.logger = SystemLogger()
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_write_and_load(self):
+        """Yazılan poz aynen geri okunmalı"""
+        snapshot = ServoStateSnapshot(self.state_file, self.logger)
+        pose = ServoPose.from_dict({0: 45, 12: 120, 13: 80})
+        snapshot.write(pose)
+        self.assertFalse(snapshot.write_if_changed(pose))
+        snapshot.stop()
+        
+        self.assertEqual(Path(self.state_file).stat().st_size, STATE_SIZE)
+        self.assertEqual(ServoStateSnapshot(self.state_file, self.logger).load(), pose)
+    
+    def test_corrupt_file_is_ignored(self):
+        """CRC uyuşmazlığında poz yüklenmemeli"""
+        snapshot = ServoStateSnapshot(self.state_file, self.logger)
+        snapshot.write(ServoPose.full(100))
+        snapshot.stop()
+        
+        data = bytearray(Path(self.state_file).read_bytes())
+        data[30] ^= 0xFF
+        Path(self.state_file).write_bytes(bytes(data))
+        
+        self.assertIsNone(ServoStateSnapshot(self.state_file, self.logger).load())
+    
+    def test_initialize_builds_arm_ik_in_background(self):
+        """Soğuk önbellekte IK ızgarası initialize'ı bekletmemeli"""
+        settings = ServoSettings(state_file=self.state_file, enable_pid=False,
+                                 gaze_lut_cache_dir=self.temp_dir.name)
+        controller = ServoController(settings, self.logger)
+        controller.arduino = Mock()
+        controller.arduino.connect.return_value = False
+        
+        start = time.time()
+        self.assertTrue(controller.initialize())
+        self.assertLess(time.time() - start, 0.5)
+        
+        controller.arm_ik_thread.join(timeout=30.0)
+        self.assertIsNotNone(controller._arm_ik)
+        self.assertEqual(len(list(Path(self.temp_dir.name).glob("arm_ik_*.npz"))), 1)
+        controller.cleanup()
+    
+    def test_arm_ik_never_built_on_detection_path(self):
+        """Izgara hazır değilken veya hazırlığı başarısızken tespit thread'i ızgara üretmemeli"""
+        settings = ServoSettings(state_file=self.state_file, enable_pid=False, gaze_lut_cache_dir="")
+        controller = ServoController(settings, self.logger)
+        controller.arduino = Mock()
+        controller.arduino.connect.return_value = False
+        
+        with patch.object(ArmReachabilityGrid, 'from_limit_arrays', side_effect=MemoryError("test")) as build:
+            self.assertTrue(controller.initialize())
+            controller.arm_ik_thread.join(timeout=5.0)
+            self.assertTrue(controller.arm_ik_failed)
+            self.assertEqual(controller.get_status()["arm_ik"], "failed")
+            
+            with patch.object(controller, 'set_arm_position') as set_arm:
+                for _ in range(3):
+                    controller.point_to_position(100, 240, 640, 480)
+            set_arm.assert_not_called()
+            self.assertEqual(build.call_count, 1)  # sadece arka plan denemesi
+        controller.cleanup()
+    
+    def test_warm_restart_skips_calibration(self):
+        """Kayıt varsa initialize kalibrasyon yapmadan kayıtlı pozu göndermeli"""
+        saved = ServoPose.full(90)
+        saved.set(ServoIDs.HEAD_PAN.value, 130)
+        snapshot = ServoStateSnapshot(self.state_file, self.logger)
+        snapshot.write(saved)
+        snapshot.stop()
+        
+        settings = ServoSettings(state_file=self.state_file, enable_pid=False, gaze_lut_cache_dir="")
+        controller = ServoController(settings, self.logger)
+        controller.arduino = Mock()
+        controller.arduino.connect.return_value = True
+        controller._arm_ik = Mock()
+        
+        start = time.time()
+        with patch.object(controller, 'calibrate_all_servos') as mock_calibrate:
+            self.assertTrue(controller.initialize())
+        
+        self.assertLess(time.time() - start, 1.0)
+        mock_calibrate.assert_not_called()
+        controller.arduino.set_pose.assert_called_once()
+        self.assertEqual(controller.current_positions.get(ServoIDs.HEAD_PAN.value), 130)
+        
+        controller.set_servo_angle(ServoIDs.HEAD_PAN.value, 100)
+        controller.cleanup()
+        self.assertEqual(ServoStateSnapshot(self.state_file, self.logger).load()
+                         .get(ServoIDs.HEAD_PAN.value), 100)
+
+
+class TestAsyncArduinoComm(unittest.TestCase):
+    """asyncio seri transport ve onay eşleme testleri (sahte Arduino ile)"""
+    
+    def setUp(self):
+        self.fake = ArduinoSimulator()
+        self.arduino = ArduinoComm(ServoSettings(port=self.fake.port), SystemLogger())
+        self.assertTrue(self.arduino.connect())
+    
+    def tearDown(self):
+        self.arduino.disconnect()
+        self.fake.close()
+    
+    def test_pose_resolves_on_ack(self):
+        """Poz tüm servolar onaylanınca True ile tamamlanmalı"""
+        pose = ServoPose.from_dict({0: 45, 12: 120, 13: 80})
+        
+        self.assertTrue(asyncio.run(self.arduino.set_pose_async(pose)))
+        self.assertIn("S12,120", self.fake.received)
+        
+        status = self.arduino.get_status()
+        self.assertEqual(status["pending_acks"], 0)
+        self.assertGreater(status["ack_latency_ms"], 0.0)
+        self.assertGreater(self.arduino.get_serial_latency(), 0.0)
+    
+    def test_missing_ack_times_out(self):
+        """Onay gelmezse False dönmeli ve zaman aşımı sayılmalı"""
+        self.fake.silent = True
+        
+        self.assertFalse(asyncio.run(self.arduino.set_servo_angle_async(3, 100)))
+        self.assertEqual(self.arduino.arduino_status["ack_timeouts"], 1)
+    
+    def test_sync_api_does_not_block(self):
+        """Senkron set_pose onayı beklemeden dönmeli"""
+        self.fake.silent = True
+        
+        start = time.perf_counter()
+        self.assertTrue(self.arduino.set_pose(ServoPose.full(100)))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.arduino.calibrate_servos())
+    
+    def test_boards_have_independent_io_threads(self):
+        """Bir kartın loop'u meşgulken diğer kartın onay gecikmesi etkilenmemeli"""
+        other_fake = ArduinoSimulator()
+        other = ArduinoComm(ServoSettings(port=other_fake.port), SystemLogger())
+        self.assertTrue(other.connect())
+        try:
+            self.assertIsNot(get_servo_loop(self.fake.port), get_servo_loop(other_fake.port))
+            
+            async def slow_callback():
+                time.sleep(0.5)  # yoklama kipi / yavaş geri çağırma: loop'u bloklar
+            
+            blocked = asyncio.run_coroutine_threadsafe(slow_callback(), get_servo_loop(self.fake.port))
+            time.sleep(0.05)
+            start = time.perf_counter()
+            self.assertTrue(asyncio.run(other.set_pose_async(ServoPose.from_dict({12: 100}))))
+            self.assertLess(time.perf_counter() - start, 0.3)
+            blocked.result(2.0)
+        finally:
+            other.disconnect()
+            other_fake.close()
+    
+    @unittest.skipUnless(os.name == "posix", "termios yalnızca POSIX")
+    def test_port_keeps_dtr_on_close(self):
+        """Açılan portta HUPCL kapatılmalı (yeniden bağlanınca Arduino resetlenmesin)"""
+        import termios
+        self.arduino.disconnect()
+        fd = os.open(self.fake.port, os.O_RDWR | os.O_NOCTTY)
+        try:
+            attrs = termios.tcgetattr(fd)
+            attrs[2] |= termios.HUPCL
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+        finally:
+            os.close(fd)
+        
+        self.assertTrue(self.arduino.connect())
+        attrs = termios.tcgetattr(self.arduino.core.serial_port.fileno())
+        self.assertFalse(attrs[2] & termios.HUPCL)
+
+
+class TestServoJournal(unittest.TestCase):
+    """Servo komut günlüğü ve tekrar oynatma testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.simulator = ArduinoSimulator()
+    
+    def tearDown(self):
+        self.simulator.close()
+        self.temp_dir.cleanup()
+    
+    def test_record_roundtrip(self):
+        """Kayıtlar sırayla ve monotonic zaman damgalarıyla okunmalı"""
+        path = os.path.join(self.temp_dir.name, "test.jrn")
+        journal = ServoJournal(path)
+        self.assertTrue(journal.start())
+        journal.record(DIRECTION_TX, "S12,100")
+        journal.record(DIRECTION_RX, "OK:12:100")
+        journal.stop()
+        
+        records = list(read_journal(path))
+        self.assertEqual([r.line for r in records], ["S12,100", "OK:12:100"])
+        self.assertEqual([r.direction for r in records], [DIRECTION_TX, DIRECTION_RX])
+        self.assertLessEqual(records[0].timestamp_ns, records[1].timestamp_ns)
+        
+        stats = analyze_journal(records)
+        self.assertEqual(stats["commands"], 1)
+        self.assertEqual(stats["unacked"], 0)
+    
+    def test_arduino_journal_and_replay(self):
+        """ArduinoComm trafiği günlüğe yazılmalı ve günlük hızlı oynatılabilmeli"""
+        settings = ServoSettings(port=self.simulator.port, journal_dir=self.temp_dir.name)
+        arduino = ArduinoComm(settings, SystemLogger())
+        self.assertTrue(arduino.connect())
+        self.assertTrue(asyncio.run(arduino.set_pose_async(ServoPose.from_dict({12: 100, 13: 80}))))
+        arduino.disconnect()
+        
+        path = next(Path(self.temp_dir.name).glob("servo_*.jrn"))
+        records = list(read_journal(str(path)))
+        tx_lines = [r.line for r in records if r.is_tx]
+        self.assertIn("S12,100", tx_lines)
+        self.assertIn("OK:13:80", [r.line for r in records if not r.is_tx])
+        
+        replayer = JournalReplayer(records, speed=0.0)
+        arduino = ArduinoComm(ServoSettings(port=self.simulator.port), SystemLogger())
+        self.assertTrue(arduino.connect())
+        try:
+            result = run_on_servo_loop(replayer.replay(arduino.core), timeout=5.0, endpoint=self.simulator.port)
+        finally:
+            arduino.disconnect()
+        
+        self.assertEqual(result["commands"], len(tx_lines))
+        self.assertEqual(result["ack_timeouts"], 0)
+        self.assertEqual(self.simulator.servo_angles[12], 100)
+
+
+class TestServoBus(unittest.TestCase):
+    """Çoklu kart servo veri yolu testleri"""
+    
+    def setUp(self):
+        self.settings = ServoSettings(servo_buses=[
+            {"name": "head", "port": "/dev/ttyUSB0", "servos": [12, 13]},
+            {"name": "left_arm", "port": "/dev/ttyUSB1", "servos": [0, 1, 2, 3, 4, 5]},
+            {"name": "right_arm", "port": "/dev/ttyUSB2", "servos": [6, 7, 8, 9, 10, 11]}
+        ])
+        self.logger = SystemLogger()
+    
+    def _connected_bus(self) -> ServoBus:
+        bus = ServoBus(self.settings, self.logger, self.settings.servo_buses)
+        for board in bus.boards:
+            board.is_connected = True
+            board._submit = Mock()
+        return bus
+    
+    def test_pose_fans_out_per_board(self):
+        """Poz her karta sadece kendi servolarıyla gitmeli"""
+        bus = self._connected_bus()
+        pose = ServoPose.from_dict({0: 45, 7: 100, 12: 120})
+        
+        self.assertTrue(bus.set_pose(pose))
+        
+        head, left_arm, right_arm = (board._submit.call_args[0][0] for board in bus.boards)
+        self.assertEqual(head, ["S12,120"])
+        self.assertEqual(left_arm, ["S0,45"])
+        self.assertEqual(right_arm, ["S7,100"])
+        self.assertEqual(bus.get_servo_positions(), {0: 45, 7: 100, 12: 120})
+    
+    def test_single_servo_routing_and_status(self):
+        """Tekil komut doğru karta gitmeli, durum kart bazlı olmalı"""
+        bus = self._connected_bus()
+        
+        self.assertTrue(bus.set_servo_angle(13, 80))
+        bus.boards[0]._submit.assert_called_once_with(["S13,80"])
+        
+        status = bus.get_status()
+        self.assertEqual(set(status["boards"]), {"head", "left_arm", "right_arm"})
+        self.assertEqual(status["boards"]["head"]["servos"], [12, 13])
+        self.assertIn("ack_latency_ms", status["boards"]["right_arm"])
+    
+    def test_partial_board_failure(self):
+        """Bir kart koptuğunda diğer kartların servoları mevcut pozisyona işlenmeli"""
+        controller = ServoController(self.settings, self.logger)
+        bus = controller.arduino
+        for board in bus.boards:
+            board.is_connected = True
+            board._submit = Mock()
+        bus.boards[1].is_connected = False  # left_arm
+        
+        pose = ServoPose.from_dict({0: 45, 7: 100, 12: 120})
+        self.assertEqual(bus.set_pose_boards(pose), {"head": True, "left_arm": False, "right_arm": True})
+        self.assertFalse(controller.set_pose(pose, check_limits=False))
+        self.assertEqual(controller.get_current_positions(), {7: 100, 12: 120})
+        
+        status = bus.get_status()
+        self.assertTrue(status["degraded"])
+        self.assertEqual(status["connected_boards"], ["head", "right_arm"])
+    
+    def test_controller_uses_bus(self):
+        """servo_buses ayarlıysa ServoController veri yolunu kullanmalı"""
+        controller = ServoController(self.settings, self.logger)
+        self.assertIsInstance(controller.arduino, ServoBus)
+        
+        with self.assertRaises(ValueError):
+            ServoBus(self.settings, self.logger, [{"port": "a", "servos": [1]}, {"port": "b", "servos": [1]}])
+
+
+class TestAnimationHotReload(unittest.TestCase):
+    """Animasyon hot-reload testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.animation_dir = Path(self.temp_dir.name)
+        self.logger = Mock()
+        
+        with patch.object(AnimationEngine, 'load_default_animations'):
+            self.engine = AnimationEngine(Mock(), self.logger)
+        self.engine.animation_path = self.animation_dir
+        
+        self.watcher = AnimationWatcher(
+            self.animation_dir, self.engine._on_animation_files_changed,
+            self.logger, use_inotify=False
+        )
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _write_animation(self, file_name: str, name: str, angle: int):
+        data = {
+            "name": name,
+            "keyframes": [
+                {"timestamp": 0.0, "servo_positions": {"12": 90}},
+                {"timestamp": 1.0, "servo_positions": {"12": angle}}
+            ]
+        }
+        (self.animation_dir / file_name).write_text(json.dumps(data), encoding='utf-8')
+    
+    def test_changed_file_is_swapped(self):
+        """Değişen dosya yeni Animation nesnesiyle değiştirilmeli"""
+        self._write_animation("nod.json", "nod", 100)
+        self.watcher.scan()
+        first = self.engine.animations["nod"]
+        
+        self._write_animation("nod.json", "nod", 45)
+        changed, removed = self.watcher.scan()
+        
+        self.assertEqual(len(changed), 1)
+        self.assertIsNot(self.engine.animations["nod"], first)
+        self.assertEqual(self.engine.animations["nod"].keyframes[1].servo_positions["12"], 45)
+        # Eski nesne (oynatılıyor olabilir) değişmemeli
+        self.assertEqual(first.keyframes[1].servo_positions["12"], 100)
+    
+    def test_unchanged_files_not_recompiled(self):
+        """Değişmeyen dosyalar tekrar derlenmemeli"""
+        self._write_animation("nod.json", "nod", 100)
+        self.watcher.scan()
+        
+        with patch.object(self.engine, '_compile_animation') as mock_compile:
+            changed, removed = self.watcher.scan()
+        
+        self.assertEqual(changed, [])
+        mock_compile.assert_not_called()
+    
+    def test_broken_file_keeps_previous_version(self):
+        """Bozuk dosya önceki sürümü silmemeli"""
+        self._write_animation("nod.json", "nod", 100)
+        self.watcher.scan()
+        previous = self.engine.animations["nod"]
+        
+        (self.animation_dir / "nod.json").write_text("{ yarım", encoding='utf-8')
+        self.watcher.scan()
+        
+        self.assertIs(self.engine.animations["nod"], previous)
+    
+    def test_removed_file_unregisters_animation(self):
+        """Silinen dosyanın animasyonu kaldırılmalı"""
+        self._write_animation("nod.json", "nod", 100)
+        self.watcher.scan()
+        
+        (self.animation_dir / "nod.json").unlink()
+        changed, removed = self.watcher.scan()
+        
+        self.assertEqual(len(removed), 1)
+        self.assertNotIn("nod", self.engine.animations)
@@ -0,0 +1,195 @@
+# =======================
+# tests/test_speech.py - Konuşma Ardışık Düzeni Testleri
+# =======================
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from config.settings import AISettings
+from modules.ai.speech import SpeechPipeline, VoiceActivityDetector, create_speech_pipeline, split_sentences
+from modules.ai.speech_backends import (
+    OpenAITTSBackend, StubAudioSink, StubSTTBackend, StubTTSBackend, WavFileSink, WavFileSource
+)
+
+
+def slow_stream(text: str, delay: float = 0.02):
+    """GPT akışını taklit et (kelime kelime)"""
+    for word in text.split(" "):
+        time.sleep(delay)
+        yield word + " "
+
+
+class TestSentenceSplitting(unittest.TestCase):
+    """Akış parçalarını cümlelere bölme testleri"""
+
+    def test_stream_chunks_to_sentences(self):
+        """Parçalara bölünmüş metin cümle cümle gelmeli, ondalıklar bölünmemeli"""
+        chunks = ["Merhaba! Ben ", "robotum. Boyum 1.", "8 metre", ". Sorunuz var mı?"]
+        self.assertEqual(list(split_sentences(chunks)),
+                         ["Merhaba!", "Ben robotum.", "Boyum 1.8 metre.", "Sorunuz var mı?"])
+
+    def test_long_sentence_is_split(self):
+        """Cümle sonu gelmeyen uzun metin virgülden bölünmeli"""
+        text = "Kameram, servolarım, yapay zekam " * 10
+        parts = list(split_sentences([text], max_chars=60))
+        self.assertGreater(len(parts), 1)
+        self.assertTrue(all(len(part) <= 60 for part in parts))
+        self.assertEqual(" ".join(parts).split(), text.split())
+
+
+class TestSpeechPipeline(unittest.TestCase):
+    """Akışlı TTS ve VAD'li STT testleri (donanımsız arka uçlarla)"""
+
+    def setUp(self):
+        self.tts = StubTTSBackend(chars_per_second=100.0, latency=0.02)
+        self.sink = StubAudioSink(realtime=True)
+        self.stt = StubSTTBackend("Sen nesin?")
+        self.pipeline = SpeechPipeline(self.tts, self.sink, self.stt)
+
+    def test_first_sentence_plays_while_generating(self):
+        """İlk cümle, yanıtın geri kalanı üretilirken çalmaya başlamalı"""
+        text = "Merhaba, ben Expo. Fuarda ziyaretçilerle konuşuyorum. Size robotik hakkında bilgi verebilirim."
+        generation_time = len(text.split(" ")) * 0.03
+        stats = self.pipeline.speak_stream(slow_stream(text, 0.03))
+
+        self.assertEqual(stats["sentences"], 3)
+        self.assertLess(stats["time_to_first_audio"], generation_time / 2)
+        self.assertEqual(self.tts.synthesized[0], "Merhaba, ben Expo.")
+        self.assertEqual(len(self.sink.played_seconds), 3)
+
+    def test_benchmark_pipelined_vs_sequential(self):
+        """Cümle bazlı akış ilk sesi belirgin şekilde öne çekmeli"""
+        result = self.pipeline.benchmark("Bu bir deneme. İkinci cümle biraz daha uzun. Üçüncü cümle de burada.",
+                                         chunk_delay=0.02)
+        self.assertLess(result["pipelined_first_audio_ms"], result["sequential_first_audio_ms"] / 2)
+        self.assertEqual(result["sentences"], 3)
+
+    def test_stop_drops_pending_sentences(self):
+        """stop() sonrası kuyruktaki cümleler çalınmamalı"""
+        self.tts.chars_per_second = 20.0
+        stream = slow_stream("Bir. İki. Üç. Dört. Beş.", 0.01)
+
+        def interrupt():
+            time.sleep(0.1)
+            self.pipeline.stop()
+
+        Thread(target=interrupt).start()
+        stats = self.pipeline.speak_stream(stream)
+        self.assertLess(stats["sentences"], 5)
+        self.assertTrue(self.sink.stopped)
+
+    def _write_utterance(self, path: str, speech_seconds: float = 1.0, trailing_silence: float = 2.0):
+        rate = 16000
+        t = np.arange(int(speech_seconds * rate)) / rate
+        speech = (np.sin(2 * np.pi * 300 * t) * 8000).astype(np.int16)
+        silence = lambda seconds: (np.random.default_rng(0).normal(0, 30, int(seconds * rate))).astype(np.int16)
+        samples = np.concatenate([silence(0.3), speech, silence(trailing_silence)])
+
+        sink = WavFileSink(path)
+        sink.play(samples, rate)
+        sink.close()
+
+    def test_vad_ends_utterance_early(self):
+        """Konuşmadan sonraki sessizlikte kayıt dosyanın sonunu beklemeden bitmeli"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "utterance.wav")
+            self._write_utterance(path)
+
+            self.assertEqual(self.pipeline.listen(WavFileSource(path)), "Sen nesin?")
+            heard = self.stt.received_seconds[0]
+            self.assertGreater(heard, 1.0)
+            self.assertLess(heard, 1.8)  # 3.3 s'lik dosyanın tamamı değil
+            self.assertEqual(self.pipeline.last_listen["ended_by_silence"], 1.0)
+
+    def test_no_speech_returns_none(self):
+        """Sadece gürültü varsa STT çağrılmamalı"""
+        noise = [np.random.default_rng(1).normal(0, 30, 320).astype(np.int16) for _ in range(50)]
+        self.assertIsNone(self.pipeline.listen(noise))
+        self.assertEqual(self.stt.received_seconds, [])
+
+    def test_vad_adapts_to_noise_floor(self):
+        """Eşik üstü sabit gürültüde de konuşma ayırt edilmeli"""
+        vad = VoiceActivityDetector(threshold=0.001)
+        rng = np.random.default_rng(2)
+        for _ in range(100):
+            vad.process(rng.normal(0, 200, 320).astype(np.int16))
+        self.assertFalse(vad.triggered)
+
+        for _ in range(10):
+            vad.process(rng.normal(0, 4000, 320).astype(np.int16))
+        self.assertTrue(vad.triggered)
+
+    def test_wav_backend_from_settings(self):
+        """wav arka ucu çıktıyı dosyaya yazmalı"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "out.wav")
+            pipeline = create_speech_pipeline(AISettings(speech_backend="wav", speech_output_file=path,
+                                                         enable_stt=False))
+            pipeline.tts.latency = 0.0
+            pipeline.speak("Merhaba. Hoş geldiniz.")
+            pipeline.cleanup()
+
+            with wave.open(path, "rb") as wav:
+                self.assertGreater(wav.getnframes(), 0)
+                self.assertEqual(wav.getframerate(), 16000)
+
+        self.assertIsNone(create_speech_pipeline(AISettings(enable_tts=False)))
+
+    def test_sounddevice_backend_uses_real_tts(self):
+        """Hoparlör arka ucu ton yerine OpenAI TTS kullanmalı; sounddevice yoksa hata vermeli"""
+        settings = AISettings(speech_backend="sounddevice", enable_stt=False, openai_api_key="test-key")
+        with patch("modules.ai.speech_backends.sounddevice", Mock()):
+            pipeline = create_speech_pipeline(settings)
+        self.assertIsInstance(pipeline.tts, OpenAITTSBackend)
+        self.assertEqual(pipeline.tts.api_base, "https://api.openai.com/v1")
+
+        with patch("modules.ai.speech_backends.sounddevice", None):
+            with self.assertRaises(RuntimeError):
+                create_speech_pipeline(settings)
+
+    def test_openai_tts_backend(self):
+        """Sentez isteği PCM biçiminde gönderilmeli ve int16 örneklere çevrilmeli"""
+        received = []
+        samples = (np.arange(2400) % 100).astype(np.int16)
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                received.append((self.path, self.headers["Authorization"],
+                                 json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+                data = samples.tobytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            tts = OpenAITTSBackend("test-key", f"http://127.0.0.1:{server.server_address[1]}/v1", voice="nova")
+            self.assertTrue(np.array_equal(tts.synthesize("Merhaba."), samples))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        path, authorization, body = received[0]
+        self.assertEqual(path, "/v1/audio/speech")
+        self.assertEqual(authorization, "Bearer test-key")
+        self.assertEqual(body["response_format"], "pcm")
+        self.assertEqual(body["voice"], "nova")
+
+
+if __name__ == '__main__':
+    unittest.main()